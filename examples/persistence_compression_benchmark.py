@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Benchmark script for the compression codecs on small persisted values.
+
+Compares the compression ratio and throughput of the available codecs on
+200-2000 byte JSON blobs, which is the typical size of the session and
+metadata values stored in ``PersistentDict``. The ``zstd_dict`` codec is
+trained on a sample of the values before it is measured.
+
+Usage:
+    python examples/persistence_compression_benchmark.py
+    python examples/persistence_compression_benchmark.py --count 5000 --dict-size 8192
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import List
+
+try:
+    from lzl.io.compression import get_compression
+except ImportError:
+    import sys
+    print("Error: lzl.io.compression not available. Install with: pip install -e .")
+    sys.exit(1)
+
+
+CODECS = ("zlib", "lz4", "zstd", "zstd_dict")
+
+
+def make_values(count: int, seed: int = 42) -> List[bytes]:
+    """Generate JSON blobs between roughly 200 and 2000 bytes."""
+    rng = random.Random(seed)
+    values = []
+    for i in range(count):
+        value = {
+            "session_id": f"{rng.getrandbits(64):016x}",
+            "user_id": f"user-{rng.randint(1, 100_000)}",
+            "created_at": 1_700_000_000 + rng.randint(0, 10_000_000),
+            "roles": rng.sample(["admin", "reader", "writer", "billing", "support"], k = rng.randint(1, 3)),
+            "client": {
+                "ip": f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+                "user_agent": rng.choice([
+                    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) Safari/605.1.15",
+                    "python-httpx/0.27.0",
+                ]),
+            },
+            "history": [
+                {"path": rng.choice(["/", "/login", "/settings", "/billing"]), "status": rng.choice([200, 302, 404])}
+                for _ in range(rng.randint(1, 25))
+            ],
+        }
+        values.append(json.dumps(value).encode())
+    return values
+
+
+def benchmark_codec(name: str, values: List[bytes], dict_size: int, sample_size: int) -> dict:
+    """Compress and decompress the values and return the measurements."""
+    compressor = get_compression(name)
+    if name == "zstd_dict":
+        compressor.train_dictionary(values[:sample_size], dict_size = dict_size)
+
+    start = time.perf_counter()
+    compressed = compressor.compress_many(values)
+    compress_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decompressed = [compressor.decompress(value) for value in compressed]
+    decompress_elapsed = time.perf_counter() - start
+    assert decompressed == values, f"{name}: roundtrip mismatch"
+
+    raw_size = sum(len(value) for value in values)
+    return {
+        "ratio": raw_size / sum(len(value) for value in compressed),
+        "compress": raw_size / compress_elapsed / (1024 * 1024),
+        "decompress": raw_size / decompress_elapsed / (1024 * 1024),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type = int, default = 20_000, help = "Number of values")
+    parser.add_argument("--dict-size", type = int, default = 16 * 1024, help = "Size of the trained dictionary in bytes")
+    parser.add_argument("--sample-size", type = int, default = 1000, help = "Number of values to train the dictionary on")
+    args = parser.parse_args()
+
+    values = make_values(args.count)
+    avg_size = sum(len(value) for value in values) / len(values)
+    print(f"Compression: {args.count:,} JSON values (avg {avg_size:,.0f} bytes)")
+    print("-" * 60)
+    print(f"{'codec':>10} {'ratio':>8} {'compress':>14} {'decompress':>14}")
+    for name in CODECS:
+        try:
+            result = benchmark_codec(name, values, args.dict_size, args.sample_size)
+        except ImportError as e:
+            print(f"{name:>10}  skipped ({e})")
+            continue
+        print(f"{name:>10} {result['ratio']:>7.2f}x {result['compress']:>9.1f} MB/s {result['decompress']:>9.1f} MB/s")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
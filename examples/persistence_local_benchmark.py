@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Benchmark script for the LocalStatefulBackend file formats.
+
+Compares sequential ``PersistentDict`` writes using the default ``json``
+format (full-file rewrite per mutation) against the append-only
+``journal`` format.
+
+Usage:
+    python examples/persistence_local_benchmark.py
+    python examples/persistence_local_benchmark.py --count 2000 --value-size 512
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    from lzl.io.persistence import PersistentDict
+except ImportError:
+    import sys
+    print("Error: lzl.io.persistence not available. Install with: pip install -e .")
+    sys.exit(1)
+
+
+def format_time(seconds: float) -> str:
+    """Format seconds as human-readable duration."""
+    if seconds < 1.0:
+        return f"{seconds * 1000:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def benchmark_sets(file_format: str, count: int, value_size: int) -> float:
+    """Run ``count`` sequential sets and return the elapsed time."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = PersistentDict(
+            name = f"bench_{file_format}",
+            backend_type = "local",
+            serializer = "json",
+            file_path = Path(tmpdir).joinpath("cache.json"),
+            file_format = file_format,
+        )
+        payload = "x" * value_size
+        start = time.perf_counter()
+        for i in range(count):
+            cache[f"key_{i}"] = {"idx": i, "payload": payload}
+        elapsed = time.perf_counter() - start
+
+        # Sanity check that everything was persisted
+        reloaded = PersistentDict(
+            name = f"bench_{file_format}",
+            backend_type = "local",
+            serializer = "json",
+            file_path = Path(tmpdir).joinpath("cache.json"),
+            file_format = file_format,
+        )
+        assert len(reloaded) == count, f"{file_format}: expected {count} keys, found {len(reloaded)}"
+    return elapsed
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type = int, default = 10_000, help = "Number of sequential sets")
+    parser.add_argument("--value-size", type = int, default = 128, help = "Size of each value payload in bytes")
+    args = parser.parse_args()
+
+    print(f"LocalStatefulBackend: {args.count:,} sequential sets ({args.value_size} byte values)")
+    print("-" * 60)
+    results = {}
+    for file_format in ("journal", "json"):
+        elapsed = benchmark_sets(file_format, args.count, args.value_size)
+        results[file_format] = elapsed
+        print(f"{file_format:>8}: {format_time(elapsed):>12}  ({args.count / elapsed:,.0f} sets/s)")
+    print("-" * 60)
+    print(f"Speedup: {results['json'] / results['journal']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
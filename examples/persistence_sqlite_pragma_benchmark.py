@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Benchmark script for the SQLite pragma tuning profiles.
+
+Measures the throughput of ``PersistentDict`` sets, gets and full iteration
+on the SQLite backend for each pragma profile (``read-heavy``,
+``write-heavy``, ``durable`` and ``ephemeral``) and the default settings,
+so the profile of a deployment can be chosen from measurements.
+
+Usage:
+    python examples/persistence_sqlite_pragma_benchmark.py
+    python examples/persistence_sqlite_pragma_benchmark.py --count 50000 --value-size 1024
+    python examples/persistence_sqlite_pragma_benchmark.py --profiles durable ephemeral
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from lzl.io.persistence import PersistentDict
+    from lzl.io.persistence.backends.sqlite.base import PRAGMA_PROFILES
+except ImportError:
+    import sys
+    print("Error: lzl.io.persistence not available. Install with: pip install -e .")
+    sys.exit(1)
+
+
+def benchmark_profile(profile: Optional[str], count: int, value_size: int, batch_size: int) -> Dict[str, float]:
+    """Run the workload against a fresh database and return the operations per second."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = PersistentDict(
+            name = "bench_pragmas",
+            backend_type = "sqlite",
+            serializer = "json",
+            base_key = f"sqlite://{Path(tmpdir).joinpath('cache.db')}",
+            db_settings = {"pragma_profile": profile} if profile else None,
+        )
+        payload = "x" * value_size
+        results = {}
+
+        start = time.perf_counter()
+        for i in range(count):
+            cache[f"key_{i}"] = {"idx": i, "payload": payload}
+        results["set"] = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(0, count, batch_size):
+            cache.set_batch({f"batch_{j}": {"idx": j, "payload": payload} for j in range(i, min(i + batch_size, count))})
+        results["set_batch"] = count / (time.perf_counter() - start)
+
+        keys = [f"key_{i}" for i in range(count)]
+        random.Random(42).shuffle(keys)
+        start = time.perf_counter()
+        for key in keys:
+            assert cache[key] is not None
+        results["get"] = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        data = cache.base.get_all_data()
+        results["iterate"] = len(data) / (time.perf_counter() - start)
+        assert len(data) == count * 2, f"{profile}: expected {count * 2} keys, found {len(data)}"
+        cache.base.db.close()
+    return results
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type = int, default = 10_000, help = "Number of keys")
+    parser.add_argument("--value-size", type = int, default = 256, help = "Size of each value payload in bytes")
+    parser.add_argument("--batch-size", type = int, default = 500, help = "Number of keys per set_batch call")
+    parser.add_argument("--profiles", nargs = "*", default = ["default", *PRAGMA_PROFILES], help = "Profiles to benchmark")
+    args = parser.parse_args()
+
+    print(f"SQLite pragma profiles: {args.count:,} keys ({args.value_size} byte values)")
+    print("-" * 72)
+    print(f"{'profile':>12} {'set/s':>12} {'set_batch/s':>14} {'get/s':>12} {'iterate/s':>14}")
+    for profile in args.profiles:
+        result = benchmark_profile(None if profile == "default" else profile, args.count, args.value_size, args.batch_size)
+        print(f"{profile:>12} {result['set']:>12,.0f} {result['set_batch']:>14,.0f} {result['get']:>12,.0f} {result['iterate']:>14,.0f}")
+    print("-" * 72)
+
+
+if __name__ == "__main__":
+    main()
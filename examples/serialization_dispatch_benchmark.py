@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""Benchmark script for the type-dispatch cache of ``serialize_object``.
+
+Serializes nested dict/list/model payloads with the handler cache enabled
+and with every lookup forced to re-resolve the handler, which costs the same
+chain of ``isinstance`` checks per value that ``serialize_object`` used to run.
+
+The msgpack serializer packs containers and primitives natively and only
+routes pydantic models through its ``default`` hook, so it gains the least.
+
+Usage:
+    python examples/serialization_dispatch_benchmark.py
+    python examples/serialization_dispatch_benchmark.py --count 5000 --rounds 10
+"""
+
+import argparse
+import datetime
+import time
+from typing import Any, Callable, Dict, List
+from uuid import UUID
+
+try:
+    from pydantic import BaseModel
+    from lzl.io.ser import get_serializer, serialize_object
+    from lzl.io.ser import utils as ser_utils
+except ImportError:
+    import sys
+    print("Error: lzl.io.ser not available. Install with: pip install -e .")
+    sys.exit(1)
+
+
+class Address(BaseModel):
+    street: str
+    city: str
+    zip_code: str
+
+
+class User(BaseModel):
+    id: int
+    name: str
+    tags: List[str]
+    address: Address
+
+
+class _NoCache(dict):
+    """Dispatch cache that never hits, so every value is resolved again."""
+
+    def get(self, key, default = None):
+        return default
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def make_payload(count: int) -> Dict[str, Any]:
+    """Generate a nested payload of dicts, lists, models and scalars."""
+    return {
+        "items": [
+            {
+                "id": i,
+                "uid": UUID(int = i),
+                "name": f"item-{i}",
+                "created_at": datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds = i),
+                "scores": [i * 0.5, i * 1.5, i * 2.5],
+                "flags": {"active": i % 2 == 0, "archived": False, "labels": ["a", "b", "c"]},
+                "owner": User(id = i, name = f"user-{i}", tags = ["x", "y"], address = Address(street = "1 Main St", city = "Springfield", zip_code = "12345")),
+            }
+            for i in range(count)
+        ],
+        "meta": {"version": 3, "source": "benchmark", "nested": [[1, 2], [3, 4], {"k": [None, True, 1.0]}]},
+    }
+
+
+def timeit(func: Callable[[], Any], rounds: int) -> float:
+    """Return the best time of the rounds in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description = __doc__, formatter_class = argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type = int, default = 2000, help = "Number of items in the payload")
+    parser.add_argument("--rounds", type = int, default = 5, help = "Number of timed rounds")
+    args = parser.parse_args()
+
+    payload = make_payload(args.count)
+    cases = {"serialize_object": lambda: serialize_object(payload)}
+    for name in ("json", "msgpack"):
+        try:
+            serializer = get_serializer(name)
+        except ImportError as e:
+            print(f"{name:>16}  skipped ({e})")
+            continue
+        cases[name] = lambda serializer = serializer: serializer.dumps(payload)
+
+    print(f"Serialization: {args.count:,} nested items, best of {args.rounds} rounds")
+    print("-" * 60)
+    print(f"{'case':>16} {'uncached':>12} {'cached':>12} {'speedup':>10}")
+    cached_table = ser_utils._dispatch_cache
+    for name, func in cases.items():
+        ser_utils._dispatch_cache = _NoCache()
+        try:
+            uncached = timeit(func, args.rounds)
+        finally:
+            ser_utils._dispatch_cache = cached_table
+        cached = timeit(func, args.rounds)
+        print(f"{name:>16} {uncached * 1000:>9.1f} ms {cached * 1000:>9.1f} ms {uncached / cached:>9.2f}x")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import time
 import random
+import itertools
 import urllib.parse
 import typing as t
 from lzl.types import BaseModel, PrivateAttr, eproperty
@@ -90,6 +91,9 @@ class ConnURL(BaseModel):
         """
         return urllib.parse.urljoin(self.url, uri)
 
+RequestRoute = Literal["leader", "follower"]
+
+
 class ConnectionClient:
     def __init__(
         self, 
@@ -98,13 +102,24 @@ class ConnectionClient:
         timeout: int = 5,
         max_redirects: int = 2,
         max_attempts_per_host: int = 2,
-        
+        leader_routing: bool = True,
     ):
+        """
+        Args:
+            leader_routing (bool): If True, writes and weak/strong reads are sent
+                to the cached leader, and none-consistency reads are spread across
+                the followers. The leader is learned from the redirects of the
+                cluster and forgotten when it fails. If False, every request goes
+                to a random node which forwards it to the leader.
+        """
         self.hosts: List[ConnURL] = hosts
         self.log_config = log_config
         self.timeout = timeout
         self.max_redirects = max_redirects
         self.max_attempts_per_host = max_attempts_per_host
+        self.leader_routing = leader_routing
+        self._leader: Optional[ConnURL] = None
+        self._follower_index = itertools.count(random.randrange(0, len(hosts)) if hosts else 0)
         from lzl.api.aioreq import Client, exceptions
         self._excs = exceptions
         self.io = Client(
@@ -113,6 +128,90 @@ class ConnectionClient:
         )
         self.timeout = timeout
 
+    """
+    Leader Routing
+    """
+
+    @property
+    def leader(self) -> Optional[ConnURL]:
+        """The cached leader of the cluster, if it is known."""
+        return self._leader
+
+    def set_leader(self, host: ConnURL) -> None:
+        """Caches the leader of the cluster."""
+        self._leader = host
+
+    def invalidate_leader(self, host: Optional[Union[ConnURL, str]] = None) -> None:
+        """Forgets the cached leader. If a host is given, the leader is only
+        forgotten if it is that host.
+        """
+        if self._leader is None: return
+        if host is not None:
+            bare = host.bare if isinstance(host, ConnURL) else host
+            if not bare.startswith(self._leader.bare): return
+        self._leader = None
+
+    def match_host(self, location: str) -> ConnURL:
+        """Returns the configured host that a redirect location points to, or a
+        new host with the credentials of the configured hosts if it is unknown.
+        """
+        parsed = urllib.parse.urlparse(location)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        for host in self.hosts:
+            if host.host.host == parsed.hostname and host.host.port == port:
+                return host
+        userinfo = ""
+        if self.hosts and self.hosts[0].host.password:
+            userinfo = f"{self.hosts[0].host.username or ''}:{self.hosts[0].host.password}@"
+        return ConnURL(host = parse_host(f"{parsed.scheme}://{userinfo}{parsed.netloc}"))
+
+    @staticmethod
+    def get_route(uri: str, query_info: Optional[logging.QueryInfoLazy] = None) -> RequestRoute:
+        """Returns where a request should be sent.
+
+        Only reads at the none consistency level are served by followers. Writes,
+        weak and strong reads, and any other requests are handled by the leader.
+        """
+        path, _, query = uri.partition("?")
+        if path not in ("/db/query", "/db/request"): return "leader"
+        level = urllib.parse.parse_qs(query).get("level", ["weak"])[0]
+        if level != "none": return "leader"
+        if path == "/db/request":
+            request_type = query_info.request_type if query_info is not None else None
+            if callable(request_type): request_type = request_type()
+            if request_type != "executeunified-readonly": return "leader"
+        return "follower"
+
+    def next_follower(self) -> ConnURL:
+        """Returns the next host for a none-consistency read, rotating across
+        the followers, or across all the hosts while the leader is unknown.
+        """
+        hosts = [host for host in self.hosts if host is not self._leader] or self.hosts
+        return hosts[next(self._follower_index) % len(hosts)]
+
+    def route_request(
+        self, 
+        uri: str, 
+        query_info: Optional[logging.QueryInfoLazy] = None,
+    ) -> Tuple[str, Optional[ConnURL], bool]:
+        """Routes a request.
+
+        Returns:
+            The uri to request, the host to try first and whether the request is
+            sent to the leader. Leader requests ask for a redirect rather than
+            being forwarded by a follower, so that the leader can be learned.
+            Only executes, requests and weak or strong queries are leader requests,
+            any node may answer the others (e.g. `/status` or `/nodes`).
+        """
+        if not self.leader_routing: return uri, None, False
+        if self.get_route(uri, query_info) == "follower":
+            return uri, self.next_follower(), False
+        path, _, query = uri.partition("?")
+        if path not in ("/db/execute", "/db/query", "/db/request"): return uri, None, False
+        if "redirect" not in urllib.parse.parse_qs(query, keep_blank_values = True):
+            uri = f"{path}?{query}&redirect" if query else f"{path}?redirect"
+        return uri, self._leader, True
+
     def fetch_response_with_host(
         self,
         host: ConnURL,
@@ -121,6 +220,7 @@ class ConnectionClient:
         json: Any = None,
         headers: Optional[Dict[str, Any]] = None,
         stream: bool = False,
+        track_leader: bool = False,
     ) -> 'Response':
         """Fetches a response from a particular host, and returns the status
         code and headers. The response body is written to the given destination.
@@ -135,6 +235,8 @@ class ConnectionClient:
             json (dict): The JSON to send in the request body.
             headers (dict): The headers to send in the request in addition to the content type.
                 The dictionary should be accessed only using lowercase keys.
+            track_leader (bool): If True, the host that handles the request is
+                cached as the leader.
 
         Returns:
             requests.Response: The response from the server.
@@ -171,6 +273,8 @@ class ConnectionClient:
                         f"Unexpected response from {current_host}: {response.status_code} {response.reason}",
                     )
 
+                if track_leader:
+                    self.set_leader(self.match_host(redirect_path[-1]) if redirect_path else host)
                 return response
             except self._excs.ConnectTimeout as e:
                 raise ConnectError(
@@ -191,6 +295,7 @@ class ConnectionClient:
         json: Any = None,
         headers: Optional[Dict[str, Any]] = None,
         stream: bool = False,
+        track_leader: bool = False,
     ) -> 'Response':
         """Fetches a response from a particular host, and returns the status
         code and headers. The response body is written to the given destination.
@@ -205,6 +310,8 @@ class ConnectionClient:
             json (dict): The JSON to send in the request body.
             headers (dict): The headers to send in the request in addition to the content type.
                 The dictionary should be accessed only using lowercase keys.
+            track_leader (bool): If True, the host that handles the request is
+                cached as the leader.
 
         Returns:
             requests.Response: The response from the server.
@@ -241,6 +348,8 @@ class ConnectionClient:
                         f"Unexpected response from {current_host}: {response.status_code} {response.reason}",
                     )
 
+                if track_leader:
+                    self.set_leader(self.match_host(redirect_path[-1]) if redirect_path else host)
                 return response
             except self._excs.ConnectTimeout as e:
                 raise ConnectError(
@@ -296,7 +405,7 @@ class ConnectionClient:
                 started_at_wall = time.time()
                 started_at_perf = time.perf_counter()
                 result = self.fetch_response_with_host(
-                    host, method, uri, json = json, headers = headers, stream = stream
+                    host, method, uri, json = json, headers = headers, stream = stream, track_leader = is_leader_route
                 )
                 request_time_perf = time.perf_counter() - started_at_perf
                 ended_at_wall = time.time()
@@ -341,6 +450,7 @@ class ConnectionClient:
                     return f"Failed to connect to node {e.host} - {str_error}"
                 logging.log(self.log_config.connect_timeout, msg_supplier, exc_info=True)
                 node_path.append((e.host, e))
+                if is_leader_route: self.invalidate_leader()
             
             except MaxRedirectsError as e:
                 def msg_supplier(max_length: Optional[int]) -> str:
@@ -351,6 +461,7 @@ class ConnectionClient:
 
                 logging.log(self.log_config.non_ok_response, msg_supplier, exc_info=True)
                 node_path.append((e.host, e))
+                if is_leader_route: self.invalidate_leader()
             
             except UnexpectedResponse as e:
                 def msg_supplier(max_length: Optional[int]) -> str:
@@ -360,6 +471,8 @@ class ConnectionClient:
 
                 logging.log(self.log_config.non_ok_response, msg_supplier, exc_info=True)
                 raise
+        uri, route_host, is_leader_route = self.route_request(uri, query_info)
+        if initial_host is None: initial_host = route_host
         return self.try_hosts(attempt_host, initial_host=initial_host)
 
     @t.overload
@@ -482,7 +595,7 @@ class ConnectionClient:
                 started_at_wall = time.time()
                 started_at_perf = time.perf_counter()
                 result = await self.afetch_response_with_host(
-                    host, method, uri, json = json, headers = headers, stream = stream
+                    host, method, uri, json = json, headers = headers, stream = stream, track_leader = is_leader_route
                 )
                 request_time_perf = time.perf_counter() - started_at_perf
                 ended_at_wall = time.time()
@@ -527,6 +640,7 @@ class ConnectionClient:
                     return f"Failed to connect to node {e.host} - {str_error}"
                 logging.log(self.log_config.connect_timeout, msg_supplier, exc_info=True)
                 node_path.append((e.host, e))
+                if is_leader_route: self.invalidate_leader()
             
             except MaxRedirectsError as e:
                 def msg_supplier(max_length: Optional[int]) -> str:
@@ -537,6 +651,7 @@ class ConnectionClient:
 
                 logging.log(self.log_config.non_ok_response, msg_supplier, exc_info=True)
                 node_path.append((e.host, e))
+                if is_leader_route: self.invalidate_leader()
             
             except UnexpectedResponse as e:
                 def msg_supplier(max_length: Optional[int]) -> str:
@@ -547,6 +662,8 @@ class ConnectionClient:
                 logging.log(self.log_config.non_ok_response, msg_supplier, exc_info=True)
                 raise
         
+        uri, route_host, is_leader_route = self.route_request(uri, query_info)
+        if initial_host is None: initial_host = route_host
         return await self.atry_hosts(attempt_host, initial_host=initial_host)
 
     def try_hosts(
@@ -682,8 +799,9 @@ class ConnectionClient:
             if resp := await attempt_host(node_ordering[index], node_path): return resp
         raise MaxAttemptsError(node_path)
     
-    def discover_leader(self) -> ConnURL:
-        """Discovers the current leader for the cluster
+    def discover_leader(self, refresh: bool = False) -> ConnURL:
+        """Discovers the current leader for the cluster, or returns the cached
+        leader unless `refresh` is set
 
         Returns:
             A tuple of (leader_host, leader_port)
@@ -695,6 +813,8 @@ class ConnectionClient:
                 we didn't expect
         """
 
+        if self._leader is not None and not refresh: return self._leader
+
         def attempt_host(
                 host: ConnURL, 
                 node_path: List[Tuple[str, Exception]]
@@ -719,11 +839,13 @@ class ConnectionClient:
                 logging.log(self.log_config.non_ok_response, msg_supplier, exc_info=True)
                 raise
 
-        return self.try_hosts(attempt_host)
+        self.set_leader(self.try_hosts(attempt_host))
+        return self._leader
     
 
-    async def adiscover_leader(self) -> ConnURL:
-        """Discovers the current leader for the cluster
+    async def adiscover_leader(self, refresh: bool = False) -> ConnURL:
+        """Discovers the current leader for the cluster, or returns the cached
+        leader unless `refresh` is set
 
         Returns:
             A tuple of (leader_host, leader_port)
@@ -735,6 +857,8 @@ class ConnectionClient:
                 we didn't expect
         """
 
+        if self._leader is not None and not refresh: return self._leader
+
         async def attempt_host(
                 host: ConnURL, 
                 node_path: List[Tuple[str, Exception]]
@@ -759,7 +883,8 @@ class ConnectionClient:
                 logging.log(self.log_config.non_ok_response, msg_supplier, exc_info=True)
                 raise
 
-        return self.try_hosts(attempt_host)
+        self.set_leader(await self.atry_hosts(attempt_host))
+        return self._leader
 
     def discover_leader_with_host(self, host: ConnURL) -> ConnURL:
         """Uses the given node in the cluster to discover the current leader
@@ -784,12 +909,7 @@ class ConnectionClient:
             )
 
             if response.is_redirect:
-                redirected_to = response.headers["Location"]
-                parsed_url = urllib.parse.urlparse(redirected_to)
-                return ConnURL(host = parse_host(
-                    parsed_url.netloc,
-                    # default_port = 443 if parsed_url.scheme == "https" else 80,
-                ))
+                return self.match_host(response.headers["Location"])
 
             if response.status_code < 200 or response.status_code > 299:
                 raise UnexpectedResponse(
@@ -831,12 +951,7 @@ class ConnectionClient:
             )
 
             if response.is_redirect:
-                redirected_to = response.headers["Location"]
-                parsed_url = urllib.parse.urlparse(redirected_to)
-                return ConnURL(host = parse_host(
-                    parsed_url.netloc,
-                    # default_port = 443 if parsed_url.scheme == "https" else 80,
-                ))
+                return self.match_host(response.headers["Location"])
 
             if response.status_code < 200 or response.status_code > 299:
                 raise UnexpectedResponse(
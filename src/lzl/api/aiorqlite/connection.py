@@ -57,6 +57,7 @@ class Connection:
         log: Union[logging.LogConfig, bool] = True,
         default_mode: Literal["sync", "async"] = "sync",
         default_return: Literal["result", "cursor"] = "result",
+        leader_routing: bool = True,
     ):
         """Initializes a new synchronous Connection. This is typically
         called with the alias rqlite.connect
@@ -90,6 +91,11 @@ class Connection:
                 configuration of the logs.
 
             default_mode (Literal["sync", "async"]): The default mode to use for
+
+            leader_routing (bool): If True, writes and weak/strong reads are sent
+                straight to the cached leader, and none-consistency reads are
+                spread across the followers. If False, requests go to a random
+                node which forwards them to the leader.
         """
         if log is True:
             log_config = logging.LogConfig()
@@ -129,6 +135,7 @@ class Connection:
             timeout = self.timeout,
             max_redirects = self.max_redirects,
             max_attempts_per_host = self.max_attempts_per_host,
+            leader_routing = leader_routing,
         )
         self.default_mode = default_mode
         self.default_return = default_return
@@ -1,12 +1,12 @@
-from .base import BaseCompression
+from .base import BaseCompression, StreamCompressor, StreamDecompressor
 from ._gzip import GzipCompression
 from ._lz4 import Lz4Compression, _lz4_available
 from ._zlib import ZlibCompression
-from ._zstd import ZstdCompression, _zstd_available
+from ._zstd import ZstdCompression, ZstdDictCompression, _zstd_available
 from typing import Any, Dict, Optional, Union, Type
 
 
-CompressionT = Union[GzipCompression, Lz4Compression, ZlibCompression, ZstdCompression, BaseCompression]
+CompressionT = Union[GzipCompression, Lz4Compression, ZlibCompression, ZstdCompression, ZstdDictCompression, BaseCompression]
 
 
 DEFAULT_COMPRESSION = (
@@ -45,6 +45,9 @@ def get_compression(
     from lzo.utils.hashing import create_hash_from_args_and_kwargs
     if compression_type == 'auto': compression_type = None
     compression_type = compression_type or get_default_compression()
+    if compression_type == "zstd_dict":
+        # Dictionaries are per-namespace state, so these are never shared
+        return ZstdDictCompression(compression_level = compression_level, **kwargs)
     comp_hash = create_hash_from_args_and_kwargs(compression_type, compression_level = compression_level, **kwargs)
     if comp_hash in _initialized_compressors:
         return _initialized_compressors[comp_hash]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import gzip
+import zlib
 from .base import BaseCompression, logger
 from typing import Optional
 
@@ -29,6 +30,19 @@ class GzipCompression(BaseCompression):
         Decompresses the data
         """
         return gzip.decompress(data)
+
+    def stream_compressor(self, level: Optional[int] = None, **kwargs) -> 'zlib._Compress':
+        """
+        Returns a new incremental compressor that writes a gzip member
+        """
+        if level is None: level = self.compression_level
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def stream_decompressor(self, **kwargs) -> 'zlib._Decompress':
+        """
+        Returns a new incremental decompressor of a gzip member
+        """
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
     
     
 
@@ -47,6 +47,48 @@ class Lz4Compression(BaseCompression):
         _kwargs = self._decompression_kwargs.copy()
         if kwargs: _kwargs.update(kwargs)
         return lz4.frame.decompress(data, **_kwargs)
+
+    def stream_compressor(self, level: Optional[int] = None, **kwargs) -> 'Lz4StreamCompressor':
+        """
+        Returns a new incremental compressor that writes a single frame
+        """
+        if level is None: level = self.compression_level
+        _kwargs = self._compression_kwargs.copy()
+        if kwargs: _kwargs.update(kwargs)
+        return Lz4StreamCompressor(lz4.frame.LZ4FrameCompressor(compression_level = level, **_kwargs))
+
+    def stream_decompressor(self, **kwargs) -> 'lz4.frame.LZ4FrameDecompressor':
+        """
+        Returns a new incremental decompressor
+        """
+        return lz4.frame.LZ4FrameDecompressor()
+
+
+class Lz4StreamCompressor:
+    """
+    Wraps the LZ4 frame compressor so that the frame header
+    is written with the first output
+    """
+
+    def __init__(self, ctx: 'lz4.frame.LZ4FrameCompressor'):
+        self.ctx = ctx
+        self.header: bytes = ctx.begin()
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses the data
+        """
+        data = self.ctx.compress(data)
+        if self.header:
+            data, self.header = self.header + data, b''
+        return data
+
+    def flush(self) -> bytes:
+        """
+        Ends the frame
+        """
+        data, self.header = self.header + self.ctx.flush(), b''
+        return data
     
     
 
@@ -34,6 +34,23 @@ class LzmaCompression(BaseCompression):
         _kwargs = self._decompression_kwargs.copy()
         if kwargs: _kwargs.update(kwargs)
         return lzma.decompress(data, **_kwargs)
+
+    def stream_compressor(self, level: Optional[int] = None, **kwargs) -> lzma.LZMACompressor:
+        """
+        Returns a new incremental compressor
+        """
+        if level is None: level = self.compression_level
+        _kwargs = self._compression_kwargs.copy()
+        if kwargs: _kwargs.update(kwargs)
+        return lzma.LZMACompressor(preset = level, **_kwargs)
+
+    def stream_decompressor(self, **kwargs) -> lzma.LZMADecompressor:
+        """
+        Returns a new incremental decompressor
+        """
+        _kwargs = self._decompression_kwargs.copy()
+        if kwargs: _kwargs.update(kwargs)
+        return lzma.LZMADecompressor(**_kwargs)
     
     
 
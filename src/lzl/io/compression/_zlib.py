@@ -29,6 +29,21 @@ class ZlibCompression(BaseCompression):
         _kwargs = self._decompression_kwargs.copy()
         if kwargs: _kwargs.update(kwargs)
         return zlib.decompress(data, **_kwargs)
+
+    def stream_compressor(self, level: Optional[int] = None, **kwargs) -> 'zlib._Compress':
+        """
+        Returns a new incremental compressor
+        """
+        if level is None: level = self.compression_level
+        return zlib.compressobj(level)
+
+    def stream_decompressor(self, **kwargs) -> 'zlib._Decompress':
+        """
+        Returns a new incremental decompressor
+        """
+        _kwargs = self._decompression_kwargs.copy()
+        if kwargs: _kwargs.update(kwargs)
+        return zlib.decompressobj(**_kwargs)
     
 
 
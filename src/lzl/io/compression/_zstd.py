@@ -4,8 +4,17 @@ from __future__ import annotations
 ZStd Compression
 """
 
+import json
+import base64
+import threading
 from .base import BaseCompression, logger
-from typing import Optional
+from typing import Any, Dict, List, Iterable, Optional, Union, Callable
+
+try:
+    import zstandard
+    _zstandard_available = True
+except ImportError:
+    _zstandard_available = False
 
 try:
     import zstd
@@ -18,6 +27,15 @@ class ZstdCompression(BaseCompression):
     name: str = "zstd"
     compression_level: Optional[int] = 3
 
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the compression
+
+        - When `zstandard` is available, compression contexts
+          are reused per thread instead of being created per call
+        """
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
 
     def validate_compression_level(self):
         """
@@ -32,22 +50,192 @@ class ZstdCompression(BaseCompression):
         """
         Checks for dependencies
         """
-        if _zstd_available is False:
-            logger.error("zstd is not available. Please install `zstd` or `pyzstd` to use zstd compression")
-            raise ImportError("zstd is not available. Please install `zstd` or `pyzstd` to use zstd compression")
+        if _zstd_available is False and _zstandard_available is False:
+            logger.error("zstd is not available. Please install `zstandard` or `zstd` to use zstd compression")
+            raise ImportError("zstd is not available. Please install `zstandard` or `zstd` to use zstd compression")
+
+    def _get_compressor(self, level: int) -> 'zstandard.ZstdCompressor':
+        """
+        Returns the compression context of the current thread
+        """
+        contexts: Dict[int, 'zstandard.ZstdCompressor'] = self._local.__dict__.setdefault('compressors', {})
+        if level not in contexts:
+            contexts[level] = zstandard.ZstdCompressor(level = level)
+        return contexts[level]
+
+    def _get_decompressor(self, data: bytes) -> 'zstandard.ZstdDecompressor':
+        """
+        Returns the decompression context of the current thread
+        """
+        if 'decompressor' not in self._local.__dict__:
+            self._local.decompressor = zstandard.ZstdDecompressor()
+        return self._local.decompressor
 
     def compress(self, data: bytes, level: Optional[int] = None, **kwargs) -> bytes:
         """
         Compresses the data
         """
         if level is None: level = self.compression_level
-        return zstd.compress(data, level)
+        if isinstance(data, str): data = data.encode(self.encoding or 'utf-8')
+        if not _zstandard_available: return zstd.compress(data, level)
+        return self._get_compressor(level).compress(data)
 
     def decompress(self, data: bytes, **kwargs) -> bytes:
         """
         Decompresses the data
         """
-        return zstd.decompress(data)
-    
-    
+        if not _zstandard_available: return zstd.decompress(data)
+        return self._get_decompressor(data).decompress(data)
+
+    def compress_many(self, values: Iterable[Union[str, bytes]], level: Optional[int] = None, **kwargs) -> List[bytes]:
+        """
+        Compresses the values with a single compression context
+        """
+        if not _zstandard_available: return super().compress_many(values, level = level, **kwargs)
+        if level is None: level = self.compression_level
+        cctx = self._get_compressor(level)
+        return [
+            cctx.compress(value.encode(self.encoding or 'utf-8') if isinstance(value, str) else value)
+            for value in values
+        ]
+
+    def stream_compressor(self, level: Optional[int] = None, **kwargs) -> 'zstandard.ZstdCompressionObj':
+        """
+        Returns a new incremental compressor that writes a single frame
+
+        - Streams are not compressed with dictionaries, which only help small values
+        """
+        if not _zstandard_available: return super().stream_compressor(level = level, **kwargs)
+        if level is None: level = self.compression_level
+        return zstandard.ZstdCompressor(level = level).compressobj()
+
+    def stream_decompressor(self, **kwargs) -> 'zstandard.ZstdDecompressionObj':
+        """
+        Returns a new incremental decompressor
+        """
+        if not _zstandard_available: return super().stream_decompressor(**kwargs)
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+class ZstdDictCompression(ZstdCompression):
+    """
+    ZStd Compression with trained dictionaries
+
+    Small values share most of their structure (keys, enum values, ids)
+    with each other, which a dictionary captures once instead of per value.
+
+    - Each frame records the id of the dictionary it was compressed with,
+      so values written with an older dictionary, or without one, remain readable
+      as long as that dictionary is still loaded
+    - The most recently added dictionary is used for compression
+    - If a frame references an unknown dictionary, `dictionary_loader` is called
+      to reload the stored dictionaries (e.g. trained by another process)
+    """
+    name: str = "zstd_dict"
+    dict_size: Optional[int] = 16 * 1024
+    dictionary_loader: Optional[Callable[[], Optional[bytes]]] = None
+
+    def __init__(self, *args, dict_size: Optional[int] = None, **kwargs):
+        """
+        Initializes the compression
+        """
+        if dict_size is not None: self.dict_size = dict_size
+        super().__init__(*args, **kwargs)
+        self._args = args
+        self.dictionaries: Dict[int, 'zstandard.ZstdCompressionDict'] = {}
+        self.active_dict_id: Optional[int] = None
+
+    def check_deps(self):
+        """
+        Checks for dependencies
+        """
+        if _zstandard_available is False:
+            logger.error("zstandard is not available. Please install `zstandard` to use zstd dictionary compression")
+            raise ImportError("zstandard is not available. Please install `zstandard` to use zstd dictionary compression")
+
+    def clone(self) -> 'ZstdDictCompression':
+        """
+        Returns a new instance with the same settings and dictionaries
+        """
+        new = self.__class__(
+            *self._args,
+            compression_level = self.compression_level,
+            encoding = self.encoding,
+            raise_errors = self.raise_errors,
+            compression_kwargs = self._compression_kwargs,
+            decompression_kwargs = self._decompression_kwargs,
+            dict_size = self.dict_size,
+            **self._kwargs,
+        )
+        new.dictionaries = self.dictionaries.copy()
+        new.active_dict_id = self.active_dict_id
+        return new
+
+    def add_dictionary(self, data: bytes, activate: Optional[bool] = True) -> int:
+        """
+        Adds a dictionary and returns its id
+        """
+        zdict = zstandard.ZstdCompressionDict(data)
+        dict_id = zdict.dict_id()
+        self.dictionaries[dict_id] = zdict
+        if activate: self.active_dict_id = dict_id
+        # Drop the contexts so that every thread picks up the new dictionary
+        self._local = threading.local()
+        return dict_id
 
+    def train_dictionary(self, samples: List[bytes], dict_size: Optional[int] = None, activate: Optional[bool] = True) -> int:
+        """
+        Trains a dictionary from the samples and returns its id
+        """
+        zdict = zstandard.train_dictionary(dict_size or self.dict_size, samples, level = self.compression_level)
+        return self.add_dictionary(zdict.as_bytes(), activate = activate)
+
+    def dump_dictionaries(self) -> bytes:
+        """
+        Dumps the dictionaries so that they can be stored with the data
+        """
+        return json.dumps({
+            'active': self.active_dict_id,
+            'dictionaries': {
+                str(dict_id): base64.b64encode(zdict.as_bytes()).decode()
+                for dict_id, zdict in self.dictionaries.items()
+            },
+        }).encode()
+
+    def load_dictionaries(self, data: Union[str, bytes]) -> None:
+        """
+        Loads the dictionaries dumped with `dump_dictionaries`
+        """
+        payload: Dict[str, Any] = json.loads(data)
+        for encoded in payload.get('dictionaries', {}).values():
+            self.add_dictionary(base64.b64decode(encoded), activate = False)
+        if payload.get('active') is not None: self.active_dict_id = payload['active']
+
+    def _get_compressor(self, level: int) -> 'zstandard.ZstdCompressor':
+        """
+        Returns the compression context of the current thread
+        """
+        contexts: Dict[Any, 'zstandard.ZstdCompressor'] = self._local.__dict__.setdefault('compressors', {})
+        key = (self.active_dict_id, level)
+        if key not in contexts:
+            contexts[key] = zstandard.ZstdCompressor(
+                level = level,
+                dict_data = self.dictionaries.get(self.active_dict_id),
+            )
+        return contexts[key]
+
+    def _get_decompressor(self, data: bytes) -> 'zstandard.ZstdDecompressor':
+        """
+        Returns the decompression context for the dictionary of the frame
+        """
+        dict_id = zstandard.get_frame_parameters(data).dict_id
+        contexts: Dict[int, 'zstandard.ZstdDecompressor'] = self._local.__dict__.setdefault('decompressors', {})
+        if dict_id not in contexts:
+            if dict_id and dict_id not in self.dictionaries and self.dictionary_loader is not None:
+                data = self.dictionary_loader()
+                if data: self.load_dictionaries(data)
+                contexts = self._local.__dict__.setdefault('decompressors', {})
+            if dict_id and dict_id not in self.dictionaries:
+                raise ValueError(f"Unknown zstd dictionary: {dict_id}")
+            contexts[dict_id] = zstandard.ZstdDecompressor(dict_data = self.dictionaries.get(dict_id))
+        return contexts[dict_id]
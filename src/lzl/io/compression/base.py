@@ -7,7 +7,25 @@ Base Compression Classes
 import abc
 from lzl.logging import logger
 from lzl.pool import ThreadPool
-from typing import Any, Optional, Union, Dict, TypeVar
+from typing import Any, Optional, Union, Dict, List, Iterable, TypeVar, Protocol
+
+
+class StreamCompressor(Protocol):
+    """
+    An incremental compression context
+    """
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class StreamDecompressor(Protocol):
+    """
+    An incremental decompression context
+    """
+
+    def decompress(self, data: bytes) -> bytes: ...
 
 
 class BaseCompression(abc.ABC):
@@ -65,6 +83,21 @@ class BaseCompression(abc.ABC):
         """
         raise NotImplementedError()
     
+    def stream_compressor(self, level: Optional[int] = None, **kwargs) -> StreamCompressor:
+        """
+        Returns a new incremental compressor that writes a single stream
+
+        - `compress` returns the output that is ready, `flush` ends the stream
+        """
+        raise NotImplementedError(f"{self.name} compression does not support streaming")
+
+    def stream_decompressor(self, **kwargs) -> StreamDecompressor:
+        """
+        Returns a new incremental decompressor for a stream
+        written by `stream_compressor`
+        """
+        raise NotImplementedError(f"{self.name} compression does not support streaming")
+
     async def acompress(self, data: Union[str, bytes], level: Optional[int] = None, **kwargs) -> bytes:
         """
         Base Compress
@@ -77,4 +110,32 @@ class BaseCompression(abc.ABC):
         """
         return await ThreadPool.run_async(self.decompress, data, **kwargs)
 
+    def compress_many(self, values: Iterable[Union[str, bytes]], level: Optional[int] = None, **kwargs) -> List[bytes]:
+        """
+        Compresses the values
+
+        - Subclasses can override this to reuse a compression context
+          across the whole batch
+        """
+        return [self.compress(value, level = level, **kwargs) for value in values]
+
+    def decompress_many(self, values: Iterable[Union[str, bytes]], **kwargs) -> List[Union[str, bytes]]:
+        """
+        Decompresses the values
 
+        - Subclasses can override this to reuse a decompression context
+          across the whole batch
+        """
+        return [self.decompress(value, **kwargs) for value in values]
+
+    async def acompress_many(self, values: Iterable[Union[str, bytes]], level: Optional[int] = None, **kwargs) -> List[bytes]:
+        """
+        Compresses the values in a single executor call
+        """
+        return await ThreadPool.run_async(self.compress_many, values, level = level, **kwargs)
+
+    async def adecompress_many(self, values: Iterable[Union[str, bytes]], **kwargs) -> List[Union[str, bytes]]:
+        """
+        Decompresses the values in a single executor call
+        """
+        return await ThreadPool.run_async(self.decompress_many, values, **kwargs)
@@ -64,5 +64,6 @@ from .backends import (
     LocalStatefulBackend, 
     RedisStatefulBackend, 
     StatefulBackendT,
+    UNCHANGED,
 )
 from .temp import TemporaryData
\ No newline at end of file
@@ -1,4 +1,4 @@
-from .base import BaseStatefulBackend
+from .base import BaseStatefulBackend, UNCHANGED
 from .local import LocalStatefulBackend
 from .redis import RedisStatefulBackend
 from .objstore import ObjStorageStatefulBackend
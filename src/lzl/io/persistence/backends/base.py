@@ -3,23 +3,30 @@ from __future__ import annotations
 """
 Base Persistence Backend
 """
+import copy
 import contextlib
 import collections.abc
-from threading import Lock
+from threading import Lock, RLock
 from asyncio import Lock as AsyncLock
 from pathlib import Path
 from pydantic import BaseModel
-from typing import TypeVar, Generic, Any, Dict, Optional, Union, Iterable, List, Type, ItemsView, TYPE_CHECKING
+from typing import TypeVar, Generic, Any, Dict, Optional, Union, Iterable, Iterator, AsyncIterator, List, Tuple, Type, ItemsView, Callable, TYPE_CHECKING
 from lzo.utils import create_unique_id, logger
 from lzl.pool import ThreadPool
 from lzo.utils.hashing import create_object_hash, create_hash_from_args_and_kwargs
 from lzl.io.ser import SerT, get_serializer, SchemaType
+from lzl.io.compression import ZstdDictCompression
 
 if TYPE_CHECKING:
     from lzo.types import BaseSettings
     from lzl.io.ser import ObjectValue
 
 
+# Returned by the function of `update_in_place` to keep the current value
+UNCHANGED = object()
+
+_rmw_lock_init = Lock()
+
 
 class BaseStatefulBackend(collections.abc.MutableMapping):
     """
@@ -86,6 +93,30 @@ class BaseStatefulBackend(collections.abc.MutableMapping):
         """
         return value if _raw else await self.serializer.adecode(value, **kwargs)
     
+    def encode_values(self, values: Iterable[Any], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[str, bytes, Exception]]:
+        """
+        Encodes a batch of Values
+        """
+        return list(values) if _raw else self.serializer.encode_many(values, return_exceptions = return_exceptions, **kwargs)
+
+    async def aencode_values(self, values: Iterable[Any], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[str, bytes, Exception]]:
+        """
+        Encodes a batch of Values
+        """
+        return list(values) if _raw else await self.serializer.aencode_many(values, return_exceptions = return_exceptions, **kwargs)
+
+    def decode_values(self, values: Iterable[Union[str, bytes]], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Any]:
+        """
+        Decodes a batch of Values
+        """
+        return list(values) if _raw else self.serializer.decode_many(values, return_exceptions = return_exceptions, **kwargs)
+
+    async def adecode_values(self, values: Iterable[Union[str, bytes]], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Any]:
+        """
+        Decodes a batch of Values
+        """
+        return list(values) if _raw else await self.serializer.adecode_many(values, return_exceptions = return_exceptions, **kwargs)
+
     def create_hash(self, obj: 'ObjectValue') -> str:
         """
         Creates a Hash
@@ -213,6 +244,24 @@ class BaseStatefulBackend(collections.abc.MutableMapping):
         """
         return await ThreadPool.run_async(self.get_all_data, exclude_base_key = exclude_base_key, **kwargs)
 
+    def iter_items(self, batch_size: Optional[int] = None, exclude_base_key: Optional[bool] = False, **kwargs) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterates over the Items
+
+        - Backends that can page through their data should override this
+        """
+        yield from self.get_all_data(exclude_base_key = exclude_base_key, **kwargs).items()
+
+    async def aiter_items(self, batch_size: Optional[int] = None, exclude_base_key: Optional[bool] = False, **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Iterates over the Items
+
+        - Backends that can page through their data should override this
+        """
+        data = await self.aget_all_data(exclude_base_key = exclude_base_key, **kwargs)
+        for item in data.items():
+            yield item
+
     async def aget_all_keys(self, exclude_base_key: Optional[bool] = False, **kwargs) -> List[str]:
         """
         Returns all the Keys
@@ -324,45 +373,30 @@ class BaseStatefulBackend(collections.abc.MutableMapping):
     def setdefault(self, key: str, default: Any = None, update_values: Optional[bool] = False, enforce_type: Optional[bool] = False, **kwargs):
         """
         Sets a Default Value
+
+        - The read and the write are atomic, see `update_in_place`
         """
-        if self.contains(key):
-            with contextlib.suppress(Exception):
-                value = self.get(key)
-                if value is not None:
-                    if enforce_type and not isinstance(value, type(default)):
-                        value = type(default)(value)
-                    if update_values and isinstance(value, dict) and default and isinstance(default, dict):
-                        from lazyops.libs.abcs.utils.helpers import update_dict
-                        value = update_dict(value, default, exclude_none = True)
-                        # for k, v in default.items():
-                        #     if k not in value or value[k] is None:
-                        #         
-                        #         value[k] = v
-                        self.set(key, value)
-                    return value
-        self.set(key, default)
-        return default
+        result = default
+        def _setdefault(value: Any) -> Any:
+            nonlocal result
+            result, changed = self._apply_default_(value, default, update_values = update_values, enforce_type = enforce_type)
+            return result if changed else UNCHANGED
+        self._update_in_place_(key, _setdefault)
+        return result
     
     async def asetdefault(self, key: str, default: Any = None, update_values: Optional[bool] = False, enforce_type: Optional[bool] = False, **kwargs):
         """
         Sets a Default Value
+
+        - The read and the write are atomic, see `update_in_place`
         """
-        if await self.acontains(key):
-            with contextlib.suppress(Exception):
-                value = await self.aget(key)
-                if value is not None:
-                    if enforce_type and not isinstance(value, type(default)):
-                        value = type(default)(value)
-                    if update_values and isinstance(value, dict) and default and isinstance(default, dict):
-                        from lazyops.libs.abcs.utils.helpers import update_dict
-                        value = update_dict(value, default, exclude_none = True)
-                        # for k, v in default.items():
-                        #     if k not in value or value[k] is None:
-                        #         value[k] = v
-                        await self.aset(key, value)
-                    return value
-        await self.aset(key, default)
-        return default
+        result = default
+        def _setdefault(value: Any) -> Any:
+            nonlocal result
+            result, changed = self._apply_default_(value, default, update_values = update_values, enforce_type = enforce_type)
+            return result if changed else UNCHANGED
+        await self._aupdate_in_place_(key, _setdefault)
+        return result
     
     def update(self, data: Dict[str, Any], **kwargs):
         """
@@ -381,29 +415,21 @@ class BaseStatefulBackend(collections.abc.MutableMapping):
     def update_key(self, key: str, data: Dict[str, Any], deep: Optional[bool] = True,  exclude_none: Optional[bool] = True, **kwargs) -> Dict[str, Any]:
         """
         Updates the Dict at the Key
+
+        - The read and the write are atomic, see `update_in_place`
         """
-        src = self.get(key, default = {}) or {}
-        if deep:
-            from lazyops.libs.abcs.utils.helpers import update_dict
-            src = update_dict(src, data, exclude_none = exclude_none)
-        else:
-            src.update(data)
-        self.set(key, src, **kwargs)
-        return src
+        func = self._merge_dict_func_(data, deep = deep, exclude_none = exclude_none)
+        return self._update_in_place_(key, func, **kwargs)[1]
 
 
     async def aupdate_key(self, key: str, data: Dict[str, Any], deep: Optional[bool] = True,  exclude_none: Optional[bool] = True, **kwargs) -> Dict[str, Any]:
         """
         [Async] Updates the Dict at the Key
+
+        - The read and the write are atomic, see `update_in_place`
         """
-        src = await self.aget(key, default = {}) or {}
-        if deep:
-            from lazyops.libs.abcs.utils.helpers import update_dict
-            src = update_dict(src, data, exclude_none = exclude_none)
-        else:
-            src.update(data)
-        await self.aset(key, src, **kwargs)
-        return src
+        func = self._merge_dict_func_(data, deep = deep, exclude_none = exclude_none)
+        return (await self._aupdate_in_place_(key, func, **kwargs))[1]
         
     def popitem(self, **kwargs):
         """
@@ -501,17 +527,148 @@ class BaseStatefulBackend(collections.abc.MutableMapping):
         """
         return f"<{self.__class__.__name__} num_keys={len(self)}, base_key={self.base_key}, serializer={self.serializer.name}>"
     
-    def migrate_compression(self, **kwargs):
+    def migrate_compression(self, batch_size: Optional[int] = 500, **kwargs) -> List[str]:
         """
         Migrates the Compression
-        """
-        pass
 
-    async def amigrate_compression(self, **kwargs):
+        - Re-encodes every value with the current compressor. Values written
+          with the `previous_compressor` are read through its fallback.
+        - Returns the keys that could not be migrated
+        """
+        failed_keys, batch = [], {}
+        for key, value in self.iter_items(exclude_base_key = True):
+            if value is None:
+                failed_keys.append(key)
+                continue
+            batch[key] = value
+            if len(batch) >= batch_size:
+                self.set_batch(batch)
+                batch = {}
+        if batch: self.set_batch(batch)
+        if failed_keys: logger.warning(f'Failed to migrate keys: {failed_keys}')
+        return failed_keys
+
+    async def amigrate_compression(self, batch_size: Optional[int] = 500, **kwargs) -> List[str]:
         """
         Migrates the Compression
+
+        - Re-encodes every value with the current compressor. Values written
+          with the `previous_compressor` are read through its fallback.
+        - Returns the keys that could not be migrated
+        """
+        failed_keys, batch = [], {}
+        async for key, value in self.aiter_items(exclude_base_key = True):
+            if value is None:
+                failed_keys.append(key)
+                continue
+            batch[key] = value
+            if len(batch) >= batch_size:
+                await self.aset_batch(batch)
+                batch = {}
+        if batch: await self.aset_batch(batch)
+        if failed_keys: logger.warning(f'Failed to migrate keys: {failed_keys}')
+        return failed_keys
+
+    """
+    Metadata Methods
+    """
+
+    def get_metadata(self, name: str) -> Optional[bytes]:
         """
-        pass
+        Returns the metadata stored alongside the data
+
+        - Metadata lives outside of the keyspace so it never shows up as a key
+        """
+        raise NotImplementedError
+
+    def set_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        raise NotImplementedError
+
+    async def aget_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored alongside the data
+        """
+        return await ThreadPool.run_async(self.get_metadata, name)
+
+    async def aset_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        return await ThreadPool.run_async(self.set_metadata, name, value)
+
+    """
+    Compression Dictionary Methods
+    """
+
+    def load_compression_dictionaries(self) -> bool:
+        """
+        Loads the compression dictionaries stored with the data
+
+        - Only applies to the `zstd_dict` compression. Returns False otherwise.
+        """
+        if not isinstance(self.serializer.compressor, ZstdDictCompression): return False
+        # Dictionaries belong to the namespace, so the serializer and compressor
+        # must not be shared with other backends
+        self.serializer = copy.copy(self.serializer)
+        self.serializer.compressor = self.serializer.compressor.clone()
+        self.serializer.compressor.dictionary_loader = self._fetch_compression_dictionaries
+        data = self._fetch_compression_dictionaries()
+        if data: self.serializer.compressor.load_dictionaries(data)
+        return True
+
+    def _fetch_compression_dictionaries(self) -> Optional[bytes]:
+        """
+        Returns the stored compression dictionaries
+        """
+        try:
+            return self.get_metadata('zstd_dict')
+        except NotImplementedError:
+            return None
+
+    def train_compression_dictionary(self, sample_size: Optional[int] = 1000, dict_size: Optional[int] = None, migrate: Optional[bool] = False, **kwargs) -> int:
+        """
+        Trains a compression dictionary from a sample of the stored values,
+        stores it alongside the data and returns its id
+
+        - Previous dictionaries are kept so existing values remain readable
+        - If `migrate` is True, all values are re-compressed with the new dictionary
+        """
+        compressor = self.serializer.compressor
+        if not isinstance(compressor, ZstdDictCompression):
+            raise ValueError('Training a compression dictionary requires the `zstd_dict` compression')
+        samples: List[bytes] = []
+        for _, value in self.iter_items():
+            if value is None: continue
+            sample = self.serializer.encode_value(value)
+            samples.append(sample.encode(self.serializer.encoding or 'utf-8') if isinstance(sample, str) else sample)
+            if len(samples) >= sample_size: break
+        if not samples: raise ValueError('Unable to train a compression dictionary without any stored values')
+        dict_id = compressor.train_dictionary(samples, dict_size = dict_size)
+        self.set_metadata('zstd_dict', compressor.dump_dictionaries())
+        if migrate: self.migrate_compression(**kwargs)
+        return dict_id
+
+    async def atrain_compression_dictionary(self, sample_size: Optional[int] = 1000, dict_size: Optional[int] = None, migrate: Optional[bool] = False, **kwargs) -> int:
+        """
+        Trains a compression dictionary from a sample of the stored values,
+        stores it alongside the data and returns its id
+        """
+        dict_id = await ThreadPool.run_async(self.train_compression_dictionary, sample_size = sample_size, dict_size = dict_size)
+        if migrate: await self.amigrate_compression(**kwargs)
+        return dict_id
+
+    def subscribe_invalidations(self, callback: Callable[..., None], **kwargs) -> bool:
+        """
+        Subscribes to invalidation events from the backend
+
+        - `callback` is called with the changed keys, or with no keys
+          when everything should be invalidated
+        - Returns False if the backend does not support it
+        """
+        return False
 
     def get_all_data_raw(self, exclude_base_key: Optional[bool] = False, **kwargs) -> Dict[str, Any]:
         """
@@ -747,6 +904,123 @@ class BaseStatefulBackend(collections.abc.MutableMapping):
         """
         await ThreadPool.run_async(self.migrate_schema, schema_map, overwrite = overwrite, **kwargs)
 
+    """
+    Atomic Read-Modify-Write Methods
+    """
+
+    def _get_rmw_lock_(self) -> RLock:
+        """
+        Returns the lock that serializes the read-modify-write operations
+        of this process
+        """
+        if self.__dict__.get('_rmw_lock') is None:
+            with _rmw_lock_init:
+                if self.__dict__.get('_rmw_lock') is None:
+                    self._rmw_lock = RLock()
+        return self._rmw_lock
+
+    def _update_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        Replaces the value of the key with `func(value)` and returns the
+        `(old, new)` values
+
+        - `func` receives `None` for a missing key and may return `UNCHANGED`
+          to skip the write, in which case `new` is `old`
+        - This only serializes the threads of this process. Backends override it
+          with a primitive that is atomic across processes, which may call `func`
+          more than once when a concurrent writer wins.
+        """
+        with self._get_rmw_lock_():
+            value = self.get(key)
+            result = func(value)
+            if result is UNCHANGED: return value, value
+            self.set(key, result, ex = ex, **kwargs)
+            return value, result
+
+    async def _aupdate_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        [Async] Replaces the value of the key with `func(value)` and returns the
+        `(old, new)` values
+        """
+        return await ThreadPool.run_async(self._update_in_place_, key, func, ex = ex, **kwargs)
+
+    @staticmethod
+    def _apply_default_(value: Optional[Any], default: Any, update_values: Optional[bool] = False, enforce_type: Optional[bool] = False) -> Tuple[Any, bool]:
+        """
+        Returns the result of `setdefault` for the current value and whether
+        it has to be written
+        """
+        if value is None: return default, True
+        try:
+            if enforce_type and not isinstance(value, type(default)):
+                value = type(default)(value)
+            if update_values and isinstance(value, dict) and default and isinstance(default, dict):
+                from lazyops.libs.abcs.utils.helpers import update_dict
+                return update_dict(value, default, exclude_none = True), True
+        except Exception:
+            return default, True
+        return value, False
+
+    @staticmethod
+    def _merge_dict_func_(data: Dict[str, Any], deep: Optional[bool] = True, exclude_none: Optional[bool] = True) -> Callable[[Optional[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Returns the function that merges the data into the dict of `update_key`
+        """
+        def _merge(src: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            src = src or {}
+            if deep:
+                from lazyops.libs.abcs.utils.helpers import update_dict
+                return update_dict(src, data, exclude_none = exclude_none)
+            src.update(data)
+            return src
+        return _merge
+
+    def update_in_place(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Any:
+        """
+        Atomically replaces the value of the key with `func(value)` and returns
+        the new value
+
+        - `func` receives `None` for a missing key and may return `UNCHANGED`
+          to keep the current value
+        - `func` may be called more than once, so it should not have side effects
+        """
+        return self._update_in_place_(key, func, ex = ex, **kwargs)[1]
+
+    async def aupdate_in_place(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Any:
+        """
+        [Async] Atomically replaces the value of the key with `func(value)` and
+        returns the new value
+        """
+        return (await self._aupdate_in_place_(key, func, ex = ex, **kwargs))[1]
+
+    def compare_and_set(self, key: str, expected: Optional[Any], value: Any, ex: Optional[int] = None, **kwargs) -> bool:
+        """
+        Atomically sets the value of the key if its current value equals
+        `expected`. An `expected` value of `None` matches a missing key.
+        """
+        current, _ = self._update_in_place_(key, lambda current: value if current == expected else UNCHANGED, ex = ex, **kwargs)
+        return current == expected
+
+    async def acompare_and_set(self, key: str, expected: Optional[Any], value: Any, ex: Optional[int] = None, **kwargs) -> bool:
+        """
+        [Async] Atomically sets the value of the key if its current value equals
+        `expected`. An `expected` value of `None` matches a missing key.
+        """
+        current, _ = await self._aupdate_in_place_(key, lambda current: value if current == expected else UNCHANGED, ex = ex, **kwargs)
+        return current == expected
+
+    def get_and_set(self, key: str, value: Any, ex: Optional[int] = None, **kwargs) -> Optional[Any]:
+        """
+        Atomically sets the value of the key and returns its previous value
+        """
+        return self._update_in_place_(key, lambda _: value, ex = ex, **kwargs)[0]
+
+    async def aget_and_set(self, key: str, value: Any, ex: Optional[int] = None, **kwargs) -> Optional[Any]:
+        """
+        [Async] Atomically sets the value of the key and returns its previous value
+        """
+        return (await self._aupdate_in_place_(key, lambda _: value, ex = ex, **kwargs))[0]
+
     """
     Context Manager Locks
     """
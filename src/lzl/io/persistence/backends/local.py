@@ -8,8 +8,8 @@ import json
 import binascii
 from lzl import load
 from pathlib import Path, PurePath
-from typing import TypeVar, Generic, Any, Dict, Optional, Union, Iterable, List, Type, TYPE_CHECKING
-from .base import BaseStatefulBackend, SchemaType, create_unique_id, logger
+from typing import TypeVar, Generic, Any, Dict, Optional, Union, Iterable, List, Tuple, Type, Callable, TYPE_CHECKING
+from .base import BaseStatefulBackend, SchemaType, ThreadPool, logger
 
 if load.TYPE_CHECKING:
     import filelock
@@ -29,15 +29,27 @@ if TYPE_CHECKING:
 class LocalStatefulBackend(BaseStatefulBackend):
     """
     Implements a Local Stateful Backend
+
+    Supports two on-disk formats:
+
+    - `json`: the whole cache is re-serialized and rewritten on every mutation
+    - `journal`: mutations are appended to a `.journal` file as one record per line
+      and periodically compacted into the JSON snapshot, so each write costs O(value size)
     """
     name: Optional[str] = "local"
     encoding: Optional[str] = "utf-8"
+    file_format: Optional[str] = "json"
+    journal_compact_size: Optional[int] = 1024 * 1024 * 8 # 8mb
+    journal_fsync: Optional[bool] = False
 
     def __init__(
         self,
         name: Optional[str] = None,
         file_path: Optional[File] = None,
         encoding: Optional[str] = None,
+        file_format: Optional[str] = None,
+        journal_compact_size: Optional[int] = None,
+        journal_fsync: Optional[bool] = None,
 
         serializer: Optional[str] = None,
         serializer_kwargs: Optional[Dict[str, Any]] = None,
@@ -59,6 +71,11 @@ class LocalStatefulBackend(BaseStatefulBackend):
         )
         if name is not None: self.name = name
         if encoding is not None: self.encoding = encoding
+        if file_format is not None: self.file_format = file_format
+        if self.file_format not in {'json', 'journal'}:
+            raise ValueError(f'Invalid File Format: {self.file_format}. Must be one of `json` or `journal`')
+        if journal_compact_size is not None: self.journal_compact_size = journal_compact_size
+        if journal_fsync is not None: self.journal_fsync = journal_fsync
         if file_path is None:
             if hasattr(self.settings, "data_dir"):
                 file_path = self.settings.data_dir.joinpath(f"{self.name}.cache")
@@ -70,7 +87,7 @@ class LocalStatefulBackend(BaseStatefulBackend):
             self.file_path = self.file_path.joinpath(f"{self.name}.cache")
         self.file_path.parent.mkdir(parents = True, exist_ok = True)
         self.file_lock_path = self.file_path.with_suffix(".lock")
-        self.file_hash_path = self.file_path.with_suffix(".hash")
+        self.file_journal_path = self.file_path.with_suffix(".journal")
         self.file_lock = filelock.FileLock(lock_file = self.file_lock_path.as_posix(), thread_local = False)
         try:
             import simdjson
@@ -80,14 +97,29 @@ class LocalStatefulBackend(BaseStatefulBackend):
             self.parser = None
             self.cache: Dict[str, Any] = {}
 
-        if not self.file_path.exists():
-            with self.file_lock:
+        # Keys that belong to this `base_key`, kept in insertion order
+        self._keys: Dict[str, None] = {}
+        # (inode, size, mtime_ns) of the snapshot when it was last loaded or written
+        self._snapshot_stat: Optional[Tuple[int, int, int]] = None
+        # Number of journal bytes that have been applied to the cache
+        self._journal_offset: int = 0
+
+        with self.file_lock:
+            if not self.file_path.exists():
                 self.file_path.write_text('{}')
-                self.file_hash = create_unique_id()
-                self.file_hash_path.write_text(self.file_hash)
-        else:
-            self.cache = self.get_data()
-            self.file_hash = self.file_hash_path.read_text()
+            self._load()
+            if self.file_format == 'json' and self._journal_offset:
+                # Fold a journal left behind by the `journal` format into the snapshot
+                self.write_data(self.cache)
+                self.file_journal_path.unlink()
+                self._journal_offset = 0
+    
+    @property
+    def has_journal(self) -> bool:
+        """
+        Returns True if there are pending journal records
+        """
+        return self._get_journal_size() > 0
     
     def encode_value(self, value: Union[Any, SchemaType], _raw: Optional[bool] = None, **kwargs) -> str:
         """
@@ -105,6 +137,35 @@ class LocalStatefulBackend(BaseStatefulBackend):
         if self.serializer.binary or self.serializer.compression_enabled:
             value = binascii.unhexlify(value)
         return super().decode_value(value, **kwargs)
+
+    def encode_values(self, values: Iterable[Any], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[str, Exception]]:
+        """
+        Encodes a batch of Values
+        """
+        if _raw: return list(values)
+        results = super().encode_values(values, return_exceptions = return_exceptions, **kwargs)
+        return [result.hex() if isinstance(result, bytes) else result for result in results]
+
+    def decode_values(self, values: Iterable[str], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Any]:
+        """
+        Decodes a batch of Values
+        """
+        if _raw: return list(values)
+        if self.serializer.binary or self.serializer.compression_enabled:
+            values = [None if value is None else binascii.unhexlify(value) for value in values]
+        return super().decode_values(values, return_exceptions = return_exceptions, **kwargs)
+
+    async def aencode_values(self, values: Iterable[Any], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[str, Exception]]:
+        """
+        Encodes a batch of Values
+        """
+        return await ThreadPool.run_async(self.encode_values, values, _raw = _raw, return_exceptions = return_exceptions, **kwargs)
+
+    async def adecode_values(self, values: Iterable[str], _raw: Optional[bool] = None, return_exceptions: Optional[bool] = False, **kwargs) -> List[Any]:
+        """
+        Decodes a batch of Values
+        """
+        return await ThreadPool.run_async(self.decode_values, values, _raw = _raw, return_exceptions = return_exceptions, **kwargs)
     
     def _precheck(self, **kwargs):
         """
@@ -132,17 +193,14 @@ class LocalStatefulBackend(BaseStatefulBackend):
         Gets a Value from the JSON
         """
         self.sync()
-        results = []
-        for key in keys:
-            if value := self.cache.get(self.get_key(key)):
-                try:
-                    results.append(self.decode_value(value))
-                except AttributeError:
-                    logger.warning(f'Unable to decode value for {key}')
-                    self.delete(key)
-                    results.append(None)
-            else:
-                results.append(None)
+        keys = list(keys)
+        values = [self.cache.get(self.get_key(key)) or None for key in keys]
+        results = self.decode_values(values, return_exceptions = True)
+        for n, (key, result) in enumerate(zip(keys, results)):
+            if isinstance(result, Exception):
+                logger.warning(f'Unable to decode value for {key}: {result}')
+                self.delete(key)
+                results[n] = None
         return results
     
 
@@ -150,39 +208,33 @@ class LocalStatefulBackend(BaseStatefulBackend):
         """
         Sets a Value in the JSON
         """
-        self.sync()
-        self.cache[self.get_key(key)] = self.encode_value(value, _raw = _raw)
-        self.write_data(self.cache)
+        self.commit(('s', self.get_key(key), self.encode_value(value, _raw = _raw)))
         
 
     def set_batch(self, data: Dict[str, Any], *args, **kwargs) -> None:
         """
         Sets a Value in the JSON
         """
-        self.sync()
-        for key, value in data.items():
-            self.cache[self.get_key(key)] = self.encode_value(value, **kwargs)
-        self.write_data(self.cache)
+        self.commit(*[
+            ('s', self.get_key(key), value)
+            for key, value in zip(data.keys(), self.encode_values(data.values(), **kwargs))
+        ])
 
     def delete(self, key: str, **kwargs) -> None:
         """
         Deletes a Value from the JSON
         """
-        self.sync()
-        _ = self.cache.pop(self.get_key(key), None)
-        self.write_data(self.cache)
+        self.commit(('d', self.get_key(key)))
     
     def clear(self, *keys: str, **kwargs):
         """
         Clears the Cache
         """
-        self.sync()
         if keys:
-            for key in keys:
-                self.cache.pop(self.get_key(key), None)
-        else:
-            self.cache = {}
-        self.write_data(self.cache)
+            return self.commit(*[('d', self.get_key(key)) for key in keys])
+        with self.file_lock:
+            self._reset({})
+            self.write_data(self.cache)
 
 
     def get_all_keys(self, exclude_base_key: Optional[bool] = False, **kwargs) -> List[str]:
@@ -190,12 +242,8 @@ class LocalStatefulBackend(BaseStatefulBackend):
         Returns all the Keys
         """
         self.sync()
-        keys = [
-            key
-            for key in self.cache.keys()
-            if key.startswith(self.base_key)
-        ] if self.base_key else list(self.cache.keys())
-        if exclude_base_key:
+        keys = list(self._keys)
+        if exclude_base_key and self.base_key:
             keys = [key.replace(f'{self.base_key}.', '') for key in keys]
         return keys
 
@@ -204,12 +252,9 @@ class LocalStatefulBackend(BaseStatefulBackend):
         Loads all the Data
         """
         self.sync()
-        all_keys = self.get_all_keys()
-        data = {
-            key: self.decode_value(value)
-            for key, value in self.cache.items() if key in all_keys
-        }
-        if exclude_base_key:
+        keys = list(self._keys)
+        data = dict(zip(keys, self.decode_values([self.cache[key] for key in keys])))
+        if exclude_base_key and self.base_key:
             data = {key.replace(f'{self.base_key}.', ''): value for key, value in data.items()}
         return data
     
@@ -218,25 +263,21 @@ class LocalStatefulBackend(BaseStatefulBackend):
         Returns all the Values
         """
         self.sync()
-        all_keys = self.get_all_keys(**kwargs)
-        return [
-            self.decode_value(value, **kwargs)
-            for key, value in self.cache.items() if key in all_keys
-        ]    
+        return self.decode_values([self.cache[key] for key in self._keys], **kwargs)
 
     def contains(self, key: str, **kwargs) -> bool:
         """
         Returns True if the Cache contains the Key
         """
         self.sync()
-        return key in self.get_all_keys(**kwargs)
+        # Also accept keys that already include the `base_key`
+        return self.get_key(key) in self._keys or key in self._keys
     
 
     def iterate(self, **kwargs) -> Iterable[Any]:
         """
         Iterates over the Cache
         """
-        self.sync()
         return iter(self.get_all_keys(**kwargs))
 
 
@@ -244,69 +285,276 @@ class LocalStatefulBackend(BaseStatefulBackend):
     Primary Utility Methods
     """
 
+    def _in_scope(self, key: str) -> bool:
+        """
+        Returns True if the key belongs to the `base_key`
+        """
+        return key.startswith(self.base_key) if self.base_key else True
+
+    def _reset(self, data: Dict[str, Any]) -> None:
+        """
+        Replaces the cache and rebuilds the key index
+        """
+        self.cache = data
+        self._keys = {key: None for key in data if self._in_scope(key)}
+
+    def _apply_record(self, record: Tuple) -> None:
+        """
+        Applies a single mutation record to the cache and key index
+        """
+        op = record[0]
+        if op == 's':
+            self.cache[record[1]] = record[2]
+            if self._in_scope(record[1]): self._keys[record[1]] = None
+        elif op == 'd':
+            self.cache.pop(record[1], None)
+            self._keys.pop(record[1], None)
+        elif op == 'c':
+            self.cache.clear()
+            self._keys.clear()
+
+    @staticmethod
+    def _get_stat(path: Path) -> Optional[Tuple[int, int, int]]:
+        """
+        Returns the (inode, size, mtime_ns) of the path
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    def _get_journal_size(self) -> int:
+        """
+        Returns the size of the journal
+        """
+        try:
+            return os.stat(self.file_journal_path).st_size
+        except FileNotFoundError:
+            return 0
+
     def should_sync(self) -> bool:
         """
         Returns True if the File should be Synced
+
+        - Only stats the files, so the common (unchanged) case does not read anything
         """
-        return self.file_hash != self.file_hash_path.read_text()
+        if self._get_stat(self.file_path) != self._snapshot_stat: return True
+        return self.file_format == 'journal' and self._get_journal_size() != self._journal_offset
     
     async def ashould_sync(self) -> bool:
         """
         Returns True if the File should be Synced
         """
-        return self.file_hash != await self.file_hash_path.async_read_text()
+        return await ThreadPool.run_async(self.should_sync)
     
     def sync(self) -> None:
         """
         Syncs the File
+
+        - Reloads everything if the snapshot was rewritten
+        - Otherwise only replays the journal records appended since the last sync
         """
         if self.should_sync():
-            self.cache = self.get_data()
+            with self.file_lock:
+                self._catch_up()
 
     async def async_sync(self) -> None:
         """
         Syncs the File
         """
-        if await self.ashould_sync():
-            self.cache = await self.aget_data()
+        await ThreadPool.run_async(self.sync)
+
+    def _load(self) -> None:
+        """
+        Loads the Snapshot and replays the Journal
+
+        - Should be called while holding the file lock
+        """
+        self._snapshot_stat = self._get_stat(self.file_path)
+        self._reset(self.read_snapshot())
+        records, self._journal_offset = self.read_journal()
+        for record in records: self._apply_record(record)
+
+    def _catch_up(self) -> None:
+        """
+        Brings the cache up to date with the files on disk
+
+        - Should be called while holding the file lock
+        """
+        if self._get_stat(self.file_path) != self._snapshot_stat: return self._load()
+        if self.file_format != 'journal': return
+        journal_size = self._get_journal_size()
+        if journal_size == self._journal_offset: return
+        if journal_size < self._journal_offset: return self._load()
+        records, self._journal_offset = self.read_journal(self._journal_offset)
+        for record in records: self._apply_record(record)
+
+    def read_snapshot(self) -> Dict[str, Any]:
+        """
+        Reads the Snapshot File
+
+        - Should be called while holding the file lock
+        """
+        if self.parser is None:
+            return json.loads(self.file_path.read_text())
+        return self.parser.parse(self.file_path.read_bytes(), recursive=True)
+
+    def read_journal(self, offset: int = 0) -> Tuple[List[Tuple], int]:
+        """
+        Reads the Journal Records starting at the offset and
+        returns them with the offset of the end of the last complete record
+
+        - Should be called while holding the file lock
+        - A torn record at the tail (from a crash mid-write) is discarded
+          and truncated so that subsequent appends start on a clean line
+        """
+        try:
+            with open(self.file_journal_path, 'rb') as f:
+                f.seek(offset)
+                payload = f.read()
+        except FileNotFoundError:
+            return [], 0
+        records, position = [], 0
+        for line in payload.splitlines(keepends = True):
+            if not line.endswith(b'\n'): break
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+            position += len(line)
+        if position < len(payload):
+            logger.warning(f'Discarding {len(payload) - position} bytes of incomplete journal records from {self.file_journal_path}')
+            with open(self.file_journal_path, 'r+b') as f:
+                f.truncate(offset + position)
+        return records, offset + position
 
     def get_data(self, **kwargs) -> Dict[str, Any]:
         """
         Returns the Data
         """
         with self.file_lock:
-            if self.parser is None:
-                return json.loads(self.file_path.read_text())
-            return self.parser.parse(self.file_path.read_bytes(), recursive=True)
+            self._load()
+        return self.cache
     
     async def aget_data(self, **kwargs) -> Dict[str, Any]:
         """
         Fetch the data
         """
-        with self.file_lock:
-            if self.parser is None:
-                return json.loads(await self.file_path.async_read_text())
-            return self.parser.parse(await self.file_path.async_read_bytes(), recursive=True)
+        return await ThreadPool.run_async(self.get_data, **kwargs)
         
     def write_data(self, data: Dict):
         """
         Writes the Data to the File
         """
+        if self.file_format == 'journal': return self.write_snapshot(data)
         with self.file_lock:
             self.file_path.write_text(json.dumps(data, indent = 4, ensure_ascii = False))
-            self.file_hash = create_unique_id()
-            self.file_hash_path.write_text(self.file_hash)
+            self._snapshot_stat = self._get_stat(self.file_path)
     
     async def awrite_data(self, data: Dict):
         """
         Writes the Data to the File
         """
+        await ThreadPool.run_async(self.write_data, data)
+
+    """
+    Journal Methods
+    """
+
+    def commit(self, *records: Tuple) -> None:
+        """
+        Applies the mutation records to the cache and persists them
+
+        - `json`: rewrites the whole file
+        - `journal`: appends the records to the journal
+        """
+        if not records: return
+        # The file lock is shared by the threads of this process
+        with self._get_rmw_lock_(), self.file_lock:
+            # Pick up writes from other processes first so they are not overwritten
+            self._catch_up()
+            for record in records: self._apply_record(record)
+            if self.file_format == 'journal': self.append_journal(*records)
+            else: self.write_data(self.cache)
+
+    def _update_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        Replaces the value of the key with `func(value)` while holding the
+        file lock, so the update is atomic across processes
+        """
+        with self._get_rmw_lock_(), self.file_lock:
+            self._catch_up()
+            return super()._update_in_place_(key, func, ex = ex, **kwargs)
+
+    def append_journal(self, *records: Tuple) -> None:
+        """
+        Appends the records to the Journal and compacts
+        it once it grows past `journal_compact_size`
+
+        - The records should already be applied to the cache
+        """
+        payload = ''.join(
+            json.dumps(record, ensure_ascii = False, separators = (',', ':')) + '\n'
+            for record in records
+        ).encode(self.encoding)
+        with self.file_lock:
+            with open(self.file_journal_path, 'ab') as f:
+                f.write(payload)
+                f.flush()
+                if self.journal_fsync: os.fsync(f.fileno())
+                self._journal_offset = f.tell()
+            if self._journal_offset >= self.journal_compact_size: self.compact()
+
+    def write_snapshot(self, data: Dict) -> None:
+        """
+        Atomically replaces the Snapshot with the data and truncates the Journal
+        """
         with self.file_lock:
-            await self.file_path.async_write_text(json.dumps(data, indent = 4, ensure_ascii = False))
-            self.file_hash = create_unique_id()
-            await self.file_hash_path.async_write_text(self.file_hash)
+            tmp_path = self.file_path.with_suffix(".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(data, ensure_ascii = False, separators = (',', ':')).encode(self.encoding))
+                f.flush()
+                if self.journal_fsync: os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
+            # A crash before the truncate is safe since replaying
+            # the journal on top of the new snapshot is idempotent
+            if self.file_journal_path.exists():
+                with open(self.file_journal_path, 'r+b') as f:
+                    f.truncate(0)
+            self._snapshot_stat = self._get_stat(self.file_path)
+            self._journal_offset = 0
 
+    def compact(self) -> None:
+        """
+        Compacts the Journal into the Snapshot
+        """
+        with self.file_lock:
+            self._catch_up()
+            self.write_snapshot(self.cache)
     
+    async def acompact(self) -> None:
+        """
+        Compacts the Journal into the Snapshot
+        """
+        await ThreadPool.run_async(self.compact)
+
+    def get_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored in a sidecar file
+        """
+        path = self.file_path.with_suffix(f'.{name}')
+        return path.read_bytes() if path.exists() else None
+
+    def set_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata in a sidecar file
+        """
+        path = self.file_path.with_suffix(f'.{name}')
+        tmp_path = self.file_path.with_suffix(f'.{name}.tmp')
+        with self.file_lock:
+            tmp_path.write_bytes(value)
+            os.replace(tmp_path, path)
 
     def incrby(self, key: str, amount: int = 1, **kwargs) -> int:
         # sourcery skip: class-extract-method
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+"""
+Object Storage Conditional Reads
+
+Values are read with a single request, and a missing object is a miss rather
+than an error. The optional `ETagCache` keeps the raw bytes of recently read
+values keyed by their ETag, so that reading an unchanged value only costs a
+revalidation.
+
+- S3-compatible filesystems (S3, R2, MinIO) revalidate with a conditional
+  `GetObject` using `If-None-Match`, which returns `304 Not Modified` for an
+  unchanged value and the new body otherwise
+- Other remote filesystems compare the ETag reported by `info()`
+- Local files are read directly and are never cached
+
+Read-modify-write operations on S3-compatible filesystems write back with a
+conditional `PutObject`, using `If-Match` on the ETag that was read (or
+`If-None-Match: *` for a new object), so a concurrent writer is detected
+with `412 Precondition Failed` rather than silently overwritten.
+"""
+
+import threading
+import collections
+import typing as t
+
+if t.TYPE_CHECKING:
+    from lzl.io.file import FileLike
+
+
+NOT_MODIFIED = object()
+PRECONDITION_FAILED = object()
+
+_ETAG_FIELDS = ('ETag', 'etag', 'md5Hash', 'generation')
+
+
+class ETagCache:
+    """
+    Bounded LRU Cache of Raw Values keyed by their ETag
+    """
+
+    def __init__(self, max_entries: t.Optional[int] = 1024, max_size: t.Optional[int] = 2 ** 26):
+        """
+        Initializes the ETag Cache
+
+        Args:
+            max_entries (int, optional): The maximum number of cached values. Defaults to 1024.
+            max_size (int, optional): The maximum total size in bytes of the cached values. Defaults to 64 MiB.
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._data: 'collections.OrderedDict[str, t.Tuple[str, t.Union[str, bytes]]]' = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> t.Optional[t.Tuple[str, t.Union[str, bytes]]]:
+        """
+        Returns the cached `(etag, value)` of the key
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None: self._data.move_to_end(key)
+            return item
+
+    def set(self, key: str, etag: t.Optional[str], value: t.Union[str, bytes]):
+        """
+        Caches the value of the key, evicting the least recently read values
+        """
+        if not etag or value is None:
+            return self.pop(key)
+        size = len(value)
+        if self.max_size and size > self.max_size:
+            return self.pop(key)
+        with self._lock:
+            existing = self._data.pop(key, None)
+            if existing is not None: self.size -= len(existing[1])
+            self._data[key] = (etag, value)
+            self.size += size
+            while self._data and (
+                (self.max_entries and len(self._data) > self.max_entries) or \
+                (self.max_size and self.size > self.max_size)
+            ):
+                _, (_, evicted) = self._data.popitem(last = False)
+                self.size -= len(evicted)
+
+    def pop(self, key: str):
+        """
+        Removes the key from the cache
+        """
+        with self._lock:
+            existing = self._data.pop(key, None)
+            if existing is not None: self.size -= len(existing[1])
+
+    def clear(self):
+        """
+        Clears the cache
+        """
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f'<ETagCache entries={len(self._data)}, size={self.size}, hits={self.hits}, misses={self.misses}>'
+
+
+def is_s3_compatible(fs: t.Any) -> bool:
+    """
+    Returns True if the filesystem supports conditional `GetObject` requests
+    """
+    return fs is not None and hasattr(fs, '_call_s3') and hasattr(fs, 'split_path')
+
+
+def _is_error_response(error: BaseException, status_codes: t.Set[int], error_codes: t.Set[str]) -> bool:
+    """
+    Returns True if the error or one of its causes is a response with one of the codes
+
+    s3fs translates client errors to an `OSError` with the
+    original botocore error as its cause
+    """
+    while error is not None:
+        response = getattr(error, 'response', None)
+        if isinstance(response, dict):
+            if response.get('ResponseMetadata', {}).get('HTTPStatusCode') in status_codes: return True
+            if response.get('Error', {}).get('Code') in error_codes: return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def is_not_modified(error: BaseException) -> bool:
+    """
+    Returns True if the error is a `304 Not Modified` response
+    """
+    return _is_error_response(error, {304}, {'304', 'NotModified'})
+
+
+def is_precondition_failed(error: BaseException) -> bool:
+    """
+    Returns True if the error is a failed conditional write
+
+    S3 answers `412 Precondition Failed`, or `409 Conflict` when
+    another conditional write to the same key is in progress
+    """
+    return _is_error_response(error, {409, 412}, {'412', 'PreconditionFailed', 'ConditionalRequestConflict'})
+
+
+def get_etag(info: t.Dict[str, t.Any]) -> t.Optional[str]:
+    """
+    Returns the ETag of the object info
+    """
+    for field in _ETAG_FIELDS:
+        if info.get(field): return str(info[field])
+    return None
+
+
+async def _aget_object(fs: t.Any, path: str, etag: t.Optional[str] = None) -> t.Union[t.Tuple[bytes, t.Optional[str]], object]:
+    """
+    Reads the object with a single `GetObject` request
+
+    Returns `NOT_MODIFIED` if the object still matches the ETag
+    """
+    bucket, key, version_id = fs.split_path(path)
+    kwargs = {'Bucket': bucket, 'Key': key}
+    if version_id: kwargs['VersionId'] = version_id
+    if etag: kwargs['IfNoneMatch'] = etag
+    try:
+        response = await fs._call_s3('get_object', **kwargs)
+    except FileNotFoundError: raise
+    except Exception as e:
+        if etag and is_not_modified(e): return NOT_MODIFIED
+        raise
+    body = response['Body']
+    try:
+        data = await body.read()
+    finally:
+        body.close()
+    return data, response.get('ETag')
+
+
+async def _aput_object(fs: t.Any, path: str, data: t.Union[str, bytes], etag: t.Optional[str] = None, encoding: t.Optional[str] = 'utf-8') -> t.Union[t.Optional[str], object]:
+    """
+    Writes the object with a conditional `PutObject` request
+
+    The write only succeeds if the object still matches the ETag,
+    or if it does not exist when no ETag is given
+
+    Returns the new ETag or `PRECONDITION_FAILED`
+    """
+    bucket, key, _ = fs.split_path(path)
+    kwargs = {'Bucket': bucket, 'Key': key, 'Body': data.encode(encoding) if isinstance(data, str) else data}
+    if etag: kwargs['IfMatch'] = etag
+    else: kwargs['IfNoneMatch'] = '*'
+    try:
+        response = await fs._call_s3('put_object', **kwargs)
+    except FileNotFoundError:
+        # The object was removed in between
+        if etag: return PRECONDITION_FAILED
+        raise
+    except FileExistsError:
+        # The object was created in between
+        return PRECONDITION_FAILED
+    except Exception as e:
+        if is_precondition_failed(e): return PRECONDITION_FAILED
+        raise
+    return response.get('ETag')
+
+
+class ConditionalReader:
+    """
+    Reads Object Storage Values with a single request
+    """
+
+    def __init__(self, cache: t.Optional[ETagCache] = None, is_binary: t.Optional[bool] = True, encoding: t.Optional[str] = 'utf-8'):
+        """
+        Initializes the Conditional Reader
+
+        Args:
+            cache (ETagCache, optional): The cache of raw values. Defaults to None, which disables caching.
+            is_binary (bool, optional): Whether values are returned as `bytes` rather than `str`. Defaults to True.
+            encoding (str, optional): The encoding of `str` values. Defaults to 'utf-8'.
+        """
+        self.cache = cache
+        self.is_binary = is_binary
+        self.encoding = encoding
+
+    def _decode(self, data: t.Union[str, bytes]) -> t.Union[str, bytes]:
+        """
+        Returns the data as the type expected by the serializer
+        """
+        if self.is_binary or isinstance(data, str): return data
+        return data.decode(self.encoding)
+
+    def _read_direct(self, f: 'FileLike') -> t.Union[str, bytes]:
+        """
+        Reads the file without revalidation
+        """
+        return f.read_bytes() if self.is_binary else f.read_text()
+
+    async def _aread_direct(self, f: 'FileLike') -> t.Union[str, bytes]:
+        """
+        Reads the file without revalidation
+        """
+        return await (f.aread_bytes() if self.is_binary else f.aread_text())
+
+    def _resolve(self, key: str, result: t.Any, cached: t.Optional[t.Tuple[str, t.Union[str, bytes]]]) -> t.Union[str, bytes]:
+        """
+        Returns the value of a conditional read and updates the cache
+        """
+        if result is NOT_MODIFIED:
+            self.cache.hits += 1
+            return cached[1]
+        data, etag = result
+        value = self._decode(data)
+        self.cache.misses += 1
+        self.cache.set(key, etag, value)
+        return value
+
+    def read(self, f: 'FileLike') -> t.Union[str, bytes]:
+        """
+        Reads the file
+
+        Raises `FileNotFoundError` if the file does not exist
+        """
+        if self.cache is None or not f.is_fsspec: return self._read_direct(f)
+        key = f.as_posix()
+        cached = self.cache.get(key)
+        etag = cached[0] if cached else None
+        try:
+            fs = f.filesys
+            if is_s3_compatible(fs):
+                from fsspec.asyn import sync
+                result = sync(fs.loop, _aget_object, fs, f.fspath_, etag)
+            else:
+                info_etag = get_etag(f.info())
+                if etag and info_etag == etag: result = NOT_MODIFIED
+                else: result = (self._read_direct(f), info_etag)
+        except FileNotFoundError:
+            self.cache.pop(key)
+            raise
+        return self._resolve(key, result, cached)
+
+    async def aread(self, f: 'FileLike') -> t.Union[str, bytes]:
+        """
+        Reads the file
+
+        Raises `FileNotFoundError` if the file does not exist
+        """
+        if self.cache is None or not f.is_fsspec: return await self._aread_direct(f)
+        key = f.as_posix()
+        cached = self.cache.get(key)
+        etag = cached[0] if cached else None
+        try:
+            fs = f.afilesys
+            if is_s3_compatible(fs):
+                result = await _aget_object(fs, f.fspath_, etag)
+            else:
+                info_etag = get_etag(await f.ainfo())
+                if etag and info_etag == etag: result = NOT_MODIFIED
+                else: result = (await self._aread_direct(f), info_etag)
+        except FileNotFoundError:
+            self.cache.pop(key)
+            raise
+        return self._resolve(key, result, cached)
+
+    def invalidate(self, f: 'FileLike'):
+        """
+        Removes the file from the cache
+        """
+        if self.cache is not None: self.cache.pop(f.as_posix())
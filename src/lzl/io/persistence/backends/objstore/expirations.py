@@ -7,10 +7,16 @@ Remote Object Storage Backend Dict-Like Persistence
 import re
 import abc
 import time
+import zlib
+import heapq
+import atexit
+import weakref
+import threading
 import datetime
 import contextlib
 from lzo.types import BaseModel, Field, model_validator, Literal, eproperty
 from lzl.io.file import File
+from lzl.pool import ThreadPool
 from typing import TypeVar, Generic, Any, Dict, Optional, Union, Tuple, Iterable, List, Type, Callable, Generator, AsyncGenerator, TYPE_CHECKING
 from ..base import logger
 
@@ -100,13 +106,112 @@ class ExpirationFile(BaseModel):
             if exp_obj.is_expired
         ]
 
+class ExpirationShard:
+    """
+    A Shard of the Expiration Index
+
+    Maps the keys to their expiration timestamps, with a min-heap of
+    `(expires_at, key)` to find the expired keys. Replaced or removed
+    expirations are left in the heap and skipped when they are popped.
+    """
+
+    def __init__(self):
+        self.index: Dict[str, float] = {}
+        self.heap: List[Tuple[float, str]] = []
+        self.pending: Dict[str, Optional[float]] = {}
+        self.loaded_at: Optional[float] = None
+
+    @staticmethod
+    def merge(data: Dict[str, float], pending: Dict[str, Optional[float]]):
+        """
+        Applies the pending changes to the data
+        """
+        for key, expires_at in pending.items():
+            if expires_at is None: data.pop(key, None)
+            else: data[key] = expires_at
+
+    def load(self, data: Dict[str, float]):
+        """
+        Replaces the index with the stored data and the pending changes
+        """
+        data = dict(data)
+        self.merge(data, self.pending)
+        self.index = data
+        self.heap = [(expires_at, key) for key, expires_at in data.items()]
+        heapq.heapify(self.heap)
+        self.loaded_at = time.monotonic()
+
+    def set(self, key: str, expires_at: float):
+        """
+        Sets the expiration of the key
+        """
+        self.index[key] = expires_at
+        self.pending[key] = expires_at
+        heapq.heappush(self.heap, (expires_at, key))
+        if len(self.heap) > 2 * len(self.index) + 64:
+            self.heap = [(exp, k) for k, exp in self.index.items()]
+            heapq.heapify(self.heap)
+
+    def remove(self, key: str) -> bool:
+        """
+        Removes the expiration of the key
+        """
+        if self.index.pop(key, None) is None: return False
+        self.pending[key] = None
+        return True
+
+    def pop_if_expired(self, key: str, now: float) -> bool:
+        """
+        Removes the key if it is expired
+        """
+        expires_at = self.index.get(key)
+        if expires_at is None or expires_at > now: return False
+        return self.remove(key)
+
+    def pop_expired(self, now: float, limit: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Removes and returns up to `limit` expired keys, mapped to whether
+        their expiration was set locally and not yet stored
+        """
+        expired = {}
+        while self.heap and self.heap[0][0] <= now and (limit is None or len(expired) < limit):
+            expires_at, key = heapq.heappop(self.heap)
+            if self.index.get(key) != expires_at: continue
+            expired[key] = self.pending.get(key) is not None
+            self.remove(key)
+        return expired
+
+    def is_pending(self, key: str) -> bool:
+        """
+        Returns True if the expiration of the key was set locally and not yet stored
+        """
+        return self.pending.get(key) is not None
+
+    def take_pending(self) -> Dict[str, Optional[float]]:
+        """
+        Returns and clears the pending changes
+        """
+        pending, self.pending = self.pending, {}
+        return pending
+
+    def restore_pending(self, pending: Dict[str, Optional[float]]):
+        """
+        Restores the pending changes that failed to be stored
+        """
+        for key, expires_at in pending.items():
+            self.pending.setdefault(key, expires_at)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
 class ExpirationBackend(abc.ABC):
     """
     Expiration Backend
     """
     name: Optional[str] = None
 
-    def __init__(self, backend: 'ObjStorageStatefulBackend'):
+    def __init__(self, backend: 'ObjStorageStatefulBackend', **kwargs):
         """
         Initializes the Expiration Backend
         """
@@ -185,12 +290,68 @@ class ExpirationBackend(abc.ABC):
         pass
 
 
+# Flushed once at exit, without keeping the backends alive
+_file_backends: 'weakref.WeakSet[FileExpirationBackend]' = weakref.WeakSet()
+
+@atexit.register
+def _flush_file_backends():
+    """
+    Stores the pending changes of the file expiration backends
+    """
+    for exp_backend in list(_file_backends):
+        exp_backend.flush()
+
+
 class FileExpirationBackend(ExpirationBackend):
     """
     File Expiration Backend
+
+    The expirations are kept in an index that is sharded by the hash of the
+    key into `num_shards` metadata objects (`.{name}.metadata.expires.{shard}`),
+    each mapping the keys to their expiration timestamps.
+
+    - Shards are loaded once and kept in memory, and reloaded when they are
+      older than `refresh_interval` seconds
+    - Setting or removing an expiration only updates the in-memory shard,
+      which costs O(log n), and marks the change as pending. Pending changes
+      are merged into the stored shard every `flush_interval` seconds, or
+      immediately if it is 0
+    - Expired keys are swept in batches of `sweep_batch` keys from the heaps
+      of the loaded shards, re-checked against the reloaded shards, and
+      deleted with a single batch operation
     """
     name: Optional[str] = 'file'
 
+    def __init__(
+        self, 
+        backend: 'ObjStorageStatefulBackend',
+        num_shards: Optional[int] = 16,
+        flush_interval: Optional[float] = 1.0,
+        refresh_interval: Optional[float] = 30.0,
+        sweep_batch: Optional[int] = 1000,
+        **kwargs,
+    ):
+        """
+        Initializes the File Expiration Backend
+
+        Args:
+            backend (ObjStorageStatefulBackend): The backend
+            num_shards (int, optional): The number of shards of the index. Defaults to 16.
+            flush_interval (float, optional): How long to wait before storing pending changes. Defaults to 1.0.
+            refresh_interval (float, optional): How long a loaded shard is used before reloading it. Defaults to 30.0.
+            sweep_batch (int, optional): The maximum number of expired keys removed per check. Defaults to 1000.
+        """
+        self.num_shards = max(num_shards or 1, 1)
+        self.flush_interval = flush_interval or 0.0
+        self.refresh_interval = refresh_interval
+        self.sweep_batch = sweep_batch
+        self.shards: List[ExpirationShard] = [ExpirationShard() for _ in range(self.num_shards)]
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        super().__init__(backend)
+        _file_backends.add(self)
+
     def _setup_(self):
         """
         Sets up the expiration backend
@@ -199,138 +360,287 @@ class FileExpirationBackend(ExpirationBackend):
         self.exp_file: 'File' = self.backend.base_key.joinpath(f'.{self.backend.name}.metadata.expires')
         self.ser = get_serializer(serializer = 'json')
 
-    def _load(self, *args, **kwargs) -> 'ExpirationFile':
+    def _handle_migration_(self):
         """
-        Loads the Expirations
+        Migrates the single expiration file to the sharded index
         """
-        if not self.exp_file.exists(): return ExpirationFile()
-        try:
-            return self.ser.loads(self.exp_file.read_text())
-        except Exception as e:
-            logger.error(f'Error Loading Expirations: {e}')
-            return ExpirationFile()
+        with contextlib.suppress(Exception):
+            if not self.exp_file.exists(): return
+            exps: 'ExpirationFile' = self.ser.loads(self.exp_file.read_text())
+            self._load_shards(*range(self.num_shards), force = True)
+            with self._lock:
+                for key, exp in exps.index.items():
+                    self.get_shard(key).set(key, exp.expires_at.timestamp())
+            if not self.flush():
+                logger.warning(f'Keeping {self.exp_file} as not all the Expirations could be stored')
+                return
+            logger.info(f'Migrated `{len(exps.index)}` Expirations from {self.exp_file} to {self.num_shards} Shards')
+            self.exp_file.unlink()
 
-    def _save(self, exps: 'ExpirationFile', **kwargs):
+    def get_shard_id(self, key: str) -> int:
         """
-        Saves the Expirations
+        Returns the shard of the key
         """
-        self.exp_file.write_text(self.ser.dumps(exps))
-    
-    async def _aload(self, *args, **kwargs) -> 'ExpirationFile':
+        return zlib.crc32(key.encode('utf-8')) % self.num_shards
+
+    def get_shard(self, key: str) -> 'ExpirationShard':
+        """
+        Returns the shard of the key
         """
-        Loads the Expirations
+        return self.shards[self.get_shard_id(key)]
+
+    def get_shard_file(self, shard_id: int) -> 'File':
         """
-        if not await self.exp_file.aexists(): return ExpirationFile()
+        Returns the metadata object of the shard
+        """
+        return self.backend.base_key.joinpath(f'.{self.backend.name}.metadata.expires.{shard_id:03d}')
+
+    def _get_shard_ids(self, *keys: str) -> List[int]:
+        """
+        Returns the shards of the keys
+        """
+        if not keys: return list(range(self.num_shards))
+        return sorted({self.get_shard_id(key) for key in keys})
+
+    def _needs_load(self, shard_id: int) -> bool:
+        """
+        Returns True if the shard has not been loaded or is stale
+        """
+        loaded_at = self.shards[shard_id].loaded_at
+        if loaded_at is None: return True
+        return self.refresh_interval is not None and time.monotonic() - loaded_at > self.refresh_interval
+
+    def _parse_shard(self, data: Optional[str]) -> Dict[str, float]:
+        """
+        Parses the stored shard
+        """
+        if not data: return {}
         try:
-            return await self.ser.aloads(await self.exp_file.aread_text())
+            return {key: float(exp) for key, exp in self.ser.loads(data).items()}
         except Exception as e:
             logger.error(f'Error Loading Expirations: {e}')
-            return ExpirationFile()
+            return {}
 
-    async def _asave(self, exps: 'ExpirationFile', **kwargs):
+    def _read_shard(self, shard_id: int) -> Dict[str, float]:
         """
-        Saves the Expirations
+        Reads the stored shard
         """
-        await self.exp_file.awrite_text(await self.ser.adumps(exps))
+        try:
+            return self._parse_shard(self.get_shard_file(shard_id).read_text())
+        except FileNotFoundError:
+            return {}
 
-    @contextlib.contextmanager
-    def handler(self, *args, **kwargs) -> Generator['ExpirationFile', None, None]:
+    async def _aread_shard(self, shard_id: int) -> Dict[str, float]:
         """
-        Handles the expiration file
+        Reads the stored shard
         """
-        exps = self._load()
         try:
-            yield exps
-        except Exception as e:
-            logger.error(f'Error Handling Expirations: {e}')
-        finally:
-            self._save(exps)
-            # logger.info(f'Saved Expirations: {exps}')
-            
-    @contextlib.asynccontextmanager
-    async def ahandler(self, *args, **kwargs) -> AsyncGenerator['ExpirationFile', None]:
+            return self._parse_shard(await self.get_shard_file(shard_id).aread_text())
+        except FileNotFoundError:
+            return {}
+
+    def _load_shards(self, *shard_ids: int, force: Optional[bool] = False):
+        """
+        Loads the shards that are missing or stale
+        """
+        shard_ids = [shard_id for shard_id in shard_ids if force or self._needs_load(shard_id)]
+        if not shard_ids: return
+        for shard_id, data in zip(shard_ids, self.backend._iterate(self._read_shard, shard_ids, return_ordered = True)):
+            with self._lock: self.shards[shard_id].load(data)
+
+    async def _aload_shards(self, *shard_ids: int, force: Optional[bool] = False):
+        """
+        Loads the shards that are missing or stale
+        """
+        shard_ids = [shard_id for shard_id in shard_ids if force or self._needs_load(shard_id)]
+        if not shard_ids: return
+        results = await ThreadPool.amap(self._aread_shard, shard_ids, return_ordered = True)
+        with self._lock:
+            for shard_id, data in zip(shard_ids, results):
+                self.shards[shard_id].load(data)
+
+    def _flush_shard(self, shard_id: int) -> bool:
         """
-        Handles the expiration file
+        Merges the pending changes of the shard into the stored shard
+
+        Returns False if they could not be stored
         """
-        exps = await self._aload()
+        shard = self.shards[shard_id]
+        with self._lock:
+            pending = shard.take_pending()
+        if not pending: return True
         try:
-            yield exps
+            data = self._read_shard(shard_id)
+            ExpirationShard.merge(data, pending)
+            self.get_shard_file(shard_id).write_text(self.ser.dumps(data))
         except Exception as e:
-            logger.error(f'Error Handling Expirations: {e}')
-        finally:
-            await self._asave(exps)
-            # logger.info(f'Saved Expirations: {exps}')
+            logger.error(f'Error Saving Expirations: {e}')
+            with self._lock: shard.restore_pending(pending)
+            return False
+        with self._lock: shard.load(data)
+        return True
+
+    def flush(self) -> bool:
+        """
+        Stores the pending changes of all the shards
 
-    def _check(self, *keys: str, **kwargs):
+        Returns False if some of them could not be stored
+        """
+        with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            shard_ids = [n for n, shard in enumerate(self.shards) if shard.pending]
+            if not shard_ids: return True
+            try:
+                return all(list(self.backend._iterate(self._flush_shard, shard_ids)))
+            except RuntimeError:
+                # The executors no longer accept work at interpreter exit
+                return all([self._flush_shard(shard_id) for shard_id in shard_ids])
+
+    def _schedule_flush(self):
+        """
+        Schedules storing the pending changes
+        """
+        if not self.flush_interval: return self.flush()
+        with self._flush_lock:
+            if self._timer is not None: return
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    async def _aschedule_flush(self):
+        """
+        Schedules storing the pending changes
+        """
+        if not self.flush_interval: return await ThreadPool.arun(self.flush)
+        self._schedule_flush()
+
+    def _get_expired(self, *keys: str, validate: Optional[bool] = False) -> Dict[str, bool]:
+        """
+        Returns the expired keys and removes them from the index
+
+        - The keys are always checked, and a batch of other expired keys is swept
+          from the loaded shards, or all of them if `validate` is set
+        - Each key is mapped to whether its expiration was set locally and not yet stored
+        """
+        now = time.time()
+        limit = None if validate else self.sweep_batch
+        expired: Dict[str, bool] = {}
+        with self._lock:
+            for key in keys:
+                shard = self.get_shard(key)
+                is_pending = shard.is_pending(key)
+                if shard.pop_if_expired(key, now): expired[key] = is_pending
+            for shard in self.shards:
+                if limit is not None and len(expired) >= limit: break
+                expired.update(shard.pop_expired(now, limit = None if limit is None else limit - len(expired)))
+        return expired
+
+    def _confirm_expired(self, expired: Dict[str, bool], stored: Dict[int, Dict[str, float]]) -> List[str]:
+        """
+        Re-checks the expired keys against the reloaded shards and returns the ones to delete
+
+        The loaded shards can be up to `refresh_interval` seconds old, so another
+        instance may have since set the key again or removed its expiration.
+        A key is kept if its stored expiration is in the future, or if it was
+        not set locally and is no longer in the stored shard.
+        """
+        now = time.time()
+        confirmed = []
+        with self._lock:
+            for key, is_pending in expired.items():
+                shard_id = self.get_shard_id(key)
+                expires_at = stored[shard_id].get(key)
+                keep = expires_at > now if expires_at is not None else not is_pending
+                if not keep:
+                    confirmed.append(key)
+                    continue
+                # Drop the local removal so that the stored expiration is kept
+                self.shards[shard_id].pending.pop(key, None)
+            for shard_id, data in stored.items():
+                self.shards[shard_id].load(data)
+        return confirmed
+
+    def _check(self, *keys: str, validate: Optional[bool] = False, **kwargs):
         """
         Runs the expiration check
         """
-        # Maps to _arun_expiration_check
-        if not self.exp_file.exists(): return
-        with self.handler() as exps:
-            expired_keys = exps.get_expired_keys()
-            if expired_keys: 
-                self.backend._clear(*expired_keys)
-                exps.remove_exps(*keys)
+        self._load_shards(*self._get_shard_ids(*keys) if not validate else range(self.num_shards))
+        expired = self._get_expired(*keys, validate = validate)
+        if not expired: return
+        shard_ids = self._get_shard_ids(*expired)
+        stored = dict(zip(shard_ids, self.backend._iterate(self._read_shard, shard_ids, return_ordered = True)))
+        expired_keys = self._confirm_expired(expired, stored)
+        if expired_keys: self.backend._clear(*expired_keys)
+        self._schedule_flush()
 
-    async def _acheck(self, *keys: str, **kwargs):
+    async def _acheck(self, *keys: str, validate: Optional[bool] = False, **kwargs):
         """
         Runs the expiration check
         """
-        # Maps to _arun_expiration_check
-        # if self.exp_file is None: return
-        if not await self.exp_file.aexists(): return
-        async with self.ahandler() as exps:
-            expired_keys = exps.get_expired_keys()
-            if expired_keys: 
-                await self.backend._aclear(*expired_keys)
-                exps.remove_exps(*keys)
+        await self._aload_shards(*self._get_shard_ids(*keys) if not validate else range(self.num_shards))
+        expired = self._get_expired(*keys, validate = validate)
+        if not expired: return
+        shard_ids = self._get_shard_ids(*expired)
+        stored = dict(zip(shard_ids, await ThreadPool.amap(self._aread_shard, shard_ids, return_ordered = True)))
+        expired_keys = self._confirm_expired(expired, stored)
+        if expired_keys: await self.backend._aclear(*expired_keys)
+        await self._aschedule_flush()
+
+    def _set_exps(self, *keys: str, ex: int):
+        """
+        Sets the expiration of the keys in the index
+        """
+        expires_at = time.time() + ex
+        with self._lock:
+            for key in keys:
+                self.get_shard(key).set(key, expires_at)
+
+    def _remove_exps(self, *keys: str) -> bool:
+        """
+        Removes the expiration of the keys from the index
+
+        Returns True if any of the keys had an expiration
+        """
+        with self._lock:
+            return any([self.get_shard(key).remove(key) for key in keys])
 
     def _set(self, *keys: str, ex: Optional[int] = None, validate: Optional[bool] = False, **kwargs):
         """
         Sets the expiration for the keys
         """
-        # logger.info(f'Setting Expirations: {keys} -> {ex}')
         ex = ex or self.backend.expiration
         if ex is None: return
-        with self.handler() as exps:
-            exps.set_exps(*keys, ex = ex)
-            if validate: 
-                expired_keys = exps.get_expired_keys()
-                if expired_keys: 
-                    self.backend._clear(*expired_keys)
-                    exps.remove_exps(*expired_keys)
+        self._load_shards(*self._get_shard_ids(*keys))
+        self._set_exps(*keys, ex = ex)
+        if validate: self._check(validate = True)
+        self._schedule_flush()
 
     async def _aset(self, *keys: str, ex: Optional[int] = None, validate: Optional[bool] = False, **kwargs):
         """
         Sets the expiration
         """
-        # logger.info(f'Setting Expirations: {keys} -> {ex}')
         ex = ex or self.backend.expiration
         if ex is None: return
-        async with self.ahandler() as exps:
-            exps.set_exps(*keys, ex = ex)
-            if validate: 
-                expired_keys = exps.get_expired_keys()
-                if expired_keys: 
-                    await self.backend._aclear(*expired_keys)
-                    exps.remove_exps(*expired_keys)
+        await self._aload_shards(*self._get_shard_ids(*keys))
+        self._set_exps(*keys, ex = ex)
+        if validate: await self._acheck(validate = True)
+        await self._aschedule_flush()
 
     def _remove(self, *keys: str, **kwargs):
         """
         Removes the expiration
         """
-        if not self.exp_file.exists(): return
-        with self.handler() as exps:
-            exps.remove_exps(*keys)
+        self._load_shards(*self._get_shard_ids(*keys))
+        if self._remove_exps(*keys): self._schedule_flush()
 
     async def _aremove(self, *keys: str, **kwargs):
         """
         Removes the expiration
         """
-        if not await self.exp_file.aexists(): return
-        async with self.ahandler() as exps:
-            exps.remove_exps(*keys)
+        await self._aload_shards(*self._get_shard_ids(*keys))
+        if self._remove_exps(*keys): await self._aschedule_flush()
 
 
 class RedisExpirationBackend(ExpirationBackend):
@@ -4,19 +4,24 @@ from __future__ import annotations
 Remote Object Storage Backend Dict-Like Persistence
 """
 
+import os
+import threading
 import concurrent.futures
 from lzl.pool import ThreadPool
 from lzo.types import Literal, eproperty
 from lzl.io.file import File
 from typing import TypeVar, Generic, Any, Dict, Optional, Union, Tuple, Iterable, List, Type, Callable, Generator, AsyncGenerator, TYPE_CHECKING
-from ..base import BaseStatefulBackend, SchemaType, create_unique_id, logger
+from ..base import BaseStatefulBackend, SchemaType, UNCHANGED, create_unique_id, logger
 from .expirations import FileExpirationBackend, RedisExpirationBackend
+from .caching import ETagCache, ConditionalReader, PRECONDITION_FAILED, is_s3_compatible, _aget_object, _aput_object
 
 if TYPE_CHECKING:
+    import filelock
     from lzl.io.file import FileLike
 
-# TODO: add caching support for lookups
 _logged_backend: bool = False
+_executors: Dict[int, concurrent.futures.ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
 
 def _display_backend(backend: str):
     """
@@ -28,6 +33,24 @@ def _display_backend(backend: str):
     _logged_backend = True
 
 
+def get_executor(max_workers: Optional[int] = None) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Returns the long-lived executor for the batch operations
+
+    Backends with the same number of workers share an executor, so that
+    child backends and repeated batches do not start new threads
+    """
+    if max_workers is None: max_workers = min(32, (os.cpu_count() or 1) + 4)
+    if max_workers not in _executors:
+        with _executors_lock:
+            if max_workers not in _executors:
+                _executors[max_workers] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers = max_workers, 
+                    thread_name_prefix = f'objstore-{max_workers}'
+                )
+    return _executors[max_workers]
+
+
 class ObjStorageStatefulBackend(BaseStatefulBackend):
     """
     Implements an Object Storage Stateful Backend
@@ -44,6 +67,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
     file_ext: Optional[str] = None
     file_pre: Optional[str] = None
     auto_delete_invalid: Optional[bool] = False
+    num_lock_stripes: Optional[int] = 64
 
     def __init__(
         self,
@@ -57,6 +81,12 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         serializer: Optional[str] = 'json',
         serializer_kwargs: Optional[Dict[str, Any]] = None,
         expiration_backend: Optional[Literal['auto', 'file', 'redis']] = 'auto', # ``
+        expiration_kwargs: Optional[Dict[str, Any]] = None,
+        etag_cache: Optional[bool] = None,
+        etag_cache_max_entries: Optional[int] = 1024,
+        etag_cache_max_size: Optional[int] = 2 ** 26,
+        max_workers: Optional[int] = None,
+        batch_concurrency: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -73,6 +103,16 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
 
             name (str, optional): The name of the backend. Defaults to None.
             expiration (int, optional): The expiration time in seconds. Defaults to None.
+            expiration_kwargs (Dict[str, Any], optional): The settings of the expiration backend,
+                such as `num_shards` or `flush_interval` of the file backend. Defaults to None.
+            etag_cache (bool, optional): Whether to cache the raw values locally and revalidate
+                them by their ETag with `If-None-Match`. Defaults to None.
+            etag_cache_max_entries (int, optional): The maximum number of cached values. Defaults to 1024.
+            etag_cache_max_size (int, optional): The maximum total size in bytes of the cached values. Defaults to 64 MiB.
+            max_workers (int, optional): The number of threads of the shared batch executor. 
+                Defaults to None, which uses `min(32, cpu_count + 4)`.
+            batch_concurrency (int, optional): The maximum number of requests in flight per batch. 
+                Defaults to None, which uses twice the number of workers.
         """
         if isinstance(base_key, str): base_key = File(base_key)
         self.base_key: 'File' = base_key
@@ -81,6 +121,9 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
             self.expiration = expiration
         self.async_enabled = async_enabled
         self.expiration_backend = expiration_backend
+        self.expiration_kwargs = expiration_kwargs or {}
+        self.max_workers = max_workers
+        self.batch_concurrency = batch_concurrency
 
         if file_ext is not None: 
             file_ext = file_ext.lstrip('.')
@@ -94,6 +137,8 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         from lzl.io.ser import get_serializer
         self.serializer = get_serializer(serializer = serializer, **(serializer_kwargs or {}))
         self._exp_ser = get_serializer(serializer = 'json')
+        self.etag_cache = ETagCache(max_entries = etag_cache_max_entries, max_size = etag_cache_max_size) if etag_cache else None
+        self.reader = ConditionalReader(cache = self.etag_cache, is_binary = self.serializer.is_binary)
         self._kwargs = kwargs
         self._kwargs['serializer'] = serializer
         self._kwargs['serializer_kwargs'] = serializer_kwargs
@@ -104,6 +149,12 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         self._kwargs['file_pre'] = file_pre
         self._kwargs['auto_delete_invalid'] = auto_delete_invalid
         self._kwargs['expiration_backend'] = self.expiration_backend
+        self._kwargs['expiration_kwargs'] = expiration_kwargs
+        self._kwargs['etag_cache'] = etag_cache
+        self._kwargs['etag_cache_max_entries'] = etag_cache_max_entries
+        self._kwargs['etag_cache_max_size'] = etag_cache_max_size
+        self._kwargs['max_workers'] = max_workers
+        self._kwargs['batch_concurrency'] = batch_concurrency
     
     def _setup_exp_backend(self):
         """
@@ -116,9 +167,9 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
             else: self.expiration_backend = 'file'
             _display_backend(self.expiration_backend)
         if self.expiration_backend == 'file':
-            self.exp_backend = FileExpirationBackend(backend = self)
+            self.exp_backend = FileExpirationBackend(backend = self, **self.expiration_kwargs)
         elif self.expiration_backend == 'redis':
-            self.exp_backend = RedisExpirationBackend(backend = self)
+            self.exp_backend = RedisExpirationBackend(backend = self, **self.expiration_kwargs)
         else:
             raise ValueError(f'Invalid Expiration Backend: {self.expiration_backend}')
         # logger.info(f'Using Expiration Backend: {self.exp_backend.name}')
@@ -154,6 +205,34 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         """
         pass
 
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Returns the executor for the batch operations
+        """
+        return get_executor(self.max_workers)
+
+    def _iterate(
+        self, 
+        func: Callable[..., Any], 
+        items: Iterable[Any], 
+        return_ordered: Optional[bool] = False, 
+        **kwargs
+    ) -> Generator[Any, None, None]:
+        """
+        Yields the results of applying the function to the items on the batch executor
+
+        - Items are consumed lazily with at most `batch_concurrency` requests in flight
+        """
+        yield from ThreadPool.iterate(
+            func,
+            items,
+            return_ordered = return_ordered,
+            executor = self.executor,
+            max_in_flight = self.batch_concurrency or self.executor._max_workers * 2,
+            **kwargs
+        )
+
 
     """
     Implemented Methods
@@ -179,9 +258,10 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         Fetches a Value from the Object Store
         """
         f_key = self.get_key(key)
-        if not f_key.exists(): 
+        try:
+            value = self.reader.read(f_key)
+        except FileNotFoundError:
             return (key, default) if _with_key else default
-        value = self.read_file(f_key)
         if value is None: 
             return (key, default) if _with_key else default
         if _raw: return (key, value) if _with_key else value
@@ -212,6 +292,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         except Exception as e:
             logger.info(f'Error Encoding Value: |r|({type(value)}) {e}|e| {value}', colored = True, prefix = f_key.as_posix())
             return (key, None) if _with_key else None
+        self.reader.invalidate(f_key)
         try:
             self.write_file(f_key, encoded)
             return (key, f_key) if _with_key else f_key
@@ -233,19 +314,47 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         Gets a Value from the Object Store
         """
         # self._run_expiration_check(*keys)
+        keys = list(keys)
         self.exp_backend._check(*keys)
-        results = []
         result_map = {key: None for key in keys}
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self._fetch_one, key, _with_key = True) for key in keys]
-            results.extend(
-                future.result()
-                for future in concurrent.futures.as_completed(futures)
-            )
-        # Map them to the original index
-        for key, value in results:
+        for key, value in self._iterate(self._fetch_one, keys, _raw = True, _with_key = True):
             result_map[key] = value
-        return list(result_map.values())
+        return self._decode_batch(result_map)
+
+    def iter_values(self, keys: Iterable[str], return_ordered: Optional[bool] = False, **kwargs) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Yields the `(key, value)` pairs of the keys as they are fetched
+
+        - Only the values in flight are held in memory
+        """
+        keys = list(keys)
+        self.exp_backend._check(*keys)
+        yield from self._iterate(self._fetch_one, keys, return_ordered = return_ordered, _with_key = True, **kwargs)
+
+    def _decode_batch(self, data: Dict[str, Any], **kwargs) -> List[Any]:
+        """
+        Decodes the raw values of a batch
+        """
+        results = self.decode_values(data.values(), return_exceptions = True, **kwargs)
+        for n, (key, result) in enumerate(zip(data.keys(), results)):
+            if isinstance(result, Exception):
+                logger.info(f'Error Decoding Value: |r|{result}|e|', colored = True, prefix = self.get_key(key).as_posix())
+                if self.auto_delete_invalid: self.delete(key)
+                results[n] = None
+        return results
+
+    def _encode_batch(self, data: Dict[str, Any], _raw: Optional[bool] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Encodes the values of a batch, dropping the ones that fail to encode
+        """
+        if _raw: return data
+        encoded = {}
+        for (key, value), result in zip(data.items(), self.encode_values(data.values(), return_exceptions = True, **kwargs)):
+            if isinstance(result, Exception):
+                logger.info(f'Error Encoding Value: |r|({type(value)}) {result}|e| {value}', colored = True, prefix = self.get_key(key).as_posix())
+                continue
+            encoded[key] = result
+        return encoded
         
 
     def set(self, key: str, value: Any, ex: Optional[int] = None, _raw: Optional[bool] = None, **kwargs) -> Optional['File']:
@@ -262,17 +371,9 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         """
         Saves a Value to the Object Store
         """
-        results = []
         exp_keys = []
         result_map = {key: None for key in data}
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self._set_one, key, value, _with_key = True, _raw = _raw, **kwargs) for key, value in data.items()]
-            results.extend(
-                future.result()
-                for future in concurrent.futures.as_completed(futures)
-            )
-        # Map them to the original index
-        for key, value in results:
+        for key, value in self._iterate(self._set_one_iter, data.items(), _with_key = True, _raw = _raw, **kwargs):
             result_map[key] = value
             if value is not None: exp_keys.append(key)
         if exp_keys: self.exp_backend._set(*exp_keys, ex = ex)
@@ -296,20 +397,37 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         """
         Saves a Value to the Object Store
         """
+        result_map = {key: None for key in data}
+        encoded = self._encode_batch(data, _raw = _raw, **kwargs)
         try:
-            return self._set_batch(data, ex = ex, _raw = _raw, **kwargs)
+            result_map.update(self._set_batch(encoded, ex = ex, _raw = True, **kwargs))
         except RuntimeError as e:
             # logger.info(f'Unable to Set Batch: {e}', colored = True, prefix = self.base_key.as_posix())
             raise e
         except Exception as e:
             logger.info(f'[Fallback] Error Setting Batch: {e}', colored = True, prefix = self.base_key.as_posix())
-            return self._set_batch_fallback(data, ex = ex, _raw = _raw, **kwargs)
+            result_map.update(self._set_batch_fallback(encoded, ex = ex, _raw = True, **kwargs))
+        return result_map
+
+    def _set_one_iter(
+        self, 
+        item: Tuple[str, Any],
+        _raw: Optional[bool] = None, 
+        _with_key: Optional[bool] = False,
+        **kwargs
+    ) -> Union[Optional['File'], Tuple[str, 'File']]:
+        """
+        Saves a Value to the Object Store
+        """
+        key, value = item
+        return self._set_one(key, value, _raw = _raw, _with_key = _with_key, **kwargs)
 
     def _delete_one(self, key: str, **kwargs) -> None:
         """
         Deletes a Value from the Object Store
         """
         f_key = self.get_key(key)
+        self.reader.invalidate(f_key)
         f_key.rm(missing_ok=True)
 
     def delete(self, key: str, **kwargs) -> None:
@@ -323,13 +441,16 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
     def _clear(self, *keys: str, **kwargs):
         """
         Clears the Keys from the Object Store
+
+        - S3-compatible stores delete the keys in batches of 1000 per request
         """
-        for _ in ThreadPool.iterate(
-            self._delete_one,
-            keys,
-            return_ordered = False,
-            **kwargs
-        ):
+        if not keys: return
+        if is_s3_compatible(self.base_key.filesys):
+            f_keys = [self.get_key(key) for key in keys]
+            for f_key in f_keys: self.reader.invalidate(f_key)
+            self.base_key.filesys.rm([f_key.fspath_ for f_key in f_keys])
+            return
+        for _ in self._iterate(self._delete_one, keys, **kwargs):
             pass
 
         
@@ -353,9 +474,10 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         Fetches a Value from the Object Store
         """
         f_key = self.get_key(key)
-        if not await f_key.aexists(): 
+        try:
+            value = await self.reader.aread(f_key)
+        except FileNotFoundError:
             return (key, default) if _with_key else default
-        value = await self.read_file(f_key, is_async = True)
         if value is None: 
             return (key, default) if _with_key else default
         if _raw: return (key, value) if _with_key else value
@@ -386,6 +508,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         except Exception as e:
             logger.info(f'Error Encoding Value: |r|({type(value)}) {e}|e| {value}', colored = True, prefix = f_key.as_posix())
             return (key, None) if _with_key else None
+        self.reader.invalidate(f_key)
         try:
             await self.write_file(f_key, encoded, is_async = True)
             return (key, f_key) if _with_key else f_key
@@ -416,6 +539,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         Deletes a Value from the Object Store
         """
         f_key = self.get_key(key)
+        self.reader.invalidate(f_key)
         await f_key.arm(missing_ok=True)
 
     async def aget(self, key: str, default: Optional[Any] = None, _raw: Optional[bool] = None, **kwargs) -> Optional[Any]:
@@ -430,17 +554,44 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         Gets a Value from the DB
         """
         await self.exp_backend._acheck(*keys)
-        results = []
-        async for result in ThreadPool.aiterate(
+        keys = list(keys)
+        result_map = {key: None for key in keys}
+        async for key, value in ThreadPool.aiterate(
             self._afetch_one,
             keys,
-            return_ordered = True,
-            **kwargs
+            return_ordered = False,
+            concurrency_limit = self.batch_concurrency,
+            _raw = True,
+            _with_key = True,
         ):
-            results.append(result)
+            result_map[key] = value
+        results = await self.adecode_values(result_map.values(), return_exceptions = True, **kwargs)
+        for n, (key, result) in enumerate(zip(keys, results)):
+            if isinstance(result, Exception):
+                logger.info(f'Error Decoding Value: |r|{result}|e|', colored = True, prefix = self.get_key(key).as_posix())
+                if self.auto_delete_invalid: await self.adelete(key)
+                results[n] = None
         return results
 
     
+    async def aiter_values(self, keys: Iterable[str], return_ordered: Optional[bool] = False, **kwargs) -> AsyncGenerator[Tuple[str, Any], None]:
+        """
+        Yields the `(key, value)` pairs of the keys as they are fetched
+
+        - Only the values in flight are held in memory
+        """
+        keys = list(keys)
+        await self.exp_backend._acheck(*keys)
+        async for item in ThreadPool.aiterate(
+            self._afetch_one,
+            keys,
+            return_ordered = return_ordered,
+            concurrency_limit = self.batch_concurrency,
+            _with_key = True,
+            **kwargs
+        ):
+            yield item
+
     async def aset(self, key: str, value: Any, ex: Optional[int] = None, _raw: Optional[bool] = None, **kwargs) -> None:
         """
         Saves a Value to the DB
@@ -457,12 +608,21 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         """
         results = []
         exp_keys = []
+        _raw = kwargs.pop('_raw', None)
+        if not _raw:
+            encoded = await self.aencode_values(data.values(), return_exceptions = True, **kwargs)
+            for key, result in zip(list(data.keys()), encoded):
+                if isinstance(result, Exception):
+                    logger.info(f'Error Encoding Value: |r|({type(data[key])}) {result}|e| {data[key]}', colored = True, prefix = self.get_key(key).as_posix())
+            data = {key: result for key, result in zip(data.keys(), encoded) if not isinstance(result, Exception)}
         items = list(data.items())
         async for (key, value) in ThreadPool.aiterate(
             self._aset_one_iter,
             items,
             return_ordered = True,
+            concurrency_limit = self.batch_concurrency,
             _with_key = True,
+            _raw = True,
             **kwargs
         ):
             results.append(value)
@@ -482,11 +642,20 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
     async def _aclear(self, *keys: str, **kwargs):
         """
         Clears the Cache
+
+        - S3-compatible stores delete the keys in batches of 1000 per request
         """
+        if not keys: return
+        if is_s3_compatible(self.base_key.afilesys):
+            f_keys = [self.get_key(key) for key in keys]
+            for f_key in f_keys: self.reader.invalidate(f_key)
+            await self.base_key.afilesys._rm([f_key.fspath_ for f_key in f_keys])
+            return
         await ThreadPool.amap(
             self._adelete_one,
             keys,
             return_ordered = False,
+            concurrency_limit = self.batch_concurrency,
             **kwargs
         )
 
@@ -507,7 +676,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         Returns the Keys within the current object storage
         """
         self.exp_backend._check(validate = True)
-        return [f_key for f_key in self.base_key.glob(pattern = pattern) if f_key.is_file() and 'metadata.expires' not in f_key.name]
+        return [f_key for f_key in self.base_key.glob(pattern = pattern) if f_key.is_file() and '.metadata.' not in f_key.name]
 
     async def _afetch_objstr_f_keys(
         self,
@@ -519,7 +688,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         """
         await self.exp_backend._acheck(validate = True)
         f_keys: List['File'] = list(await self.base_key.aglob(pattern=pattern))
-        return [f_key for f_key in f_keys if f_key.is_file() and 'metadata.expires' not in f_key.name]
+        return [f_key for f_key in f_keys if f_key.is_file() and '.metadata.' not in f_key.name]
 
     def _parse_f_keys_to_str(
         self,
@@ -566,6 +735,19 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         values = self.get_values(keys)
         return {k: v for k, v in zip(keys, values)}
 
+    def iter_items(
+        self, 
+        batch_size: Optional[int] = None, 
+        exclude_base_key: Optional[bool] = False, 
+        **kwargs
+    ) -> Generator[Tuple[str, Any], None, None]:
+        """
+        Iterates over the Items as they are fetched without loading all the Data
+        """
+        f_keys = self._fetch_objstr_f_keys()
+        keys = self._parse_f_keys_to_str(f_keys, exclude_base_key = exclude_base_key, **kwargs)
+        yield from self.iter_values(keys)
+
     def get_all_keys(
         self, 
         exclude_base_key: Optional[bool] = False, 
@@ -594,6 +776,20 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         values = await self.aget_values(keys)
         return {k: v for k, v in zip(keys, values)}
 
+    async def aiter_items(
+        self, 
+        batch_size: Optional[int] = None, 
+        exclude_base_key: Optional[bool] = False, 
+        **kwargs
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
+        """
+        Iterates over the Items as they are fetched without loading all the Data
+        """
+        f_keys = await self._afetch_objstr_f_keys()
+        keys = self._parse_f_keys_to_str(f_keys, exclude_base_key = exclude_base_key, **kwargs)
+        async for item in self.aiter_values(keys):
+            yield item
+
     def length(self, **kwargs) -> int:
         """
         Returns the Length of the Cache
@@ -646,6 +842,112 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         """
         await self.exp_backend._aset(key, ex = ex, validate = True)
 
+    def get_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored alongside the data
+        """
+        f_key = self.base_key.joinpath(f'.{self.name}.metadata.{name}')
+        return f_key.read_bytes() if f_key.exists() else None
+
+    def set_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        self.base_key.joinpath(f'.{self.name}.metadata.{name}').write_bytes(value)
+
+    async def aget_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored alongside the data
+        """
+        f_key = self.base_key.joinpath(f'.{self.name}.metadata.{name}')
+        return await f_key.aread_bytes() if await f_key.aexists() else None
+
+    async def aset_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        await self.base_key.joinpath(f'.{self.name}.metadata.{name}').awrite_bytes(value)
+
+    """
+    Atomic Read-Modify-Write Methods
+    """
+
+    def _get_key_lock_(self, key: str) -> 'filelock.FileLock':
+        """
+        Returns the striped file lock of the key on a local filesystem
+        """
+        import zlib
+        import filelock
+        stripe = zlib.crc32(key.encode('utf-8')) % self.num_lock_stripes
+        return filelock.FileLock(self.base_key.joinpath(f'.{self.name}.metadata.lock.{stripe:03d}').as_posix())
+
+    def _decode_current_(self, f_key: 'FileLike', data: Optional[bytes]) -> Optional[Any]:
+        """
+        Decodes the current value of a read-modify-write operation
+
+        - A value that cannot be decoded is treated as missing and overwritten
+        """
+        if data is None: return None
+        try:
+            return self.decode_value(self.reader._decode(data))
+        except Exception as e:
+            logger.info(f'Error Decoding Value: |r|({type(data)}) {e}|e|', colored = True, prefix = f_key.as_posix())
+            return None
+
+    def _update_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        Replaces the value of the key with `func(value)` atomically across processes
+
+        - S3-compatible filesystems write back conditionally on the ETag that
+          was read and retry when another writer changes the object first
+        - Local files hold a striped file lock
+        - Other remote filesystems only serialize the threads of this process
+        """
+        if not self.base_key.is_fsspec:
+            with self._get_key_lock_(key):
+                return super()._update_in_place_(key, func, ex = ex, **kwargs)
+        fs = self.base_key.filesys
+        if not is_s3_compatible(fs): return super()._update_in_place_(key, func, ex = ex, **kwargs)
+        from fsspec.asyn import sync
+        f_key = self.get_key(key)
+        while True:
+            self.exp_backend._check(key)
+            try:
+                data, etag = sync(fs.loop, _aget_object, fs, f_key.fspath_)
+            except FileNotFoundError:
+                data, etag = None, None
+            value = self._decode_current_(f_key, data)
+            result = func(value)
+            if result is UNCHANGED: return value, value
+            encoded = self.encode_value(result, **kwargs)
+            self.reader.invalidate(f_key)
+            if sync(fs.loop, _aput_object, fs, f_key.fspath_, encoded, etag) is PRECONDITION_FAILED: continue
+            self.exp_backend._set(key, ex = ex)
+            return value, result
+
+    async def _aupdate_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        [Async] Replaces the value of the key with `func(value)` atomically across processes
+        """
+        if not self.base_key.is_fsspec or not is_s3_compatible(self.base_key.afilesys):
+            return await super()._aupdate_in_place_(key, func, ex = ex, **kwargs)
+        fs = self.base_key.afilesys
+        f_key = self.get_key(key)
+        while True:
+            await self.exp_backend._acheck(key)
+            try:
+                data, etag = await _aget_object(fs, f_key.fspath_)
+            except FileNotFoundError:
+                data, etag = None, None
+            value = self._decode_current_(f_key, data)
+            result = func(value)
+            if result is UNCHANGED: return value, value
+            encoded = self.encode_value(result, **kwargs)
+            self.reader.invalidate(f_key)
+            if await _aput_object(fs, f_key.fspath_, encoded, etag) is PRECONDITION_FAILED: continue
+            await self.exp_backend._aset(key, ex = ex)
+            return value, result
+
     def purge(self, **kwargs) -> None:
         """
         Purges the cache
@@ -653,6 +955,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         logger.warning('Purging the Cache is not recommended. Use `clear` instead.')
         f_keys = list(self.base_key.glob(pattern = '*', as_path = False))
         logger.info(f'Purging {len(f_keys)} Keys')
+        if self.etag_cache is not None: self.etag_cache.clear()
         self.base_key.rm(recursive = True, missing_ok = True)
         # self.clear(*f_keys, **kwargs)
 
@@ -663,6 +966,7 @@ class ObjStorageStatefulBackend(BaseStatefulBackend):
         logger.warning('Purging the Cache is not recommended. Use `clear` instead.')
         f_keys = list(await self.base_key.aglob(pattern = '*', as_path = False))
         logger.info(f'Purging {len(f_keys)} Keys')
+        if self.etag_cache is not None: self.etag_cache.clear()
         await self.base_key.arm(recursive = True, missing_ok = True)
         # await self.aclear(*f_keys, **kwargs)
 
@@ -2,13 +2,33 @@
 Redis Persistence Type leveraging `aiokeydb` library
 """
 
-from typing import Any, Dict, Optional, Union, Iterable, List, Type, TYPE_CHECKING
-from .base import BaseStatefulBackend, SchemaType, logger
+from typing import Any, Dict, Optional, Union, Iterable, Iterator, AsyncIterator, List, Set, Tuple, Type, Callable, TYPE_CHECKING
+from .base import BaseStatefulBackend, SchemaType, UNCHANGED, ThreadPool, logger
 
 if TYPE_CHECKING:
     from aiokeydb import KeyDBSession
     from lzo.types import BaseSettings
 
+# Sets the key (or the hash field) only if it still holds the value that was read
+# KEYS[1]: key or hash, ARGV: field ('' for plain keys), existed, expected, value, ex (0 for none)
+CAS_SCRIPT = """
+local current
+if ARGV[1] == '' then current = redis.call('GET', KEYS[1]) else current = redis.call('HGET', KEYS[1], ARGV[1]) end
+if ARGV[2] == '1' then
+    if current ~= ARGV[3] then return 0 end
+elseif current then
+    return 0
+end
+local ex = tonumber(ARGV[5])
+if ARGV[1] == '' then
+    if ex > 0 then redis.call('SET', KEYS[1], ARGV[4], 'EX', ex) else redis.call('SET', KEYS[1], ARGV[4]) end
+else
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[4])
+    if ex > 0 then redis.call('EXPIRE', KEYS[1], ex) end
+end
+return 1
+"""
+
 class RedisStatefulBackend(BaseStatefulBackend):
     """
     Implements a Redis Stateful Backend
@@ -20,6 +40,9 @@ class RedisStatefulBackend(BaseStatefulBackend):
     expiration: Optional[int] = None
     hset_disabled: Optional[bool] = False
     keyjoin: Optional[str] = ':'
+    scan_batch_size: Optional[int] = 1000
+    _cas_script: Optional[Any] = None
+    _acas_script: Optional[Any] = None
 
     def __init__(
         self,
@@ -27,6 +50,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         expiration: Optional[int] = None,
         hset_disabled: Optional[bool] = False,
         keyjoin: Optional[str] = None,
+        scan_batch_size: Optional[int] = None,
         serializer: Optional[str] = None,
         serializer_kwargs: Optional[Dict[str, Any]] = None,
         base_key: Optional[str] = None,
@@ -57,6 +81,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         if expiration is not None: self.expiration = expiration
         self.hset_enabled = (not hset_disabled and self.base_key is not None)
         if keyjoin is not None: self.keyjoin = keyjoin
+        if scan_batch_size is not None: self.scan_batch_size = scan_batch_size
         from lazyops.utils.lazy import get_keydb_session
         self.cache: 'KeyDBSession' = get_keydb_session(
             name = self.name, 
@@ -88,16 +113,15 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         Gets a Value from the DB
         """
+        keys = list(keys)
         if self.hset_enabled: values = self.cache.hmget(self.base_key, keys)
         else: values = self.cache.client.mget([self.get_key(key) for key in keys])
-        results = []
-        for key, value in zip(keys, values):
-            try:
-                results.append(self.decode_value(value, **kwargs))
-            except Exception as e:
-                logger.error(f'Error Getting Value for Key: {key} - {e}')
+        results = self.decode_values(values, return_exceptions = True, **kwargs)
+        for n, (key, result) in enumerate(zip(keys, results)):
+            if isinstance(result, Exception):
+                logger.error(f'Error Getting Value for Key: {key} - {result}')
                 self.delete(key)
-                results.append(None)
+                results[n] = None
         return results
 
 
@@ -117,7 +141,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         Saves a Value to the DB
         """
         ex = ex or self.expiration
-        data = {k: self.encode_value(v, **kwargs) for k, v in data.items()}
+        data = dict(zip(data.keys(), self.encode_values(data.values(), **kwargs)))
         if self.hset_enabled:
             self.cache.client.hset(self.base_key, mapping = data)
             if ex is not None: self.cache.expire(self.base_key, ex)
@@ -141,14 +165,13 @@ class RedisStatefulBackend(BaseStatefulBackend):
         Clears the Cache
         """
         if self.hset_enabled:
-            if keys: self.cache.hdel(self.base_key, *keys)
-            else: self.cache.delete(self.base_key)
+            if keys: self._remove_keys(keys)
+            else: self.cache.client.unlink(self.base_key)
         elif keys:
-            keys = [self.get_key(key) for key in keys]
-            self.cache.delete(*keys)
+            self._remove_keys([self.get_key(key) for key in keys])
         else:
-            keys = self.cache.client.keys(f'{self.base_key}{self.keyjoin}*')
-            if keys: self.cache.client.delete(*keys)
+            for page, _ in self._iter_pages():
+                self._remove_keys(page)
     
     async def aget(self, key: str, default: Optional[Any] = None, _raw: Optional[bool] = None, **kwargs) -> Optional[Any]:
         """
@@ -168,15 +191,15 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         Gets a Value from the DB
         """
+        keys = list(keys)
         if self.hset_enabled: values = await self.cache.async_hmget(self.base_key, keys)
         else: values = await self.cache.async_client.mget([self.get_key(key) for key in keys])
-        results = []
-        for key, value in zip(keys, values):
-            try: results.append(self.decode_value(value, **kwargs))
-            except Exception as e:
-                logger.error(f'Error Getting Value for Key: {key} - {e}')
+        results = await self.adecode_values(values, return_exceptions = True, **kwargs)
+        for n, (key, result) in enumerate(zip(keys, results)):
+            if isinstance(result, Exception):
+                logger.error(f'Error Getting Value for Key: {key} - {result}')
                 await self.adelete(key)
-                results.append(None)
+                results[n] = None
         return results
         
     async def aset(self, key: str, value: Any, ex: Optional[int] = None, _raw: Optional[bool] = None, **kwargs) -> None:
@@ -195,7 +218,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         Saves a Value to the DB
         """
         ex = ex or self.expiration
-        data = {k: self.encode_value(v, **kwargs) for k, v in data.items()}
+        data = dict(zip(data.keys(), await self.aencode_values(data.values(), **kwargs)))
         if self.hset_enabled:
             await self.cache.async_client.hset(self.base_key, mapping = data)
             if ex is not None: await self.cache.async_expire(self.base_key, ex)
@@ -218,24 +241,21 @@ class RedisStatefulBackend(BaseStatefulBackend):
         Clears the Cache
         """
         if self.hset_enabled:
-            if keys: await self.cache.async_hdel(self.base_key, *keys)
-            else: await self.cache.async_delete(self.base_key)
+            if keys: await self._aremove_keys(keys)
+            else: await self.cache.async_client.unlink(self.base_key)
         elif keys:
-            keys = [self.get_key(key) for key in keys]
-            await self.cache.async_delete(*keys)
-
+            await self._aremove_keys([self.get_key(key) for key in keys])
         else:
-            keys = await self.cache.async_client.keys(f'{self.base_key}{self.keyjoin}*')
-            if keys: await self.cache.async_client.delete(*keys)
+            async for page, _ in self._aiter_pages():
+                await self._aremove_keys(page)
 
     def iterate(self, **kwargs) -> Iterable[Any]:
         """
         Iterates over the Cache
         """
-        if self.hset_enabled: return iter(self.cache.hkeys(self.base_key))
         if not self.base_key:
             raise NotImplementedError('Cannot iterate over a Redis Cache without a base key')
-        return iter(self.cache.client.keys(f'{self.base_key}{self.keyjoin}*'))
+        return self.iter_keys(decode = False)
     
     def __len__(self):
         """
@@ -244,7 +264,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         if self.hset_enabled: return self.cache.hlen(self.base_key)
         if not self.base_key:
             raise NotImplementedError('Cannot get the length of a Redis Cache without a base key')
-        return len(self.cache.client.keys(f'{self.base_key}{self.keyjoin}*'))
+        return sum(len(page) for page, _ in self._iter_pages())
     
 
     def get_all_data(self, exclude_base_key: Optional[bool] = False, **kwargs) -> Dict[str, Any]:
@@ -253,30 +273,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         if not self.hset_enabled and not self.base_key:
             raise NotImplementedError('Cannot get all data from a Redis Cache without a base key')
-        if self.hset_enabled:
-            data = self.cache.hgetall(self.base_key)
-            results = {}
-            for key, value in data.items():
-                if isinstance(key, bytes): key = key.decode()
-                try: results[key] = self.decode_value(value, **kwargs)
-                except AttributeError:
-                    logger.warning(f'Unable to decode value for {key}')
-                    self.delete(key)
-            return results
-        
-        keys = self._fetch_set_keys(decode = True)
-        data_list = self.cache.client.mget(keys)
-        results: Dict[str, Any] = {}
-        for key, value in zip(keys, data_list):
-            if isinstance(key, bytes): key = key.decode()
-            try:
-                results[key] = self.decode_value(value, **kwargs)
-            except AttributeError:
-                logger.warning(f'Unable to decode value for {key}')
-                self.delete(key)
-        if exclude_base_key:
-            results = {k.replace(f'{self.base_key}.', ''): v for k, v in results.items()}
-        return results
+        return dict(self.iter_items(exclude_base_key = exclude_base_key, **kwargs))
     
     def get_all_keys(self, exclude_base_key: Optional[bool] = False, **kwargs) -> List[str]:
         """
@@ -284,11 +281,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         if not self.base_key:
             raise NotImplementedError('Cannot get all keys from a Redis Cache without a base key')
-        if self.hset_enabled: return self._fetch_hset_keys(decode = True)
-        keys = self._fetch_set_keys(decode = True)
-        if exclude_base_key:
-            keys = [key.replace(f'{self.base_key}.', '') for key in keys]
-        return keys
+        return list(self.iter_keys(exclude_base_key = exclude_base_key))
     
     def get_all_values(self, **kwargs) -> List[Any]:
         """
@@ -296,26 +289,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         if not self.base_key:
             raise NotImplementedError('Cannot get all values from a Redis Cache without a base key')
-        if self.hset_enabled:
-            data = self.cache.hgetall(self.base_key)
-            results = []
-            for key, value in data.items():
-                try:
-                    results.append(self.decode_value(value, **kwargs))
-                except Exception as e:
-                    logger.warning(f'Unable to decode value for {key}: {e}')
-                    self.delete(key)
-            return results
-        keys = self._fetch_set_keys(decode = False)
-        data_list = self.cache.client.mget(keys)
-        results = []
-        for key, value in zip(keys, data_list):
-            try:
-                results.append(self.decode_value(value, **kwargs))
-            except Exception as e:
-                logger.warning(f'Unable to decode value for {key}: {e}')
-                self.delete(key)
-        return results
+        return [value for _, value in self.iter_items(**kwargs)]
 
     async def aget_all_data(self, exclude_base_key: Optional[bool] = False, **kwargs) -> Dict[str, Any]:
         """
@@ -323,29 +297,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         if not self.base_key:
             raise NotImplementedError('Cannot get all data from a Redis Cache without a base key')
-        if self.hset_enabled:
-            data = await self.cache.async_hgetall(self.base_key)
-            results = {}
-            for key, value in data.items():
-                if isinstance(key, bytes): key = key.decode()
-                try:
-                    results[key] = self.decode_value(value, **kwargs)
-                except Exception as e:
-                    logger.warning(f'Unable to decode value for {key}: {e}')
-                    await self.adelete(key)
-            return results
-        keys = await self._afetch_set_keys(decode = True)
-        data_list = await self.cache.async_client.mget(keys)
-        results: Dict[str, Any] = {}
-        for key, value in zip(keys, data_list):
-            try:
-                results[key] = self.decode_value(value, **kwargs)
-            except Exception as e:
-                logger.warning(f'Unable to decode value for {key}: {e}')
-                await self.adelete(key)
-        if exclude_base_key:
-            results = {k.replace(f'{self.base_key}.', ''): v for k, v in results.items()}
-        return results
+        return {key: value async for key, value in self.aiter_items(exclude_base_key = exclude_base_key, **kwargs)}
     
     async def aget_all_keys(self, exclude_base_key: Optional[bool] = False, **kwargs) -> List[str]:
         """
@@ -353,12 +305,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         if not self.base_key:
             raise NotImplementedError('Cannot get all keys from a Redis Cache without a base key')
-        if self.hset_enabled: 
-            return await self._afetch_hset_keys(decode = True)
-        keys = await self._afetch_set_keys(decode = True)
-        if exclude_base_key:
-            keys = [key.replace(f'{self.base_key}.', '') for key in keys]
-        return keys
+        return [key async for key in self.aiter_keys(exclude_base_key = exclude_base_key)]
     
     async def aget_all_values(self, **kwargs) -> List[Any]:
         """
@@ -366,26 +313,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         if not self.base_key:
             raise NotImplementedError('Cannot get all values from a Redis Cache without a base key')
-        if self.hset_enabled:
-            data = await self.cache.async_hgetall(self.base_key)
-            results = []
-            for key, value in data.items():
-                try:
-                    results.append(self.decode_value(value, **kwargs))
-                except Exception as e:
-                    logger.warning(f'Unable to decode value for {key}: {e}')
-                    await self.adelete(key)
-            return results
-        keys = await self._afetch_set_keys(decode = False)
-        data_list = await self.cache.async_client.mget(keys)
-        results = []
-        for key, value in zip(keys, data_list):
-            try:
-                results.append(self.decode_value(value, **kwargs))
-            except Exception as e:
-                logger.warning(f'Unable to decode value for {key}: {e}')
-                await self.adelete(key)
-        return results
+        return [value async for _, value in self.aiter_items(**kwargs)]
 
     def contains(self, key, **kwargs):
         """
@@ -420,6 +348,294 @@ class RedisStatefulBackend(BaseStatefulBackend):
             # await self.cache.async_expire(self.base_key, ex)
         await self.cache.async_client.expire(self.get_key(key), ex)
 
+    def subscribe_invalidations(self, callback: Callable[..., None], configure: Optional[bool] = False, **kwargs) -> bool:
+        """
+        Subscribes to the Redis keyspace notifications of the keys
+        and calls `callback` with the changed keys
+
+        - Requires `notify-keyspace-events` to include `K` and the relevant
+          event classes (e.g. `Kg$hx`). Set `configure` to update the server config.
+        - In hset mode, any change to the hash invalidates everything
+        """
+        try:
+            if configure: self.cache.client.config_set('notify-keyspace-events', 'Kg$hxe')
+            db = self.cache.client.connection_pool.connection_kwargs.get('db', 0)
+            prefix = f'__keyspace@{db}__:'
+            if self.hset_enabled: pattern = f'{prefix}{self.base_key}'
+            elif self.base_key: pattern = f'{prefix}{self.base_key}{self.keyjoin}*'
+            else: pattern = f'{prefix}*'
+            key_prefix = f'{prefix}{self.base_key}{self.keyjoin}' if self.base_key else prefix
+
+            def _handler(message: Dict[str, Any]):
+                if self.hset_enabled: return callback()
+                channel = message['channel']
+                if isinstance(channel, bytes): channel = channel.decode()
+                callback(channel[len(key_prefix):])
+
+            pubsub = self.cache.client.pubsub(ignore_subscribe_messages = True)
+            pubsub.psubscribe(**{pattern: _handler})
+            self._invalidation_thread = pubsub.run_in_thread(sleep_time = 0.1, daemon = True)
+            return True
+        except Exception as e:
+            logger.warning(f'Unable to subscribe to keyspace notifications: {e}')
+            return False
+
+    def _get_metadata_key(self, name: str) -> str:
+        """
+        Returns the key of the metadata
+
+        - It is prefixed so that it never matches the keys of the namespace
+        """
+        return f'__metadata__{self.keyjoin}{name}{self.keyjoin}{self.base_key}' if self.base_key else f'__metadata__{self.keyjoin}{name}'
+
+    def get_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored alongside the data
+        """
+        return self.cache.client.get(self._get_metadata_key(name))
+
+    def set_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        self.cache.client.set(self._get_metadata_key(name), value)
+
+    async def aget_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored alongside the data
+        """
+        return await self.cache.async_client.get(self._get_metadata_key(name))
+
+    async def aset_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        await self.cache.async_client.set(self._get_metadata_key(name), value)
+
+    """
+    Atomic Read-Modify-Write Methods
+    """
+
+    def _get_cas_args_(self, key: str, raw: Optional[bytes], value: Any, ex: Optional[int] = None, **kwargs) -> Tuple[List[str], List[Any]]:
+        """
+        Returns the keys and arguments of the compare-and-set script
+        """
+        target, field = (self.base_key, key) if self.hset_enabled else (self.get_key(key), '')
+        args = [field, int(raw is not None), b'' if raw is None else raw, self.encode_value(value, **kwargs), int(ex or 0)]
+        return [target], args
+
+    def _decode_current_(self, key: str, raw: Optional[bytes]) -> Optional[Any]:
+        """
+        Decodes the current value of a read-modify-write operation
+
+        - A value that cannot be decoded is treated as missing and overwritten
+        """
+        if raw is None: return None
+        try:
+            return self.decode_value(raw)
+        except Exception as e:
+            logger.error(f'Error Decoding Value for Key: {key} - {e}')
+            return None
+
+    def _update_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        Replaces the value of the key with `func(value)` through a Lua
+        compare-and-set, retrying when another writer changes it first
+        """
+        ex = ex or self.expiration
+        if self._cas_script is None: self._cas_script = self.cache.client.register_script(CAS_SCRIPT)
+        while True:
+            if self.hset_enabled: raw = self.cache.client.hget(self.base_key, key)
+            else: raw = self.cache.client.get(self.get_key(key))
+            value = self._decode_current_(key, raw)
+            result = func(value)
+            if result is UNCHANGED: return value, value
+            keys, args = self._get_cas_args_(key, raw, result, ex = ex, **kwargs)
+            if self._cas_script(keys = keys, args = args): return value, result
+
+    async def _aupdate_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        [Async] Replaces the value of the key with `func(value)` through a Lua
+        compare-and-set, retrying when another writer changes it first
+        """
+        ex = ex or self.expiration
+        if self._acas_script is None: self._acas_script = self.cache.async_client.register_script(CAS_SCRIPT)
+        while True:
+            if self.hset_enabled: raw = await self.cache.async_client.hget(self.base_key, key)
+            else: raw = await self.cache.async_client.get(self.get_key(key))
+            value = self._decode_current_(key, raw)
+            result = func(value)
+            if result is UNCHANGED: return value, value
+            keys, args = self._get_cas_args_(key, raw, result, ex = ex, **kwargs)
+            if await self._acas_script(keys = keys, args = args): return value, result
+
+    """
+    Streaming Functions
+
+    These walk the keyspace with SCAN / HSCAN one page at a time so that
+    large namespaces neither block the server nor need to fit in memory.
+    """
+
+    def iter_keys(self, batch_size: Optional[int] = None, decode: Optional[bool] = True, exclude_base_key: Optional[bool] = False) -> Iterator[Union[str, bytes]]:
+        """
+        Iterates over the Keys
+        """
+        for page, _ in self._iter_pages(batch_size):
+            for key in page:
+                if decode and isinstance(key, bytes): key = key.decode()
+                yield self._strip_key(key) if exclude_base_key else key
+
+    def iter_items(self, batch_size: Optional[int] = None, exclude_base_key: Optional[bool] = False, **kwargs) -> Iterator[Tuple[str, Any]]:
+        """
+        Iterates over the Items
+        """
+        for page, values in self._iter_pages(batch_size, fetch_values = True):
+            items, invalid = self._decode_page(page, values, exclude_base_key = exclude_base_key, **kwargs)
+            if invalid: self._remove_keys(invalid)
+            yield from items
+
+    async def aiter_keys(self, batch_size: Optional[int] = None, decode: Optional[bool] = True, exclude_base_key: Optional[bool] = False) -> AsyncIterator[Union[str, bytes]]:
+        """
+        Iterates over the Keys
+        """
+        async for page, _ in self._aiter_pages(batch_size):
+            for key in page:
+                if decode and isinstance(key, bytes): key = key.decode()
+                yield self._strip_key(key) if exclude_base_key else key
+
+    async def aiter_items(self, batch_size: Optional[int] = None, exclude_base_key: Optional[bool] = False, **kwargs) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Iterates over the Items
+
+        - Each page is decoded in a worker thread while the event loop
+          stays free to fetch the next one
+        """
+        async for page, values in self._aiter_pages(batch_size, fetch_values = True):
+            items, invalid = await ThreadPool.run_async(self._decode_page, page, values, exclude_base_key = exclude_base_key, **kwargs)
+            if invalid: await self._aremove_keys(invalid)
+            for item in items:
+                yield item
+
+    def _strip_key(self, key: str) -> str:
+        """
+        Removes the base key prefix from a key
+        """
+        if self.hset_enabled or not self.base_key: return key
+        prefix = f'{self.base_key}{self.keyjoin}'
+        return key[len(prefix):] if key.startswith(prefix) else key
+
+    def _decode_page(self, keys: List[Union[str, bytes]], values: List[Optional[bytes]], exclude_base_key: Optional[bool] = False, **kwargs) -> Tuple[List[Tuple[str, Any]], List[Union[str, bytes]]]:
+        """
+        Decodes a page of values and returns the decoded items
+        along with the keys whose values could not be decoded
+        """
+        items, invalid = [], []
+        for key, value, result in zip(keys, values, self.decode_values(values, return_exceptions = True, **kwargs)):
+            # The key expired or was deleted between the SCAN and the MGET
+            if value is None: continue
+            if isinstance(key, bytes): key = key.decode()
+            if isinstance(result, Exception):
+                logger.warning(f'Unable to decode value for {key}: {result}')
+                invalid.append(key)
+                continue
+            items.append((self._strip_key(key) if exclude_base_key else key, result))
+        return items, invalid
+
+    @staticmethod
+    def _unseen_keys(keys: Iterable[bytes], seen: Set[bytes]) -> List[bytes]:
+        """
+        Returns the keys that have not been seen yet and marks them as seen
+        """
+        unseen = []
+        for key in keys:
+            if key in seen: continue
+            seen.add(key)
+            unseen.append(key)
+        return unseen
+
+    def _iter_pages(self, batch_size: Optional[int] = None, fetch_values: Optional[bool] = False) -> Iterator[Tuple[List[bytes], Optional[List[bytes]]]]:
+        """
+        Yields pages of `(keys, values)`
+
+        - In hset mode, the values come along with HSCAN
+        - Otherwise, the MGET of a page is pipelined with the SCAN of the next page
+        - Keys that the scan returns more than once are only yielded the first time
+        """
+        batch_size = batch_size or self.scan_batch_size
+        seen: Set[bytes] = set()
+        if self.hset_enabled:
+            cursor = 0
+            while True:
+                cursor, data = self.cache.client.hscan(self.base_key, cursor, count = batch_size)
+                keys = self._unseen_keys(data, seen)
+                if keys: yield keys, ([data[key] for key in keys] if fetch_values else None)
+                if not cursor: break
+            return
+
+        cursor, pending = 0, []
+        while cursor is not None or pending:
+            pipe = self.cache.client.pipeline(transaction = False)
+            if cursor is not None: pipe.scan(cursor, match = f'{self.base_key}{self.keyjoin}*', count = batch_size)
+            if pending and fetch_values: pipe.mget(pending)
+            results = pipe.execute() if len(pipe) else []
+            if pending: yield pending, (results[-1] if fetch_values else None)
+            if cursor is not None:
+                cursor, pending = results[0]
+                cursor, pending = int(cursor) or None, self._unseen_keys(pending, seen)
+            else: pending = []
+
+    async def _aiter_pages(self, batch_size: Optional[int] = None, fetch_values: Optional[bool] = False) -> AsyncIterator[Tuple[List[bytes], Optional[List[bytes]]]]:
+        """
+        Yields pages of `(keys, values)`
+
+        - In hset mode, the values come along with HSCAN
+        - Otherwise, the MGET of a page is pipelined with the SCAN of the next page
+        - Keys that the scan returns more than once are only yielded the first time
+        """
+        batch_size = batch_size or self.scan_batch_size
+        seen: Set[bytes] = set()
+        if self.hset_enabled:
+            cursor = 0
+            while True:
+                cursor, data = await self.cache.async_client.hscan(self.base_key, cursor, count = batch_size)
+                keys = self._unseen_keys(data, seen)
+                if keys: yield keys, ([data[key] for key in keys] if fetch_values else None)
+                if not cursor: break
+            return
+
+        cursor, pending = 0, []
+        while cursor is not None or pending:
+            pipe = self.cache.async_client.pipeline(transaction = False)
+            if cursor is not None: pipe.scan(cursor, match = f'{self.base_key}{self.keyjoin}*', count = batch_size)
+            if pending and fetch_values: pipe.mget(pending)
+            results = await pipe.execute() if len(pipe) else []
+            if pending: yield pending, (results[-1] if fetch_values else None)
+            if cursor is not None:
+                cursor, pending = results[0]
+                cursor, pending = int(cursor) or None, self._unseen_keys(pending, seen)
+            else: pending = []
+
+    def _remove_keys(self, keys: List[Union[str, bytes]]) -> None:
+        """
+        Removes the keys in chunks
+
+        - Uses UNLINK so that large values are freed in the background
+        """
+        for i in range(0, len(keys), self.scan_batch_size):
+            chunk = keys[i:i + self.scan_batch_size]
+            if self.hset_enabled: self.cache.client.hdel(self.base_key, *chunk)
+            else: self.cache.client.unlink(*chunk)
+
+    async def _aremove_keys(self, keys: List[Union[str, bytes]]) -> None:
+        """
+        Removes the keys in chunks
+
+        - Uses UNLINK so that large values are freed in the background
+        """
+        for i in range(0, len(keys), self.scan_batch_size):
+            chunk = keys[i:i + self.scan_batch_size]
+            if self.hset_enabled: await self.cache.async_client.hdel(self.base_key, *chunk)
+            else: await self.cache.async_client.unlink(*chunk)
 
     """
     Utility Functions
@@ -429,7 +645,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         This is a utility func for non-hset
         """
-        keys: List[Union[str, bytes]] = self.cache.client.keys(f'{self.base_key}{self.keyjoin}*')
+        keys: List[Union[str, bytes]] = list(self.iter_keys(decode = False))
         if decode: return [key.decode() if isinstance(key, bytes) else key for key in keys]
         return keys
     
@@ -445,7 +661,7 @@ class RedisStatefulBackend(BaseStatefulBackend):
         """
         This is a utility func for non-hset
         """
-        keys: List[Union[str, bytes]] = await self.cache.async_client.keys(f'{self.base_key}{self.keyjoin}*')
+        keys: List[Union[str, bytes]] = [key async for key in self.aiter_keys(decode = False)]
         if decode: return [key.decode() if isinstance(key, bytes) else key for key in keys]
         return keys
     
@@ -15,9 +15,13 @@ import typing as t
 import atexit
 from lzl.pool import ThreadPool
 from lzo.types import eproperty
-from pydantic.networks import MultiHostUrl, UrlConstraints, Annotated
+from pydantic.networks import UrlConstraints, Annotated
+try:
+    from pydantic_core import MultiHostUrl
+except ImportError:
+    from pydantic.networks import MultiHostUrl
 from ..base import logger
-from .utils import dict_diff, format_table_name
+from .utils import dict_diff, format_table_name, get_statement_size
 from typing import TypeVar, Generic, Any, Dict, Optional, Union, Tuple, Iterable, List, Type, Callable, Generator, AsyncGenerator, TYPE_CHECKING
 
 try:
@@ -76,19 +80,19 @@ OPTIMIZED = {
         'tag_index': 0,
     },
     'balanced': {
-        'sqlite_mmap_size': 1024 * 128,  # 128mb
+        'sqlite_mmap_size': 2**27,  # 128mb
     },
     'cache': {
         'eviction_policy': 'least-frequently-used',
-        'sqlite_mmap_size': 1024 * 512,  # 512mb
+        'sqlite_mmap_size': 2**29,  # 512mb
         'size_limit': 1024 * 1024 * 1024 * 5,  # 5gb
     },
     'write': {
-        'sqlite_mmap_size': 1024 * 256,  # 256mb
+        'sqlite_mmap_size': 2**28,  # 256mb
         'size_limit': 1024 * 1024 * 1024 * 2,  # 2gb
     },
     'read': {
-        'sqlite_mmap_size': 1024 * 128,  # 128mb
+        'sqlite_mmap_size': 2**27,  # 128mb
         'size_limit': 1024 * 1024 * 1024 * 1,  # 1gb
     },
 }
@@ -165,6 +169,8 @@ class BaseRqliteDB(abc.ABC):
     The Rqlite Database
     """
     timeout: Optional[float] = 60.0
+    max_batch_size: int = 2**20 # 1mb per request
+    max_batch_statements: int = 1000
     _db_kind: Optional[str] = 'RQLite'
 
     def __init__(
@@ -173,10 +179,15 @@ class BaseRqliteDB(abc.ABC):
         table: str, 
         optimization: Optional[Optimization] = None, 
         timeout: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_statements: Optional[int] = None,
         **kwargs
     ):
         """
         Initializes the Rqlite Database
+
+        Batched writes are sent as transactional multi-statement requests of at most
+        `max_batch_size` bytes and `max_batch_statements` statements each
         """
         self._extra: t.Dict[str, t.Any] = {}
         self.conn_uri = conn_uri
@@ -193,11 +204,15 @@ class BaseRqliteDB(abc.ABC):
         # self._txn_id = None
         self._is_configuring: bool = False
         if timeout is not None: self.timeout = timeout
+        if max_batch_size is not None: self.max_batch_size = max_batch_size
+        if max_batch_statements is not None: self.max_batch_statements = max_batch_statements
         self._policies = get_eviction_policies(table_name = self.table)
         self._child_kwargs = {
             'conn_uri': self.conn_uri,
             'optimization': self.optimization,
             'timeout': self.timeout,
+            'max_batch_size': self.max_batch_size,
+            'max_batch_statements': self.max_batch_statements,
             'kwargs': self._config,
         }
         self._spawned: t.Dict[str, t.List['Connection']] = {
@@ -478,7 +493,7 @@ class BaseRqliteDB(abc.ABC):
         """
         Registers the exit functions
         """
-        from lzo.utils.aexit import register
+        from lzo.utils.aioexit import register
         with contextlib.suppress(Exception):
             register(self._aon_exit_)
         atexit.register(self._on_exit_)
@@ -1435,7 +1450,18 @@ class BaseRqliteDB(abc.ABC):
             )
             for key, value in data.items()
         ]
-        return sql(
+        return sql(self._upsert_statement_, batch_data)
+
+    """
+    Batch Methods
+    """
+
+    @property
+    def _upsert_statement_(self) -> str:
+        """
+        Returns the upsert statement
+        """
+        return (
             f'INSERT INTO "{self.table}" ('
             ' key, store_time, expire_time, access_time,'
             ' access_count, tag, size, value'
@@ -1447,9 +1473,215 @@ class BaseRqliteDB(abc.ABC):
                 ' access_count = excluded.access_count,'
                 ' tag = excluded.tag,'
                 ' size = excluded.size,'
-                ' value = excluded.value',
-            batch_data,
+                ' value = excluded.value'
         )
+
+    def _chunk_statements_(
+        self, 
+        statements: t.Iterable[t.Tuple[str, t.Tuple[t.Any, ...]]],
+    ) -> t.Generator[t.List[t.Tuple[str, t.Tuple[t.Any, ...]]], None, None]:
+        """
+        Groups the statements into chunks that fit within a single request
+        """
+        chunk, size = [], 0
+        for operation, params in statements:
+            statement_size = get_statement_size(operation, params)
+            if chunk and (
+                size + statement_size > self.max_batch_size or \
+                len(chunk) >= self.max_batch_statements
+            ):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append((operation, params))
+            size += statement_size
+        if chunk: yield chunk
+
+    def _execute_batch_(self, statements: t.Iterable[t.Tuple[str, t.Tuple[t.Any, ...]]]) -> int:
+        """
+        Executes the statements as transactional multi-statement requests
+
+        Each chunk is applied atomically in a single consensus round.
+        Returns the number of affected rows
+        """
+        cursor = self.io.cursor()
+        count = 0
+        for chunk in self._chunk_statements_(statements):
+            if self._debug_enabled: logger.info(f'SQL Batch: {len(chunk)} statements', prefix = self.table)
+            result = cursor.executemany3(chunk, transaction = True, is_async = False)
+            count += sum(item.rows_affected or 0 for item in result.items)
+        return count
+    
+    async def _aexecute_batch_(self, statements: t.Iterable[t.Tuple[str, t.Tuple[t.Any, ...]]]) -> int:
+        """
+        [Async] Executes the statements as transactional multi-statement requests
+
+        Each chunk is applied atomically in a single consensus round.
+        Returns the number of affected rows
+        """
+        cursor = self.aio.cursor()
+        count = 0
+        for chunk in self._chunk_statements_(statements):
+            if self._debug_enabled: logger.info(f'[Async] SQL Batch: {len(chunk)} statements', prefix = self.table)
+            result = await cursor.executemany3(chunk, transaction = True, is_async = True)
+            count += sum(item.rows_affected or 0 for item in result.items)
+        return count
+    
+    def _set_batch_statements_(
+        self, 
+        data: t.Dict[str, t.Any], 
+        now: float, 
+        expire: t.Optional[float] = None, 
+        tag: t.Optional[str] = None,
+    ) -> t.List[t.Tuple[str, t.Tuple[t.Any, ...]]]:
+        """
+        Returns the upsert statements for the batch
+        """
+        statement = self._upsert_statement_
+        expire_time = None if expire is None else now + expire
+        return [
+            (
+                statement,
+                (
+                    key,
+                    now,  # store_time
+                    expire_time,
+                    now,  # access_time
+                    0,  # access_count
+                    tag,
+                    self.get_object_size(value),
+                    value,
+                ),
+            )
+            for key, value in data.items()
+        ]
+    
+    def _delete_batch_statements_(self, keys: t.Iterable[str]) -> t.List[t.Tuple[str, t.Tuple[t.Any, ...]]]:
+        """
+        Returns the delete statements for the keys
+
+        Keys are grouped to stay within the SQLite variable limit
+        """
+        keys = list(keys)
+        statements = []
+        for n in range(0, len(keys), 500):
+            chunk = tuple(keys[n:n + 500])
+            statements.append((
+                f'DELETE FROM "{self.table}" WHERE key IN ({", ".join("?" * len(chunk))})',
+                chunk,
+            ))
+        return statements
+    
+    def _cull_statements_(self, now: float, limit: t.Optional[int] = None, evict: bool = False) -> t.List[t.Tuple[str, t.Tuple[t.Any, ...]]]:
+        """
+        Returns the statements that evict expired keys and, if `evict`,
+        keys selected by the eviction policy
+        """
+        cull_limit = self.cull_limit if limit is None else limit
+        if cull_limit == 0: return []
+        statements = [(
+            f'DELETE FROM "{self.table}" WHERE rowid IN ('
+            f'SELECT rowid FROM "{self.table}"'
+            ' WHERE expire_time IS NOT NULL AND expire_time < ?'
+            ' ORDER BY expire_time LIMIT ?)',
+            (now, cull_limit),
+        )]
+        select_policy = self.eviction_policies['cull']
+        if evict and select_policy is not None:
+            statements.append((
+                f'DELETE FROM "{self.table}" WHERE rowid IN (%s)' % select_policy.format(fields = 'rowid', now = now),
+                (cull_limit,),
+            ))
+        return statements
+
+    def set_batch(
+        self, 
+        data: t.Dict[str, t.Any], 
+        expire: t.Optional[float] = None, 
+        tag: t.Optional[str] = None, 
+        cull: bool = True,
+    ) -> int:
+        """
+        Sets a batch of items in the cache
+
+        The upserts and culling are compiled into transactional multi-statement
+        requests chunked by payload size, rather than a request per key.
+
+        :param data: mapping of keys to values
+        :param expire: seconds until the items expire (default None, no expiry)
+        :param tag: text to associate with the items (default None)
+        :param bool cull: evict expired and policy-selected items (default True)
+        :return: number of rows affected
+        """
+        if not data: return 0
+        now = time.time()
+        statements = self._set_batch_statements_(data, now, expire = expire, tag = tag)
+        if cull: statements += self._cull_statements_(now, evict = self.volume() > self.size_limit)
+        return self._execute_batch_(statements)
+
+    async def aset_batch(
+        self, 
+        data: t.Dict[str, t.Any], 
+        expire: t.Optional[float] = None, 
+        tag: t.Optional[str] = None, 
+        cull: bool = True,
+    ) -> int:
+        """
+        [Async] Sets a batch of items in the cache
+
+        The upserts and culling are compiled into transactional multi-statement
+        requests chunked by payload size, rather than a request per key.
+
+        :param data: mapping of keys to values
+        :param expire: seconds until the items expire (default None, no expiry)
+        :param tag: text to associate with the items (default None)
+        :param bool cull: evict expired and policy-selected items (default True)
+        :return: number of rows affected
+        """
+        if not data: return 0
+        now = time.time()
+        statements = self._set_batch_statements_(data, now, expire = expire, tag = tag)
+        if cull: statements += self._cull_statements_(now, evict = await self.avolume() > self.size_limit)
+        return await self._aexecute_batch_(statements)
+    
+    def delete_batch(self, keys: t.Iterable[str]) -> int:
+        """
+        Deletes a batch of keys from the cache in transactional requests
+
+        :param keys: keys to delete
+        :return: number of rows deleted
+        """
+        return self._execute_batch_(self._delete_batch_statements_(keys))
+
+    async def adelete_batch(self, keys: t.Iterable[str]) -> int:
+        """
+        [Async] Deletes a batch of keys from the cache in transactional requests
+
+        :param keys: keys to delete
+        :return: number of rows deleted
+        """
+        return await self._aexecute_batch_(self._delete_batch_statements_(keys))
+    
+    def cull(self, limit: t.Optional[int] = None) -> int:
+        """
+        Evicts expired items and, when the volume exceeds the size limit,
+        items selected by the eviction policy in a single transactional request
+
+        :param limit: maximum number of items to evict per kind (default `cull_limit`)
+        :return: number of rows deleted
+        """
+        now = time.time()
+        return self._execute_batch_(self._cull_statements_(now, limit = limit, evict = self.volume() > self.size_limit))
+
+    async def acull(self, limit: t.Optional[int] = None) -> int:
+        """
+        [Async] Evicts expired items and, when the volume exceeds the size limit,
+        items selected by the eviction policy in a single transactional request
+
+        :param limit: maximum number of items to evict per kind (default `cull_limit`)
+        :return: number of rows deleted
+        """
+        now = time.time()
+        return await self._aexecute_batch_(self._cull_statements_(now, limit = limit, evict = await self.avolume() > self.size_limit))
     
     """
     Index / Tag Methods
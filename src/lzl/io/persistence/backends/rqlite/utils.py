@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pydantic.alias_generators import to_camel
-from typing import Any, Dict, Type, Union
+from typing import Any, Dict, Iterable, Type, Union
 
 
 def dict_diff(dict_a: Dict[str, Any], dict_b: Dict[str, Any], show_value_diff: bool = True):
@@ -33,3 +33,16 @@ def format_table_name(table_name: str) -> str:
     parts = table_name.split('.')
     parts = [to_camel(part) for part in parts]
     return '_'.join(parts)
+
+
+def get_statement_size(operation: str, parameters: Iterable[Any]) -> int:
+    """
+    Estimates the request payload size of a statement
+
+    >>> get_statement_size('DELETE FROM t WHERE key = ?', ('key',))
+    38
+    """
+    size = len(operation) + 4
+    for param in parameters:
+        size += len(param) + 4 if isinstance(param, (str, bytes, bytearray)) else 24
+    return size
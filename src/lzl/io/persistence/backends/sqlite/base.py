@@ -9,7 +9,9 @@ Borrowed parts from `python-diskache <https://github.com/grantjenks/python-diskc
 import abc
 import copy
 import time
+import pathlib
 import asyncio
+import functools
 import contextlib
 import threading
 import contextlib
@@ -28,6 +30,8 @@ except ImportError:
 from pydantic.alias_generators import to_camel
 from ..base import logger
 from .utils import dict_diff
+from .connections import ReadConnections, WriteQueue
+from .files import FileStore, FILE_PREFIX
 from typing import TypeVar, Generic, Any, Dict, Optional, Union, Tuple, Iterable, List, Type, Callable, Generator, AsyncGenerator, TYPE_CHECKING
 
 try:
@@ -97,23 +101,69 @@ OPTIMIZED = {
         'tag_index': 0,
     },
     'balanced': {
-        'sqlite_mmap_size': 1024 * 128,  # 128mb
+        'sqlite_mmap_size': 2**27,  # 128mb
     },
     'cache': {
         'eviction_policy': 'least-frequently-used',
-        'sqlite_mmap_size': 1024 * 512,  # 512mb
+        'sqlite_mmap_size': 2**29,  # 512mb
         'size_limit': 1024 * 1024 * 1024 * 5,  # 5gb
     },
     'write': {
-        'sqlite_mmap_size': 1024 * 256,  # 256mb
+        'sqlite_mmap_size': 2**28,  # 256mb
         'size_limit': 1024 * 1024 * 1024 * 2,  # 2gb
     },
     'read': {
-        'sqlite_mmap_size': 1024 * 128,  # 128mb
+        'sqlite_mmap_size': 2**27,  # 128mb
         'size_limit': 1024 * 1024 * 1024 * 1,  # 1gb
     },
 }
 
+# Tuning profiles for the SQLite pragmas, applied on top of the optimization.
+# Negative cache sizes are in KiB rather than pages.
+PRAGMA_PROFILES = {
+    'read-heavy': {
+        'sqlite_cache_size': -2**18,  # 256mb
+        'sqlite_journal_size_limit': 2**26,  # 64mb
+        'sqlite_mmap_size': 2**30,  # 1gb
+        'sqlite_page_size': 4096,
+        'sqlite_synchronous': 1,  # NORMAL
+        'sqlite_temp_store': 2,  # MEMORY
+    },
+    'write-heavy': {
+        'sqlite_cache_size': -2**17,  # 128mb
+        'sqlite_journal_size_limit': 2**28,  # 256mb
+        'sqlite_mmap_size': 2**28,  # 256mb
+        'sqlite_page_size': 8192,
+        'sqlite_synchronous': 1,  # NORMAL
+        'sqlite_temp_store': 2,  # MEMORY
+    },
+    'durable': {
+        'sqlite_cache_size': -2**16,  # 64mb
+        'sqlite_journal_size_limit': 2**26,  # 64mb
+        'sqlite_mmap_size': 0,  # I/O errors are reported instead of raising SIGBUS
+        'sqlite_page_size': 4096,
+        'sqlite_synchronous': 2,  # FULL
+        'sqlite_temp_store': 1,  # FILE
+    },
+    'ephemeral': {
+        'sqlite_cache_size': -2**17,  # 128mb
+        'sqlite_journal_size_limit': 2**24,  # 16mb
+        'sqlite_mmap_size': 2**28,  # 256mb
+        'sqlite_page_size': 4096,
+        'sqlite_synchronous': 0,  # OFF
+        'sqlite_temp_store': 2,  # MEMORY
+    },
+}
+
+# Pragmas that are not stored in the database and have to be set on every connection
+CONNECTION_PRAGMAS = (
+    'sqlite_cache_size',
+    'sqlite_journal_size_limit',
+    'sqlite_mmap_size',
+    'sqlite_synchronous',
+    'sqlite_temp_store',
+)
+
 METADATA = {
     'count': 0,
     'size': 0,
@@ -129,8 +179,16 @@ Optimization = t.Literal[
     'read',
 ]
 
+PragmaProfile = t.Literal[
+    'read-heavy',
+    'write-heavy',
+    'durable',
+    'ephemeral',
+]
+
 def get_optimized_settings(
     optimization: Optional[str] = None, 
+    pragma_profile: Optional[PragmaProfile] = None,
     **kwargs
 ) -> Dict[str, Any]:
     """
@@ -139,6 +197,9 @@ def get_optimized_settings(
     base = copy.deepcopy(DEFAULT_SETTINGS)
     if optimization:
         base.update(OPTIMIZED.get(optimization, {}))
+    if pragma_profile:
+        if pragma_profile not in PRAGMA_PROFILES: raise ValueError(f'Invalid Pragma Profile: {pragma_profile}. Must be one of {list(PRAGMA_PROFILES)}')
+        base.update(PRAGMA_PROFILES[pragma_profile])
     if kwargs: base.update(kwargs)
     return base
 
@@ -206,17 +267,53 @@ class BaseSqliteDB(abc.ABC):
         optimization: Optional[Optimization] = None, 
         timeout: Optional[float] = None,
         is_remote: Optional[bool] = False,
+        pragma_profile: Optional[PragmaProfile] = None,
+        read_connections: Optional[bool] = True,
+        group_commit: Optional[bool] = True,
+        group_commit_size: Optional[int] = 256,
+        group_commit_delay: Optional[float] = 0.0,
+        large_value_threshold: Optional[int] = 2**20,
         **kwargs
     ):
         """
         Initializes the Sqlite Database
+
+        Args:
+            pragma_profile (PragmaProfile, optional): The tuning profile of the SQLite pragmas,
+                one of `read-heavy`, `write-heavy`, `durable` or `ephemeral`. Defaults to None.
+            read_connections (bool, optional): Use a read-only connection per thread for reads
+                of local databases. Defaults to True.
+            group_commit (bool, optional): Send the primary writes of local databases through
+                a single writer thread that commits them in batches. Defaults to True.
+            group_commit_size (int, optional): The maximum number of writes per batch. Defaults to 256.
+            group_commit_delay (float, optional): How long the writer waits for more writes
+                before committing a batch. Defaults to 0.0.
+            large_value_threshold (int, optional): The size in bytes from which values of local
+                databases are stored in files next to the database. Defaults to 1mb.
         """
         self._extra: t.Dict[str, t.Any] = {}
         self.conn_uri = conn_uri
         self.table = format_table_name(table)
         self.optimization = optimization
+        if pragma_profile is not None and pragma_profile not in PRAGMA_PROFILES:
+            raise ValueError(f'Invalid Pragma Profile: {pragma_profile}. Must be one of {list(PRAGMA_PROFILES)}')
+        self.pragma_profile = pragma_profile
         self._io: t.Optional['Connection'] = None
         self._aio: t.Optional['AsyncConnection'] = None
+        self.read_connections = read_connections
+        self.group_commit = group_commit
+        self.group_commit_size = group_commit_size
+        self.group_commit_delay = group_commit_delay
+        self.large_value_threshold = large_value_threshold
+        self._file_store: t.Optional[FileStore] = None
+        self._readers: t.Optional[ReadConnections] = None
+        self._writer: t.Optional[WriteQueue] = None
+        self._write_lock = threading.RLock()
+        # The connection being configured, only visible to the initializing thread / task
+        self._init_conn: t.Optional['Connection'] = None
+        self._init_tid: t.Optional[int] = None
+        self._ainit_conn: t.Optional['AsyncConnection'] = None
+        self._ainit_lock: t.Optional[asyncio.Lock] = None
         # self.configured: bool = kwargs.pop('configured', False)
         self.is_child_db = kwargs.pop('is_child_db', False)
         self._debug_enabled = kwargs.pop('debug_enabled', False)
@@ -230,8 +327,14 @@ class BaseSqliteDB(abc.ABC):
         self._child_kwargs = {
             'conn_uri': self.conn_uri,
             'optimization': self.optimization,
+            'pragma_profile': self.pragma_profile,
             'is_remote': self.is_remote,
             'timeout': self.timeout,
+            'read_connections': self.read_connections,
+            'group_commit': self.group_commit,
+            'group_commit_size': self.group_commit_size,
+            'group_commit_delay': self.group_commit_delay,
+            'large_value_threshold': self.large_value_threshold,
             'kwargs': self._config,
         }
         self._spawned: t.Dict[str, t.List[t.Union['Connection', 'AsyncConnection']]] = {
@@ -258,6 +361,7 @@ class BaseSqliteDB(abc.ABC):
             check_same_thread = False,
             isolation_level = None,
         )
+        self._apply_pragmas_(new)
         self._spawned['io'].append(new)
         return new
 
@@ -272,6 +376,8 @@ class BaseSqliteDB(abc.ABC):
             check_same_thread = False,
             isolation_level = None,
         )
+        for pragma in self._connection_pragmas:
+            await (await new.execute(pragma)).fetchall()
         self._spawned['aio'].append(new)
         return new
     
@@ -279,30 +385,54 @@ class BaseSqliteDB(abc.ABC):
     def _init_io_(self) -> None:
         """
         Initializes the IO Connection
+
+        - Runs under the write lock so that only one thread configures the database
+        - The connection is only published once the database has been configured
         """
         if self._io is not None: return
-        self._io = self._get_io_()
-        if self._debug_enabled: logger.info(f'[Sync] Opened {self._db_kind} Database Connection: {self.conn_uri}', prefix = self.table, colored = True)
-        self._validate_table_(self._io)
-        if not self.is_configured:
-            self._is_configuring = True
-            self.run_configure()
-            self._io = self._get_io_()
-            self._is_configuring = False
+        with self._write_lock:
+            if self._io is not None: return
+            conn = self._get_io_()
+            if self._debug_enabled: logger.info(f'[Sync] Opened {self._db_kind} Database Connection: {self.conn_uri}', prefix = self.table, colored = True)
+            self._init_conn, self._init_tid = conn, threading.get_ident()
+            try:
+                self._validate_table_(conn)
+                if not self.is_configured:
+                    self._is_configuring = True
+                    self.run_configure()
+                    conn = self._get_io_()
+            finally:
+                self._is_configuring = False
+                if self._init_conn is not conn:
+                    self._init_conn.close()
+                    self._spawned['io'].remove(self._init_conn)
+                self._init_conn, self._init_tid = None, None
+            self._io = conn
 
     async def _init_aio_(self) -> None:
         """
         [Async] Initializes the IO Connection
         """
         if self._aio is not None: return
-        self._aio = await self._get_aio_()
-        if self._debug_enabled: logger.info(f'[Async] Opened {self._db_kind} Database Connection: {self.conn_uri}', prefix = self.table, colored = True)
-        await self._avalidate_table_()
-        if not self.is_configured:
-            self._is_configuring = True
-            await self.arun_configure()
-            self._aio = await self._get_aio_()
-            self._is_configuring = False
+        if self._ainit_lock is None: self._ainit_lock = asyncio.Lock()
+        async with self._ainit_lock:
+            if self._aio is not None: return
+            conn = await self._get_aio_()
+            if self._debug_enabled: logger.info(f'[Async] Opened {self._db_kind} Database Connection: {self.conn_uri}', prefix = self.table, colored = True)
+            self._ainit_conn = conn
+            try:
+                await self._avalidate_table_()
+                if not self.is_configured:
+                    self._is_configuring = True
+                    await self.arun_configure()
+                    conn = await self._get_aio_()
+            finally:
+                self._is_configuring = False
+                if self._ainit_conn is not conn:
+                    await self._ainit_conn.close()
+                    self._spawned['aio'].remove(self._ainit_conn)
+                self._ainit_conn = None
+            self._aio = conn
             
 
     @property
@@ -322,6 +452,206 @@ class BaseSqliteDB(abc.ABC):
         if self._aio is None: raise ValueError('Async Connection must be configured first')
         return self._aio
 
+    @property
+    def is_local_file(self) -> bool:
+        """
+        Returns True if the database is a local file that
+        can be opened by multiple connections
+        """
+        return not self.is_remote and self.conn_uri not in {'', ':memory:'} and not self.conn_uri.startswith('file:')
+
+    def _get_read_io_(self) -> 'Connection':
+        """
+        Returns a new Read-Only Connection
+        """
+        uri = f'{pathlib.Path(self.conn_uri).absolute().as_uri()}?mode=ro'
+        new = sqlite3.connect(
+            uri,
+            uri = True,
+            timeout = self.timeout,
+            check_same_thread = False,
+            isolation_level = None,
+        )
+        self._apply_pragmas_(new)
+        return new
+
+    @eproperty
+    def _connection_pragmas(self) -> t.List[str]:
+        """
+        Returns the pragma statements that are set on every new connection
+        """
+        settings = get_optimized_settings(optimization = self.optimization, pragma_profile = self.pragma_profile, **self._config)
+        return [
+            f'PRAGMA {key[7:]} = {settings[key]}'
+            for key in CONNECTION_PRAGMAS if settings.get(key) is not None
+        ]
+
+    def _apply_pragmas_(self, conn: 'Connection') -> None:
+        """
+        Sets the connection-level pragmas, which are not persisted in the database
+
+        - Retries while another process holds the lock to configure the database,
+          since the connection is opened without a busy timeout until then
+        """
+        for pragma in self._connection_pragmas:
+            start = time.time()
+            while True:
+                try:
+                    conn.execute(pragma).fetchall()
+                    break
+                except sqlite3.OperationalError as exc:
+                    if str(exc) != 'database is locked': raise
+                    if time.time() - start > 60: raise
+                    time.sleep(0.001)
+
+    @property
+    def readers(self) -> t.Optional[ReadConnections]:
+        """
+        Returns the Per-Thread Read Connections
+        """
+        if self._readers is None and self.read_connections and self.is_local_file:
+            self._readers = ReadConnections(self._get_read_io_)
+        return self._readers
+
+    @property
+    def writer(self) -> t.Optional[WriteQueue]:
+        """
+        Returns the Group-Committing Write Queue
+        """
+        if self._writer is None and self.group_commit and self.is_local_file:
+            self._writer = WriteQueue(self, max_batch = self.group_commit_size, max_delay = self.group_commit_delay)
+        return self._writer
+
+    def _use_writer_(self) -> bool:
+        """
+        Returns True if writes should be sent through the write queue
+
+        - Writes made inside a transaction of the current thread,
+          including the writer thread itself, run in that transaction
+        """
+        return self.writer is not None and self._txn_id != threading.get_ident()
+
+    def _submit_write(self, op: t.Callable[[t.Callable[..., 'Cursor']], t.Any], retry: bool = False) -> t.Any:
+        """
+        Runs the write operation through the write queue,
+        or in a transaction if the write queue is not used
+        """
+        if not self._use_writer_():
+            with self._transact(retry) as sql:
+                return op(sql)
+        return self.writer.submit(op).result()
+
+    async def _asubmit_write(self, op: t.Callable[[t.Callable[..., 'Cursor']], t.Any]) -> t.Any:
+        """
+        [Async] Runs the write operation through the write queue
+        """
+        return await asyncio.wrap_future(self.writer.submit(op))
+
+    @property
+    def file_store(self) -> t.Optional[FileStore]:
+        """
+        Returns the Large Value File Store of local databases
+
+        - Values of other processes may be stored in files, so the store is
+          available even if `large_value_threshold` is disabled
+        """
+        if self._file_store is None and self.is_local_file:
+            path = pathlib.Path(self.conn_uri).absolute()
+            threshold = self.large_value_threshold if sqlite3.sqlite_version_info >= (3, 31) else None
+            self._file_store = FileStore(path.parent.joinpath(f'{path.name}-files', self.table), threshold = threshold)
+        return self._file_store
+
+    def _store_value_(self, value: t.Any) -> t.Any:
+        """
+        Returns the value to store in the row, which is a file
+        reference for values above the large value threshold
+        """
+        if self.file_store is None or not self.file_store.should_store(value): return value
+        return self.file_store.store(value)
+
+    def _load_value_(self, value: t.Any, default: t.Any = ENOVAL) -> t.Any:
+        """
+        Returns the value of a row, reading it from its file if it is a file reference
+
+        - Returns `default` if the file was removed by a concurrent delete
+        """
+        if value.__class__ is not bytes or value[:len(FILE_PREFIX)] != FILE_PREFIX or self.file_store is None: return value
+        return self.file_store.load(value, default = default)
+
+    def create_file_storage(self):
+        """
+        Creates the schema used to track the value files of the table
+
+        - `filename` is a virtual column generated from the file references
+        - The triggers queue the files of deleted and replaced rows
+        """
+        sql = self._sql_retry
+        columns = {row[1] for row in sql(f'PRAGMA table_xinfo("{self.table}")').fetchall()}
+        if 'filename' not in columns:
+            try:
+                sql(
+                    f'ALTER TABLE "{self.table}" ADD COLUMN filename TEXT'
+                    f' GENERATED ALWAYS AS (CASE WHEN substr(value, 1, {len(FILE_PREFIX)}) = X\'{FILE_PREFIX.hex()}\''
+                    f' THEN CAST(substr(value, {len(FILE_PREFIX) + 1}) AS TEXT) END) VIRTUAL'
+                )
+            except sqlite3.OperationalError as e:
+                # Another process added the column first
+                if 'duplicate column' not in str(e): raise
+        sql(
+            f'CREATE INDEX IF NOT EXISTS "{self.table}_filename" ON'
+            f' "{self.table}"(filename) WHERE filename IS NOT NULL'
+        )
+        sql(
+            f'CREATE TABLE IF NOT EXISTS "{self.table}_files" ('
+            ' filename TEXT PRIMARY KEY)'
+        )
+        sql(
+            f'CREATE TRIGGER IF NOT EXISTS "{self.table}_files_delete"'
+            f' AFTER DELETE ON "{self.table}" FOR EACH ROW'
+            ' WHEN OLD.filename IS NOT NULL BEGIN'
+            f' INSERT OR IGNORE INTO "{self.table}_files" VALUES (OLD.filename); END'
+        )
+        sql(
+            f'CREATE TRIGGER IF NOT EXISTS "{self.table}_files_update"'
+            f' AFTER UPDATE OF value ON "{self.table}" FOR EACH ROW'
+            ' WHEN OLD.filename IS NOT NULL AND OLD.filename IS NOT NEW.filename BEGIN'
+            f' INSERT OR IGNORE INTO "{self.table}_files" VALUES (OLD.filename); END'
+        )
+        self._extra['has_file_storage'] = True
+
+    def _configure_file_storage_(self):
+        """
+        Creates the file storage schema if large values are stored in files,
+        or detects whether another process created it
+        """
+        if self.file_store is None: return
+        if self.file_store.threshold:
+            self.create_file_storage()
+            return
+        ((exists,),) = self._sql_retry(
+            'SELECT EXISTS(SELECT 1 FROM sqlite_master WHERE type = "table" AND name = ?)',
+            (f'{self.table}_files',),
+        ).fetchall()
+        self._extra['has_file_storage'] = bool(exists)
+
+    def _remove_orphaned_files_(self, sql: t.Callable[..., 'Cursor']):
+        """
+        Removes the value files that are no longer referenced
+
+        - Runs inside the write transaction, right before it is committed
+        """
+        if not self._extra.get('has_file_storage'): return
+        self.file_store.remove_orphans(self.table, sql)
+
+    async def _aremove_orphaned_files_(self, sql: t.Callable[..., t.Awaitable['AsyncCursor']]):
+        """
+        [Async] Removes the value files that are no longer referenced
+
+        - Runs inside the write transaction, right before it is committed
+        """
+        if not self._extra.get('has_file_storage'): return
+        await self.file_store.aremove_orphans(self.table, sql)
+
     """
     IO Wrappers 
     """
@@ -333,7 +663,7 @@ class BaseSqliteDB(abc.ABC):
         """
         def _execute(statement, *args, **kwargs):
             logger.info(f'SQL: {statement}: {args} {kwargs}')
-            return self._io.execute(statement, *args, **kwargs)
+            return self._conn.execute(statement, *args, **kwargs)
         return _execute
 
     @property
@@ -343,7 +673,7 @@ class BaseSqliteDB(abc.ABC):
         """
         async def _aexecute(statement, *args, **kwargs):
             logger.info(f'SQL: {statement}: {args} {kwargs}')
-            return await self._aio.execute(statement, *args, **kwargs)
+            return await self._aconn.execute(statement, *args, **kwargs)
         return _aexecute
     
 
@@ -354,7 +684,7 @@ class BaseSqliteDB(abc.ABC):
         """
         def _executemany(statement, *args, **kwargs):
             logger.info(f'SQL: {statement}: {args} {kwargs}')
-            return self._io.executemany(statement, *args, **kwargs)
+            return self._conn.executemany(statement, *args, **kwargs)
         return _executemany
 
     @property
@@ -364,25 +694,63 @@ class BaseSqliteDB(abc.ABC):
         """
         async def _aexecutemany(statement, *args, **kwargs):
             logger.info(f'[Async] SQL: {statement}: {args} {kwargs}')
-            return await self._aio.executemany(statement, *args, **kwargs)
+            return await self._aconn.executemany(statement, *args, **kwargs)
         return _aexecutemany
 
+    @property
+    def _conn(self) -> 'Connection':
+        """
+        Returns the Writer Connection
+
+        - Returns the connection being configured to the initializing thread
+        - Other threads wait for the initialization to complete
+        """
+        if self._io is not None: return self._io
+        if self._init_tid == threading.get_ident(): return self._init_conn
+        self._init_io_()
+        return self._io
+
+    @property
+    def _aconn(self) -> 'AsyncConnection':
+        """
+        [Async] Returns the Writer Connection
+        """
+        if self._aio is not None: return self._aio
+        if self._ainit_conn is not None: return self._ainit_conn
+        raise RuntimeError('Async Connection must be configured first')
+
     @property
     def _sql(self) -> t.Callable[..., 'Cursor']:
         """
         Returns the SQL
         """
-        if not self._io and not self._is_configuring: self._init_io_()
-        return self._sql_debug if self._debug_enabled else self._io.execute
+        conn = self._conn
+        return self._sql_debug if self._debug_enabled else conn.execute
+
+    @property
+    def _rsql(self) -> t.Callable[..., 'Cursor']:
+        """
+        Returns the SQL of the Read Connection of the current thread
+
+        - Falls back to the writer connection inside a transaction
+          so that reads see the uncommitted writes
+        """
+        sql = self._sql
+        if self._is_configuring or self._txn_id == threading.get_ident() or self.readers is None: return sql
+        conn = self.readers.get()
+        if not self._debug_enabled: return conn.execute
+        def _execute(statement, *args, **kwargs):
+            logger.info(f'[Read] SQL: {statement}: {args} {kwargs}')
+            return conn.execute(statement, *args, **kwargs)
+        return _execute
 
     @property
     def _asql(self) -> t.Callable[..., t.Awaitable['AsyncCursor']]:
         """
         [Async] Returns the SQL
         """
-        if self._aio or self._is_configuring:
-            return self._asql_debug if self._debug_enabled else self._aio.execute
-        else: raise RuntimeError('Async Connection must be configured first')
+        conn = self._aconn
+        return self._asql_debug if self._debug_enabled else conn.execute
 
     
     @property
@@ -390,14 +758,16 @@ class BaseSqliteDB(abc.ABC):
         """
         Returns the SQL
         """
-        return self._sqlmany_debug if self._debug_enabled else self._io.executemany
+        conn = self._conn
+        return self._sqlmany_debug if self._debug_enabled else conn.executemany
 
     @property
     def _asqlmany(self) -> t.Callable[..., t.Awaitable['AsyncCursor']]:
         """
         [Async] Returns the SQL
         """
-        return self._asqlmany_debug if self._debug_enabled else self._aio.executemany
+        conn = self._aconn
+        return self._asqlmany_debug if self._debug_enabled else conn.executemany
     
     @property
     def _sql_retry(self) -> t.Callable[..., 'Cursor']:
@@ -489,6 +859,8 @@ class BaseSqliteDB(abc.ABC):
         """
         Closes the IO Connection
         """
+        if self._writer is not None: self._writer.close()
+        if self._readers is not None: self._readers.close()
         if self._io is not None:
             self._io.close()
             self._io = None
@@ -511,7 +883,7 @@ class BaseSqliteDB(abc.ABC):
         """
         Registers the exit functions
         """
-        from lzo.utils.aexit import register
+        from lzo.utils.aioexit import register
         with contextlib.suppress(Exception):
             register(self._aon_exit_)
         atexit.register(self._on_exit_)
@@ -597,11 +969,12 @@ class BaseSqliteDB(abc.ABC):
             update_statement = f'UPDATE "{self.table}_settings" SET value = ? WHERE key = ?'
             # This means that the DB should have already been configured
             current_settings = dict(conn.execute(f'SELECT key, value FROM "{self.table}_settings"').fetchall())
-            settings = get_optimized_settings(optimization = self.optimization, **self._config)
+            settings = get_optimized_settings(optimization = self.optimization, pragma_profile = self.pragma_profile, **self._config)
             diff_settings = dict_diff(current_settings, settings)['value_diffs']
             if diff_settings:
                 for key, value in diff_settings.items():
-                    if key.startswith('sqlite_'): 
+                    # The connection pragmas are set on every connection, so the applied values are stored
+                    if key.startswith('sqlite_') and key not in CONNECTION_PRAGMAS:
                         if self._debug_enabled: logger.info(f'Skipping Diff: {key}: {value}')
                         continue
                     if self._debug_enabled: logger.info(f'Settings Diff: {key}: {value}')
@@ -615,6 +988,7 @@ class BaseSqliteDB(abc.ABC):
                 self.create_tag_index()
             # else:
             #     self.drop_tag_index()
+            self._configure_file_storage_()
             self.configured = True
             return True
         except sqlite3.OperationalError: 
@@ -631,11 +1005,12 @@ class BaseSqliteDB(abc.ABC):
             update_statement = f'UPDATE "{self.table}_settings" SET value = ? WHERE key = ?'
             # This means that the DB should have already been configured
             current_settings: t.Dict[str, t.Union[str, int]] = dict(await (await conn.execute(f'SELECT key, value FROM "{self.table}_settings" ')).fetchall())
-            settings = get_optimized_settings(optimization = self.optimization, **self._config)
+            settings = get_optimized_settings(optimization = self.optimization, pragma_profile = self.pragma_profile, **self._config)
             diff_settings = dict_diff(current_settings, settings)['value_diffs']
             if diff_settings:
                 for key, value in diff_settings.items():
-                    if key.startswith('sqlite_'): 
+                    # The connection pragmas are set on every connection, so the applied values are stored
+                    if key.startswith('sqlite_') and key not in CONNECTION_PRAGMAS:
                         if self._debug_enabled: logger.info(f'Skipping Diff: {key}: {value}')
                         continue
                     if self._debug_enabled: logger.info(f'Settings Diff: {key}: {value}')
@@ -711,7 +1086,7 @@ class BaseSqliteDB(abc.ABC):
         Gets a default property
         """
         if self._config.get(key): return self._config[key]
-        settings = get_optimized_settings(optimization = self.optimization)
+        settings = get_optimized_settings(optimization = self.optimization, pragma_profile = self.pragma_profile)
         return settings[key]
 
 
@@ -768,14 +1143,17 @@ class BaseSqliteDB(abc.ABC):
         try: current_settings = dict(sql(f'SELECT key, value FROM "{self.table}_settings" ').fetchall())
         except sqlite3.OperationalError: current_settings = {}
 
-        settings = get_optimized_settings(optimization = self.optimization, **current_settings)
+        settings = get_optimized_settings(optimization = self.optimization, pragma_profile = self.pragma_profile, **current_settings)
+        # The chosen profile takes precedence over the previously stored pragmas
+        if self.pragma_profile: settings.update(PRAGMA_PROFILES[self.pragma_profile])
         if self._config: settings.update(self._config)
 
         for key in METADATA:
             settings.pop(key, None)
 
         # Chance to set pragmas before any tables are created.
-        for key, value in sorted(settings.items()):
+        # The page size cannot be changed once the database is in WAL mode
+        for key, value in sorted(settings.items(), key = lambda item: (item[0] != 'sqlite_page_size', item[0])):
             if key.startswith('sqlite_'):
                 self.reset(key, value, update=False)
         
@@ -869,6 +1247,7 @@ class BaseSqliteDB(abc.ABC):
             self.create_tag_index()
         # else:
         #     self.drop_tag_index()
+        self._configure_file_storage_()
 
         self.configured = True
         self.is_configured = True
@@ -886,14 +1265,17 @@ class BaseSqliteDB(abc.ABC):
         try: current_settings: t.Dict[str, t.Union[str, int]] = dict(await (await sql(f'SELECT key, value FROM "{self.table}_settings" ')).fetchall())
         except aiosqlite.OperationalError: current_settings = {}
 
-        settings = get_optimized_settings(optimization = self.optimization, **current_settings)
+        settings = get_optimized_settings(optimization = self.optimization, pragma_profile = self.pragma_profile, **current_settings)
+        # The chosen profile takes precedence over the previously stored pragmas
+        if self.pragma_profile: settings.update(PRAGMA_PROFILES[self.pragma_profile])
         if self._config: settings.update(self._config)
 
         for key in METADATA:
             settings.pop(key, None)
 
         # Chance to set pragmas before any tables are created.
-        for key, value in sorted(settings.items()):
+        # The page size cannot be changed once the database is in WAL mode
+        for key, value in sorted(settings.items(), key = lambda item: (item[0] != 'sqlite_page_size', item[0])):
             if key.startswith('sqlite_'):
                 await self.areset(key, value, update=False)
         
@@ -1048,16 +1430,15 @@ class BaseSqliteDB(abc.ABC):
         txn_id = self._txn_id
         if tid == txn_id: begin = False
         else:
-            while True:
-                try:
-                    sql('BEGIN IMMEDIATE')
-                    begin = True
-                    self._txn_id = tid
-                    break
-                except sqlite3.OperationalError as e:
-                    logger.info(f'SQLite Error: {e}')
-                    if retry: continue
-                    raise Timeout from None
+            # The writer connection is shared with the write queue
+            self._write_lock.acquire()
+            try:
+                self._begin_(sql, retry = retry)
+            except BaseException:
+                self._write_lock.release()
+                raise
+            begin = True
+            self._txn_id = tid
 
         try:
             yield sql
@@ -1071,7 +1452,44 @@ class BaseSqliteDB(abc.ABC):
             if begin:
                 assert self._txn_id == tid
                 self._txn_id = None
-                sql('COMMIT')
+                self._commit_(sql)
+        finally:
+            if begin: self._write_lock.release()
+
+    def _commit_(self, sql: t.Callable[..., 'Cursor']) -> None:
+        """
+        Removes the orphaned value files and commits the transaction
+        """
+        try:
+            self._remove_orphaned_files_(sql)
+        except BaseException:
+            sql('ROLLBACK')
+            raise
+        sql('COMMIT')
+
+    async def _acommit_(self, sql: t.Callable[..., t.Awaitable['AsyncCursor']]) -> None:
+        """
+        [Async] Removes the orphaned value files and commits the transaction
+        """
+        try:
+            await self._aremove_orphaned_files_(sql)
+        except BaseException:
+            await sql('ROLLBACK')
+            raise
+        await sql('COMMIT')
+
+    def _begin_(self, sql: t.Callable[..., 'Cursor'], retry: bool = False) -> None:
+        """
+        Begins an immediate transaction
+        """
+        while True:
+            try:
+                sql('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                logger.info(f'SQLite Error: {e}')
+                if retry: continue
+                raise Timeout from None
 
 
     @contextlib.asynccontextmanager
@@ -1138,7 +1556,7 @@ class BaseSqliteDB(abc.ABC):
             if begin:
                 assert self._txn_id == tid
                 self._txn_id = None
-                await sql('COMMIT')
+                await self._acommit_(sql)
 
     @contextlib.contextmanager
     def _transact_many(self, retry: bool = False) -> t.Generator[t.Callable[..., t.Tuple['Cursor', 'Cursor']], None, None]:
@@ -1154,16 +1572,14 @@ class BaseSqliteDB(abc.ABC):
         txn_id = self._txn_id
         if tid == txn_id: begin = False
         else:
-            while True:
-                try:
-                    sql('BEGIN IMMEDIATE')
-                    begin = True
-                    self._txn_id = tid
-                    break
-                except sqlite3.OperationalError as e:
-                    logger.info(f'SQLite Error: {e}')
-                    if retry: continue
-                    raise Timeout from None
+            self._write_lock.acquire()
+            try:
+                self._begin_(sql, retry = retry)
+            except BaseException:
+                self._write_lock.release()
+                raise
+            begin = True
+            self._txn_id = tid
 
         try:
             yield (sql, sqlmany)
@@ -1177,7 +1593,9 @@ class BaseSqliteDB(abc.ABC):
             if begin:
                 assert self._txn_id == tid
                 self._txn_id = None
-                sql('COMMIT')
+                self._commit_(sql)
+        finally:
+            if begin: self._write_lock.release()
 
 
     @contextlib.asynccontextmanager
@@ -1216,7 +1634,7 @@ class BaseSqliteDB(abc.ABC):
             if begin:
                 assert self._txn_id == tid
                 self._txn_id = None
-                await sql('COMMIT')
+                await self._acommit_(sql)
     
     def _format_keys_(self, keys: t.Iterable[str]) -> str:
         """
@@ -1305,6 +1723,7 @@ class BaseSqliteDB(abc.ABC):
         sql = self._asql if is_async else self._sql
         # expire_time, tag, size, mode, filename, value = columns
         expire_time, tag, size, value = columns
+        value = self._store_value_(value)
         return sql(
             f'UPDATE "{self.table}" SET'
             ' store_time = ?,'
@@ -1336,6 +1755,7 @@ class BaseSqliteDB(abc.ABC):
         sql = self._asql if is_async else self._sql
         # expire_time, tag, size, mode, filename, value = columns
         expire_time, tag, size, value = columns
+        value = self._store_value_(value)
         return sql(
             f'INSERT INTO "{self.table}"('
             ' key, store_time, expire_time, access_time,'
@@ -1359,6 +1779,7 @@ class BaseSqliteDB(abc.ABC):
         """
         if sql is None: sql = self._asql if is_async else self._sql
         expire_time, tag, size, value = columns
+        value = self._store_value_(value)
         return sql(
             f'INSERT INTO "{self.table}" ('
             ' key, store_time, expire_time, access_time,'
@@ -1404,7 +1825,7 @@ class BaseSqliteDB(abc.ABC):
                 0,  # access_count
                 tag,
                 self.get_object_size(value),
-                value,
+                self._store_value_(value),
             )
             for key, value in data.items()
         ]
@@ -1431,7 +1852,7 @@ class BaseSqliteDB(abc.ABC):
                 0,  # access_count
                 tag,
                 self.get_object_size(value),
-                value,
+                self._store_value_(value),
                 key,
             )
             for key, value in data.items()
@@ -1464,7 +1885,7 @@ class BaseSqliteDB(abc.ABC):
                 0,  # access_count
                 tag,
                 self.get_object_size(value),
-                value,
+                self._store_value_(value),
             )
             for key, value in data.items()
         ]
@@ -1761,6 +2182,12 @@ class BaseSqliteDB(abc.ABC):
             args = (pattern,)
         if order: select += f' ORDER BY {order_by} {order}'
         if limit: select += f' LIMIT {limit}'
+        if self.readers is not None:
+            rows = self._rsql(select, args).fetchall()
+            if not rows: return ([], []) if include_rowid else []
+            keys = [row[0] for row in rows]
+            if not include_rowid: return keys
+            return keys, [row[1] for row in rows]
         with self._transact(retry) as sql:
             rows = sql(
                 select,
@@ -1785,6 +2212,8 @@ class BaseSqliteDB(abc.ABC):
         """
         Fetches the keys
         """
+        if self.readers is not None:
+            return await self.pool.arun(self.fetch_keys, pattern = pattern, include_rowid = include_rowid, order = order, order_by = order_by, limit = limit, retry = retry)
         select = (
             f'SELECT key, rowid FROM "{self.table}"'
         )
@@ -1824,7 +2253,7 @@ class BaseSqliteDB(abc.ABC):
         with self._transact(retry) as sql:
             rows = sql(
                 f'SELECT rowid FROM "{self.table}"'
-                ' WHERE key = ? AND raw = ?'
+                ' WHERE key = ?'
                 ' AND (expire_time IS NULL OR expire_time > ?)',
                 (key, time.time()),
             ).fetchall()
@@ -1869,17 +2298,22 @@ class BaseSqliteDB(abc.ABC):
         :raises Timeout: if database timeout occurs
 
         """
-        with self._transact(retry) as sql:
-            rows = sql(
-                f'SELECT rowid FROM "{self.table}"'
-                ' WHERE key IN (%s)'
-                ' AND (expire_time IS NULL OR expire_time > ?)' % self._format_keys_(keys),
-                (time.time(),),
-            ).fetchall()
-            if not rows: raise KeyError(keys)
-            rowids = [row[0] for row in rows if row]
-            sql(f'DELETE FROM "{self.table}" WHERE rowid IN (%s)' % self._format_rowids_(rowids))
-            return len(rowids)
+        return self._submit_write(functools.partial(self._delete_keys_op_, keys), retry = retry)
+
+    def _delete_keys_op_(self, keys: t.Tuple[str, ...], sql: t.Callable[..., 'Cursor']) -> int:
+        """
+        Deletes the keys with the given sql
+        """
+        rows = sql(
+            f'SELECT rowid FROM "{self.table}"'
+            ' WHERE key IN (%s)'
+            ' AND (expire_time IS NULL OR expire_time > ?)' % self._format_keys_(keys),
+            (time.time(),),
+        ).fetchall()
+        if not rows: raise KeyError(keys)
+        rowids = [row[0] for row in rows if row]
+        sql(f'DELETE FROM "{self.table}" WHERE rowid IN (%s)' % self._format_rowids_(rowids))
+        return len(rowids)
     
     async def _adelete_keys_(self, *keys: str, retry: bool = True) -> int:
         """[Async] Delete corresponding item for `keys` from cache.
@@ -1892,6 +2326,7 @@ class BaseSqliteDB(abc.ABC):
         :raises KeyError: if key is not found
         :raises Timeout: if database timeout occurs
         """
+        if self._use_writer_(): return await self._asubmit_write(functools.partial(self._delete_keys_op_, keys))
         async with self._atransact(retry) as sql:
             rows = await (await sql(
                 f'SELECT rowid FROM "{self.table}"'
@@ -1943,7 +2378,8 @@ class BaseSqliteDB(abc.ABC):
         :return: True if key matching item
 
         """
-        sql = self._sql_retry if retry else self._sql
+        if self.readers is not None: sql = self._rsql
+        else: sql = self._sql_retry if retry else self._sql
         select = (
             f'SELECT rowid FROM "{self.table}"'
             ' WHERE key = ?'
@@ -1959,6 +2395,7 @@ class BaseSqliteDB(abc.ABC):
         :return: True if key matching item
 
         """
+        if self.readers is not None: return await self.pool.arun(self.contains, key, retry = retry)
         sql = self._asql_retry if retry else self._asql
         select = (
             f'SELECT rowid FROM "{self.table}"'
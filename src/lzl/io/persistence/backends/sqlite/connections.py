@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+"""
+SQLite Connection Management
+
+- `ReadConnections` hands out one read-only connection per thread, so that
+  readers never share a handle and, in WAL mode, never wait on the writer.
+- `WriteQueue` owns the single writer connection of a database from a
+  dedicated thread and group-commits the queued write operations: every
+  operation runs in its own savepoint, and a whole batch is committed
+  in a single transaction.
+"""
+
+import time
+import queue
+import threading
+import contextlib
+import typing as t
+from concurrent import futures
+from typing import Any, Callable, List, Optional, Tuple, TYPE_CHECKING
+from ..base import logger
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection, Cursor
+    from .base import BaseSqliteDB
+
+RT = t.TypeVar('RT')
+WriteOp = Callable[[Callable[..., 'Cursor']], RT]
+
+_STOP = object()
+
+
+class ReadConnections:
+    """
+    Per-Thread Read-Only Connections
+    """
+
+    def __init__(self, factory: Callable[[], 'Connection']):
+        """
+        Initializes the Read Connections
+
+        Args:
+            factory (Callable[[], Connection]): Opens a new read-only connection
+        """
+        self.factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns: List['Connection'] = []
+
+    def get(self) -> 'Connection':
+        """
+        Returns the connection of the current thread
+        """
+        conn: Optional['Connection'] = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.factory()
+            self._local.conn = conn
+            with self._lock: self._conns.append(conn)
+        return conn
+
+    def close(self):
+        """
+        Closes all the connections
+        """
+        with self._lock:
+            conns, self._conns = self._conns, []
+        self._local = threading.local()
+        for conn in conns:
+            with contextlib.suppress(Exception):
+                conn.close()
+
+    def __len__(self) -> int:
+        return len(self._conns)
+
+
+class WriteQueue:
+    """
+    Group-Committing Write Queue
+
+    Write operations are callables that receive the `sql` execute function of
+    the writer connection. They are run by a single thread which drains up to
+    `max_batch` queued operations, waiting up to `max_delay` seconds for more
+    to arrive, and commits them in one transaction.
+
+    - A failing operation is rolled back to its savepoint and only its own
+      future receives the exception
+    - If the commit fails, every operation of the batch receives the exception
+    """
+
+    def __init__(
+        self,
+        db: 'BaseSqliteDB',
+        max_batch: Optional[int] = 256,
+        max_delay: Optional[float] = 0.0,
+    ):
+        """
+        Initializes the Write Queue
+
+        Args:
+            db (BaseSqliteDB): The database that owns the writer connection
+            max_batch (int, optional): The maximum number of operations per transaction. Defaults to 256.
+            max_delay (float, optional): How long to wait for more operations before committing. Defaults to 0.0.
+        """
+        self.db = db
+        self.max_batch = max(max_batch or 1, 1)
+        self.max_delay = max_delay or 0.0
+        self._queue: 'queue.SimpleQueue[Any]' = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches: int = 0
+        self.operations: int = 0
+
+    @property
+    def thread_id(self) -> Optional[int]:
+        """
+        Returns the id of the writer thread
+        """
+        return self._thread.ident if self._thread is not None else None
+
+    def _start(self):
+        """
+        Starts the writer thread
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive(): return
+            self._thread = threading.Thread(
+                target = self._run,
+                name = f'sqlite-writer-{self.db.table}',
+                daemon = True
+            )
+            self._thread.start()
+
+    def submit(self, op: WriteOp) -> 'futures.Future[RT]':
+        """
+        Queues the write operation and returns its future
+        """
+        if self._thread is None or not self._thread.is_alive(): self._start()
+        future: 'futures.Future[RT]' = futures.Future()
+        self._queue.put((op, future))
+        return future
+
+    def _drain(self, batch: List[Tuple[WriteOp, futures.Future]]) -> bool:
+        """
+        Adds the queued operations to the batch
+
+        Returns False if the queue was stopped
+        """
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                timeout = deadline - time.monotonic()
+                item = self._queue.get(timeout = timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty: break
+            if item is _STOP: return False
+            batch.append(item)
+        return True
+
+    def _run(self):
+        """
+        Runs the writer loop
+        """
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is _STOP: break
+            batch = [item]
+            running = self._drain(batch)
+            try:
+                self._commit(batch)
+            except Exception as e:
+                logger.error(f'[{self.db.table}] Error committing {len(batch)} writes: {e}')
+
+    def _commit(self, batch: List[Tuple[WriteOp, futures.Future]]):
+        """
+        Runs the operations of the batch in a single transaction
+        """
+        batch = [(op, future) for op, future in batch if future.set_running_or_notify_cancel()]
+        if not batch: return
+        results: List[Tuple[futures.Future, Any, bool]] = []
+        db = self.db
+        with db._write_lock:
+            try:
+                db._init_io_()
+                sql = db._sql
+                db._begin_(sql)
+            except BaseException as e:
+                for _, future in batch: future.set_exception(e)
+                return
+            db._txn_id = threading.get_ident()
+            try:
+                for op, future in batch:
+                    sql('SAVEPOINT write_op')
+                    try:
+                        result = op(sql)
+                    except BaseException as e:
+                        sql('ROLLBACK TO write_op')
+                        sql('RELEASE write_op')
+                        results.append((future, e, True))
+                    else:
+                        sql('RELEASE write_op')
+                        results.append((future, result, False))
+                db._remove_orphaned_files_(sql)
+                sql('COMMIT')
+            except BaseException as e:
+                with contextlib.suppress(Exception):
+                    sql('ROLLBACK')
+                for _, future in batch:
+                    if not future.done(): future.set_exception(e)
+                return
+            finally:
+                db._txn_id = None
+
+        self.batches += 1
+        self.operations += len(results)
+        for future, result, is_error in results:
+            if is_error: future.set_exception(result)
+            else: future.set_result(result)
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Commits the queued operations and stops the writer thread
+        """
+        if self._thread is None: return
+        self._queue.put(_STOP)
+        if self._thread is not threading.current_thread(): self._thread.join(timeout)
+        self._thread = None
+
+    def __repr__(self) -> str:
+        return f'<WriteQueue table={self.db.table}, batches={self.batches}, operations={self.operations}>'
@@ -6,10 +6,12 @@ SQLite Backend
 Borrowed parts from `python-diskache <https://github.com/grantjenks/python-diskcache>`_
 """
 
+import io
 import abc
 import copy
 import time
 import asyncio
+import functools
 import contextlib
 import threading
 import contextlib
@@ -174,12 +176,15 @@ class SqliteDB(BaseSqliteDB):
         size = self.get_object_size(value)
         expire_time = None if expire is None else now + expire
         columns = (expire_time, tag, size, value)
-        
-        with self._transact(retry) as sql:
-            # We'll use the upsert method here
-            self._row_upsert(key, now, columns, sql = sql)
-            self._cull(now, sql)
-            return True
+        return self._submit_write(functools.partial(self._set_op_, key, now, columns), retry = retry)
+
+    def _set_op_(self, key: str, now: float, columns: t.Tuple[t.Any, ...], sql: t.Callable[..., 'Cursor']) -> bool:
+        """
+        Upserts the row with the given sql
+        """
+        self._row_upsert(key, now, columns, sql = sql)
+        self._cull(now, sql)
+        return True
         
     async def _aset(self, key: str, value: t.Any, expire: Optional[float] = None, read: bool = False, tag: t.Optional[str] = None, retry: bool = False):
         """Set `key` and `value` item in cache.
@@ -250,7 +255,9 @@ class SqliteDB(BaseSqliteDB):
         now = time.time()
         size = self.get_object_size(value)
         expire_time = None if expire is None else now + expire
-        columns = (expire_time, tag, size, value)        
+        columns = (expire_time, tag, size, value)
+        if self._use_writer_():
+            return await self._asubmit_write(functools.partial(self._set_op_, key, now, columns))
         async with self._atransact(retry) as sql:
             await self._row_upsert(key, now, columns, is_async = True, sql = sql)
             self.abg_cull(now, retry = retry)
@@ -269,10 +276,15 @@ class SqliteDB(BaseSqliteDB):
         now = time.time()
         expire_time = None if expire is None else now + expire
         columns = (expire_time, tag)
-        with self._transact(retry) as sql:
-            self._bulk_upsert(data, now, columns)
-            self._cull(now, sql)
-            return True
+        return self._submit_write(functools.partial(self._batch_set_op_, data, now, columns), retry = retry)
+
+    def _batch_set_op_(self, data: t.Dict[str, t.Any], now: float, columns: t.Tuple[t.Any, ...], sql: t.Callable[..., 'Cursor']) -> bool:
+        """
+        Upserts the rows with the given sql
+        """
+        self._bulk_upsert(data, now, columns)
+        self._cull(now, sql)
+        return True
 
     async def abatch_set(self, data: t.Dict[str, t.Any], expire: t.Optional[float] = None, tag: t.Optional[str] = None, retry: t.Optional[bool] = None):
         """
@@ -287,8 +299,10 @@ class SqliteDB(BaseSqliteDB):
         now = time.time()
         expire_time = None if expire is None else now + expire
         columns = (expire_time, tag)
-        # async with self._atransact(retry) as sql:
-        await self._bulk_upsert(data, now, columns, is_async = True)
+        if self._use_writer_():
+            return await self._asubmit_write(functools.partial(self._batch_set_op_, data, now, columns))
+        async with self._atransact_many(retry) as (sql, sqlmany):
+            await self._bulk_upsert(data, now, columns, is_async = True, sql = sqlmany)
         self.abg_cull(now, retry = retry)
         return True
 
@@ -767,7 +781,7 @@ class SqliteDB(BaseSqliteDB):
         )
         if not self.statistics and update_column is None:
             # Fast path, no transaction necessary.
-            rows = self._sql(select, (key, time.time())).fetchall()
+            rows = self._rsql(select, (key, time.time())).fetchall()
             if not rows: return default
 
             # ((rowid, db_expire_time, db_tag, mode, filename, db_value),) = rows
@@ -778,6 +792,8 @@ class SqliteDB(BaseSqliteDB):
             if _result is ENOVAL: return default
             ((rowid, expire_time, tag, access_count, hit_count, value),) = _result
 
+        value = self._load_value_(value)
+        if value is ENOVAL: return default
         if not include_meta: return value
         return value, {
             'expire_time': expire_time,
@@ -807,6 +823,9 @@ class SqliteDB(BaseSqliteDB):
         :return: value for item or default if key not found or a tuple of (value, metadata)
         :raises Timeout: if database timeout occurs
         """
+        if self.readers is not None:
+            # Reads run on the per-thread connections of the thread pool
+            return await self.pool.arun(self.get, key, default = default, include_meta = include_meta, retry = retry)
         update_column = self.eviction_policies['get']
         select = (
             'SELECT rowid, expire_time, tag, access_count, hit_count, value'
@@ -823,6 +842,8 @@ class SqliteDB(BaseSqliteDB):
             if _result is ENOVAL: return default
             ((rowid, expire_time, tag, access_count, hit_count, value),) = _result
         
+        value = self._load_value_(value)
+        if value is ENOVAL: return default
         if not include_meta: return value
         return value, {
             'expire_time': expire_time,
@@ -843,6 +864,13 @@ class SqliteDB(BaseSqliteDB):
         cache_miss = (
             f'UPDATE "{self.table}_settings" SET value = value + 1 WHERE key = "misses"'
         )
+        if self.readers is not None and self._use_writer_():
+            # Read without a transaction and queue the statistics update
+            # so that reads do not wait on the writer
+            rows = self._rsql(select, (key, time.time())).fetchall()
+            rowids = [rows[0][0]] if rows else []
+            self.writer.submit(functools.partial(self._record_access_, rowids, len(rowids), 1 - len(rowids), update_column))
+            return rows or ENOVAL
         with self._transact(retry) as sql:
             rows = sql(select, (key, time.time())).fetchall()
             if not rows:
@@ -884,6 +912,17 @@ class SqliteDB(BaseSqliteDB):
                 await sql(update % update_column.format(now=now), (rowid,))
             return rows
 
+    def _record_access_(self, rowids: t.List[int], hits: int, misses: int, update_column: t.Optional[str], sql: t.Callable[..., 'Cursor']) -> None:
+        """
+        Records the cache hits and misses and updates the accessed rows
+        """
+        if self.statistics:
+            if hits: sql(f'UPDATE "{self.table}_settings" SET value = value + ? WHERE key = "hits"', (hits,))
+            if misses: sql(f'UPDATE "{self.table}_settings" SET value = value + ? WHERE key = "misses"', (misses,))
+        if update_column is not None and rowids:
+            now = time.time()
+            sql(f'UPDATE "{self.table}" SET %s WHERE rowid IN ({self._format_rowids_(rowids)})' % update_column.format(now=now))
+
     def fetch_kv_data(self, limit: t.Optional[int] = None, **kwargs) -> t.Dict[str, t.Any]:
         """
         Loads all the Data
@@ -898,17 +937,19 @@ class SqliteDB(BaseSqliteDB):
         if limit is not None: select += f' LIMIT {limit}'
         now = time.time()
         data_results = {}
-        rows = self._sql(select, (now,)).fetchall()
+        rows = self._rsql(select, (now,)).fetchall()
         if not rows: return data_results
         for row in rows:
             key, value = row
-            data_results[key] = value
+            value = self._load_value_(value)
+            if value is not ENOVAL: data_results[key] = value
         return data_results
 
     async def afetch_kv_data(self, limit: t.Optional[int] = None, **kwargs) -> t.Dict[str, t.Any]:
         """
         Loads all the Data
         """
+        if self.readers is not None: return await self.pool.arun(self.fetch_kv_data, limit = limit, **kwargs)
         # Since this is a heavy operation, we'll just retrieve it from the DB
         # with a single query
         select = (
@@ -924,7 +965,8 @@ class SqliteDB(BaseSqliteDB):
             if not rows: return data_results
             for row in rows:
                 key, value = row
-                data_results[key] = value
+                value = self._load_value_(value)
+                if value is not ENOVAL: data_results[key] = value
         return data_results
 
 
@@ -939,13 +981,15 @@ class SqliteDB(BaseSqliteDB):
         )
         if limit is not None: select += f' LIMIT {limit}'
         now = time.time()
-        rows = self._sql(select, (now,)).fetchall()
-        return [row[0] for row in rows]
+        rows = self._rsql(select, (now,)).fetchall()
+        values = (self._load_value_(row[0]) for row in rows)
+        return [value for value in values if value is not ENOVAL]
 
     async def afetch_values(self, limit: t.Optional[int] = None, **kwargs) -> t.List[t.Any]:
         """
         Fetches the values
         """
+        if self.readers is not None: return await self.pool.arun(self.fetch_values, limit = limit, **kwargs)
         select = (
             'SELECT value'
             f' FROM "{self.table}"'
@@ -954,7 +998,8 @@ class SqliteDB(BaseSqliteDB):
         if limit is not None: select += f' LIMIT {limit}'
         now = time.time()
         rows = await (await self._asql(select, (now,))).fetchall()
-        return [row[0] for row in rows]
+        values = (self._load_value_(row[0]) for row in rows)
+        return [value for value in values if value is not ENOVAL]
         
     def batch_get(self, *keys: str, default: t.Optional[t.Any] = None, include_meta: bool = False, retry: t.Optional[bool] = False):
         """
@@ -986,7 +1031,7 @@ class SqliteDB(BaseSqliteDB):
             
         if not self.statistics and update_column is None:
             # Fast path, no transaction necessary.
-            rows = self._sql(select, (now,)).fetchall()
+            rows = self._rsql(select, (now,)).fetchall()
             if not rows:  return return_noval()
             fetched_results = {
                 key: (rowid, value, db_expire_time, db_tag, db_access_count, db_hit_count)
@@ -1005,7 +1050,7 @@ class SqliteDB(BaseSqliteDB):
                     'access_count': db_access_count,
                     'hits': db_hit_count,
                 }
-                batch_results[key] = value
+                batch_results[key] = self._load_value_(value, default)
 
         else:  # Slow path, transaction required.
             _result = self._batch_update_statistics(keys, now, select, update_column = update_column, default = default, retry = retry)
@@ -1027,6 +1072,8 @@ class SqliteDB(BaseSqliteDB):
         :param retry: retry if database timeout occurs (default None, no retry)
         :return: dict of key/value pairs or tuple of (key, value) pairs if include_meta is True
         """
+        if self.readers is not None:
+            return await self.pool.arun(self.batch_get, *keys, default = default, include_meta = include_meta, retry = retry)
         update_column = self.eviction_policies['get']
         select = (
             'SELECT rowid, expire_time, tag, access_count, hit_count, value, key'
@@ -1064,7 +1111,7 @@ class SqliteDB(BaseSqliteDB):
                     'access_count': db_access_count,
                     'hits': db_hit_count,
                 }
-                batch_results[key] = value
+                batch_results[key] = self._load_value_(value, default)
 
         else:  # Slow path, transaction required.
             _result = await self._abatch_update_statistics(keys, now, select, update_column = update_column, default = default, retry = retry)
@@ -1086,6 +1133,30 @@ class SqliteDB(BaseSqliteDB):
         cache_bulk_miss = (
             f'UPDATE "{self.table}_settings" SET value = value + {len(keys)} WHERE key = "misses"'
         )
+        if self.readers is not None and self._use_writer_():
+            # Read without a transaction and queue the statistics update
+            rows = self._rsql(select, (now,)).fetchall()
+            found = {row[6]: row[0] for row in rows}
+            rowids = [found[key] for key in keys if key in found]
+            self.writer.submit(functools.partial(self._record_access_, rowids, len(rowids), len(keys) - len(rowids), update_column))
+            if not rows: return ENOVAL
+            meta_results, batch_results = {}, {}
+            fetched_results = {row[6]: row for row in rows}
+            for key in keys:
+                if key not in fetched_results:
+                    batch_results[key] = default
+                    meta_results[key] = None
+                    continue
+                (rowid, db_expire_time, db_tag, db_access_count, db_hit_count, value, _) = fetched_results[key]
+                meta_results[key] = {
+                    'expire_time': db_expire_time,
+                    'tag': db_tag,
+                    'rowid': rowid,
+                    'access_count': db_access_count,
+                    'hits': db_hit_count,
+                }
+                batch_results[key] = self._load_value_(value, default)
+            return batch_results, meta_results
         with self._transact(retry) as sql:
             rows = sql(select, (now,)).fetchall()
             if not rows:
@@ -1112,7 +1183,7 @@ class SqliteDB(BaseSqliteDB):
                     'access_count': db_access_count,
                     'hits': db_hit_count,
                 }
-                batch_results[key] = value
+                batch_results[key] = self._load_value_(value, default)
                 n_hits += 1
                 # row_ids.append((rowid,))
                 row_ids.append(rowid)
@@ -1166,7 +1237,7 @@ class SqliteDB(BaseSqliteDB):
                     'access_count': db_access_count,
                     'hits': db_hit_count,
                 }
-                batch_results[key] = value
+                batch_results[key] = self._load_value_(value, default)
                 n_hits += 1
                 row_ids.append(rowid)
 
@@ -1219,7 +1290,7 @@ class SqliteDB(BaseSqliteDB):
             if not rows: return {}, {} if include_meta else {}
             for row in rows:
                 rowid, expire_time, tag, access_count, hit_count, value, key = row
-                batch_results[key] = value
+                batch_results[key] = self._load_value_(value, None)
                 if include_meta: meta_results[key] = {
                     'expire_time': expire_time,
                     'tag': tag,
@@ -1280,7 +1351,7 @@ class SqliteDB(BaseSqliteDB):
             if not rows: return {}, {} if include_meta else {}
             for row in rows:
                 rowid, expire_time, tag, access_count, hit_count, value, key = row
-                batch_results[key] = value
+                batch_results[key] = self._load_value_(value, None)
                 if include_meta: meta_results[key] = {
                     'expire_time': expire_time,
                     'tag': tag,
@@ -1316,10 +1387,20 @@ class SqliteDB(BaseSqliteDB):
         :raises Timeout: if database timeout occurs
 
         """
-        handle = self.get(key, default=ENOVAL, read=True, retry=retry)
-        if handle is ENOVAL:
-            raise KeyError(key)
-        return handle
+        rows = self._rsql(
+            f'SELECT value FROM "{self.table}" WHERE key = ?'
+            ' AND (expire_time IS NULL OR expire_time > ?)',
+            (key, time.time()),
+        ).fetchall()
+        if not rows: raise KeyError(key)
+        ((value,),) = rows
+        # Large values are streamed from their file instead of being loaded
+        if self.file_store is not None and self.file_store.is_reference(value):
+            try:
+                return self.file_store.open(value)
+            except FileNotFoundError: raise KeyError(key) from None
+        if isinstance(value, str): value = value.encode()
+        return io.BytesIO(value)
 
 
     def pop(
@@ -1359,6 +1440,8 @@ class SqliteDB(BaseSqliteDB):
             if not rows: return default
             ((rowid, db_expire_time, db_tag, value),) = rows
             # ((rowid, db_expire_time, db_tag, mode, filename, db_value),) = rows
+            # Read the file before it is removed on commit
+            value = self._load_value_(value, None)
             sql(f'DELETE FROM "{self.table}" WHERE rowid = ?', (rowid,))
 
         if expire_time and tag: return value, db_expire_time, db_tag
@@ -1401,6 +1484,7 @@ class SqliteDB(BaseSqliteDB):
             rows = await (await sql(select, (key, time.time()))).fetchall()
             if not rows: return default
             ((rowid, db_expire_time, db_tag, value),) = rows
+            value = self._load_value_(value, None)
             await sql(f'DELETE FROM "{self.table}" WHERE rowid = ?', (rowid,))
 
         if expire_time and tag: return value, db_expire_time, db_tag
@@ -1425,9 +1509,15 @@ class SqliteDB(BaseSqliteDB):
         """
         # pylint: disable=unnecessary-dunder-call
         try:
-            return self._delete_key_(key, retry=retry)
+            return self._submit_write(functools.partial(self._delete_key_op_, key), retry = retry)
         except KeyError:
             return False
+
+    def _delete_key_op_(self, key: str, sql: t.Callable[..., 'Cursor']) -> bool:
+        """
+        Deletes the key within the transaction of the given sql
+        """
+        return self._delete_key_(key)
     
     async def adelete(self, key: str, retry: bool = False):
         """Delete corresponding item for `key` from cache.
@@ -1445,6 +1535,8 @@ class SqliteDB(BaseSqliteDB):
         """
         # pylint: disable=unnecessary-dunder-call
         try:
+            if self._use_writer_():
+                return await self._asubmit_write(functools.partial(self._delete_key_op_, key))
             return await self._adelete_key_(key, retry=retry)
         except KeyError:
             return False
@@ -1717,6 +1809,7 @@ class SqliteDB(BaseSqliteDB):
                     #     (rowid, key, db_expire, db_tag, mode, name, db_value),
                     # ) = rows
 
+                    value = self._load_value_(value, None)
                     sql(f'DELETE FROM "{self.table}" WHERE rowid = ?', (rowid,))
                     break
                     # if db_expire is not None and db_expire < time.time():
@@ -1826,6 +1919,7 @@ class SqliteDB(BaseSqliteDB):
                     (
                         (rowid, key, db_expire, db_tag, value),
                     ) = rows
+                    value = self._load_value_(value, None)
                     await sql(f'DELETE FROM "{self.table}" WHERE rowid = ?', (rowid,))
                     break
             break
@@ -1932,6 +2026,7 @@ class SqliteDB(BaseSqliteDB):
             #     continue
             break
 
+        value = self._load_value_(value, None)
         if expire_time and tag: return (key, value), db_expire, db_tag
         elif expire_time: return (key, value), db_expire
         elif tag: return (key, value), db_tag
@@ -2023,6 +2118,7 @@ class SqliteDB(BaseSqliteDB):
                     if db_expire is None or db_expire >= time.time(): break
                     await sql(f'DELETE FROM "{self.table}" WHERE rowid = ?', (rowid,))
             break
+        value = self._load_value_(value, None)
         if expire_time and tag: return (key, value), db_expire, db_tag
         elif expire_time: return (key, value), db_expire
         elif tag: return (key, value), db_tag
@@ -2083,6 +2179,7 @@ class SqliteDB(BaseSqliteDB):
 
             break
 
+        value = self._load_value_(value, None)
         if expire_time and tag: return (key, value), db_expire, db_tag
         elif expire_time: return (key, value), db_expire
         elif tag: return (key, value), db_tag
@@ -2141,6 +2238,7 @@ class SqliteDB(BaseSqliteDB):
                         break
             break
 
+        value = self._load_value_(value, None)
         if expire_time and tag: return (key, value), db_expire, db_tag
         elif expire_time: return (key, value), db_expire
         elif tag: return (key, value), db_tag
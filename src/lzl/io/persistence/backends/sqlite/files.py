@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+"""
+SQLite Large Value Storage
+
+Values at or above a size threshold are not stored inline in the `value`
+column. They are written to content-addressed files under the cache directory
+and the row only keeps a reference to the file.
+
+- A reference is the `FILE_PREFIX` marker followed by the relative path
+  of the file, so the read paths only have to check the prefix
+- Files are named by the hash of their contents, so identical values share
+  a single file. The table exposes the path as a virtual `filename` column
+  with a partial index, which is used to count the references to a file
+- Triggers queue the files of deleted and replaced rows in the
+  `{table}_files` table. The writer removes the queued files that are no
+  longer referenced before it commits
+- Files are read back through `mmap`, which avoids buffered reads of
+  multi-megabyte files
+"""
+
+import os
+import mmap
+import hashlib
+import pathlib
+import tempfile
+import contextlib
+import typing as t
+from ..base import logger
+
+if t.TYPE_CHECKING:
+    from sqlite3 import Cursor
+    from aiosqlite import Cursor as AsyncCursor
+
+
+FILE_PREFIX = b'\x00lzl:file:'
+
+# Marks whether the file holds an encoded `str` or raw `bytes`
+_STR_SUFFIX = '.s'
+_BYTES_SUFFIX = '.b'
+
+_MISSING = object()
+
+
+class FileStore:
+    """
+    Content-Addressed Value Files
+    """
+
+    def __init__(self, directory: t.Union[str, pathlib.Path], threshold: t.Optional[int] = None, encoding: t.Optional[str] = 'utf-8'):
+        """
+        Initializes the File Store
+
+        Args:
+            directory (Union[str, pathlib.Path]): The directory that holds the files
+            threshold (int, optional): The size in bytes from which values are stored in files.
+                Defaults to None, which disables storing values in files.
+            encoding (str, optional): The encoding of `str` values. Defaults to 'utf-8'.
+        """
+        self.directory = pathlib.Path(directory)
+        self.threshold = threshold
+        self.encoding = encoding
+
+    @staticmethod
+    def is_reference(value: t.Any) -> bool:
+        """
+        Returns True if the value is a file reference
+        """
+        return value.__class__ is bytes and value[:len(FILE_PREFIX)] == FILE_PREFIX
+
+    @staticmethod
+    def get_filename(value: bytes) -> str:
+        """
+        Returns the relative path of a file reference
+        """
+        return value[len(FILE_PREFIX):].decode('ascii')
+
+    def get_path(self, filename: str) -> pathlib.Path:
+        """
+        Returns the path of a file
+        """
+        return self.directory.joinpath(filename)
+
+    def should_store(self, value: t.Any) -> bool:
+        """
+        Returns True if the value should be stored in a file
+        """
+        return bool(self.threshold) and isinstance(value, (str, bytes, bytearray)) and len(value) >= self.threshold
+
+    def store(self, value: t.Union[str, bytes]) -> bytes:
+        """
+        Writes the value to its file and returns the reference
+
+        Must be called inside the write transaction, so that the
+        file cannot be removed before the row referencing it is committed
+        """
+        if isinstance(value, str):
+            data, suffix = value.encode(self.encoding), _STR_SUFFIX
+        else:
+            data, suffix = value, _BYTES_SUFFIX
+        digest = hashlib.blake2b(data, digest_size = 20).hexdigest()
+        filename = f'{digest[:2]}/{digest[2:4]}/{digest}{suffix}'
+        path = self.get_path(filename)
+        if not path.exists():
+            path.parent.mkdir(parents = True, exist_ok = True)
+            fd, tmp_path = tempfile.mkstemp(dir = path.parent, prefix = '.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+        return FILE_PREFIX + filename.encode('ascii')
+
+    def load(self, value: bytes, default: t.Any = _MISSING) -> t.Union[str, bytes, t.Any]:
+        """
+        Reads the value of a file reference
+
+        Returns `default` if the file was removed by a concurrent delete
+        """
+        filename = self.get_filename(value)
+        try:
+            with open(self.get_path(filename), 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size:
+                    with mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+                        data = mm[:]
+                else: data = b''
+        except FileNotFoundError:
+            if default is _MISSING: raise
+            return default
+        return data.decode(self.encoding) if filename.endswith(_STR_SUFFIX) else data
+
+    def open(self, value: bytes) -> t.BinaryIO:
+        """
+        Opens the file of a file reference for reading
+        """
+        return open(self.get_path(self.get_filename(value)), 'rb')
+
+    def remove_orphans(self, table: str, sql: t.Callable[..., 'Cursor']) -> int:
+        """
+        Removes the queued files that are no longer referenced by the table
+
+        Must be called inside the write transaction
+        """
+        rows = sql(f'SELECT filename FROM "{table}_files"').fetchall()
+        if not rows: return 0
+        sql(f'DELETE FROM "{table}_files"')
+        removed = 0
+        for (filename,) in rows:
+            if sql(f'SELECT 1 FROM "{table}" WHERE filename = ? LIMIT 1', (filename,)).fetchall(): continue
+            removed += self._unlink(table, filename)
+        return removed
+
+    async def aremove_orphans(self, table: str, sql: t.Callable[..., t.Awaitable['AsyncCursor']]) -> int:
+        """
+        [Async] Removes the queued files that are no longer referenced by the table
+
+        Must be called inside the write transaction
+        """
+        rows = await (await sql(f'SELECT filename FROM "{table}_files"')).fetchall()
+        if not rows: return 0
+        await sql(f'DELETE FROM "{table}_files"')
+        removed = 0
+        for (filename,) in rows:
+            if await (await sql(f'SELECT 1 FROM "{table}" WHERE filename = ? LIMIT 1', (filename,))).fetchall(): continue
+            removed += self._unlink(table, filename)
+        return removed
+
+    def _unlink(self, table: str, filename: str) -> bool:
+        """
+        Removes a value file, returning whether it existed
+        """
+        try:
+            os.unlink(self.get_path(filename))
+            return True
+        except FileNotFoundError: pass
+        except OSError as e:
+            logger.warning(f'[{table}] Error removing value file {filename}: {e}')
+        return False
+
+    def __repr__(self) -> str:
+        return f'<FileStore directory={self.directory}, threshold={self.threshold}>'
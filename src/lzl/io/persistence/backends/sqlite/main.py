@@ -6,7 +6,7 @@ SQLite Backend Dict-Like Persistence
 import copy
 import typing as t
 from typing import TypeVar, Generic, Any, Dict, Optional, Union, Tuple, Iterable, List, Type, Callable, Generator, AsyncGenerator, TYPE_CHECKING
-from ..base import BaseStatefulBackend, SchemaType, create_unique_id, logger
+from ..base import BaseStatefulBackend, SchemaType, UNCHANGED, create_unique_id, logger
 from .db import SqliteDB, SqliteDsn, Optimization, ENOVAL
 
 
@@ -138,7 +138,7 @@ class SqliteStatefulBackend(BaseStatefulBackend):
         """
         Returns a deleter function
         """
-        return self.db._delete_keys_(*keys) if is_async else self.db._adelete_keys_(*keys)
+        return self.db._adelete_keys_(*keys) if is_async else self.db._delete_keys_(*keys)
     
     def _contains(self, key: str, is_async: Optional[bool] = None) -> bool:
         """
@@ -294,15 +294,15 @@ class SqliteStatefulBackend(BaseStatefulBackend):
         Decodes the data
         """
         data_keys = list(data.keys())
-        for key in data_keys:
-            try:
-                data[key] = self.decode_value(data[key], _raw = _raw, **kwargs)
-            except Exception as e:
+        results = self.decode_values(data.values(), _raw = _raw, return_exceptions = True, **kwargs)
+        for key, result in zip(data_keys, results):
+            if isinstance(result, Exception):
                 if skip_on_errors: 
                     data.pop(key)
                     continue
-                logger.info(f'Error Decoding Key {key} : |r|({type(data[key])}) {e}|e| {data[key]}', colored = True)
-                raise e
+                logger.info(f'Error Decoding Key {key} : |r|({type(data[key])}) {result}|e| {data[key]}', colored = True)
+                raise result
+            data[key] = result
         return data
 
     async def _adecode_kv_data(self, data: t.Dict[str, t.Any], _raw: Optional[bool] = None, skip_on_errors: Optional[bool] = True, **kwargs) -> t.Dict[str, t.Any]:
@@ -310,54 +310,50 @@ class SqliteStatefulBackend(BaseStatefulBackend):
         [Async] Decodes the data
         """
         data_keys = list(data.keys())
-        for key in data_keys:
-            try:
-                data[key] = await self.adecode_value(data[key], _raw = _raw, **kwargs)
-            except Exception as e:
+        results = await self.adecode_values(data.values(), _raw = _raw, return_exceptions = True, **kwargs)
+        for key, result in zip(data_keys, results):
+            if isinstance(result, Exception):
                 if skip_on_errors: 
                     data.pop(key)
                     continue
-                logger.info(f'Error Decoding Key {key} : |r|({type(data[key])}) {e}|e| {data[key]}', colored = True)
-                raise e
+                logger.info(f'Error Decoding Key {key} : |r|({type(data[key])}) {result}|e| {data[key]}', colored = True)
+                raise result
+            data[key] = result
         return data
     
     def _decode_values(self, values: t.List[t.Any], _raw: Optional[bool] = None, skip_on_errors: Optional[bool] = True, **kwargs) -> t.List[t.Any]:
         """
         Decodes the values
         """
-        invalid_idx = []
-        for n, value in enumerate(values):
-            try:
-                values[n] = self.decode_value(value, _raw = _raw, **kwargs)
-            except Exception as e:
+        results = self.decode_values(values, _raw = _raw, return_exceptions = True, **kwargs)
+        invalid_idx = set()
+        for n, (value, result) in enumerate(zip(values, results)):
+            if isinstance(result, Exception):
                 if skip_on_errors: 
-                    invalid_idx.append(n)
-                    # values.pop(n)
+                    invalid_idx.add(n)
                     continue
-                logger.info(f'Error Decoding Value {n} : |r|({type(value)}) {e}|e| {value}', colored = True)
-                raise e
+                logger.info(f'Error Decoding Value {n} : |r|({type(value)}) {result}|e| {value}', colored = True)
+                raise result
         if invalid_idx:
-            values = [values[i] for i in range(len(values)) if i not in invalid_idx]
-        return values
+            results = [results[i] for i in range(len(results)) if i not in invalid_idx]
+        return results
 
     async def _adecode_values(self, values: t.List[t.Any], _raw: Optional[bool] = None, skip_on_errors: Optional[bool] = True, **kwargs) -> t.List[t.Any]:
         """
         [Async] Decodes the values
         """
-        invalid_idx = []
-        for n, value in enumerate(values):
-            try:
-                values[n] = await self.adecode_value(value, _raw = _raw, **kwargs)
-            except Exception as e:
+        results = await self.adecode_values(values, _raw = _raw, return_exceptions = True, **kwargs)
+        invalid_idx = set()
+        for n, (value, result) in enumerate(zip(values, results)):
+            if isinstance(result, Exception):
                 if skip_on_errors: 
-                    invalid_idx.append(n)
-                    # values.pop(n)
+                    invalid_idx.add(n)
                     continue
-                logger.info(f'Error Decoding Value {n} : |r|({type(value)}) {e}|e| {value}', colored = True)
-                raise e
+                logger.info(f'Error Decoding Value {n} : |r|({type(value)}) {result}|e| {value}', colored = True)
+                raise result
         if invalid_idx:
-            values = [values[i] for i in range(len(values)) if i not in invalid_idx]
-        return values
+            results = [results[i] for i in range(len(results)) if i not in invalid_idx]
+        return results
 
     """
     Implemented Methods
@@ -400,14 +396,14 @@ class SqliteStatefulBackend(BaseStatefulBackend):
         Saves a Value to the Object Store
         """
         data_keys = list(data.keys())
-        for key in data_keys:
-            try:
-                data[key] = self.encode_value(data[key], _raw = _raw, **kwargs)
-            except Exception as e:
+        results = self.encode_values(data.values(), _raw = _raw, return_exceptions = True, **kwargs)
+        for key, result in zip(data_keys, results):
+            if isinstance(result, Exception):
                 value = data.pop(key)
-                logger.info(f'Error Encoding Key {key} : |r|({type(value)}) {e}|e| {value}', colored = True)
+                logger.info(f'Error Encoding Key {key} : |r|({type(value)}) {result}|e| {value}', colored = True)
                 if skip_on_errors: continue
-                raise e
+                raise result
+            data[key] = result
         ex = ex or self.expiration
         self.db.batch_set(data, expire = ex, tag = tag, **kwargs)
         return len(data)
@@ -417,18 +413,67 @@ class SqliteStatefulBackend(BaseStatefulBackend):
         [Async] Saves a Value to the Object Store
         """
         data_keys = list(data.keys())
-        for key in data_keys:
-            try:
-                data[key] = await self.aencode_value(data[key], _raw = _raw, **kwargs)
-            except Exception as e:
+        results = await self.aencode_values(data.values(), _raw = _raw, return_exceptions = True, **kwargs)
+        for key, result in zip(data_keys, results):
+            if isinstance(result, Exception):
                 value = data.pop(key)
-                logger.info(f'Error Encoding Key {key} : |r|({type(value)}) {e}|e| {value}', colored = True)
+                logger.info(f'Error Encoding Key {key} : |r|({type(value)}) {result}|e| {value}', colored = True)
                 if skip_on_errors: continue
-                raise e
+                raise result
+            data[key] = result
         ex = ex or self.expiration
         await self.db.abatch_set(data, expire = ex, tag = tag, **kwargs)
         return len(data)
 
+    @property
+    def metadata_db(self) -> 'SqliteDB':
+        """
+        Returns the table that holds the metadata of this table
+        """
+        if getattr(self, '_metadata_db', None) is None:
+            self._metadata_db = self.db.get_child(f'{self.db.table}_metadata')
+        return self._metadata_db
+
+    def get_metadata(self, name: str) -> Optional[bytes]:
+        """
+        Returns the metadata stored alongside the data
+        """
+        return self.metadata_db.get(name)
+
+    def set_metadata(self, name: str, value: bytes) -> None:
+        """
+        Stores the metadata alongside the data
+        """
+        self.metadata_db.set(name, value)
+
+    def get_values(self, keys: Iterable[str], _raw: Optional[bool] = None, **kwargs) -> List[Any]:
+        """
+        Gets the Values from SQLite in a single query
+        """
+        keys = list(keys)
+        if not keys: return []
+        data = self.db.batch_get(*keys)
+        results = self.decode_values([data.get(key) for key in keys], _raw = _raw, return_exceptions = True, **kwargs)
+        for n, (key, result) in enumerate(zip(keys, results)):
+            if isinstance(result, Exception):
+                logger.info(f'Error Decoding Key {key} : |r|{result}|e|', colored = True)
+                results[n] = None
+        return results
+
+    async def aget_values(self, keys: Iterable[str], _raw: Optional[bool] = None, **kwargs) -> List[Any]:
+        """
+        [Async] Gets the Values from SQLite in a single query
+        """
+        keys = list(keys)
+        if not keys: return []
+        data = await self.db.abatch_get(*keys)
+        results = await self.adecode_values([data.get(key) for key in keys], _raw = _raw, return_exceptions = True, **kwargs)
+        for n, (key, result) in enumerate(zip(keys, results)):
+            if isinstance(result, Exception):
+                logger.info(f'Error Decoding Key {key} : |r|{result}|e|', colored = True)
+                results[n] = None
+        return results
+
 
         
     def delete(self, key: str, **kwargs) -> None:
@@ -596,6 +641,18 @@ class SqliteStatefulBackend(BaseStatefulBackend):
         """
         return await self.aset_batch(data, ex = ex, tag = tag, retry = retry)
 
+    def _update_in_place_(self, key: str, func: Callable[[Optional[Any]], Any], ex: Optional[int] = None, **kwargs) -> Tuple[Optional[Any], Optional[Any]]:
+        """
+        Replaces the value of the key with `func(value)` within a
+        `BEGIN IMMEDIATE` transaction, so the update is atomic across processes
+        """
+        with self.db.transact(retry = True):
+            value = self._get_one(key)
+            result = func(value)
+            if result is UNCHANGED: return value, value
+            self._set_one(key, result, ex = ex, **kwargs)
+            return value, result
+
     def select(
         self, 
         *tags: str, 
@@ -6,7 +6,6 @@ Persistence Types
 - Handles persistence of data with Redis or JSON+Pickle
 """
 
-import gc
 import copy
 import atexit
 import asyncio
@@ -18,7 +17,7 @@ from lzl.load import lazy_import
 from lzl.logging import logger, null_logger
 from lzl.pool import ThreadPool
 
-from typing import Any, Dict, Optional, Union, Iterable, List, Type, Set, Callable, Mapping, MutableMapping, Tuple, TypeVar, overload, TYPE_CHECKING
+from typing import Any, Dict, Optional, Union, Iterable, Iterator, AsyncIterator, List, Type, Set, Callable, Mapping, MutableMapping, Tuple, TypeVar, overload, TYPE_CHECKING
 from .backends import (
     LocalStatefulBackend, 
     ObjStorageStatefulBackend,
@@ -36,6 +35,8 @@ from .addons import (
     NestedCountMetric,
     MetricT
 )
+from .mutations import MutationTracker
+from .nearcache import NearCache, MISSING
 from .debug import get_autologger
 
 if TYPE_CHECKING:
@@ -150,6 +151,11 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         self.child_base_key = kwargs.pop('child_base_key', None)
         self.is_child_cache = self.child_base_key is not None
 
+        # Optional in-process near cache in front of the backend
+        near_cache = kwargs.pop('near_cache', None)
+        near_cache_kwargs = kwargs.pop('near_cache_kwargs', None)
+        self._near_cache_kwargs: Optional[Dict[str, Any]] = (near_cache_kwargs or {}) if near_cache else None
+
         self._kwargs = kwargs
         self._kwargs['serializer'] = serializer
         self._kwargs['serializer_kwargs'] = serializer_kwargs
@@ -177,6 +183,8 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         self.parent_base_key = kwargs.get('parent_base_key') or parent.base_key
         self.child_base_key = kwargs.get('child_base_key') or parent.base_key
         self.is_child_cache = True
+        self._near_cache_kwargs: Optional[Dict[str, Any]] = kwargs.pop('near_cache_kwargs', None) or parent._near_cache_kwargs
+        if kwargs.pop('near_cache', None) is False: self._near_cache_kwargs = None
         self._metric_types: Dict[str, Type['MetricT']] = kwargs.get('metric_types') or copy.deepcopy(parent._metric_types)
         self.base = new_base
 
@@ -191,13 +199,22 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Initializes the context
         """
-        self._mutation_tracker: Dict[KT, VT] = {}
-        self._mutation_hashes: Dict[str, str] = {}
+        self._mutation_tracker = MutationTracker()
 
         # V2 Mutation Tracking with Context Manager  
         self._in_context: bool = False
         self._temporal_dict: Dict[KT, VT] = {}
 
+        self.base.load_compression_dictionaries()
+
+        self._near_cache: Optional[NearCache] = None
+        # Keys with a scheduled background write, `None` for a full clear
+        self._pending_writes: collections.Counter = collections.Counter()
+        if self._near_cache_kwargs is not None:
+            self._near_cache = NearCache(**self._near_cache_kwargs)
+            if self._near_cache.remote_invalidation and not self.base.subscribe_invalidations(self._invalidate):
+                logger.warning(f'Backend {self.base.name} does not support remote invalidation of the near cache')
+
         if self._metric_types:
             for k, v in self._metric_types.items():
                 if isinstance(v, str): v = lazy_import(v)
@@ -287,6 +304,9 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
             base_kwargs['backend'] = self.base_class
         if 'async_enabled' not in base_kwargs:
             base_kwargs['async_enabled'] = self.base.async_enabled
+        if 'near_cache' not in base_kwargs and self._near_cache_kwargs is not None:
+            base_kwargs['near_cache'] = True
+            base_kwargs['near_cache_kwargs'] = self._near_cache_kwargs
         return base_kwargs
 
     def get_child(self, key: KT, **kwargs) -> 'PersistentDict':
@@ -309,9 +329,88 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         return self.base.get_key(key)
 
+    """
+    Near Cache Methods
+    """
+
+    @property
+    def near_cache(self) -> Optional[NearCache]:
+        """
+        Returns the Near Cache if enabled
+        """
+        return self._near_cache
+
+    def _invalidate(self, *keys: KT) -> None:
+        """
+        Invalidates the keys in the near cache, or everything if no keys are provided
+        """
+        if self._near_cache is not None: self._near_cache.invalidate(*keys)
+
+    def _near_set(self, key: KT, value: Any) -> None:
+        """
+        Caches the value in the near cache unless a background write of the key is pending,
+        since the value read from the backend may be the one being replaced
+        """
+        if key in self._pending_writes or None in self._pending_writes: return
+        self._near_cache.set(key, value)
+
+    def _background_write(self, write: t.Awaitable[Any], *keys: KT) -> None:
+        """
+        Schedules the write in the background
+
+        The keys are invalidated once more when the write completes, so that
+        values read in the meantime do not stay in the near cache
+        """
+        pending = keys or (None,)
+        self._pending_writes.update(pending)
+
+        def _on_done(_: asyncio.Task) -> None:
+            self._pending_writes.subtract(pending)
+            for key in pending:
+                if self._pending_writes[key] <= 0: del self._pending_writes[key]
+            self._invalidate(*keys)
+
+        ThreadPool.create_background_task(write, task_callback = _on_done)
+
+    def _near_get(self, key: KT, default: Optional[VT] = None, **kwargs) -> Optional[VT]:
+        """
+        Returns the value from the near cache, falling back to the backend
+        """
+        value = self._near_cache.get(key)
+        if value is MISSING:
+            value = self.base.get(key, _raw = True, **kwargs)
+            if value is None: return default
+            self._near_set(key, value)
+        try:
+            result = self.base.decode_value(value, **kwargs)
+        except Exception as e:
+            logger.warning(f'Unable to decode near cached value for {key}: {e}')
+            self._invalidate(key)
+            return self.base.get(key, default = default, **kwargs)
+        return default if result is None else result
+
+    async def _anear_get(self, key: KT, default: Optional[VT] = None, **kwargs) -> Optional[VT]:
+        """
+        Returns the value from the near cache, falling back to the backend
+        """
+        value = self._near_cache.get(key)
+        if value is MISSING:
+            value = await self.base.aget(key, _raw = True, **kwargs)
+            if value is None: return default
+            self._near_set(key, value)
+        try:
+            result = await self.base.adecode_value(value, **kwargs)
+        except Exception as e:
+            logger.warning(f'Unable to decode near cached value for {key}: {e}')
+            self._invalidate(key)
+            return await self.base.aget(key, default = default, **kwargs)
+        return default if result is None else result
+
     def get(self, key: KT, default: Optional[VT] = None, _raw: Optional[bool] = None, **kwargs) -> Optional[VT]:
         """Return the value stored for ``key`` or ``default`` when missing."""
         self._save_mutation_objects(key)
+        if self._near_cache is not None and not _raw:
+            return self._near_get(key, default = default, **kwargs)
         return self.base.get(key, default = default, _raw = _raw, **kwargs)
     
     def get_values(self, keys: Iterable[str], **kwargs) -> List[VT]:
@@ -325,22 +424,25 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
     
     def set(self, key: KT, value: Any, ex: Optional[Union[float, int]] = None, _raw: Optional[bool] = None, **kwargs) -> Optional[KT]:
         """Persist ``value`` under ``key`` optionally expiring after ``ex`` seconds."""
+        self._invalidate(key)
         if self.base.async_enabled and is_in_async_loop():
-            ThreadPool.create_background_task(self.base.aset(key, value, ex = ex, _raw = _raw, **kwargs))
+            self._background_write(self.base.aset(key, value, ex = ex, _raw = _raw, **kwargs), key)
         else:
             return self.base.set(key, value, ex = ex, _raw = _raw, **kwargs)
     
     def set_batch(self, data: Dict[str, Any], **kwargs) -> None:
         """Store a mapping of key/value pairs in a single backend call."""
-        if self.base.async_enabled:
-            ThreadPool.create_background_task(self.base.aset_batch(data, **kwargs))
+        self._invalidate(*data.keys())
+        if self.base.async_enabled and is_in_async_loop():
+            self._background_write(self.base.aset_batch(data, **kwargs), *data.keys())
         else:
             self.base.set_batch(data, **kwargs)
 
     def delete(self, key: KT, **kwargs) -> None:
         """Remove ``key`` from the persistence backend."""
+        self._invalidate(key)
         if self.base.async_enabled and is_in_async_loop():
-            ThreadPool.create_background_task(self.base.adelete(key, **kwargs))
+            self._background_write(self.base.adelete(key, **kwargs), key)
         else:
             self.base.delete(key, **kwargs)
 
@@ -350,14 +452,17 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
     
     def clear(self, *keys, **kwargs) -> None:
         """Clear all stored items or only the provided ``keys`` when supplied."""
+        self._invalidate(*keys)
         if self.base.async_enabled and is_in_async_loop():
-            ThreadPool.create_background_task(self.base.clear(*keys, **kwargs))
+            self._background_write(self.base.aclear(*keys, **kwargs), *keys)
         else:
             self.base.clear(*keys, **kwargs)
     
     async def aget(self, key: KT, default: Optional[VT] = None, _raw: Optional[bool] = None, **kwargs) -> Optional[VT]:
         """Async equivalent of :meth:`get` for coroutine contexts."""
         await self._asave_mutation_objects(key)
+        if self._near_cache is not None and not _raw:
+            return await self._anear_get(key, default = default, **kwargs)
         return await self.base.aget(key, default = default, _raw = _raw, **kwargs)
     
     async def aget_values(self, keys: Iterable[KT], **kwargs) -> List[VT]:
@@ -373,18 +478,21 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Saves a Value to the DB
         """
+        self._invalidate(key)
         return await self.base.aset(key, value, ex = ex, _raw = _raw, **kwargs)
 
     async def aset_batch(self, data: Dict[KT, VT], **kwargs) -> None:
         """
         Saves a Value to the DB
         """
+        self._invalidate(*data.keys())
         await self.base.aset_batch(data, **kwargs)
 
     async def adelete(self, key: KT, **kwargs) -> None:
         """
         Deletes a Value from the DB
         """
+        self._invalidate(key)
         await self.base.adelete(key, **kwargs)
     
     async def acontains(self, key: KT, **kwargs) -> bool:
@@ -397,6 +505,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Clears the Cache
         """
+        self._invalidate(*keys)
         await self.base.aclear(*keys, **kwargs)
     
     def get_all_data(self, **kwargs) -> Dict[KT, VT]:
@@ -405,6 +514,21 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         self._save_mutation_objects()
         return self.base.get_all_data(**kwargs)
+
+    def iter_items(self, batch_size: Optional[int] = None, **kwargs) -> Iterator[Tuple[KT, VT]]:
+        """
+        Iterates over the Items in batches without loading all the Data
+        """
+        self._save_mutation_objects()
+        yield from self.base.iter_items(batch_size = batch_size, **kwargs)
+
+    async def aiter_items(self, batch_size: Optional[int] = None, **kwargs) -> AsyncIterator[Tuple[KT, VT]]:
+        """
+        Iterates over the Items in batches without loading all the Data
+        """
+        await self._asave_mutation_objects()
+        async for item in self.base.aiter_items(batch_size = batch_size, **kwargs):
+            yield item
     
     def get_all_keys(self, **kwargs) -> Iterable[KT]:
         """
@@ -514,6 +638,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         if 'ex' in kwargs:
             expiration = kwargs.pop('ex')
         ex = expiration if expiration is not None else timeout
+        self._invalidate(key)
         self.base.expire(key, ex = ex, **kwargs)
 
     async def aexpire(self, key: KT, timeout: Optional[int] = None, expiration: Optional[int] = None, **kwargs) -> None:
@@ -523,42 +648,32 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         if 'ex' in kwargs:
             expiration = kwargs.pop('ex')
         ex = expiration if expiration is not None else timeout
+        self._invalidate(key)
         await self.base.aexpire(key, ex = ex, **kwargs)
 
     @contextlib.contextmanager
     def track_changes(self, key: KT, func: str, *args, **kwargs):
         """
         Tracks Changes
+
+        - The yielded value flags its key as dirty when it is mutated in place,
+          so no hashing of the value is needed to detect changes
         """
         try:
-            value = None
             if key in self._mutation_tracker:
-                autologger.info(f'tracked {func} {key} (cached) {self._mutation_tracker[key]}')
-                if self.base.create_hash(self._mutation_tracker[key]) == self._mutation_hashes[key]:
-                    value = self._mutation_tracker[key]
-                else:
-                    autologger.info(f'tracked {func} {key} (changed). Saving')
-                    self.base.set(key, self._mutation_tracker[key])
-                    value = self._mutation_tracker.pop(key)
-                    self._mutation_hashes.pop(key)
-            
-            if value is None:
+                autologger.info(f'tracked {func} {key} (cached)')
+                value = self._mutation_tracker[key]
+            else:
                 autologger.info(f'tracked {func} {key}')
-                value = getattr(self.base, func)(key, *args, **kwargs)
-            
-            # Save the hash before yielding
-            if key not in self._mutation_hashes:
-                self._mutation_hashes[key] = self.base.create_hash(value)
-                self._mutation_tracker[key] = value
-
+                if self._near_cache is not None and func in {'get', '__getitem__'}:
+                    value = self._near_get(key, *args, **kwargs)
+                else:
+                    value = getattr(self.base, func)(key, *args, **kwargs)
+                    self._invalidate(key)
+                value = self._mutation_tracker.track(key, value)
             yield value
         finally:
-            if key not in self._mutation_hashes:
-                # Should have been set above, but just in case
-                self._mutation_hashes[key] = self.base.create_hash(value)
-                self._mutation_tracker[key] = value
-                
-            if self.base.create_hash(value) != self._mutation_hashes[key]:
+            if self._mutation_tracker.is_dirty(key):
                 autologger.info(f'tracked {func} {key} (post-changed). Saving')
                 self._save_mutation_objects(key)
 
@@ -567,35 +682,25 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
     async def atrack_changes(self, key: KT, func: str, *args, **kwargs):
         """
         Tracks Changes
+
+        - The yielded value flags its key as dirty when it is mutated in place,
+          so no hashing of the value is needed to detect changes
         """
         try:
-            value = None
             if key in self._mutation_tracker:
-                autologger.info(f'tracked {func} {key} (cached): {self._mutation_tracker[key]}')
-                if self.base.create_hash(self._mutation_tracker[key]) == self._mutation_hashes[key]:
-                    value = self._mutation_tracker[key]
-                else:
-                    autologger.info(f'tracked {func} {key} (changed). Saving')
-                    await self.base.aset(key, self._mutation_tracker[key])
-                    value = self._mutation_tracker.pop(key)
-                    self._mutation_hashes.pop(key)
-            if value is None:
+                autologger.info(f'tracked {func} {key} (cached)')
+                value = self._mutation_tracker[key]
+            else:
                 autologger.info(f'tracked {func} {key}')
-                value = await getattr(self.base, func)(key, *args, **kwargs)
-            
-            # Save the hash before yielding
-            if key not in self._mutation_hashes:
-                self._mutation_hashes[key] = self.base.create_hash(value)
-                self._mutation_tracker[key] = value
-
+                if self._near_cache is not None and func in {'aget', 'get', '__getitem__'}:
+                    value = await self._anear_get(key, *args, **kwargs)
+                else:
+                    value = await getattr(self.base, func)(key, *args, **kwargs)
+                    self._invalidate(key)
+                value = self._mutation_tracker.track(key, value)
             yield value
         finally:
-            if key not in self._mutation_hashes:
-                # Should have been set above, but just in case
-                self._mutation_hashes[key] = self.base.create_hash(value)
-                self._mutation_tracker[key] = value
-
-            if self.base.create_hash(value) != self._mutation_hashes[key]:
+            if self._mutation_tracker.is_dirty(key):
                 autologger.info(f'tracked {func} {key} (post-changed). Saving')
                 await self._asave_mutation_objects(key)
 
@@ -619,6 +724,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         Updates the Cache
         """
         self._save_mutation_objects()
+        self._invalidate(*data.keys())
         self.base.update(data, **kwargs)
 
     async def aupdate(self, data: Dict[str, Any], **kwargs) -> None:
@@ -626,6 +732,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         Updates the Cache
         """
         await self._asave_mutation_objects()
+        self._invalidate(*data.keys())
         await self.base.aupdate(data, **kwargs)
 
 
@@ -633,36 +740,94 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Updates the Dict at the Key
         """
+        self._invalidate(key)
         return self.base.update_key(key, data, deep = deep, exclude_none = exclude_none, **kwargs)
     
     async def aupdate_key(self, key: str, data: Dict[str, Any], deep: Optional[bool] = True,  exclude_none: Optional[bool] = True, **kwargs) -> Dict[str, Any]:
         """
         [Async] Updates the Dict at the Key
         """
+        self._invalidate(key)
         return await self.base.aupdate_key(key, data, deep = deep, exclude_none = exclude_none, **kwargs)
 
+    def update_in_place(self, key: KT, func: Callable[[Optional[VT]], Any], ex: Optional[int] = None, **kwargs) -> VT:
+        """
+        Atomically replaces the value of the key with `func(value)` and returns the new value
+
+        - `func` receives `None` for a missing key and may return `UNCHANGED`
+          to keep the current value
+        - `func` may be called more than once, so it should not have side effects
+        """
+        self._save_mutation_objects(key)
+        self._invalidate(key)
+        return self.base.update_in_place(key, func, ex = ex, **kwargs)
+    
+    async def aupdate_in_place(self, key: KT, func: Callable[[Optional[VT]], Any], ex: Optional[int] = None, **kwargs) -> VT:
+        """
+        [Async] Atomically replaces the value of the key with `func(value)` and returns the new value
+        """
+        await self._asave_mutation_objects(key)
+        self._invalidate(key)
+        return await self.base.aupdate_in_place(key, func, ex = ex, **kwargs)
+
+    def compare_and_set(self, key: KT, expected: Optional[VT], value: VT, ex: Optional[int] = None, **kwargs) -> bool:
+        """
+        Atomically sets the value of the key if its current value equals `expected`
+        """
+        self._save_mutation_objects(key)
+        self._invalidate(key)
+        return self.base.compare_and_set(key, expected, value, ex = ex, **kwargs)
+    
+    async def acompare_and_set(self, key: KT, expected: Optional[VT], value: VT, ex: Optional[int] = None, **kwargs) -> bool:
+        """
+        [Async] Atomically sets the value of the key if its current value equals `expected`
+        """
+        await self._asave_mutation_objects(key)
+        self._invalidate(key)
+        return await self.base.acompare_and_set(key, expected, value, ex = ex, **kwargs)
+
+    def get_and_set(self, key: KT, value: VT, ex: Optional[int] = None, **kwargs) -> Optional[VT]:
+        """
+        Atomically sets the value of the key and returns its previous value
+        """
+        self._save_mutation_objects(key)
+        self._invalidate(key)
+        return self.base.get_and_set(key, value, ex = ex, **kwargs)
+    
+    async def aget_and_set(self, key: KT, value: VT, ex: Optional[int] = None, **kwargs) -> Optional[VT]:
+        """
+        [Async] Atomically sets the value of the key and returns its previous value
+        """
+        await self._asave_mutation_objects(key)
+        self._invalidate(key)
+        return await self.base.aget_and_set(key, value, ex = ex, **kwargs)
+
     def popitem(self, **kwargs) -> Any:
         """
         Pops an Item from the Cache
         """
+        self._invalidate()
         return self.base.popitem(**kwargs)
     
     async def apopitem(self, **kwargs) -> Any:
         """
         Pops an Item from the Cache
         """
+        self._invalidate()
         return await self.base.apopitem(**kwargs)
     
     def pop(self, key: KT, default: Optional[VT] = None, **kwargs) -> VT:
         """
         Pops an Item from the Cache
         """
+        self._invalidate(key)
         return self.base.pop(key, default, **kwargs)
     
     async def apop(self, key: KT, default: Optional[VT] = None, **kwargs) -> VT:
         """
         Pops an Item from the Cache
         """
+        self._invalidate(key)
         return await self.base.apop(key, default, **kwargs)
     
     # def __repr__(self):
@@ -683,54 +848,48 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Clears the Mutation Tracker
         """
-        _ = self._mutation_tracker.pop(key, None)
-        _ = self._mutation_hashes.pop(key, None)
+        self._mutation_tracker.discard(key)
 
     def _save_mutation_objects(self, *keys: str):
         """
         Saves the Mutation Objects
+
+        - Only the values that were mutated are written
+        - The keys (or all keys if none are provided) are no longer tracked afterwards
         """
         if not self._mutation_tracker: return
-        if keys:
-            for key in keys:
-                if key in self._mutation_tracker:
-                    self.base.set(key, self._mutation_tracker[key])
-                    self._clear_from_mutation_tracker(key)
-        
-        else:
-            autologger.info(f'_save_mutation_objects: {list(self._mutation_tracker.keys())}')
+        if dirty := self._mutation_tracker.get_dirty(*keys):
+            autologger.info(f'_save_mutation_objects: {list(dirty.keys())}')
+            self._invalidate(*dirty.keys())
             try:
-                self.base.set_batch(self._mutation_tracker)
-                self._mutation_tracker = {}
-                self._mutation_hashes = {}
+                self.base.set_batch(dirty)
             except RuntimeError as e:
-                logger.warning(f'Unable to Save {len(self._mutation_tracker)} Mutation Objects: {e}')
+                logger.warning(f'Unable to Save {len(dirty)} Mutation Objects: {e}')
+                return
             except Exception as e:
-                logger.trace(f'Error Saving {len(self._mutation_tracker)} Mutation Objects:', e)
+                logger.trace(f'Error Saving {len(dirty)} Mutation Objects:', e)
                 raise e
-        gc.collect()
+        self._mutation_tracker.discard(*keys)
 
     async def _asave_mutation_objects(self, *keys: str):
         """
         Saves the Mutation Objects
+
+        - Only the values that were mutated are written
+        - The keys (or all keys if none are provided) are no longer tracked afterwards
         """
         if not self._mutation_tracker: return
-        if keys:
-            for key in keys:
-                if key in self._mutation_tracker:
-                    await self.base.aset(key, self._mutation_tracker[key])
-                    self._clear_from_mutation_tracker(key)
-        else:
-            autologger.info(f'_save_mutation_objects: {list(self._mutation_tracker.keys())}')
-            await self.base.aset_batch(self._mutation_tracker)
-            self._mutation_tracker = {}
-            self._mutation_hashes = {}
-        gc.collect()
+        if dirty := self._mutation_tracker.get_dirty(*keys):
+            autologger.info(f'_save_mutation_objects: {list(dirty.keys())}')
+            self._invalidate(*dirty.keys())
+            await self.base.aset_batch(dirty)
+        self._mutation_tracker.discard(*keys)
 
     """
     v2 Mutation Tracking
     """
-    # TODO: deal with atomicity across multiple threads/processes/workers
+    # The context lock is coarse. Prefer `update_in_place` / `compare_and_set`
+    # for atomic updates of single keys across threads/processes/workers
 
     def _enter_context(self, timeout: Optional[float] = None, blocking: Optional[bool] = True, **kwargs) -> bool:
         """
@@ -749,6 +908,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         autologger.info(f'Exiting Context: {self.name}/{self.base_key}')
         autologger.info(self._temporal_dict, prefix = self.base_key, colored = True)
+        self._invalidate(*self._temporal_dict.keys())
         self.base.set_batch(self._temporal_dict)
         self._temporal_dict.clear()
         self.base.release_lock()
@@ -784,6 +944,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         autologger.info(f'Exiting Context: {self.name}/{self.base_key}')
         autologger.info(self._temporal_dict, prefix = self.base_key, colored = True)
+        self._invalidate(*self._temporal_dict.keys())
         await self.base.aset_batch(self._temporal_dict)
         self._temporal_dict.clear()
         await self.base.release_alock()
@@ -826,6 +987,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         autologger.info(f'__setitem__ {key} {value}')
         if key in self._mutation_tracker:
             self._clear_from_mutation_tracker(key)
+        self._invalidate(key)
         return self.base.__setitem__(key, value)
         
     def __delitem__(self, key):
@@ -840,6 +1002,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         autologger.info(f'__delitem__ {key}')
         if key in self._mutation_tracker:
             self._clear_from_mutation_tracker(key)
+        self._invalidate(key)
         return self.base.__delitem__(key)
         
     def __contains__(self, key: KT):
@@ -914,14 +1077,38 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Migrates the compression
         """
+        self._invalidate()
         return self.base.migrate_compression(**kwargs)
 
     async def amigrate_compression(self, **kwargs):
         """
         Migrates the compression
         """
+        self._invalidate()
         return await self.base.amigrate_compression(**kwargs)
     
+    def train_compression_dictionary(self, sample_size: Optional[int] = 1000, dict_size: Optional[int] = None, migrate: Optional[bool] = False, **kwargs) -> int:
+        """
+        Trains a compression dictionary from a sample of the stored values
+        and stores it alongside the data
+
+        - Requires the `zstd_dict` compression
+        - If `migrate` is True, all values are re-compressed with the new dictionary
+        """
+        if migrate: self._invalidate()
+        return self.base.train_compression_dictionary(sample_size = sample_size, dict_size = dict_size, migrate = migrate, **kwargs)
+
+    async def atrain_compression_dictionary(self, sample_size: Optional[int] = 1000, dict_size: Optional[int] = None, migrate: Optional[bool] = False, **kwargs) -> int:
+        """
+        Trains a compression dictionary from a sample of the stored values
+        and stores it alongside the data
+
+        - Requires the `zstd_dict` compression
+        - If `migrate` is True, all values are re-compressed with the new dictionary
+        """
+        if migrate: self._invalidate()
+        return await self.base.atrain_compression_dictionary(sample_size = sample_size, dict_size = dict_size, migrate = migrate, **kwargs)
+
     def flush(self, *keys: str):
         """
         Finalize any in-memory objects
@@ -960,12 +1147,14 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Loads the Data
         """
+        self._invalidate()
         self.base.load_data_raw(data, includes_base_key = includes_base_key, **kwargs)
 
     async def aload_data_raw(self, data: Dict[str, Any], includes_base_key: Optional[bool] = False, **kwargs):
         """
         Loads the Data
         """
+        self._invalidate()
         await self.base.aload_data_raw(data, includes_base_key = includes_base_key, **kwargs)
 
 
@@ -985,12 +1174,14 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Replicates the Data
         """
+        self._invalidate()
         self.base.replicate_from(source, **kwargs)
 
     async def areplicate_from(self, source: Any, **kwargs):
         """
         Replicates the Data
         """
+        self._invalidate()
         await self.base.areplicate_from(source, **kwargs)
 
     
@@ -1002,24 +1193,28 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Increments the value of the key by the given amount
         """
+        self._invalidate(key)
         return self.base.incr(key, amount = amount, **kwargs)
     
     async def aincr(self, key: KT, amount: Union[int, float] = 1, **kwargs) -> Union[int, float]:
         """
         Increments the value of the key by the given amount
         """
+        self._invalidate(key)
         return await self.base.aincr(key, amount = amount, **kwargs)
     
     def decr(self, key: KT, amount: Union[int, float] = 1, **kwargs) -> Union[int, float]:
         """
         Decrements the value of the key by the given amount
         """
+        self._invalidate(key)
         return self.base.decr(key, amount = amount, **kwargs)
     
     async def adecr(self, key: KT, amount: Union[int, float] = 1, **kwargs) -> Union[int, float]:
         """
         Decrements the value of the key by the given amount
         """
+        self._invalidate(key)
         return await self.base.adecr(key, amount = amount, **kwargs)
     
 
@@ -1031,12 +1226,14 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Adds the value to the set
         """
+        self._invalidate(key)
         return self.base.sadd(key, *values, **kwargs)
     
     async def asadd(self, key: KT, *value: Any, **kwargs) -> int:
         """
         Adds the value to the set
         """
+        self._invalidate(key)
         return await self.base.asadd(key, *value, **kwargs)
     
     def slength(self, key: KT, **kwargs) -> int:
@@ -1092,25 +1289,29 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Removes the value from the set
         """
+        self._invalidate(key)
         return self.base.srem(key, *values, **kwargs)
     
     async def asrem(self, key: KT, *values: Any, **kwargs) -> int:
         """
         Removes the value from the set
         """
+        self._invalidate(key)
         return await self.base.asrem(key, *values, **kwargs)
     
     def spop(self, key: KT, **kwargs) -> Any:
         """
         Removes and returns a random member of the set
         """
+        self._invalidate(key)
         return self.base.spop(key, **kwargs)
     
     async def aspop(self, key: KT, **kwargs) -> Any:
         """
         Removes and returns a random member of the set
         """
-        return await self.base.aspop(key, **kwargs) 
+        self._invalidate(key)
+        return await self.base.aspop(key, **kwargs)
     
     """
     Copy Methods
@@ -1153,6 +1354,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Migrates the schema
         """
+        self._invalidate()
         self.base.migrate_schema(schema_map, overwrite = overwrite, **kwargs)
 
 
@@ -1160,6 +1362,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Migrates the schema
         """
+        self._invalidate()
         await self.base.amigrate_schema(schema_map, overwrite = overwrite, **kwargs)
 
 
@@ -1221,6 +1424,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Clones the data from the target PersistentDict to a current PersistentDict
         """
+        self._invalidate()
         return self.base.clone_from(target = target, target_base_key = target_base_key, schema_map = schema_map, overwrite = overwrite, **kwargs)
 
     @overload
@@ -1255,6 +1459,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Clones the data from the target PersistentDict to a current PersistentDict
         """
+        self._invalidate()
         return await self.base.aclone_from(target = target, target_base_key = target_base_key, schema_map = schema_map, overwrite = overwrite, **kwargs)
 
     
@@ -1300,6 +1505,7 @@ class PersistentDict(collections.abc.MutableMapping, MutableMapping[KT, VT]):
         """
         Calls the method
         """
+        self._invalidate()
         return getattr(self.base, method)(*args, **kwargs)
 
 
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+"""
+Mutation Tracking
+
+Dirty-flag containers used by `PersistentDict.track_changes` to detect
+in-place mutations of the values it hands out without hashing them.
+
+- `dict`, `list` and `set` values are replaced with subclasses that flag
+  their root key as dirty on any mutating call. Nested containers are
+  wrapped lazily when they are accessed.
+- Pydantic models keep their class. Their container fields are wrapped,
+  and reassigned fields are detected by comparing the field values by identity.
+- Any other mutable object cannot be observed, so its root key is always
+  considered dirty.
+"""
+
+import datetime
+from enum import Enum
+from uuid import UUID
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Set, Tuple, Iterable, TypeVar
+
+KT = TypeVar('KT')
+
+_MISSING = object()
+
+ImmutableTypes = (
+    str, bytes, int, float, bool, complex, type(None),
+    datetime.datetime, datetime.date, datetime.time, datetime.timedelta,
+    Enum, UUID, Decimal, frozenset,
+)
+
+
+class KeyTracker:
+    """
+    Tracks the mutations of a single root key
+    """
+
+    __slots__ = ('key', 'dirty', 'models', 'opaque')
+
+    def __init__(self, key: Any, dirty: Set[Any]):
+        """
+        Initializes the Key Tracker
+        """
+        self.key = key
+        self.dirty = dirty
+        self.models: List[Tuple[BaseModel, Dict[str, Any]]] = []
+        self.opaque: bool = False
+
+    def mark(self) -> None:
+        """
+        Marks the root key as dirty
+        """
+        self.dirty.add(self.key)
+
+    def wrap(self, value: Any) -> Any:
+        """
+        Wraps the value so that mutations to it are tracked
+        """
+        cls = type(value)
+        if cls is dict: return TrackedDict(value, self)
+        if cls is list: return TrackedList(value, self)
+        if cls is set: return TrackedSet(value, self)
+        if cls in _TrackedTypes or isinstance(value, ImmutableTypes): return value
+        if isinstance(value, BaseModel):
+            self.track_model(value)
+            return value
+        if cls is tuple:
+            if any(not isinstance(item, ImmutableTypes) for item in value): self.opaque = True
+            return value
+        self.opaque = True
+        return value
+
+    def track_model(self, model: BaseModel) -> None:
+        """
+        Wraps the container fields of the model and records
+        the identity of its fields to detect reassignments
+        """
+        fields = model.__dict__
+        for name, value in fields.items():
+            tracked = self.wrap(value)
+            if tracked is not value: fields[name] = tracked
+        self.models.append((model, fields.copy()))
+
+    def is_dirty(self) -> bool:
+        """
+        Returns True if the root key has been mutated
+        """
+        if self.opaque or self.key in self.dirty: return True
+        for model, snapshot in self.models:
+            fields = model.__dict__
+            if len(fields) != len(snapshot): return True
+            for name, value in snapshot.items():
+                if fields.get(name, _MISSING) is not value: return True
+        return False
+
+
+class TrackedDict(dict):
+    """
+    A `dict` that flags its root key as dirty when it is mutated
+    """
+
+    __slots__ = ('_tracker',)
+
+    def __init__(self, data: Dict[Any, Any], tracker: KeyTracker):
+        """
+        Initializes the Tracked Dict
+        """
+        dict.__init__(self, data)
+        self._tracker = tracker
+
+    def _wrap_item(self, key: Any, value: Any) -> Any:
+        """
+        Wraps a nested value in place
+        """
+        tracked = self._tracker.wrap(value)
+        if tracked is not value: dict.__setitem__(self, key, tracked)
+        return tracked
+
+    def _wrap_all(self) -> None:
+        """
+        Wraps all the nested values in place
+        """
+        for key, value in dict.items(self):
+            self._wrap_item(key, value)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._wrap_item(key, dict.__getitem__(self, key))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = dict.get(self, key, _MISSING)
+        return default if value is _MISSING else self._wrap_item(key, value)
+
+    def values(self):
+        self._wrap_all()
+        return dict.values(self)
+
+    def items(self):
+        self._wrap_all()
+        return dict.items(self)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        dict.__setitem__(self, key, value)
+        self._tracker.mark()
+
+    def __delitem__(self, key: Any) -> None:
+        dict.__delitem__(self, key)
+        self._tracker.mark()
+
+    def __ior__(self, other: Any) -> 'TrackedDict':
+        dict.update(self, other)
+        self._tracker.mark()
+        return self
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            dict.__setitem__(self, key, default)
+            self._tracker.mark()
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        dict.update(self, *args, **kwargs)
+        self._tracker.mark()
+
+    def pop(self, key: Any, *args) -> Any:
+        value = dict.pop(self, key, _MISSING)
+        if value is _MISSING:
+            if args: return args[0]
+            raise KeyError(key)
+        self._tracker.mark()
+        return value
+
+    def popitem(self) -> Tuple[Any, Any]:
+        item = dict.popitem(self)
+        self._tracker.mark()
+        return item
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self._tracker.mark()
+
+    def __reduce_ex__(self, protocol: int):
+        # Pickle and copy as a plain `dict`
+        return (dict, (dict.copy(self),))
+
+
+class TrackedList(list):
+    """
+    A `list` that flags its root key as dirty when it is mutated
+    """
+
+    __slots__ = ('_tracker',)
+
+    def __init__(self, data: Iterable[Any], tracker: KeyTracker):
+        """
+        Initializes the Tracked List
+        """
+        list.__init__(self, data)
+        self._tracker = tracker
+
+    def __getitem__(self, index: Any) -> Any:
+        value = list.__getitem__(self, index)
+        if isinstance(index, slice): return value
+        tracked = self._tracker.wrap(value)
+        if tracked is not value: list.__setitem__(self, index, tracked)
+        return tracked
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        list.__setitem__(self, index, value)
+        self._tracker.mark()
+
+    def __delitem__(self, index: Any) -> None:
+        list.__delitem__(self, index)
+        self._tracker.mark()
+
+    def __iadd__(self, other: Iterable[Any]) -> 'TrackedList':
+        list.extend(self, other)
+        self._tracker.mark()
+        return self
+
+    def __imul__(self, n: int) -> 'TrackedList':
+        list.__imul__(self, n)
+        self._tracker.mark()
+        return self
+
+    def append(self, value: Any) -> None:
+        list.append(self, value)
+        self._tracker.mark()
+
+    def extend(self, values: Iterable[Any]) -> None:
+        list.extend(self, values)
+        self._tracker.mark()
+
+    def insert(self, index: int, value: Any) -> None:
+        list.insert(self, index, value)
+        self._tracker.mark()
+
+    def pop(self, index: int = -1) -> Any:
+        value = list.pop(self, index)
+        self._tracker.mark()
+        return value
+
+    def remove(self, value: Any) -> None:
+        list.remove(self, value)
+        self._tracker.mark()
+
+    def clear(self) -> None:
+        list.clear(self)
+        self._tracker.mark()
+
+    def sort(self, *args, **kwargs) -> None:
+        list.sort(self, *args, **kwargs)
+        self._tracker.mark()
+
+    def reverse(self) -> None:
+        list.reverse(self)
+        self._tracker.mark()
+
+    def __reduce_ex__(self, protocol: int):
+        # Pickle and copy as a plain `list`
+        return (list, (list.copy(self),))
+
+
+class TrackedSet(set):
+    """
+    A `set` that flags its root key as dirty when it is mutated
+    """
+
+    __slots__ = ('_tracker',)
+
+    def __init__(self, data: Iterable[Any], tracker: KeyTracker):
+        """
+        Initializes the Tracked Set
+        """
+        set.__init__(self, data)
+        self._tracker = tracker
+
+    def _mutate(self, method: str, *args) -> Any:
+        result = getattr(set, method)(self, *args)
+        self._tracker.mark()
+        return result
+
+    def add(self, value: Any) -> None: self._mutate('add', value)
+    def discard(self, value: Any) -> None: self._mutate('discard', value)
+    def remove(self, value: Any) -> None: self._mutate('remove', value)
+    def pop(self) -> Any: return self._mutate('pop')
+    def clear(self) -> None: self._mutate('clear')
+    def update(self, *others: Iterable[Any]) -> None: self._mutate('update', *others)
+    def difference_update(self, *others: Iterable[Any]) -> None: self._mutate('difference_update', *others)
+    def intersection_update(self, *others: Iterable[Any]) -> None: self._mutate('intersection_update', *others)
+    def symmetric_difference_update(self, other: Iterable[Any]) -> None: self._mutate('symmetric_difference_update', other)
+
+    def __ior__(self, other: Any) -> 'TrackedSet':
+        self._mutate('__ior__', other)
+        return self
+
+    def __iand__(self, other: Any) -> 'TrackedSet':
+        self._mutate('__iand__', other)
+        return self
+
+    def __isub__(self, other: Any) -> 'TrackedSet':
+        self._mutate('__isub__', other)
+        return self
+
+    def __ixor__(self, other: Any) -> 'TrackedSet':
+        self._mutate('__ixor__', other)
+        return self
+
+    def __reduce_ex__(self, protocol: int):
+        # Pickle and copy as a plain `set`
+        return (set, (set(set.__iter__(self)),))
+
+
+_TrackedTypes = (TrackedDict, TrackedList, TrackedSet)
+
+
+class MutationTracker:
+    """
+    Holds the values handed out by `PersistentDict` and tracks
+    which of their root keys have been mutated since they were loaded
+    """
+
+    def __init__(self):
+        """
+        Initializes the Mutation Tracker
+        """
+        self.values: Dict[Any, Any] = {}
+        self.trackers: Dict[Any, KeyTracker] = {}
+        self.dirty: Set[Any] = set()
+
+    def track(self, key: KT, value: Any) -> Any:
+        """
+        Starts tracking the value and returns the tracked value
+        """
+        tracker = KeyTracker(key, self.dirty)
+        value = tracker.wrap(value)
+        self.values[key] = value
+        self.trackers[key] = tracker
+        return value
+
+    def is_dirty(self, key: KT) -> bool:
+        """
+        Returns True if the value of the key has been mutated
+        """
+        tracker = self.trackers.get(key)
+        return tracker is not None and tracker.is_dirty()
+
+    def get_dirty(self, *keys: KT) -> Dict[KT, Any]:
+        """
+        Returns the mutated values for the keys, or for all tracked keys
+        """
+        keys = keys or self.values.keys()
+        return {
+            key: self.values[key]
+            for key in keys
+            if key in self.trackers and self.trackers[key].is_dirty()
+        }
+
+    def discard(self, *keys: KT) -> None:
+        """
+        Stops tracking the keys, or all keys if none are provided
+        """
+        if not keys: return self.clear()
+        for key in keys:
+            self.values.pop(key, None)
+            self.trackers.pop(key, None)
+            self.dirty.discard(key)
+
+    def clear(self) -> None:
+        """
+        Stops tracking all keys
+        """
+        self.values.clear()
+        self.trackers.clear()
+        self.dirty.clear()
+
+    def __getitem__(self, key: KT) -> Any:
+        return self.values[key]
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self.values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __bool__(self) -> bool:
+        return bool(self.values)
+
+    def keys(self) -> Iterable[KT]:
+        return self.values.keys()
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+"""
+Near Cache
+
+A bounded, in-process LRU cache with per-key TTL that `PersistentDict`
+can place in front of any backend.
+
+- Values are stored in their encoded form, so every hit decodes a fresh
+  object and callers can never mutate the cached copy
+- Size is accounted in bytes of the encoded values
+- Entries are invalidated by writes made through the owning `PersistentDict`
+  and optionally by the backend (e.g. Redis keyspace notifications)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+MISSING = object()
+
+
+class NearCache:
+    """
+    Bounded LRU + TTL cache for encoded values
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = 1024,
+        max_bytes: Optional[int] = 1024 * 1024 * 64, # 64mb
+        ttl: Optional[float] = None,
+        remote_invalidation: Optional[bool] = False,
+        **kwargs,
+    ):
+        """
+        Initializes the Near Cache
+
+        Args:
+            max_size (int, optional): The maximum number of entries. Defaults to 1024.
+            max_bytes (int, optional): The maximum total size of the encoded values. Defaults to 64mb.
+            ttl (float, optional): The default time-to-live of an entry in seconds. Defaults to None (no expiry).
+            remote_invalidation (bool, optional): Whether to subscribe to invalidation events
+                from the backend when it supports them. Defaults to False.
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.remote_invalidation = remote_invalidation
+        self._kwargs = kwargs
+        self._data: 'OrderedDict[Any, Tuple[Union[str, bytes], Optional[float], int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: Any) -> Any:
+        """
+        Returns the encoded value or `MISSING`
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                self._pop(key)
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Any, value: Union[str, bytes], ttl: Optional[float] = None) -> None:
+        """
+        Stores the encoded value
+        """
+        size = len(value)
+        if self.max_bytes is not None and size > self.max_bytes: return
+        ttl = ttl if ttl is not None else self.ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._data: self._pop(key)
+            self._data[key] = (value, expires_at, size)
+            self.size_bytes += size
+            while self._data and (
+                (self.max_size is not None and len(self._data) > self.max_size) or \
+                (self.max_bytes is not None and self.size_bytes > self.max_bytes)
+            ):
+                _, (_, _, evicted_size) = self._data.popitem(last = False)
+                self.size_bytes -= evicted_size
+                self.evictions += 1
+
+    def _pop(self, key: Any) -> None:
+        """
+        Removes the entry
+
+        - Should be called while holding the lock
+        """
+        entry = self._data.pop(key, None)
+        if entry is not None: self.size_bytes -= entry[2]
+
+    def invalidate(self, *keys: Any) -> None:
+        """
+        Invalidates the keys, or everything if no keys are provided
+        """
+        if not keys: return self.clear()
+        with self._lock:
+            for key in keys:
+                self._pop(key)
+
+    def clear(self) -> None:
+        """
+        Clears the cache
+        """
+        with self._lock:
+            self._data.clear()
+            self.size_bytes = 0
+
+    def reset_stats(self) -> None:
+        """
+        Resets the hit/miss counters
+        """
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Returns the cache statistics
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'size_bytes': self.size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def __contains__(self, key: Any) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f'<NearCache size={len(self._data)}, size_bytes={self.size_bytes}, hits={self.hits}, misses={self.misses}>'
@@ -5,9 +5,11 @@ from __future__ import annotations
 import abc
 import atexit
 import contextlib
+import copy
 import os
 import pathlib
 import tempfile
+import threading
 import typing as t
 
 from lzl import load
@@ -24,8 +26,25 @@ if t.TYPE_CHECKING:
 MutableMappingT = dict[str, t.Any]
 
 
+def _copy_value(value: t.Any) -> t.Any:
+    """Return a copy of ``value`` that does not share containers with the cache."""
+
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return copy.deepcopy(value)
+
+
 class TemporaryData(abc.ABC):
-    """Dictionary-like interface backed by an auto-cleaned JSON file."""
+    """Dictionary-like interface backed by an auto-cleaned JSON file.
+
+    The parsed payload is kept in memory and only re-read when the file's
+    mtime, size or inode change. Appends (``append``/``has_logged``) are
+    written through under the file lock so they deduplicate across processes.
+    When ``flush_interval`` is set (and the store is not multithreaded) they
+    are instead buffered in-process and written together ``flush_interval``
+    seconds after the first pending append, on :meth:`flush`, on the next
+    write and at exit.
+    """
 
     def __init__(
         self,
@@ -33,6 +52,7 @@ class TemporaryData(abc.ABC):
         filedir: pathlib.Path | None = None,
         is_multithreaded: bool | None = False,
         timeout: int | None = 10,
+        flush_interval: float | None = None,
     ) -> None:
         """Prepare the on-disk file and optional file lock used by the store."""
 
@@ -51,6 +71,12 @@ class TemporaryData(abc.ABC):
         self.timeout = timeout
         self.is_multithreaded = bool(is_multithreaded)
         self._filelock: "SoftFileLock | None" = None
+        self.flush_interval = flush_interval or 0.0
+        self._lock = threading.RLock()
+        self._cache: MutableMappingT | None = None
+        self._cache_stat: tuple[int, int, int] | None = None
+        self._pending: dict[str, list[t.Any]] = {}
+        self._flush_timer: threading.Timer | None = None
         from lzl.io.ser import get_serializer
 
         self.serializer = get_serializer("json")
@@ -73,6 +99,7 @@ class TemporaryData(abc.ABC):
                     if self.is_multithreaded and not data.get("process_id"):
                         data["process_id"] = os.getpid()
                         self.filepath.write_text(self.serializer.dumps(data, indent=2))
+                    self._cache, self._cache_stat = data, self._stat()
                 atexit.register(self.cleanup_on_exit)
             except Exception as exc:  # pragma: no cover - logging path
                 from lazyops.libs.logging import logger as lazy_logger
@@ -88,54 +115,118 @@ class TemporaryData(abc.ABC):
             self.filepath.write_text("{}")
         return self.serializer.loads(self.filepath.read_text())
 
-    @property
-    def data(self) -> MutableMappingT:
-        """Return the current JSON payload guarded by the file lock."""
+    def _stat(self) -> tuple[int, int, int] | None:
+        """Return the ``(mtime_ns, size, inode)`` signature of the JSON file."""
 
         try:
-            with self.filelock.acquire():
-                return self._load_data()
-        except filelock.Timeout as exc:  # pragma: no cover - timing dependent
-            from lazyops.libs.logging import logger as lazy_logger
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _is_cache_valid(self) -> bool:
+        """Return ``True`` when the in-memory payload matches the file on disk."""
+
+        return self._cache is not None and self._cache_stat is not None and self._stat() == self._cache_stat
+
+    def _apply_pending(self, data: MutableMappingT) -> None:
+        """Merge the buffered appends into ``data``."""
+
+        for key, values in self._pending.items():
+            current = data.setdefault(key, [])
+            current.extend(value for value in values if value not in current)
+
+    def _refresh(self) -> MutableMappingT:
+        """Re-read the file (while holding the file lock) unless the cache is current."""
+
+        if not self._is_cache_valid():
+            data = self._load_data()
+            self._cache_stat = self._stat()
+            self._apply_pending(data)
+            self._cache = data
+        return self._cache
+
+    def _write(self, data: MutableMappingT) -> None:
+        """Write ``data`` (while holding the file lock) and mark the buffer as flushed."""
+
+        self.filepath.write_text(self.serializer.dumps(data, indent=2))
+        self._cache = data
+        self._cache_stat = self._stat()
+        self._pending.clear()
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    def _read(self) -> MutableMappingT:
+        """Return the cached payload, re-reading the file only when it changed."""
+
+        with self._lock:
+            if self._is_cache_valid():
+                return self._cache
+            try:
+                with self.filelock.acquire():
+                    return self._refresh()
+            except filelock.Timeout as exc:  # pragma: no cover - timing dependent
+                from lazyops.libs.logging import logger as lazy_logger
 
-            lazy_logger.trace(f"Filelock timeout for {self.filepath}")
-            raise exc
+                lazy_logger.trace(f"Filelock timeout for {self.filepath}")
+                raise exc
+
+    @property
+    def data(self) -> MutableMappingT:
+        """Return a copy of the current JSON payload."""
+
+        with self._lock:
+            return copy.deepcopy(self._read())
 
     @contextlib.contextmanager
     def ctx(self) -> t.Generator[MutableMappingT, None, None]:
         """Context manager yielding mutable JSON data with automatic flush."""
 
         try:
-            with self.filelock.acquire():
-                data = self._load_data()
+            with self._lock, self.filelock.acquire():
+                data = self._refresh()
                 try:
                     yield data
                 finally:
-                    self.filepath.write_text(self.serializer.dumps(data, indent=2))
+                    self._write(data)
         except filelock.Timeout as exc:  # pragma: no cover - timing dependent
             logger.trace(f"Filelock timeout for {self.filepath}", exc)
             raise exc
 
+    def flush(self) -> None:
+        """Write the buffered appends to disk."""
+
+        with self._lock:
+            if not self._pending:
+                return
+            with self.ctx():
+                pass
+
     def get(self, key: str, default: t.Any | None = None) -> t.Any:
-        """Return ``data[key]`` if present, otherwise ``default``."""
+        """Return a copy of ``data[key]`` if present, otherwise ``default``."""
 
-        return self.data.get(key, default)
+        with self._lock:
+            data = self._read()
+            if key not in data:
+                return default
+            return _copy_value(data[key])
 
     def __contains__(self, key: str) -> bool:
         """Return ``True`` when ``key`` exists in the cached data."""
 
-        return key in self.data
+        return key in self._read()
 
     def __getitem__(self, key: str) -> t.Any:
-        """Return the value stored for ``key`` or ``None`` when missing."""
+        """Return a copy of the value stored for ``key`` or ``None`` when missing."""
 
-        return self.data.get(key)
+        return self.get(key)
 
     def __setitem__(self, key: str, value: t.Any) -> None:
         """Persist ``value`` under ``key`` and flush to disk immediately."""
 
         with self.ctx() as data:
-            data[key] = value
+            data[key] = _copy_value(value)
 
     def __delitem__(self, key: str) -> None:
         """Remove ``key`` from the stored data."""
@@ -146,12 +237,12 @@ class TemporaryData(abc.ABC):
     def __iter__(self) -> t.Iterator[str]:
         """Return an iterator over stored keys."""
 
-        return iter(self.data)
+        return iter(self.keys())
 
     def __len__(self) -> int:
         """Return the number of stored keys."""
 
-        return len(self.data)
+        return len(self._read())
 
     def __repr__(self) -> str:  # pragma: no cover - convenience method
         return repr(self.data)
@@ -162,7 +253,7 @@ class TemporaryData(abc.ABC):
     def __bool__(self) -> bool:
         """Return ``True`` when the store contains at least one value."""
 
-        return bool(self.data)
+        return bool(self._read())
 
     def __eq__(self, other: t.Any) -> bool:
         """Compare the stored data with an arbitrary object."""
@@ -172,14 +263,19 @@ class TemporaryData(abc.ABC):
     def keys(self) -> t.Set[str]:
         """Return the set-like view of stored keys."""
 
-        return self.data.keys()
+        with self._lock:
+            return dict.fromkeys(self._read()).keys()
 
     def setdefault(self, key: str, default: t.Any) -> t.Any:
         """Return ``data[key]`` if present, otherwise persist and return ``default``."""
 
+        with self._lock:
+            data = self._read()
+            if key in data:
+                return _copy_value(data[key])
         with self.ctx() as data:
             value = data.setdefault(key, default)
-        return value
+        return _copy_value(value)
 
     def close(self) -> None:
         """Release the file lock safeguarding the JSON payload."""
@@ -187,15 +283,30 @@ class TemporaryData(abc.ABC):
         self.filelock.release()
 
     def append(self, key: str, value: t.Any) -> bool:
-        """Append ``value`` to the list stored at ``key`` if it is unique."""
-
-        with self.ctx() as data:
-            if key not in data:
-                data[key] = []
-            if value not in data[key]:
-                data[key].append(value)
+        """Append ``value`` to the list stored at ``key`` if it is unique.
+
+        Returns ``True`` when ``value`` was already present. The append is
+        written under the file lock unless buffering is enabled.
+        """
+
+        with self._lock:
+            current = self._read().get(key)
+            if current is not None and value in current:
+                return True
+            if self.flush_interval and not self.is_multithreaded:
+                self._pending.setdefault(key, []).append(value)
+                self._cache.setdefault(key, []).append(value)
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
                 return False
-        return True
+            with self.ctx() as data:
+                current = data.setdefault(key, [])
+                if value in current:
+                    return True
+                current.append(value)
+        return False
 
     def cleanup_on_exit(self) -> None:
         """Remove the persisted files when the interpreter shuts down."""
@@ -203,6 +314,8 @@ class TemporaryData(abc.ABC):
         if not self.filepath.exists() and not self.filelock_path.exists():
             return
         if self.is_multithreaded and self["process_id"] != os.getpid():
+            with contextlib.suppress(Exception):
+                self.flush()
             return
         with contextlib.suppress(Exception):
             self.close()
@@ -26,8 +26,10 @@ from .utils import (
     deserialize_object,
     get_object_class,
     get_object_classname,
+    register_object_serializer,
     register_schema_mapping,
     serialize_object,
+    unregister_object_serializer,
 )
 from ._json import JsonSerializer
 from ._msgpack import MsgPackSerializer
@@ -213,6 +215,8 @@ __all__ = [
     "serialize_object",
     "deserialize_object",
     "register_schema_mapping",
+    "register_object_serializer",
+    "unregister_object_serializer",
     "get_object_class",
     "get_object_classname",
     "create_object_hash",
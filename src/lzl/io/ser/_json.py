@@ -4,6 +4,7 @@ from typing import Any, Dict, Optional, Union, Type, Tuple, TYPE_CHECKING
 from lzl.load import lazy_import
 from .base import BaseSerializer, ObjectValue, SchemaType, SerializableObject, BaseModel, logger, ThreadPool, ModuleType
 from .utils import serialize_object, SerMode
+from .models import get_model_codec, get_codec_by_name, split_envelope
 from .defaults import default_json, JsonLibT
 
 class JsonSerializer(BaseSerializer):
@@ -14,6 +15,7 @@ class JsonSerializer(BaseSerializer):
     disable_object_serialization: Optional[bool] = False
     disable_nested_values: Optional[bool] = None
     allow_failed_import: Optional[bool] = False
+    stream_delimiter: Optional[bytes] = b'\n'
 
     def __init__(
         self, 
@@ -86,10 +88,26 @@ class JsonSerializer(BaseSerializer):
             mode = 'raw'
         return serialize_object(obj, mode = mode, **kwargs)
     
+    @property
+    def _use_model_codecs(self) -> bool:
+        """
+        Returns whether models can be encoded with their compiled codecs
+        """
+        return self.ser_mode != 'raw' and not self.disable_object_serialization and \
+            not self.disable_nested_values and not self.serialization_obj_kwargs
+
     def encode_value(self, value: Union[Any, SchemaType], mode: Optional[SerMode] = None, **kwargs) -> str:
         """
         Encode the value with the JSON Library
+
+        - Models are encoded with their compiled codec when no options are given
         """
+        if mode is None and not kwargs and self._use_model_codecs and \
+            (codec := get_model_codec(value.__class__)) is not None:
+            try:
+                return self.coerce_output_value(codec.encode_envelope(value).decode(self.encoding))
+            except Exception as e:
+                if not self._is_silenced: logger.trace(f'Error Encoding Model: |r|({type(value)})|e| {str(value)[:1000]}', e, colored = True)
         try:
             value_dict = self.serialize_obj(value, mode = mode, **kwargs, **self.serialization_obj_kwargs)
             encoded = self.jsonlib.dumps(value_dict, **kwargs)
@@ -127,6 +145,13 @@ class JsonSerializer(BaseSerializer):
         """
         if value is None: return None
         if isinstance(value, (str, bytes)):
+            if (envelope := split_envelope(value)) is not None:
+                # Models written by their compiled codec, falls back to the generic path on errors
+                try:
+                    codec = get_codec_by_name(envelope[0], schema_map = schema_map or self.schema_map)
+                    if codec is not None: return codec.from_json(envelope[1])
+                except Exception as e:
+                    if self._is_verbose: logger.info(f'Error Decoding Model: |r|{envelope[0]} {e}|e|', colored = True, prefix = self.jsonlib_name)
             try:
                 # value = self.check_encoded_value(value)
                 value = self.jsonlib.loads(value, **kwargs)
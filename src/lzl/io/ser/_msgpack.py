@@ -2,16 +2,29 @@ from __future__ import annotations
 
 """
 MsgPack Serializer
+
+Extension Types:
+- `2`: pydantic models as JSON with their `__class__`, see `lzl.io.ser.models`
+- `3`: numpy arrays and scalars as `<header length: u16><msgpack (dtype, shape)><raw buffer>`,
+  which are decoded with `np.frombuffer` as a read-only view of the payload without copying
 """
 
-from typing import Any, Dict, Optional, Union, Type, TypeVar
+import struct
+from typing import Any, Dict, Optional, Union, Tuple, Type, TypeVar
 from lzl.load import lazy_import
 from .base import BinaryBaseSerializer, BaseModel, ModuleType, SchemaType, ObjectValue, logger
 from .defaults import default_msgpack, MsgPackLibT, default_json, JsonLibT
+from .utils import np
+from .models import get_model_codec, get_codec_by_name, split_class
 
 
 MsgPackLibT = TypeVar("MsgPackLibT")
 
+MODEL_EXT_CODE = 2
+NDARRAY_EXT_CODE = 3
+
+_ndarray_header = struct.Struct('<H')
+
 class MsgPackSerializer(BinaryBaseSerializer):
     name: Optional[str] = "msgpack"
     encoding: Optional[str] = "utf-8"
@@ -66,10 +79,44 @@ class MsgPackSerializer(BinaryBaseSerializer):
         cls.msgpacklib = lib
         default_msgpack = lib
         
+    def encode_ndarray(self, obj: Union['np.ndarray', 'np.generic']) -> Any:
+        """
+        Encodes the numpy array or scalar as an extension type with its raw buffer
+
+        - Object and structured arrays are encoded as lists
+        """
+        if obj.dtype.hasobject or obj.dtype.fields is not None: return obj.tolist()
+        if isinstance(obj, np.ndarray):
+            shape = list(obj.shape)
+            obj = np.ascontiguousarray(obj)
+        else:
+            shape = None
+        header = self.msgpacklib.packb((obj.dtype.str, shape))
+        return self.msgpacklib.ExtType(NDARRAY_EXT_CODE, _ndarray_header.pack(len(header)) + header + obj.tobytes())
+
+    def decode_ndarray(self, data: bytes) -> Union['np.ndarray', 'np.generic']:
+        """
+        Decodes the numpy array or scalar without copying the buffer
+        """
+        (size,) = _ndarray_header.unpack_from(data)
+        offset = _ndarray_header.size + size
+        dtype, shape = self.msgpacklib.unpackb(data[_ndarray_header.size:offset], raw = False)
+        array = np.frombuffer(data, dtype = np.dtype(dtype), offset = offset)
+        if shape is None: return array[0]
+        return array.reshape(shape)
+
     def default_serialization_hook(self, obj: ObjectValue):
         """
         Default Serialization Hook
         """
+        if np is not None:
+            if isinstance(obj, (np.ndarray, np.generic)): 
+                return self.encode_ndarray(obj)
+            # Checks for torch / TF tensors without importing
+            if hasattr(obj, 'numpy') and hasattr(obj, 'shape'):
+                if hasattr(obj, 'detach'): obj = obj.detach().cpu()
+                return self.encode_ndarray(obj.numpy())
+
         if not isinstance(obj, BaseModel) and not hasattr(obj, 'model_dump'):
             logger.info(f'Invalid Object Type: |r|{type(obj)}|e| {obj}', colored = True, prefix = "msgpack")
             return obj
@@ -77,18 +124,30 @@ class MsgPackSerializer(BinaryBaseSerializer):
         if self.disable_object_serialization: 
             return obj.model_dump_json(**self.serialization_obj_kwargs)
 
+        if not self.serialization_obj_kwargs and (codec := get_model_codec(obj.__class__)) is not None:
+            return self.msgpacklib.ExtType(MODEL_EXT_CODE, codec.encode_with_class(obj))
+
         obj_class_name = self.fetch_object_classname(obj)
         if obj_class_name not in self.serialization_schemas:
             self.serialization_schemas[obj_class_name] = obj.__class__
         data = obj.model_dump(mode = 'json', **self.serialization_obj_kwargs)
         data['__class__'] = obj_class_name
-        return self.msgpacklib.ExtType(2, self.jsonlib.dumps(data).encode(self.encoding))
+        return self.msgpacklib.ExtType(MODEL_EXT_CODE, self.jsonlib.dumps(data).encode(self.encoding))
     
     def default_deserialization_hook(self, code: int, data: Union[str, bytes]) -> ObjectValue:
         """
         Default Deserialization Hook
         """
-        if code != 2: return data
+        if code == NDARRAY_EXT_CODE and np is not None: return self.decode_ndarray(data)
+        if code != MODEL_EXT_CODE: return data
+        if not self.disable_object_serialization and not self.serialization_obj_kwargs and \
+            isinstance(data, bytes) and (split := split_class(data)) is not None:
+            # Models written by their compiled codec, falls back to the generic path on errors
+            try:
+                codec = get_codec_by_name(split[0], schema_map = self.schema_map)
+                if codec is not None: return codec.from_json(split[1])
+            except Exception as e:
+                logger.info(f'Error Decoding Model: |r|{split[0]} {e}|e|', colored = True, prefix = "msgpack")
         if isinstance(data, bytes): data = data.decode(self.encoding)
         try:
             data = self.jsonlib.loads(data)
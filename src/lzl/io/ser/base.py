@@ -6,6 +6,7 @@ Base Serializers
 
 import abc
 import zlib
+import asyncio
 from lzl.logging import logger
 from lzl.pool import ThreadPool
 from lzl.types import BaseModel
@@ -20,12 +21,14 @@ from .utils import (
     serialize_object,
     deserialize_object,
 )
-from typing import Any, Optional, Union, Dict, TypeVar, Type, List, TYPE_CHECKING
+from .streams import FrameEncoder, FrameDecoder, DEFAULT_STREAM_CHUNK_SIZE
+from typing import Any, Optional, Union, Dict, TypeVar, Type, List, Iterable, Iterator, AsyncIterable, AsyncIterator, Callable, TYPE_CHECKING
 from types import ModuleType
 
 
 if TYPE_CHECKING:
     from ..compression import CompressionT
+    from ..file import PathLike
 
 
 class BaseSerializer(abc.ABC):
@@ -40,6 +43,8 @@ class BaseSerializer(abc.ABC):
     enforce_string_value: Optional[bool] = False
     enforce_byte_value: Optional[bool] = False
     ser_mode: Optional[SerMode] = 'auto'
+    batch_chunk_size: Optional[int] = 2048
+    stream_delimiter: Optional[bytes] = None
     _is_ser: Optional[bool] = True
 
     def __init__(
@@ -75,6 +80,7 @@ class BaseSerializer(abc.ABC):
         if enforce_string_value is not None: self.enforce_string_value = enforce_string_value
         if enforce_byte_value is not None: self.enforce_byte_value = enforce_byte_value
         if ser_mode is not None: self.ser_mode = ser_mode
+        if kwargs.get('batch_chunk_size') is not None: self.batch_chunk_size = kwargs.pop('batch_chunk_size')
         self.schema_map = schema_map
         self.raise_errors = raise_errors
         self._kwargs = kwargs
@@ -229,6 +235,201 @@ class BaseSerializer(abc.ABC):
         """
         return await ThreadPool.run_async(self.decode, value, **kwargs)
     
+    def encode_many(self, values: Iterable[ObjectValue], return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[str, bytes, Exception]]:
+        """
+        Encodes the values
+
+        - The compressor processes the whole batch at once
+        - If `return_exceptions` is True, values that fail to encode are
+          returned as the raised exception instead of failing the batch
+        """
+        results: List[Union[str, bytes, Exception]] = []
+        for value in values:
+            try:
+                results.append(self.encode_value(value, **kwargs))
+            except Exception as e:
+                if not return_exceptions: raise e
+                results.append(e)
+        if self.compression_enabled:
+            idxs = [n for n, value in enumerate(results) if not isinstance(value, Exception)]
+            compressed = self.compressor.compress_many([
+                results[n].encode(self.encoding) if isinstance(results[n], str) else results[n] for n in idxs
+            ])
+            for n, value in zip(idxs, compressed):
+                results[n] = value
+        return [value if isinstance(value, Exception) else self.coerce_output_value(value) for value in results]
+
+    def decompress_many(self, values: Iterable[Union[str, bytes]], **kwargs) -> List[Optional[Union[str, bytes]]]:
+        """
+        Decompresses the values
+
+        - `None` values are returned as `None`
+        """
+        values = list(values)
+        if not self.compression_enabled: return values
+        idxs = [n for n, value in enumerate(values) if value is not None]
+        results: List[Optional[Union[str, bytes]]] = [None] * len(values)
+        for n, value in zip(idxs, self.compressor.decompress_many([values[n] for n in idxs], **kwargs)):
+            if value is not None and not self.binary: value = value.decode(self.encoding)
+            results[n] = value
+        return results
+
+    def decode_many(self, values: Iterable[Union[str, bytes]], return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[ObjectValue, Exception]]:
+        """
+        Decodes the values
+
+        - `None` values are returned as `None`
+        - If the batch cannot be decompressed at once (e.g. some values were
+          written with a previous compressor), each value is decoded individually
+        - If `return_exceptions` is True, values that fail to decode are
+          returned as the raised exception instead of failing the batch
+        """
+        values = list(values)
+        try:
+            decompressed = self.decompress_many(values, **kwargs)
+        except Exception:
+            decompressed = None
+        results: List[Union[ObjectValue, Exception]] = []
+        for n, value in enumerate(values):
+            if value is None:
+                results.append(None)
+                continue
+            try:
+                results.append(self.decode(value, **kwargs) if decompressed is None else self.decode_value(decompressed[n], **kwargs))
+            except Exception as e:
+                if not return_exceptions: raise e
+                results.append(e)
+        return results
+
+    async def _arun_chunked(self, func: Callable[..., List[Any]], values: Iterable[Any], **kwargs) -> List[Any]:
+        """
+        Runs the batch function in the executor
+
+        - Small batches are processed in a single call, larger ones
+          are split into `batch_chunk_size` chunks that run concurrently
+        """
+        values = list(values)
+        if not values: return []
+        if not self.batch_chunk_size or len(values) <= self.batch_chunk_size:
+            return await ThreadPool.run_async(func, values, **kwargs)
+        chunks = await asyncio.gather(*[
+            ThreadPool.run_async(func, values[i:i + self.batch_chunk_size], **kwargs)
+            for i in range(0, len(values), self.batch_chunk_size)
+        ])
+        return [value for chunk in chunks for value in chunk]
+
+    async def aencode_many(self, values: Iterable[ObjectValue], return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[str, bytes, Exception]]:
+        """
+        Encodes the values asynchronously
+        """
+        return await self._arun_chunked(self.encode_many, values, return_exceptions = return_exceptions, **kwargs)
+
+    async def adecode_many(self, values: Iterable[Union[str, bytes]], return_exceptions: Optional[bool] = False, **kwargs) -> List[Union[ObjectValue, Exception]]:
+        """
+        Decodes the values asynchronously
+        """
+        return await self._arun_chunked(self.decode_many, values, return_exceptions = return_exceptions, **kwargs)
+
+    def _encode_stream_value(self, value: ObjectValue, **kwargs) -> bytes:
+        """
+        Encodes a value of a stream to bytes
+        """
+        value = self.encode_value(value, **kwargs)
+        return value.encode(self.encoding or 'utf-8') if isinstance(value, str) else value
+
+    def encode_stream(self, values: Iterable[ObjectValue], chunk_size: Optional[int] = None, **kwargs) -> Iterator[bytes]:
+        """
+        Encodes the values into a stream of byte chunks
+
+        - Values are written as NDJSON lines if the serializer has a `stream_delimiter`,
+          otherwise as length-prefixed frames, see `lzl.io.ser.streams`
+        - If compression is enabled, the whole stream is compressed incrementally
+        - Values are consumed lazily, so the stream is never held in memory
+        """
+        encoder = FrameEncoder(self.stream_delimiter, compressor = self.compressor, chunk_size = chunk_size)
+        for value in values:
+            if chunk := encoder.encode(self._encode_stream_value(value, **kwargs)): yield chunk
+        if chunk := encoder.flush(): yield chunk
+
+    async def aencode_stream(self, values: Union[Iterable[ObjectValue], AsyncIterable[ObjectValue]], chunk_size: Optional[int] = None, **kwargs) -> AsyncIterator[bytes]:
+        """
+        [Async] Encodes the values or async iterator into a stream of byte chunks
+        """
+        encoder = FrameEncoder(self.stream_delimiter, compressor = self.compressor, chunk_size = chunk_size)
+        if hasattr(values, '__aiter__'):
+            async for value in values:
+                if chunk := encoder.encode(self._encode_stream_value(value, **kwargs)): yield chunk
+        else:
+            for value in values:
+                if chunk := encoder.encode(self._encode_stream_value(value, **kwargs)): yield chunk
+        if chunk := encoder.flush(): yield chunk
+
+    def decode_stream(self, chunks: Iterable[bytes], **kwargs) -> Iterator[ObjectValue]:
+        """
+        Decodes a stream written by `encode_stream`, yielding one value at a time
+        """
+        decoder = FrameDecoder(self.stream_delimiter, compressor = self.compressor)
+        for chunk in chunks:
+            for value in decoder.decode(chunk):
+                yield self.decode_value(value, **kwargs)
+        for value in decoder.flush():
+            yield self.decode_value(value, **kwargs)
+
+    async def adecode_stream(self, chunks: Union[Iterable[bytes], AsyncIterable[bytes]], **kwargs) -> AsyncIterator[ObjectValue]:
+        """
+        [Async] Decodes a stream written by `encode_stream`, yielding one value at a time
+        """
+        decoder = FrameDecoder(self.stream_delimiter, compressor = self.compressor)
+        if hasattr(chunks, '__aiter__'):
+            async for chunk in chunks:
+                for value in decoder.decode(chunk):
+                    yield self.decode_value(value, **kwargs)
+        else:
+            for chunk in chunks:
+                for value in decoder.decode(chunk):
+                    yield self.decode_value(value, **kwargs)
+        for value in decoder.flush():
+            yield self.decode_value(value, **kwargs)
+
+    def dump_stream(self, values: Iterable[ObjectValue], path: 'PathLike', chunk_size: Optional[int] = None, **kwargs) -> None:
+        """
+        Writes the values to the file as a stream
+        """
+        from lzl.io.file import File
+        with File(path).open('wb') as f:
+            for chunk in self.encode_stream(values, chunk_size = chunk_size, **kwargs):
+                f.write(chunk)
+
+    async def adump_stream(self, values: Union[Iterable[ObjectValue], AsyncIterable[ObjectValue]], path: 'PathLike', chunk_size: Optional[int] = None, **kwargs) -> None:
+        """
+        [Async] Writes the values or async iterator to the file as a stream
+        """
+        from lzl.io.file import File
+        async with File(path).aopen('wb') as f:
+            async for chunk in self.aencode_stream(values, chunk_size = chunk_size, **kwargs):
+                await f.write(chunk)
+
+    def load_stream(self, path: 'PathLike', chunk_size: Optional[int] = None, **kwargs) -> Iterator[ObjectValue]:
+        """
+        Reads the values of a file written by `dump_stream`, one value at a time
+        """
+        from lzl.io.file import File
+        chunk_size = chunk_size or DEFAULT_STREAM_CHUNK_SIZE
+        with File(path).open('rb') as f:
+            yield from self.decode_stream(iter(lambda: f.read(chunk_size), b''), **kwargs)
+
+    async def aload_stream(self, path: 'PathLike', chunk_size: Optional[int] = None, **kwargs) -> AsyncIterator[ObjectValue]:
+        """
+        [Async] Reads the values of a file written by `dump_stream`, one value at a time
+        """
+        from lzl.io.file import File
+        chunk_size = chunk_size or DEFAULT_STREAM_CHUNK_SIZE
+        async with File(path).aopen('rb') as f:
+            async def _iter_chunks() -> AsyncIterator[bytes]:
+                while chunk := await f.read(chunk_size): yield chunk
+            async for value in self.adecode_stream(_iter_chunks(), **kwargs):
+                yield value
+
     def dumps(self, value: ObjectValue, **kwargs) -> Union[str, bytes]:
         # sourcery skip: class-extract-method
         """
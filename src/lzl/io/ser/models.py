@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+"""
+Compiled Pydantic Model Codecs
+
+`get_model_codec` compiles an encoder and a decoder per model class on first use,
+which go through the model's pydantic-core serializer and validator directly
+instead of `model_dump` / `model_validate` and the generic `serialize_object` walk.
+
+The JSON serializer writes models with the same envelope as `serialize_object`:
+
+    {"__type__":"pydantic","__class__":"<module>.<name>","value":{...}}
+
+and the msgpack serializer writes the model JSON with a leading `__class__` key.
+The decoders slice the model JSON out of these byte layouts and fall back to
+the generic path for anything else, e.g. values written by older versions.
+
+Decoding always validates: pydantic-core's `validate_json` is faster than building
+the models in Python with `model_construct`, even for models with validators.
+"""
+
+import typing as t
+from lzl.types import BaseModel
+from .utils import get_object_class, register_object_class, _alias_schema_mapping
+
+if t.TYPE_CHECKING:
+    from pydantic_core import SchemaSerializer, SchemaValidator
+
+
+SER_CONTEXT = {'source': 'io', 'method': 'serializer'}
+DESER_CONTEXT = {'source': 'io', 'method': 'deserializer'}
+
+JSON_ENVELOPE_PREFIX = b'{"__type__":"pydantic","__class__":"'
+JSON_ENVELOPE_VALUE = b'","value":'
+MSGPACK_CLASS_PREFIX = b'{"__class__":"'
+
+_JSON_ENVELOPE_PREFIX_STR = JSON_ENVELOPE_PREFIX.decode()
+_JSON_ENVELOPE_VALUE_STR = JSON_ENVELOPE_VALUE.decode()
+
+ModelT = t.TypeVar('ModelT', bound = BaseModel)
+
+_model_codecs: t.Dict[t.Type, t.Optional['ModelCodec']] = {}
+
+
+class ModelCodec(t.Generic[ModelT]):
+    """
+    Compiled Encoder and Decoder of a Pydantic Model
+    """
+
+    __slots__ = ('model', 'class_name', 'serializer', 'validator')
+
+    def __init__(self, model: t.Type[ModelT]):
+        self.model = model
+        self.class_name: str = register_object_class(model, is_type = True)
+        self.serializer: 'SchemaSerializer' = model.__pydantic_serializer__
+        self.validator: 'SchemaValidator' = model.__pydantic_validator__
+
+    def to_json(self, obj: ModelT) -> bytes:
+        """
+        Encodes the model to JSON
+        """
+        return self.serializer.to_json(obj, round_trip = True, context = SER_CONTEXT)
+
+    def from_json(self, data: t.Union[str, bytes]) -> ModelT:
+        """
+        Decodes and validates the model from JSON
+        """
+        return self.validator.validate_json(data, context = DESER_CONTEXT)
+
+    def encode_envelope(self, obj: ModelT) -> bytes:
+        """
+        Encodes the model with the `serialize_object` envelope
+        """
+        return JSON_ENVELOPE_PREFIX + self.class_name.encode() + JSON_ENVELOPE_VALUE + self.to_json(obj) + b'}'
+
+    def encode_with_class(self, obj: ModelT) -> bytes:
+        """
+        Encodes the model JSON with a leading `__class__` key
+        """
+        data = self.to_json(obj)
+        prefix = MSGPACK_CLASS_PREFIX + self.class_name.encode() + b'"'
+        if data == b'{}': return prefix + b'}'
+        return prefix + b',' + data[1:]
+
+
+def get_model_codec(obj_type: t.Type) -> t.Optional[ModelCodec]:
+    """
+    Returns the compiled codec of the model class, or None if the
+    type is not a pydantic v2 model
+    """
+    try:
+        return _model_codecs[obj_type]
+    except KeyError:
+        pass
+    codec = None
+    if isinstance(obj_type, type) and issubclass(obj_type, BaseModel) and \
+        hasattr(obj_type, '__pydantic_serializer__') and hasattr(obj_type, '__pydantic_validator__'):
+        codec = ModelCodec(obj_type)
+    _model_codecs[obj_type] = codec
+    return codec
+
+
+def get_codec_by_name(class_name: str, schema_map: t.Optional[t.Dict[str, str]] = None) -> t.Optional[ModelCodec]:
+    """
+    Returns the compiled codec of the stored class name
+    """
+    if schema_map is not None and class_name in schema_map:
+        class_name = schema_map[class_name]
+    elif class_name in _alias_schema_mapping:
+        class_name = _alias_schema_mapping[class_name]
+    return get_model_codec(get_object_class(class_name))
+
+
+def split_envelope(value: t.Union[str, bytes]) -> t.Optional[t.Tuple[str, t.Union[str, bytes]]]:
+    """
+    Returns the class name and the model JSON of a `serialize_object` envelope,
+    or None if the value was not written by `ModelCodec.encode_envelope`
+    """
+    prefix, sep, end = (_JSON_ENVELOPE_PREFIX_STR, _JSON_ENVELOPE_VALUE_STR, '}') if isinstance(value, str) else \
+        (JSON_ENVELOPE_PREFIX, JSON_ENVELOPE_VALUE, b'}')
+    if not value.startswith(prefix) or not value.endswith(end): return None
+    idx = value.find(sep, len(prefix))
+    if idx < 0: return None
+    class_name = value[len(prefix):idx]
+    return class_name if isinstance(class_name, str) else class_name.decode(), value[idx + len(sep):-1]
+
+
+def split_class(value: bytes) -> t.Optional[t.Tuple[str, bytes]]:
+    """
+    Returns the class name and the model JSON of a value
+    written by `ModelCodec.encode_with_class`
+    """
+    if not value.startswith(MSGPACK_CLASS_PREFIX): return None
+    end = value.find(b'"', len(MSGPACK_CLASS_PREFIX))
+    if end < 0: return None
+    rest = value[end + 1:]
+    if rest.startswith(b','): rest = rest[1:]
+    return value[len(MSGPACK_CLASS_PREFIX):end].decode(), b'{' + rest
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+"""
+Streaming Serialization Frames
+
+Serializers write a stream of values as a sequence of frames:
+
+- Text serializers (`stream_delimiter` set, e.g. JSON) write one value per line (NDJSON)
+- Binary serializers write each value with a 4-byte big-endian length prefix
+
+When compression is enabled, the whole stream is compressed incrementally
+with the compressor's streaming context instead of compressing each value,
+so a stream can be written and read back in constant memory. When reading,
+memory is bounded by the read chunk size times the compression ratio.
+"""
+
+import struct
+import typing as t
+
+if t.TYPE_CHECKING:
+    from ..compression import CompressionT, StreamCompressor, StreamDecompressor
+
+
+FRAME_HEADER = struct.Struct('>I')
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class FrameEncoder:
+    """
+    Frames the encoded values and returns the stream in chunks
+    of at least `chunk_size` bytes before compression
+    """
+
+    def __init__(
+        self,
+        delimiter: t.Optional[bytes] = None,
+        compressor: t.Optional['CompressionT'] = None,
+        chunk_size: t.Optional[int] = None,
+    ):
+        self.delimiter = delimiter
+        self.chunk_size = chunk_size or DEFAULT_STREAM_CHUNK_SIZE
+        self.ctx: t.Optional['StreamCompressor'] = compressor.stream_compressor() if compressor is not None else None
+        self.buffer = bytearray()
+
+    def encode(self, value: bytes) -> t.Optional[bytes]:
+        """
+        Adds the encoded value and returns a chunk once the buffer is full
+        """
+        if self.delimiter is None:
+            self.buffer += FRAME_HEADER.pack(len(value))
+            self.buffer += value
+        else:
+            if self.delimiter in value: raise ValueError(f'Encoded value contains the stream delimiter {self.delimiter!r}')
+            self.buffer += value
+            self.buffer += self.delimiter
+        if len(self.buffer) < self.chunk_size: return None
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        """
+        Returns the buffered frames
+        """
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return self.ctx.compress(data) if self.ctx is not None else data
+
+    def flush(self) -> bytes:
+        """
+        Returns the remaining frames and ends the stream
+        """
+        data = self._drain()
+        if self.ctx is not None: data += self.ctx.flush()
+        return data
+
+
+class FrameDecoder:
+    """
+    Splits a chunked stream back into the encoded values
+    """
+
+    def __init__(
+        self,
+        delimiter: t.Optional[bytes] = None,
+        compressor: t.Optional['CompressionT'] = None,
+    ):
+        self.delimiter = delimiter
+        self.ctx: t.Optional['StreamDecompressor'] = compressor.stream_decompressor() if compressor is not None else None
+        self.buffer = bytearray()
+
+    def decode(self, chunk: bytes) -> t.List[bytes]:
+        """
+        Adds the chunk and returns the values that are complete
+        """
+        if self.ctx is not None: chunk = self.ctx.decompress(chunk)
+        self.buffer += chunk
+        return self._split_delimited() if self.delimiter is not None else self._split_prefixed()
+
+    def _split_delimited(self) -> t.List[bytes]:
+        """
+        Returns the complete lines, skipping blank ones
+        """
+        values, start = [], 0
+        while (end := self.buffer.find(self.delimiter, start)) >= 0:
+            if end > start and self.buffer[start:end].strip(): values.append(bytes(self.buffer[start:end]))
+            start = end + len(self.delimiter)
+        if start: del self.buffer[:start]
+        return values
+
+    def _split_prefixed(self) -> t.List[bytes]:
+        """
+        Returns the complete length-prefixed frames
+        """
+        values, start, size = [], 0, len(self.buffer)
+        while size - start >= FRAME_HEADER.size:
+            (length,) = FRAME_HEADER.unpack_from(self.buffer, start)
+            end = start + FRAME_HEADER.size + length
+            if end > size: break
+            values.append(bytes(self.buffer[start + FRAME_HEADER.size:end]))
+            start = end
+        if start: del self.buffer[:start]
+        return values
+
+    def flush(self) -> t.List[bytes]:
+        """
+        Returns the last value of the stream
+
+        - A trailing line without a delimiter is returned as a value
+        - A truncated length-prefixed frame raises a ValueError
+        """
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        if self.delimiter is not None: return [data] if data.strip() else []
+        if data: raise ValueError(f'Truncated stream: {len(data)} trailing bytes do not form a complete frame')
+        return []
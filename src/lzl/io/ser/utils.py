@@ -95,203 +95,202 @@ def extract_model_dumps_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
 
 
 
-def serialize_object(
-    obj: SerializableObject,
-    mode: Optional[SerMode] = 'auto',
-    **kwargs
-) -> Union[Dict[str, Any], List[Dict[str, Any]], Any]:
-    # sourcery skip: extract-duplicate-method
-    """
-    Helper to serialize an object
+"""
+Object Serialization Dispatch
 
-    Args:
-        obj: the object to serialize
+`serialize_object` resolves the handler of a value once per type and caches it
+in `_dispatch_cache`, so nested payloads only pay a dict lookup per value.
 
-    Returns:
-        the serialized object in dict
-        
-        if not disable_nested_values:
-        {
-            "__type__": ...,
-            "value": ...,
-        }
+Handlers have the signature `handler(obj, mode, kwargs)`.
+"""
 
-        otherwise for JSON Objects:
+ObjectHandler = Callable[[Any, SerMode, Dict[str, Any]], Any]
 
-        {
-            "__type__": ...,
-            ...,
-        }
+# Handlers registered with `register_object_serializer`, looked up along the MRO
+_registered_handlers: Dict[Type, ObjectHandler] = {}
+
+# Resolved handlers keyed on `type(obj)`
+_dispatch_cache: Dict[Type, ObjectHandler] = {}
 
+
+def _serialize(obj: SerializableObject, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
     """
-    if obj is None: return None
-    disable_nested_values: Optional[bool] = kwargs.get('disable_nested_values')
-
-    if isinstance(obj, BaseModel) or hasattr(obj, 'model_dump'):
-        obj_class_name = register_object_class(obj)
-        obj_value = obj.model_dump(mode = 'json', round_trip = True, context = {'source': 'io', 'method': 'serializer'}, **extract_model_dumps_kwargs(kwargs))
-        if mode == 'raw': return obj_value
-        if disable_nested_values:
-            return {
-                "__type__": "pydantic",
-                "__class__": obj_class_name,
-                **obj_value,
-            }
+    Serializes the object with the cached handler of its type
+    """
+    handler = _dispatch_cache.get(obj.__class__)
+    if handler is None: handler = _resolve_handler(obj)
+    return handler(obj, mode, kwargs)
+
+
+def _ser_primitive(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    return obj
+
+
+def _ser_pydantic(obj: 'BaseModel', mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    obj_class_name = register_object_class(obj)
+    obj_value = obj.model_dump(mode = 'json', round_trip = True, context = {'source': 'io', 'method': 'serializer'}, **extract_model_dumps_kwargs(kwargs))
+    if mode == 'raw': return obj_value
+    if kwargs.get('disable_nested_values'):
         return {
             "__type__": "pydantic",
             "__class__": obj_class_name,
-            "value": obj_value,
+            **obj_value,
         }
+    return {
+        "__type__": "pydantic",
+        "__class__": obj_class_name,
+        "value": obj_value,
+    }
 
-    # Move this to the top before primitives
-    if np is not None:
-        # if isinstance(obj, (np.int_, np.intc, np.intp, np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64)):
-        if isinstance(obj, np_int_types):
-            if mode == 'raw': return int(obj)
-            obj_class_name = register_object_class(obj)
-            return {
-                "__type__": "numpy",
-                "__class__": obj_class_name,
-                "value": int(obj),
-            }
-
-
-        # if isinstance(obj, (np.float_, np.float16, np.float32, np.float64)):
-        if isinstance(obj, np_float_types):
-            if mode == 'raw': return float(obj)
-            obj_class_name = register_object_class(obj)
-            return {
-                "__type__": "numpy",
-                "__class__": obj_class_name,
-                "value": float(obj),
-            }
-
-
-    if is_primitive(obj, exclude_bytes = True):
-        return obj
-    
-    if isinstance(obj, type):
-        obj_class_name = register_object_class(obj, is_type = True)
-        if mode == 'raw': return obj_class_name
-        return {
-            "__type__": "type",
-            "__class__": obj_class_name,
-            "value": obj_class_name,
-        }
 
-    if isinstance(obj, (list, tuple)):
-        return [serialize_object(item, mode = mode, **kwargs) for item in obj]
+def _ser_np_int(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return int(obj)
+    return {
+        "__type__": "numpy",
+        "__class__": register_object_class(obj),
+        "value": int(obj),
+    }
 
-    if isinstance(obj, dict):
-        if "__type__" in obj: 
-            return obj['value'] if mode == 'raw' and obj.get('value') else obj
-        return {key: serialize_object(value, mode = mode, **kwargs) for key, value in obj.items()}
 
-    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
-        if mode == 'raw': return obj.isoformat()
-        return {
-            "__type__": "datetime",
-            "value": obj.isoformat(),
-        }
+def _ser_np_float(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return float(obj)
+    return {
+        "__type__": "numpy",
+        "__class__": register_object_class(obj),
+        "value": float(obj),
+    }
+
+
+def _ser_type(obj: Type, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    obj_class_name = register_object_class(obj, is_type = True)
+    if mode == 'raw': return obj_class_name
+    return {
+        "__type__": "type",
+        "__class__": obj_class_name,
+        "value": obj_class_name,
+    }
+
+
+def _ser_sequence(obj: Union[List, Tuple], mode: SerMode, kwargs: Dict[str, Any]) -> List[Any]:
+    return [_serialize(item, mode, kwargs) for item in obj]
+
+
+def _ser_dict(obj: Dict[str, Any], mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if "__type__" in obj:
+        return obj['value'] if mode == 'raw' and obj.get('value') else obj
+    return {key: _serialize(value, mode, kwargs) for key, value in obj.items()}
+
+
+def _ser_datetime(obj: Union[datetime.datetime, datetime.date, datetime.time], mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.isoformat()
+    return {
+        "__type__": "datetime",
+        "value": obj.isoformat(),
+    }
+
+
+def _ser_timedelta(obj: datetime.timedelta, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.total_seconds()
+    return {
+        "__type__": "timedelta",
+        "value": obj.total_seconds(),
+    }
 
-    if isinstance(obj, datetime.timedelta):
-        if mode == 'raw': return obj.total_seconds()
-        return {
-            "__type__": "timedelta",
-            "value": obj.total_seconds(),
-        }
 
-    if isinstance(obj, dataclasses.InitVar) or dataclasses.is_dataclass(obj):
-        if mode == 'raw': return dataclasses.asdict(obj)
-        obj_class_name = register_object_class(obj)
-        if disable_nested_values:
-            return {
-                "__type__": "dataclass",
-                "__class__": obj_class_name,
-                **dataclasses.asdict(obj),
-            }
+def _ser_dataclass(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return dataclasses.asdict(obj)
+    obj_class_name = register_object_class(obj)
+    if kwargs.get('disable_nested_values'):
         return {
             "__type__": "dataclass",
             "__class__": obj_class_name,
-            "value": dataclasses.asdict(obj),
+            **dataclasses.asdict(obj),
         }
+    return {
+        "__type__": "dataclass",
+        "__class__": obj_class_name,
+        "value": dataclasses.asdict(obj),
+    }
 
-    if hasattr(obj, 'as_posix'):
-        if mode == 'raw': return obj.as_posix()
-        obj_class_name = register_object_class(obj)
-        return {
-            "__type__": "path",
-            "__class__": obj_class_name,
-            "value": obj.as_posix(),
-        }
 
-    if isinstance(obj, (bytes, bytearray)):
-        if mode == 'raw': return obj
-        return {
-            "__type__": "bytes",
-            "value": obj.hex(),
-        }
+def _ser_path(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.as_posix()
+    return {
+        "__type__": "path",
+        "__class__": register_object_class(obj),
+        "value": obj.as_posix(),
+    }
 
-    if isinstance(obj, (set, frozenset)):
-        if mode == 'raw': return list(obj)
-        return {
-            "__type__": "set",
-            "value": list(obj),
-        }
 
-    if isinstance(obj, Enum):
-        if mode == 'raw': return obj.value
-        obj_class_name = register_object_class(obj)
-        return {
-            "__type__": "enum",
-            "__class__": obj_class_name,
-            "value": obj.value,
-        }
+def _ser_bytes(obj: Union[bytes, bytearray], mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj
+    return {
+        "__type__": "bytes",
+        "value": obj.hex(),
+    }
 
-    if isinstance(obj, UUID):
-        if mode == 'raw': return str(obj)
-        return {
-            "__type__": "uuid",
-            "value": str(obj),
-        }
 
-    if hasattr(obj, 'serialize'):
-        if mode == 'raw': return obj.serialize()
-        obj_class_name = register_object_class(obj)
-        return {
-            "__type__": "serializable",
-            "__class__": obj_class_name,
-            "value": obj.serialize(),
-        }
+def _ser_set(obj: Union[set, frozenset], mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return list(obj)
+    return {
+        "__type__": "set",
+        "value": list(obj),
+    }
 
-    if isinstance(obj, abc.ABC):
-        logger.info(f'Pickle Serializing ABC Object: |r|({type(obj)}) {str(obj)[:1000]}', colored = True)
-        # if mode == 'raw': raise TypeError(f"Cannot serialize object of type in raw mode {type(obj)}")
-        obj_bytes = default_pickle.dumps(obj)
-        if mode == 'raw': return obj_bytes
-        return {
-            "__type__": "pickle",
-            "value": obj_bytes.hex(),
-        }
+
+def _ser_enum(obj: Enum, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.value
+    return {
+        "__type__": "enum",
+        "__class__": register_object_class(obj),
+        "value": obj.value,
+    }
 
 
-    if hasattr(obj, "numpy"):  # Checks for TF tensors without needing the import
-        if mode == 'raw': return obj.numpy().tolist()
-        return {
-            "__type__": "tensor",
-            "value": obj.numpy().tolist(),
-        }
+def _ser_uuid(obj: UUID, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return str(obj)
+    return {
+        "__type__": "uuid",
+        "value": str(obj),
+    }
 
-    if hasattr(obj, 'tolist'): # Checks for torch tensors without importing
-        if mode == 'raw': return obj.tolist()
-        return {
-            "__type__": "tensor",
-            "value": obj.tolist(),
-        }
 
-    # Try one shot encoding objects
-    # with contextlib.suppress(Exception):
+def _ser_serializable(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.serialize()
+    return {
+        "__type__": "serializable",
+        "__class__": register_object_class(obj),
+        "value": obj.serialize(),
+    }
+
 
+def _ser_abc(obj: abc.ABC, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    logger.info(f'Pickle Serializing ABC Object: |r|({type(obj)}) {str(obj)[:1000]}', colored = True)
+    obj_bytes = default_pickle.dumps(obj)
+    if mode == 'raw': return obj_bytes
+    return {
+        "__type__": "pickle",
+        "value": obj_bytes.hex(),
+    }
+
+
+def _ser_tf_tensor(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.numpy().tolist()
+    return {
+        "__type__": "tensor",
+        "value": obj.numpy().tolist(),
+    }
+
+
+def _ser_tensor(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+    if mode == 'raw': return obj.tolist()
+    return {
+        "__type__": "tensor",
+        "value": obj.tolist(),
+    }
+
+
+def _ser_pickle(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
     try:
         logger.info(f'Pickle Serializing Object: |r|({type(obj)}) {str(obj)[:1000]}', colored = True)
         obj_bytes = default_pickle.dumps(obj)
@@ -301,12 +300,130 @@ def serialize_object(
             "value": obj_bytes.hex(),
         }
     except Exception as e:
-
         logger.info(f'Error Serializing Object: |r|({type(obj)}) {e}|e| {str(obj)[:1000]}', colored = True)
-
     raise TypeError(f"Cannot serialize object of type {type(obj)}")
 
 
+def _get_builtin_handler(obj: SerializableObject) -> ObjectHandler:
+    # sourcery skip: low-code-quality
+    """
+    Returns the built-in handler of the object
+
+    The checks are ordered by precedence, e.g. numpy floats are `float`
+    subclasses and `IntEnum` members are `int` subclasses
+    """
+    if isinstance(obj, BaseModel) or hasattr(obj, 'model_dump'): return _ser_pydantic
+    if np is not None:
+        if isinstance(obj, np_int_types): return _ser_np_int
+        if isinstance(obj, np_float_types): return _ser_np_float
+    if is_primitive(obj, exclude_bytes = True): return _ser_primitive
+    if isinstance(obj, type): return _ser_type
+    if isinstance(obj, (list, tuple)): return _ser_sequence
+    if isinstance(obj, dict): return _ser_dict
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)): return _ser_datetime
+    if isinstance(obj, datetime.timedelta): return _ser_timedelta
+    if isinstance(obj, dataclasses.InitVar) or dataclasses.is_dataclass(obj): return _ser_dataclass
+    if hasattr(obj, 'as_posix'): return _ser_path
+    if isinstance(obj, (bytes, bytearray)): return _ser_bytes
+    if isinstance(obj, (set, frozenset)): return _ser_set
+    if isinstance(obj, Enum): return _ser_enum
+    if isinstance(obj, UUID): return _ser_uuid
+    if hasattr(obj, 'serialize'): return _ser_serializable
+    if isinstance(obj, abc.ABC): return _ser_abc
+    # Checks for TF tensors without needing the import
+    if hasattr(obj, 'numpy'): return _ser_tf_tensor
+    # Checks for torch tensors without importing
+    if hasattr(obj, 'tolist'): return _ser_tensor
+    return _ser_pickle
+
+
+def _resolve_handler(obj: SerializableObject) -> ObjectHandler:
+    """
+    Resolves and caches the handler of the object's type
+
+    - Registered handlers are looked up along the MRO and take precedence
+    - Otherwise the built-in checks are run once for the type
+    """
+    obj_type = obj.__class__
+    handler = None
+    if _registered_handlers:
+        for base in obj_type.__mro__:
+            if base in _registered_handlers:
+                handler = _registered_handlers[base]
+                break
+    if handler is None: handler = _get_builtin_handler(obj)
+    _dispatch_cache[obj_type] = handler
+    return handler
+
+
+def register_object_serializer(
+    obj_type: Type,
+    func: Optional[Callable[..., Any]] = None,
+) -> Callable[..., Any]:
+    """
+    Registers a serializer for the type (and its subclasses)
+
+    The function is called as `func(obj, mode = mode, **kwargs)` and should return
+    a value that `deserialize_object` understands, such as primitives, containers
+    or one of the built-in `{"__type__": ...}` forms.
+
+    Can be used as a decorator:
+
+        @register_object_serializer(Money)
+        def serialize_money(obj: Money, mode: SerMode = 'auto', **kwargs):
+            return str(obj.amount) if mode == 'raw' else {"__type__": "serializable", ...}
+    """
+    def _register(func: Callable[..., Any]) -> Callable[..., Any]:
+        def handler(obj: Any, mode: SerMode, kwargs: Dict[str, Any]) -> Any:
+            return func(obj, mode = mode, **kwargs)
+        _registered_handlers[obj_type] = handler
+        _dispatch_cache.clear()
+        return func
+    return _register if func is None else _register(func)
+
+
+def unregister_object_serializer(obj_type: Type) -> None:
+    """
+    Removes the registered serializer for the type
+    """
+    if _registered_handlers.pop(obj_type, None) is not None:
+        _dispatch_cache.clear()
+
+
+def serialize_object(
+    obj: SerializableObject,
+    mode: Optional[SerMode] = 'auto',
+    **kwargs
+) -> Union[Dict[str, Any], List[Dict[str, Any]], Any]:
+    """
+    Helper to serialize an object
+
+    Args:
+        obj: the object to serialize
+
+    Returns:
+        the serialized object in dict
+        
+        if not disable_nested_values:
+        {
+            "__type__": ...,
+            "value": ...,
+        }
+
+        otherwise for JSON Objects:
+
+        {
+            "__type__": ...,
+            ...,
+        }
+
+    The handler of each type is resolved once and cached, see
+    `register_object_serializer` to add handlers for custom types.
+    """
+    if obj is None: return None
+    return _serialize(obj, mode, kwargs)
+
+
 def deserialize_object(
     obj: Union[Dict[str, Any], List[Dict[str, Any]], Any], 
     schema_map: Optional[Dict[str, str]] = None, 
@@ -3,21 +3,39 @@ from __future__ import annotations
 """Convenience façade for LazyOps thread/async pooling utilities."""
 
 from .base import (
+    TaskStats,
     ThreadPool,
     amap_iterable,
+    amap_window,
     ensure_coro,
     get_concurrency_limit,
     is_coro_func,
     set_concurrency_limit,
 )
+from .limiters import (
+    AIMDLimiter,
+    BaseLimiter,
+    GradientLimiter,
+    StaticLimiter,
+    get_limiter,
+    register_limiter,
+)
 from .utils import is_in_async_loop
 
 __all__: list[str] = [
+    "AIMDLimiter",
+    "BaseLimiter",
+    "GradientLimiter",
+    "StaticLimiter",
+    "TaskStats",
     "ThreadPool",
     "amap_iterable",
+    "amap_window",
     "ensure_coro",
     "get_concurrency_limit",
+    "get_limiter",
     "is_coro_func",
     "is_in_async_loop",
+    "register_limiter",
     "set_concurrency_limit",
 ]
@@ -5,11 +5,15 @@ from __future__ import annotations
 import os
 import abc
 import sys
+import time
 # import anyio
 import inspect
 import asyncio
 import shlex
 import functools
+import threading
+import itertools
+import collections
 import subprocess
 import contextvars
 import contextlib
@@ -19,7 +23,8 @@ from concurrent import futures
 # from anyio._core._eventloop import threadlocals
 from lzl.proxied import proxied
 from lzl import load
-from typing import Callable, Coroutine, Any, Union, List, Set, Tuple, TypeVar, Optional, Generator, Awaitable, Iterable, AsyncGenerator, Dict, TYPE_CHECKING
+from .limiters import BaseLimiter, StaticLimiter, LimiterT, get_limiter
+from typing import Callable, Coroutine, Any, Union, List, Set, Tuple, TypeVar, Optional, Generator, Awaitable, Iterable, AsyncIterable, AsyncIterator, AsyncGenerator, Dict, Deque, TYPE_CHECKING
 
 if TYPE_CHECKING:
     import anyio
@@ -110,19 +115,173 @@ async def async_map(
     func: Callable[..., Awaitable[Any]],
     iterable: Iterable[Any], 
     *args,
-    limit: Optional[int] = None,
+    limit: Optional[LimiterT] = None,
     return_when: Optional[str] = 'FIRST_COMPLETED',
     **kwargs,
 ) -> AsyncGenerator[RT, None]:
-    """Yield results from applying ``func`` to ``iterable`` as tasks complete."""
+    """Yield results from applying ``func`` to ``iterable`` as tasks complete.
+
+    ``limit`` may be an integer or a limiter (see :mod:`lzl.pool.limiters`).
+    """
     func = ensure_coro(func)
     partial = functools.partial(func, *args, **kwargs)
     try:
         mapped_iterable = map(partial, iterable)
     except TypeError:
         mapped_iterable = (partial(x) async for x in iterable)
-    async for task in amap_iterable(mapped_iterable, limit = limit, return_when = return_when):
-        yield await task
+    async for result in amap_window(mapped_iterable, concurrency_limit = limit, return_ordered = False):
+        yield result
+
+
+class TaskStats:
+    """Latency statistics of the tasks scheduled by a windowed async map.
+
+    Pass an instance as ``stats`` to :meth:`ThreadPool.amap` or
+    :meth:`ThreadPool.aiterate` to have it populated while the tasks run.
+    """
+
+    def __init__(self, max_samples: Optional[int] = 10_000):
+        """Initialise the counters, keeping the last ``max_samples`` latencies."""
+        self.count: int = 0
+        self.errors: int = 0
+        self.total: float = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.samples: Deque[float] = collections.deque(maxlen = max_samples)
+
+    def record(self, latency: float, error: Optional[bool] = False):
+        """Record the latency of a finished task."""
+        self.count += 1
+        if error: self.errors += 1
+        self.total += latency
+        self.min = latency if self.min is None else min(self.min, latency)
+        self.max = latency if self.max is None else max(self.max, latency)
+        self.samples.append(latency)
+
+    @property
+    def mean(self) -> float:
+        """Return the mean latency in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Return the ``q`` (0-100) percentile of the recorded latencies."""
+        if not self.samples: return 0.0
+        samples = sorted(self.samples)
+        return samples[min(int(len(samples) * q / 100), len(samples) - 1)]
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the statistics as a dictionary."""
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+    def __repr__(self) -> str:
+        return f'<TaskStats count={self.count}, errors={self.errors}, mean={self.mean:.4f}s, max={self.max}>'
+
+
+async def _timed(
+    awaitable: Awaitable[RT], 
+    stats: Optional[TaskStats] = None, 
+    limiter: Optional[BaseLimiter] = None,
+) -> RT:
+    """Await ``awaitable`` and record its latency in ``stats`` and ``limiter``."""
+    if stats is None and limiter is None: return await awaitable
+    start = time.perf_counter()
+    try:
+        result = await awaitable
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        latency = time.perf_counter() - start
+        if stats is not None: stats.record(latency, error = True)
+        if limiter is not None: limiter.record(latency, error = e)
+        raise
+    latency = time.perf_counter() - start
+    if stats is not None: stats.record(latency)
+    if limiter is not None: limiter.record(latency)
+    return result
+
+
+async def amap_window(
+    mapped_iterable: Union[Iterable[Awaitable[RT]], AsyncIterable[Awaitable[RT]]],
+    concurrency_limit: Optional[LimiterT] = None,
+    return_ordered: Optional[bool] = True,
+    max_buffered: Optional[int] = None,
+    stats: Optional[TaskStats] = None,
+    return_exceptions: Optional[bool] = False,
+) -> AsyncGenerator[RT, None]:
+    """Yield the results of ``mapped_iterable`` using a sliding window of tasks.
+
+    A new task is started as soon as any task finishes, so ``concurrency_limit``
+    tasks stay in flight. With ``return_ordered`` results that finish early are
+    held in a reorder buffer (up to ``max_buffered``, defaulting to four times
+    the limit) and yielded in input order. On error, or when the consumer stops
+    early, the remaining tasks are cancelled, unless ``return_exceptions`` is
+    set, in which case the exceptions are yielded in place of the results.
+
+    ``concurrency_limit`` may also be a limiter (or the name of one, see
+    :mod:`lzl.pool.limiters`), in which case the window follows the limit it
+    derives from the latency and errors of the finished tasks.
+    """
+    try:
+        iterable = aiter(mapped_iterable)
+        is_async = True
+    except (TypeError, AttributeError):
+        iterable = iter(mapped_iterable)
+        is_async = False
+    
+    limiter = get_limiter(concurrency_limit)
+    record_limiter = limiter if not isinstance(limiter, StaticLimiter) else None
+    iterable_ended: bool = False
+    pending: Dict[asyncio.Future, int] = {}
+    buffered: Dict[int, Any] = {}
+    submitted, next_index = 0, 0
+    try:
+        while pending or not iterable_ended:
+            limit = max(limiter.limit, 1)
+            buffer_limit = limit * 4 if max_buffered is None else max_buffered
+            while len(pending) < limit and len(buffered) < buffer_limit and not iterable_ended:
+                try: iter_item = await anext(iterable) if is_async else next(iterable)
+                except StopAsyncIteration if is_async else StopIteration:
+                    iterable_ended = True
+                else: 
+                    pending[asyncio.ensure_future(_timed(iter_item, stats, record_limiter))] = submitted
+                    submitted += 1
+            
+            if not pending: break
+            done, _ = await asyncio.wait(pending, return_when = asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                result = task.exception() if return_exceptions and task.exception() is not None else task.result()
+                if not return_ordered: 
+                    yield result
+                    continue
+                buffered[index] = result
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for task in pending: task.cancel()
+        if pending: await asyncio.gather(*pending, return_exceptions = True)
+
+
+def _run_chunk(func: Callable[..., RT], chunk: List[Any]) -> List[RT]:
+    """Apply ``func`` to every item of ``chunk`` within a single task."""
+    return [func(item) for item in chunk]
+
+
+def _iter_chunks(iterable: Iterable[Any], chunksize: int) -> Generator[List[Any], None, None]:
+    """Yield lists of up to ``chunksize`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunksize)):
+        yield chunk
 
 
 async def _read_stream(stream: asyncio.streams.StreamReader, cb: t.Optional[t.Union[t.Callable, t.Awaitable]]):  
@@ -367,6 +526,24 @@ class ThreadPool(abc.ABC):
     Iterators
     """
 
+    def get_shared_pool(
+        self,
+        num_workers: Optional[int] = None,
+        process_pool: bool = False,
+    ) -> Tuple[futures.Executor, bool]:
+        """Return the executor for a fan-out call and whether it is dedicated.
+
+        The shared executors are reused unless a different ``num_workers`` is
+        requested, or the caller is itself running inside the shared thread pool,
+        where waiting on the same executor could exhaust its workers.
+        """
+        if num_workers is not None and num_workers != self.max_workers:
+            return self.get_pool(num_workers = num_workers, process_pool = process_pool), True
+        if process_pool: return self.ppool, False
+        if self._pool is not None and threading.current_thread() in getattr(self._pool, '_threads', ()):
+            return self.get_pool(num_workers = num_workers, process_pool = process_pool), True
+        return self.pool, False
+
     def map(
         self,
         func: Callable[..., RT],
@@ -376,16 +553,18 @@ class ThreadPool(abc.ABC):
         use_process_pool: Optional[bool] = False, 
         **kwargs
     ) -> List[RT]:  # sourcery skip: assign-if-exp
-        """Return the results of applying ``func`` across ``iterable``."""
-        num_workers = kwargs.pop('num_workers', None)
-        partial_func = functools.partial(func, *args, **kwargs)
-        with self.get_pool(num_workers = num_workers, process_pool = use_process_pool) as executor:
-            _futures = [
-                executor.submit(partial_func, item) for item in iterable
-            ]
-            if not return_ordered: return [f.result() for f in futures.as_completed(_futures)]
-            futures.wait(_futures)
-            return [f.result() for f in _futures]
+        """Return the results of applying ``func`` across ``iterable``.
+
+        Accepts the same options as :meth:`iterate`.
+        """
+        return list(self.iterate(
+            func, 
+            iterable, 
+            *args, 
+            return_ordered = return_ordered, 
+            use_process_pool = use_process_pool, 
+            **kwargs
+        ))
     
 
     def iterate(
@@ -395,22 +574,67 @@ class ThreadPool(abc.ABC):
         *args,
         use_process_pool: Optional[bool] = False, 
         return_ordered: Optional[bool] = True,
+        max_in_flight: Optional[int] = None,
+        chunksize: Optional[int] = 1,
+        executor: Optional[futures.Executor] = None,
         **kwargs
     ) -> Generator[RT, None, None]:  # sourcery skip: assign-if-exp
-        """Yield items produced by applying ``func`` across ``iterable``."""
+        """Yield items produced by applying ``func`` across ``iterable``.
+
+        Items are pulled from ``iterable`` lazily and at most ``max_in_flight``
+        tasks (defaults to twice the number of workers) are submitted at once,
+        so large generators are consumed in constant memory.
+
+        - ``return_ordered`` yields the results in the order of ``iterable``,
+          otherwise they are yielded as soon as they complete
+        - ``chunksize`` groups the items into chunks submitted as a single task,
+          which amortizes the pickling overhead of process pools
+        - ``num_workers`` runs on a dedicated executor instead of the shared one
+        - ``executor`` runs on a caller-owned executor, which is left running
+        """
         num_workers = kwargs.pop('num_workers', None)
         partial_func = functools.partial(func, *args, **kwargs)
-        with self.get_pool(num_workers = num_workers, process_pool = use_process_pool) as executor:
-            _futures = [
-                executor.submit(partial_func, item) for item in iterable
-            ]
+        if executor is not None: dedicated = False
+        else: executor, dedicated = self.get_shared_pool(num_workers = num_workers, process_pool = use_process_pool)
+        if max_in_flight is None: max_in_flight = (num_workers or self.max_workers) * 2
+        max_in_flight = max(max_in_flight, 1)
+        chunksize = max(chunksize or 1, 1)
+        if chunksize > 1:
+            partial_func = functools.partial(_run_chunk, partial_func)
+            iterable = _iter_chunks(iterable, chunksize)
+        
+        iterator = iter(iterable)
+        pending: Deque[futures.Future] = collections.deque()
+        try:
+            for item in iterator:
+                pending.append(executor.submit(partial_func, item))
+                if len(pending) < max_in_flight: continue
+                if return_ordered: 
+                    result = pending.popleft().result()
+                    if chunksize > 1: yield from result
+                    else: yield result
+                    continue
+                done, not_done = futures.wait(pending, return_when = futures.FIRST_COMPLETED)
+                pending = collections.deque(not_done)
+                for f in done:
+                    if chunksize > 1: yield from f.result()
+                    else: yield f.result()
+            
             if not return_ordered:
-                for f in futures.as_completed(_futures):
-                    yield f.result()
-            else:
-                futures.wait(_futures)
-                for f in _futures:
-                    yield f.result()
+                remaining = futures.as_completed(pending)
+                pending = collections.deque()
+                for f in remaining:
+                    if chunksize > 1: yield from f.result()
+                    else: yield f.result()
+                return
+            
+            while pending:
+                result = pending.popleft().result()
+                if chunksize > 1: yield from result
+                else: yield result
+        finally:
+            for f in pending: f.cancel()
+            if dedicated: executor.shutdown(wait = False, cancel_futures = True)
     
     async def amap(
         self,
@@ -418,24 +642,23 @@ class ThreadPool(abc.ABC):
         iterable: Iterable[Any], 
         *args,
         return_ordered: Optional[bool] = True,
-        concurrency_limit: Optional[int] = None,
+        concurrency_limit: Optional[LimiterT] = None,
         **kwargs,
     ) -> List[RT]:
-        """Await results serially while respecting the concurrency limit."""
-        return_when = kwargs.pop('return_when', 'ALL_COMPLETED' if return_ordered else 'FIRST_COMPLETED')
-        concurrency_limit = kwargs.pop('limit', concurrency_limit)
-        func = self.ensure_coro(func)
-        partial = functools.partial(func, *args, **kwargs)
-        try: mapped_iterable = map(partial, iterable)
-        except TypeError: mapped_iterable = (partial(x) async for x in iterable)
-        results = []
-        async for result in amap_iterable(
-            mapped_iterable, 
-            return_when = return_when, 
-            concurrency_limit = concurrency_limit
-        ):
-            results.append(await result)
-        return results
+        """Return the results of applying ``func`` across ``iterable``.
+
+        Accepts the same options as :meth:`aiterate`.
+        """
+        return [
+            result async for result in self.aiterate(
+                func, 
+                iterable, 
+                *args, 
+                return_ordered = return_ordered, 
+                concurrency_limit = concurrency_limit, 
+                **kwargs
+            )
+        ]
     
     async def aiterate(
         self,
@@ -443,22 +666,38 @@ class ThreadPool(abc.ABC):
         iterable: Iterable[Any], 
         *args,
         return_ordered: Optional[bool] = True,
-        concurrency_limit: Optional[int] = None,
+        concurrency_limit: Optional[LimiterT] = None,
+        max_buffered: Optional[int] = None,
+        stats: Optional[TaskStats] = None,
+        return_exceptions: Optional[bool] = False,
         **kwargs,
     ) -> AsyncGenerator[RT, None]:
-        """Async generator yielding results as soon as underlying tasks finish."""
-        return_when = kwargs.pop('return_when', 'ALL_COMPLETED' if return_ordered else 'FIRST_COMPLETED')
+        """Async generator yielding results while keeping ``concurrency_limit`` tasks in flight.
+
+        - ``return_ordered`` yields the results in the order of ``iterable``,
+          otherwise they are yielded as soon as they complete
+        - ``stats`` is populated with the per-task latencies
+        - ``return_exceptions`` yields the exceptions of failed tasks instead of raising
+        - ``concurrency_limit`` accepts a limiter (or its name) from
+          :mod:`lzl.pool.limiters` to adapt the window to the downstream service
+
+        See :func:`amap_window` for the scheduling details.
+        """
+        kwargs.pop('return_when', None)
         concurrency_limit = kwargs.pop('limit', concurrency_limit)
         func = self.ensure_coro(func)
         partial = functools.partial(func, *args, **kwargs)
         try: mapped_iterable = map(partial, iterable)
         except TypeError: mapped_iterable = (partial(x) async for x in iterable)
-        async for result in amap_iterable(
+        async for result in amap_window(
             mapped_iterable, 
-            return_when = return_when, 
-            concurrency_limit = concurrency_limit
+            concurrency_limit = concurrency_limit,
+            return_ordered = return_ordered,
+            max_buffered = max_buffered,
+            stats = stats,
+            return_exceptions = return_exceptions,
         ):
-            yield await result
+            yield result
     
     sync_map = map
     sync_iterate = iterate
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+"""Adaptive concurrency limiters for the windowed async map helpers.
+
+A limiter decides how many tasks :func:`lzl.pool.base.amap_window` keeps in
+flight. It is fed the latency of every finished task and whether it failed,
+so adaptive limiters can grow while the downstream service keeps up and back
+off when latency rises or it starts rejecting requests (e.g. HTTP 429).
+
+Limiters are not shared across event loops; use one instance per call site.
+"""
+
+import abc
+import math
+import asyncio
+from typing import Dict, Optional, Type, Union
+
+
+OverloadStatusCodes = {429, 503}
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """Return ``True`` when ``error`` signals that the downstream is overloaded.
+
+    Matches timeouts and errors carrying a 429/503 status code either directly
+    (``status_code`` / ``status``) or on their ``response``.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)): return True
+    for obj in (error, getattr(error, 'response', None)):
+        if obj is None: continue
+        for attr in ('status_code', 'status'):
+            status = getattr(obj, attr, None)
+            if isinstance(status, int) and status in OverloadStatusCodes: return True
+    return False
+
+
+class BaseLimiter(abc.ABC):
+    """Base class of the concurrency limiters."""
+
+    name: Optional[str] = None
+
+    def __init__(
+        self,
+        initial_limit: Optional[int] = 10,
+        min_limit: Optional[int] = 1,
+        max_limit: Optional[int] = 1000,
+        **kwargs,
+    ):
+        """Initialise the limiter bounded by ``min_limit`` and ``max_limit``."""
+        self.min_limit = max(min_limit or 1, 1)
+        self.max_limit = max(max_limit or self.min_limit, self.min_limit)
+        self._limit: float = float(self._clamp(initial_limit))
+        self._kwargs = kwargs
+
+    def _clamp(self, value: float) -> float:
+        """Clamp ``value`` to the configured bounds."""
+        return min(max(value, self.min_limit), self.max_limit)
+
+    @property
+    def limit(self) -> int:
+        """Return the current number of tasks allowed in flight."""
+        return int(self._limit)
+
+    def record(self, latency: float, error: Optional[BaseException] = None):
+        """Record a finished task and update the limit."""
+        if error is not None and is_overload_error(error): self.on_overload(latency, error)
+        else: self.on_sample(latency, error)
+
+    @abc.abstractmethod
+    def on_sample(self, latency: float, error: Optional[BaseException] = None):
+        """Update the limit from a finished task that did not signal overload."""
+
+    def on_overload(self, latency: float, error: BaseException):
+        """Update the limit after the downstream signalled overload."""
+        self.on_sample(latency, error)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} limit={self.limit}, min={self.min_limit}, max={self.max_limit}>'
+
+
+class StaticLimiter(BaseLimiter):
+    """A fixed concurrency limit."""
+
+    name: Optional[str] = 'static'
+
+    def __init__(self, limit: Optional[int] = None, **kwargs):
+        """Initialise the limiter, defaulting to the global concurrency limit."""
+        if limit is None:
+            from .base import get_concurrency_limit
+            limit = get_concurrency_limit()
+        kwargs.setdefault('max_limit', limit)
+        super().__init__(initial_limit = limit, **kwargs)
+
+    def on_sample(self, latency: float, error: Optional[BaseException] = None):
+        """The limit never changes."""
+
+
+class AIMDLimiter(BaseLimiter):
+    """Additive increase, multiplicative decrease.
+
+    The limit grows by ``increase`` per window of successful tasks and is
+    multiplied by ``backoff`` on overload, or when a task is slower than
+    ``timeout`` seconds.
+    """
+
+    name: Optional[str] = 'aimd'
+
+    def __init__(
+        self,
+        initial_limit: Optional[int] = 10,
+        increase: Optional[float] = 1.0,
+        backoff: Optional[float] = 0.9,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        """Initialise the limiter."""
+        super().__init__(initial_limit = initial_limit, **kwargs)
+        self.increase = increase
+        self.backoff = backoff
+        self.timeout = timeout
+
+    def on_sample(self, latency: float, error: Optional[BaseException] = None):
+        """Grow the limit, unless the task was slower than the timeout."""
+        if self.timeout is not None and latency > self.timeout:
+            return self.on_overload(latency, error)
+        if error is None: self._limit = self._clamp(self._limit + self.increase / self._limit)
+
+    def on_overload(self, latency: float, error: Optional[BaseException] = None):
+        """Shrink the limit multiplicatively."""
+        self._limit = self._clamp(self._limit * self.backoff)
+
+
+class GradientLimiter(BaseLimiter):
+    """Latency gradient based limiter.
+
+    Compares a short-term latency average against a slowly moving long-term
+    baseline. While they match the limit grows by a queue allowance of
+    ``sqrt(limit)``; as short-term latency rises above the baseline the limit
+    is scaled down by their ratio (never below half per update).
+    """
+
+    name: Optional[str] = 'gradient'
+
+    def __init__(
+        self,
+        initial_limit: Optional[int] = 10,
+        smoothing: Optional[float] = 0.2,
+        tolerance: Optional[float] = 1.5,
+        short_window: Optional[int] = 10,
+        long_window: Optional[int] = 600,
+        backoff: Optional[float] = 0.9,
+        **kwargs,
+    ):
+        """Initialise the limiter.
+
+        Args:
+            smoothing: Weight of each new limit estimate per window of samples.
+            tolerance: How much the short-term latency may exceed the baseline before backing off.
+            short_window: Number of samples of the short-term average.
+            long_window: Number of samples of the long-term baseline.
+            backoff: Multiplier applied to the limit on overload.
+        """
+        super().__init__(initial_limit = initial_limit, **kwargs)
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self._short_factor = 2 / (short_window + 1)
+        self._long_factor = 2 / (long_window + 1)
+        self.short_latency: Optional[float] = None
+        self.long_latency: Optional[float] = None
+
+    def on_sample(self, latency: float, error: Optional[BaseException] = None):
+        """Update the latency averages and the limit."""
+        if self.short_latency is None:
+            self.short_latency = self.long_latency = latency
+        else:
+            self.short_latency += (latency - self.short_latency) * self._short_factor
+            self.long_latency += (latency - self.long_latency) * self._long_factor
+
+        # Let the baseline recover quickly after a latency spike has passed
+        if self.long_latency > self.short_latency * 2: self.long_latency *= 0.95
+        if not self.short_latency: return
+        gradient = max(0.5, min(1.0, self.tolerance * self.long_latency / self.short_latency))
+        new_limit = self._limit * gradient + math.sqrt(self._limit)
+        # Spread each update over a window of samples, like the AIMD increase
+        weight = self.smoothing / self._limit
+        self._limit = self._clamp(self._limit * (1 - weight) + new_limit * weight)
+
+    def on_overload(self, latency: float, error: Optional[BaseException] = None):
+        """Shrink the limit multiplicatively."""
+        self._limit = self._clamp(self._limit * self.backoff)
+
+
+LimiterT = Union[int, str, BaseLimiter]
+
+_limiters: Dict[str, Type[BaseLimiter]] = {
+    StaticLimiter.name: StaticLimiter,
+    AIMDLimiter.name: AIMDLimiter,
+    GradientLimiter.name: GradientLimiter,
+}
+
+
+def register_limiter(limiter: Type[BaseLimiter], name: Optional[str] = None):
+    """Register a limiter class so it can be referenced by name."""
+    _limiters[name or limiter.name] = limiter
+
+
+def get_limiter(limiter: Optional[LimiterT] = None, **kwargs) -> BaseLimiter:
+    """Return a limiter for ``limiter``.
+
+    Accepts a limiter instance, the name of a registered limiter (created with
+    ``kwargs``), or an integer / ``None`` for a static limit.
+    """
+    if isinstance(limiter, BaseLimiter): return limiter
+    if limiter is None or isinstance(limiter, int): return StaticLimiter(limiter, **kwargs)
+    if limiter not in _limiters: raise ValueError(f'Unknown limiter: {limiter}. Available: {list(_limiters)}')
+    return _limiters[limiter](**kwargs)
@@ -4,10 +4,12 @@ from __future__ import annotations
 Hashing Helpers
 """
 
+import sys
+import struct
 import hashlib
 from lzl import load
 from pydantic import BaseModel
-from typing import Optional, Union, Any, TypeVar, Dict, List, TYPE_CHECKING
+from typing import Optional, Union, Any, TypeVar, Dict, List, Callable, Type, TYPE_CHECKING
 
 if load.TYPE_CHECKING:
     import xxhash
@@ -19,6 +21,296 @@ PyModelType = TypeVar("PyModelType", bound=BaseModel)
 ObjT = Union['PyModelType', Dict, Any]
 
 
+"""
+Canonical Hashing
+
+Objects are hashed from a canonical encoding, so equal values hash the same
+regardless of dict key order and without hashing the repr of the whole object.
+
+The encoding is streamed by `ObjectHasher` into the xxhash state. Every value
+is tagged with its type, so e.g. tuples and lists or int and str keys never
+hash the same:
+
+- bytes and contiguous numpy arrays are hashed directly from their buffers
+- mapping keys and set elements are sorted, by their encoding for mixed types
+- pydantic models are encoded by class name and their non-None fields
+- anything else is encoded by its class name and `str()`
+"""
+
+# Buffers larger than this are hashed directly instead of being copied
+_DIRECT_UPDATE_SIZE = 4096
+_FLUSH_SIZE = 64 * 1024
+
+_hexdigests: Dict[Optional[int], Callable[[Union[str, bytes]], str]] = {}
+
+def _get_hexdigest(hash_length: Optional[int] = None) -> Callable[[Union[str, bytes]], str]:
+    """
+    Returns the xxhash hexdigest function of the hash length
+    """
+    try:
+        return _hexdigests[hash_length]
+    except KeyError:
+        pass
+    if hash_length is None or hash_length == 32: func = xxhash.xxh3_128_hexdigest
+    elif hash_length == 16: func = xxhash.xxh3_64_hexdigest
+    elif hash_length == 8: func = xxhash.xxh32_hexdigest
+    else: raise ValueError(f"Invalid hash length: {hash_length}")
+    _hexdigests[hash_length] = func
+    return func
+
+
+HashHandler = Callable[['ObjectHasher', Any], None]
+
+_pack_size = struct.Struct('<Q').pack
+_pack_float = struct.Struct('<d').pack
+
+_hash_handlers: Dict[Type, HashHandler] = {}
+
+
+class ObjectHasher:
+    """
+    Streams a type-tagged encoding of objects into an xxhash state
+
+    - Every value is written as a one-byte tag followed by a length-prefixed
+      payload, so different structures never encode to the same bytes
+    - Mapping keys are sorted, falling back to their encoding for mixed types
+    - bytes and contiguous numpy arrays are hashed directly from their buffers
+    - A container that is reached again while it is being encoded is written
+      as a back-reference to its depth, so self-referencing objects can be hashed
+    """
+
+    __slots__ = ('state', 'buffer', 'stack')
+
+    def __init__(self, hash_length: Optional[int] = None):
+        if hash_length is None or hash_length == 32: self.state = xxhash.xxh3_128()
+        elif hash_length == 16: self.state = xxhash.xxh3_64()
+        elif hash_length == 8: self.state = xxhash.xxh32()
+        else: raise ValueError(f"Invalid hash length: {hash_length}")
+        self.buffer = bytearray()
+        self.stack: Dict[int, int] = {}
+
+    def update(self, obj: ObjT) -> 'ObjectHasher':
+        """
+        Adds the object to the hash
+        """
+        _encode(self, obj)
+        return self
+
+    def write_buffer(self, tag: bytes, data: Any, size: int) -> None:
+        """
+        Writes a tagged buffer, hashing large ones without copying them
+        """
+        self.buffer += tag
+        self.buffer += _pack_size(size)
+        if size < _DIRECT_UPDATE_SIZE:
+            self.buffer += data
+            return
+        self.flush()
+        self.state.update(data)
+
+    def enter(self, obj: Any) -> bool:
+        """
+        Marks the container as being encoded
+
+        Returns False, after writing a back-reference, if it already is
+        """
+        depth = self.stack.get(id(obj))
+        if depth is not None:
+            self.buffer += b'r'
+            self.buffer += _pack_size(len(self.stack) - depth)
+            return False
+        self.stack[id(obj)] = len(self.stack)
+        return True
+
+    def exit(self, obj: Any) -> None:
+        """
+        Marks the container as encoded
+        """
+        del self.stack[id(obj)]
+
+    def flush(self) -> None:
+        """
+        Feeds the buffered encoding into the hash state
+        """
+        if self.buffer:
+            self.state.update(self.buffer)
+            self.buffer.clear()
+
+    def hexdigest(self) -> str:
+        """
+        Returns the hexadecimal digest
+        """
+        self.flush()
+        return self.state.hexdigest()
+
+
+def _encode(h: ObjectHasher, obj: Any) -> None:
+    """
+    Writes the canonical encoding of the object
+
+    The common exact types are handled inline, everything else
+    goes through the cached handler of its type
+    """
+    out = h.buffer
+    tp = obj.__class__
+    if tp is str:
+        data = obj.encode('utf-8', 'surrogatepass')
+        if len(data) < _DIRECT_UPDATE_SIZE:
+            out += b's'
+            out += _pack_size(len(data))
+            out += data
+        else: h.write_buffer(b's', data, len(data))
+    elif tp is int:
+        data = obj.to_bytes((obj.bit_length() + 8) >> 3, 'little', signed = True)
+        out += b'i'
+        out += _pack_size(len(data))
+        out += data
+    elif tp is float:
+        out += b'f'
+        # NaN payloads and the sign of zero are not part of the value
+        out += b'nan' if obj != obj else _pack_float(obj + 0.0)
+    elif tp is dict: _hash_mapping(h, obj)
+    elif tp is list or tp is tuple: _hash_sequence(h, obj)
+    elif obj is None: out += b'N'
+    elif obj is True: out += b'T'
+    elif obj is False: out += b'F'
+    else:
+        handler = _hash_handlers.get(tp)
+        if handler is None: handler = _resolve_hash_handler(tp)
+        handler(h, obj)
+    if len(out) >= _FLUSH_SIZE: h.flush()
+
+
+class _OrderingEncoder(ObjectHasher):
+    """
+    Collects the whole encoding instead of hashing it, used for ordering
+    """
+
+    __slots__ = ()
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.stack = {}
+
+    def write_buffer(self, tag: bytes, data: Any, size: int) -> None:
+        self.buffer += tag
+        self.buffer += _pack_size(size)
+        self.buffer += data
+
+    def flush(self) -> None:
+        pass
+
+
+# Subclasses (e.g. enums) are hashed by their base value
+def _hash_int(h: ObjectHasher, obj: int) -> None:
+    _encode(h, int(obj))
+
+def _hash_float(h: ObjectHasher, obj: float) -> None:
+    _encode(h, float(obj))
+
+def _hash_str(h: ObjectHasher, obj: str) -> None:
+    _encode(h, str.__str__(obj))
+
+def _hash_bytes(h: ObjectHasher, obj: Union[bytes, bytearray, memoryview]) -> None:
+    if isinstance(obj, memoryview): obj = obj.cast('B') if obj.c_contiguous else obj.tobytes()
+    h.write_buffer(b'b', obj, len(obj))
+
+def _hash_sequence(h: ObjectHasher, obj: Union[list, tuple]) -> None:
+    if not h.enter(obj): return
+    h.buffer += b'l' if isinstance(obj, list) else b't'
+    h.buffer += _pack_size(len(obj))
+    for item in obj: _encode(h, item)
+    h.exit(obj)
+
+def _encode_canonical(obj: Any) -> bytes:
+    """
+    Returns the type-tagged encoding of a small object, used for ordering
+    """
+    h = _OrderingEncoder()
+    _encode(h, obj)
+    return bytes(h.buffer)
+
+def _hash_mapping(h: ObjectHasher, obj: Dict[Any, Any]) -> None:
+    try:
+        keys = sorted(obj)
+    except TypeError:
+        # Keys of mixed types are ordered by their encoding
+        keys = sorted(obj, key = _encode_canonical)
+    if not h.enter(obj): return
+    h.buffer += b'd'
+    h.buffer += _pack_size(len(keys))
+    for key in keys:
+        _encode(h, key)
+        _encode(h, obj[key])
+    h.exit(obj)
+
+def _hash_set(h: ObjectHasher, obj: Union[set, frozenset]) -> None:
+    h.buffer += b'S'
+    h.buffer += _pack_size(len(obj))
+    for data in sorted(_encode_canonical(item) for item in obj):
+        h.buffer += data
+
+def _hash_model(h: ObjectHasher, obj: BaseModel) -> None:
+    # Fields set to None are skipped, as with `model_dump_json(exclude_none = True)`
+    values = {key: value for key, value in obj.__dict__.items() if value is not None}
+    extra = getattr(obj, '__pydantic_extra__', None)
+    if extra: values.update((key, value) for key, value in extra.items() if value is not None)
+    if not h.enter(obj): return
+    h.buffer += b'm'
+    _hash_str(h, f'{obj.__class__.__module__}.{obj.__class__.__qualname__}')
+    _hash_mapping(h, values)
+    h.exit(obj)
+
+def _hash_model_dump(h: ObjectHasher, obj: Any) -> None:
+    h.buffer += b'm'
+    _hash_str(h, f'{obj.__class__.__module__}.{obj.__class__.__qualname__}')
+    _encode(h, obj.model_dump(exclude_none = True))
+
+def _hash_ndarray(h: ObjectHasher, obj: Any) -> None:
+    h.buffer += b'a'
+    _hash_str(h, obj.dtype.str)
+    _hash_sequence(h, obj.shape)
+    if obj.dtype.hasobject:
+        _encode(h, obj.tolist())
+        return
+    if not obj.flags.c_contiguous: obj = obj.copy(order = 'C')
+    h.write_buffer(b'b', obj.data.cast('B') if obj.ndim else obj.tobytes(), obj.nbytes)
+
+def _hash_np_scalar(h: ObjectHasher, obj: Any) -> None:
+    h.buffer += b'g'
+    _hash_str(h, obj.dtype.str)
+    if obj.dtype.hasobject: _encode(h, obj.item())
+    else: _hash_bytes(h, obj.tobytes())
+
+def _hash_object(h: ObjectHasher, obj: Any) -> None:
+    h.buffer += b'o'
+    _hash_str(h, f'{obj.__class__.__module__}.{obj.__class__.__qualname__}')
+    _hash_str(h, str(obj))
+
+
+def _resolve_hash_handler(obj_type: Type) -> HashHandler:
+    """
+    Resolves and caches the hash handler of the type
+
+    The checks are ordered by precedence, e.g. numpy floats are `float` subclasses
+    """
+    np = sys.modules.get('numpy')
+    if np is not None and issubclass(obj_type, np.ndarray): handler = _hash_ndarray
+    elif np is not None and issubclass(obj_type, np.generic): handler = _hash_np_scalar
+    elif issubclass(obj_type, int): handler = _hash_int
+    elif issubclass(obj_type, float): handler = _hash_float
+    elif issubclass(obj_type, str): handler = _hash_str
+    elif issubclass(obj_type, (bytes, bytearray, memoryview)): handler = _hash_bytes
+    elif issubclass(obj_type, (list, tuple)): handler = _hash_sequence
+    elif issubclass(obj_type, dict): handler = _hash_mapping
+    elif issubclass(obj_type, (set, frozenset)): handler = _hash_set
+    elif issubclass(obj_type, BaseModel): handler = _hash_model
+    elif hasattr(obj_type, 'model_dump'): handler = _hash_model_dump
+    else: handler = _hash_object
+    _hash_handlers[obj_type] = handler
+    return handler
+
+
 def create_object_hash(
     obj: ObjT,
     _sep: Optional[str] = ':',
@@ -27,27 +319,19 @@ def create_object_hash(
     """
     Creates a deterministic hash for a given object using xxhash.
 
-    Supports dictionaries, lists, tuples, sets, and Pydantic models.
+    Strings are hashed as is. Other objects are hashed from their canonical
+    encoding, so equal dicts hash the same regardless of key order.
 
     Args:
         obj: The object to hash.
-        _sep: Separator used when joining iterable elements (default: ':').
+        _sep: Unused, kept for compatibility.
         _hash_length: Length/type of hash (8=32bit, 16=64bit, 32/None=128bit).
 
     Returns:
         The resulting hexadecimal hash string.
     """
-    if _hash_length is None or _hash_length == 32: _hasher = xxhash.xxh3_128_hexdigest
-    elif _hash_length == 16: _hasher = xxhash.xxh3_64_hexdigest
-    elif _hash_length == 8: _hasher = xxhash.xxh32_hexdigest
-
-    if isinstance(obj, dict):
-        return _hasher(str(obj))
-    if isinstance(obj, (list, tuple, set)):
-        return f'{_sep}'.join(create_object_hash(item, _sep = _sep) for item in obj)
-    if isinstance(obj, BaseModel) or hasattr(obj, "model_dump"):
-        return _hasher(obj.model_dump_json(exclude_none=True))
-    return _hasher(str(obj))
+    if isinstance(obj, str): return _get_hexdigest(_hash_length)(obj)
+    return ObjectHasher(_hash_length).update(obj).hexdigest()
 
 def create_hash_from_args_and_kwargs(
     *args,
@@ -70,7 +354,7 @@ def create_hash_from_args_and_kwargs(
         _key_base: An optional initial tuple to prepend to the hash key.
         _exclude: A list of keyword argument names to exclude from the hash.
         _exclude_none: If True, excludes keyword arguments with None values.
-        _sep: Separator used for joining hash components.
+        _sep: Unused, kept for compatibility.
         _hash_length: Length/type of hash (8=32bit, 16=64bit, 32/None=128bit).
         **kwargs: Keyword arguments to include in the hash.
 
@@ -78,16 +362,9 @@ def create_hash_from_args_and_kwargs(
         The resulting hexadecimal hash string.
     """
     hash_key = _key_base or ()
-    if args: 
+    if args:
         hash_key += tuple(type(arg) for arg in args) if _typed else args
     if kwargs:
         if _exclude: kwargs = {k: v for k, v in kwargs.items() if k not in _exclude}
         if _exclude_none: kwargs = {k: v for k, v in kwargs.items() if v is not None}
-        sorted_items = sorted(kwargs.items())
-        for item in sorted_items:
-            hash_key += item
-    
-    key = f'{_sep}'.join(str(k) for k in hash_key)
-    return create_object_hash(key, _sep = _sep, _hash_length = _hash_length)
-
-
+    return create_object_hash([hash_key, kwargs], _hash_length = _hash_length)
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from lzl.api import aiorqlite
+
+
+class _Cluster:
+    """
+    Serves the redirect behaviour of an rqlite cluster: followers redirect
+    writes and weak/strong reads to the leader when asked to, and forward
+    them otherwise, while none reads are served by any node.
+    """
+
+    def __init__(self, size: int):
+        self.leader = 0
+        self.requests: List[List[str]] = [[] for _ in range(size)]
+        self.servers = [self._serve(n) for n in range(size)]
+        self.urls = [f"http://127.0.0.1:{server.server_address[1]}" for server in self.servers]
+
+    def _serve(self, node: int) -> ThreadingHTTPServer:
+        cluster = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                path, _, query = self.path.partition("?")
+                params = urllib.parse.parse_qs(query, keep_blank_values=True)
+                level = params.get("level", ["weak"])[0]
+                local = path == "/db/query" and level == "none"
+                if node != cluster.leader and not local:
+                    if "redirect" in params:
+                        cluster.requests[node].append("redirect")
+                        self.send_response(301)
+                        self.send_header("Location", cluster.urls[cluster.leader] + self.path)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    cluster.requests[node].append("forward")
+                else:
+                    cluster.requests[node].append(path)
+                if path == "/db/execute":
+                    body = {"results": [{"last_insert_id": 1, "rows_affected": 1}]}
+                else:
+                    body = {"results": [{"columns": ["a"], "types": ["integer"], "values": [[node]]}]}
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def reset(self) -> None:
+        for requests in self.requests:
+            requests.clear()
+
+    def close(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def test_writes_go_to_the_cached_leader() -> None:
+    cluster = _Cluster(3)
+    try:
+        conn = aiorqlite.connect(cluster.urls, log=False)
+        for _ in range(5):
+            conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.io.leader is conn.io.hosts[0]
+        # Only the first write may be redirected, none is forwarded
+        assert cluster.requests[0].count("/db/execute") == 5
+        assert sum(r.count("redirect") for r in cluster.requests) <= 1
+        assert not any("forward" in r for r in cluster.requests)
+
+        # None reads are spread across the followers
+        cluster.reset()
+        nodes = {conn.execute("SELECT a", read_consistency="none").results[0][0] for _ in range(6)}
+        assert nodes == {1, 2}
+        assert conn.execute("SELECT a", read_consistency="weak").results[0][0] == 0
+
+        # A new leader is learned from the redirect of the previous one
+        cluster.leader = 2
+        cluster.reset()
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.io.leader is conn.io.hosts[2]
+        assert cluster.requests[0] == ["redirect"] and cluster.requests[2] == ["/db/execute"] * 2
+
+        # A failed leader is forgotten
+        cluster.leader = 1
+        cluster.servers[2].shutdown()
+        cluster.servers[2].server_close()
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.io.leader is conn.io.hosts[1]
+    finally:
+        cluster.close()
+
+
+def test_async_routing_and_single_node() -> None:
+    cluster = _Cluster(1)
+    try:
+        conn = aiorqlite.connect(cluster.urls, log=False)
+
+        async def _test() -> None:
+            await conn.cursor().aexecute("INSERT INTO t VALUES (1)")
+            assert conn.io.leader is conn.io.hosts[0]
+            result = await conn.cursor().aexecute("SELECT a", read_consistency="strong")
+            assert result.results[0][0] == 0
+            assert await conn.io.adiscover_leader() is conn.io.hosts[0]
+
+        asyncio.run(_test())
+        result = conn.execute("SELECT a", read_consistency="none")
+        assert result.results[0][0] == 0
+        assert cluster.requests[0] == ["/db/execute", "/db/query", "/db/query"]
+    finally:
+        cluster.close()
+
+
+def test_only_db_requests_are_leader_routes() -> None:
+    conn = aiorqlite.connect(["http://127.0.0.1:1", "http://127.0.0.1:2"], log=False)
+    for uri in ("/status", "/nodes", "/readyz", "/db/backup", "/db/load"):
+        assert conn.io.route_request(uri) == (uri, None, False)
+    assert conn.io.route_request("/db/execute") == ("/db/execute?redirect", None, True)
+    assert conn.io.route_request("/db/query?level=strong") == ("/db/query?level=strong&redirect", None, True)
+    assert conn.io.route_request("/db/query?level=none")[2] is False
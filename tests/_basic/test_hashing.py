@@ -0,0 +1,80 @@
+import datetime
+from uuid import UUID
+
+import pytest
+from pydantic import BaseModel
+
+from lzo.utils.hashing import ObjectHasher, create_hash_from_args_and_kwargs, create_object_hash
+
+
+class Item(BaseModel):
+    name: str
+    meta: dict = {}
+    note: str | None = None
+
+
+def test_dict_hash_ignores_key_order() -> None:
+    assert create_object_hash({"a": 1, "b": {"x": 1, "y": 2}}) == create_object_hash({"b": {"y": 2, "x": 1}, "a": 1})
+    assert create_object_hash({"a": 1}) != create_object_hash({"a": 1.0})
+    assert create_object_hash({"a": 1}) != create_object_hash({"a": 2})
+
+
+def test_set_and_model_hashes_are_canonical() -> None:
+    assert create_object_hash({"b", "a", "c"}) == create_object_hash({"c", "a", "b"})
+    assert create_object_hash(Item(name="x", meta={"a": 1, "b": 2})) == create_object_hash(Item(name="x", meta={"b": 2, "a": 1}))
+    assert create_object_hash(Item(name="x")) != create_object_hash(Item(name="y"))
+
+
+def test_unsortable_keys_are_ordered_by_encoding() -> None:
+    value = {1: "a", "b": [datetime.datetime(2024, 1, 1), UUID(int=1)], (1, 2): b"raw"}
+    reordered = {(1, 2): b"raw", "b": [datetime.datetime(2024, 1, 1), UUID(int=1)], 1: "a"}
+    assert create_object_hash(value) == create_object_hash(reordered)
+    assert ObjectHasher().update(value).hexdigest() == create_object_hash(value)
+
+
+def test_types_do_not_collide() -> None:
+    assert create_object_hash({1: "a"}) != create_object_hash({"1": "a"})
+    assert create_object_hash((1, 2)) != create_object_hash([1, 2])
+    assert create_object_hash(["\x00b", "ab"]) != create_object_hash(b"\xab")
+    assert create_hash_from_args_and_kwargs(x={1: 2}) != create_hash_from_args_and_kwargs(x={"1": 2})
+
+
+def test_self_referencing_containers_are_hashed() -> None:
+    data = {"a": 1}
+    data["self"] = data
+    items = [1, 2]
+    items.append(items)
+    assert create_object_hash(data) == create_object_hash(data)
+    assert create_object_hash(items) != create_object_hash([1, 2, [1, 2]])
+
+    # Isomorphic cycles hash the same, and repeated references are not cycles
+    other = {"a": 1}
+    other["self"] = other
+    assert create_object_hash(other) == create_object_hash(data)
+    shared = [1]
+    assert create_object_hash([shared, shared]) == create_object_hash([[1], [1]])
+
+
+def test_buffers_are_hashed_by_content() -> None:
+    data = bytearray(b"x" * 100_000)
+    first = create_object_hash({"data": bytes(data)})
+    data[50_000] = ord("y")
+    assert create_object_hash({"data": bytes(data)}) != first
+
+
+def test_ndarray_hash_covers_the_whole_array() -> None:
+    np = pytest.importorskip("numpy")
+    array = np.zeros(10_000)
+    changed = array.copy()
+    changed[5_000] = 1.0
+    assert create_object_hash(array) == create_object_hash(array.copy())
+    assert create_object_hash(array) != create_object_hash(changed)
+    assert create_object_hash(array[::2]) == create_object_hash(np.ascontiguousarray(array[::2]))
+    assert create_object_hash(np.zeros((2, 3))) != create_object_hash(np.zeros((3, 2)))
+
+
+def test_hash_from_args_and_kwargs() -> None:
+    assert create_hash_from_args_and_kwargs("json", level=3, mode="a") == create_hash_from_args_and_kwargs("json", mode="a", level=3)
+    assert create_hash_from_args_and_kwargs("json", level=None) == create_hash_from_args_and_kwargs("json")
+    assert create_hash_from_args_and_kwargs("json") != create_hash_from_args_and_kwargs("msgpack")
+    assert len(create_hash_from_args_and_kwargs("json", _hash_length=16)) == 16
@@ -0,0 +1,83 @@
+import multiprocessing
+import threading
+from pathlib import Path
+
+import pytest
+
+from lzl.io.persistence import PersistentDict, UNCHANGED
+
+
+def _make_cache(path: Path, backend_type: str) -> PersistentDict:
+    if backend_type == "sqlite":
+        return PersistentDict(
+            name="atomic",
+            backend_type="sqlite",
+            base_key=f"sqlite://{path / 'cache.db'}",
+            serializer="json",
+        )
+    return PersistentDict(
+        name="atomic",
+        backend_type="local",
+        file_path=path / "cache.json",
+        serializer="json",
+    )
+
+
+def _merge_sessions(path: str, backend_type: str, worker: int, count: int) -> None:
+    cache = _make_cache(Path(path), backend_type)
+    for i in range(count):
+        cache.update_key("session", {f"{worker}-{i}": i})
+
+
+@pytest.mark.parametrize("backend_type", ["local", "sqlite"])
+def test_compare_and_set_and_get_and_set(tmp_path: Path, backend_type: str) -> None:
+    cache = _make_cache(tmp_path, backend_type)
+    assert cache.compare_and_set("alpha", None, 1)
+    assert not cache.compare_and_set("alpha", None, 2)
+    assert cache.compare_and_set("alpha", 1, 3)
+    assert cache.get("alpha") == 3
+
+    assert cache.get_and_set("alpha", 4) == 3
+    assert cache.get_and_set("beta", 5) is None
+    assert cache.get("alpha") == 4
+
+
+@pytest.mark.parametrize("backend_type", ["local", "sqlite"])
+def test_update_in_place(tmp_path: Path, backend_type: str) -> None:
+    cache = _make_cache(tmp_path, backend_type)
+    assert cache.update_in_place("count", lambda value: (value or 0) + 1) == 1
+    assert cache.update_in_place("count", lambda value: (value or 0) + 1) == 2
+    assert cache.update_in_place("count", lambda value: UNCHANGED) == 2
+    assert cache.setdefault("count", 10) == 2
+    assert cache.setdefault("other", 10) == 10
+
+
+@pytest.mark.parametrize("backend_type", ["local", "sqlite"])
+def test_concurrent_thread_updates(tmp_path: Path, backend_type: str) -> None:
+    cache = _make_cache(tmp_path, backend_type)
+
+    def _work(worker: int) -> None:
+        for i in range(25):
+            cache.update_in_place("count", lambda value: (value or 0) + 1)
+            cache.update_key("session", {f"{worker}-{i}": i})
+
+    threads = [threading.Thread(target=_work, args=(worker,)) for worker in range(4)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    assert cache.get("count") == 100
+    assert len(cache.get("session")) == 100
+
+
+@pytest.mark.parametrize("backend_type", ["local", "sqlite"])
+def test_concurrent_process_merges(tmp_path: Path, backend_type: str) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    procs = [
+        ctx.Process(target=_merge_sessions, args=(str(tmp_path), backend_type, worker, 20))
+        for worker in range(3)
+    ]
+    for proc in procs: proc.start()
+    for proc in procs: proc.join(timeout=120)
+    assert all(proc.exitcode == 0 for proc in procs)
+
+    cache = _make_cache(tmp_path, backend_type)
+    assert len(cache.get("session")) == 60
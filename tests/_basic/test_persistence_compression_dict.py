@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from lzl.io.persistence import PersistentDict
+
+
+def _make_cache(path: Path) -> PersistentDict:
+    return PersistentDict(
+        name="zdict",
+        backend_type="local",
+        file_path=path,
+        serializer="json",
+        serializer_kwargs={"compression": "zstd_dict"},
+    )
+
+
+def _make_value(idx: int) -> dict:
+    return {
+        "user_id": f"user-{idx}",
+        "roles": ["admin", "reader"],
+        "client": {"ip": f"10.0.{idx % 255}.1", "agent": "Mozilla/5.0 (X11; Linux x86_64)"},
+        "created_at": 1_700_000_000 + idx,
+    }
+
+
+def test_train_and_migrate_dictionary(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    cache = _make_cache(path)
+    cache.set_batch({f"key_{i}": _make_value(i) for i in range(300)})
+    before = sum(len(value) for value in cache.base.cache.values())
+
+    dict_id = cache.train_compression_dictionary(sample_size=200, dict_size=2048, migrate=True)
+    assert cache.base.serializer.compressor.active_dict_id == dict_id
+    assert sum(len(value) for value in cache.base.cache.values()) < before
+    assert cache.get("key_5") == _make_value(5)
+
+    # A new instance loads the stored dictionaries
+    reloaded = _make_cache(path)
+    assert reloaded.base.serializer.compressor.active_dict_id == dict_id
+    assert reloaded.get("key_7") == _make_value(7)
+
+
+def test_unknown_dictionary_is_reloaded(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    writer = _make_cache(path)
+    reader = _make_cache(path)
+    writer.set_batch({f"key_{i}": _make_value(i) for i in range(200)})
+
+    dict_id = writer.train_compression_dictionary(sample_size=200, dict_size=2048)
+    writer["fresh"] = _make_value(1000)
+    assert reader.get("fresh") == _make_value(1000)
+    assert reader.base.serializer.compressor.active_dict_id == dict_id
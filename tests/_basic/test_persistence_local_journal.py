@@ -0,0 +1,81 @@
+from pathlib import Path
+
+from lzl.io.persistence import PersistentDict
+
+
+def _make_cache(path: Path, **kwargs) -> PersistentDict:
+    return PersistentDict(
+        name="journal",
+        backend_type="local",
+        file_path=path,
+        serializer="json",
+        **kwargs,
+    )
+
+
+def test_journal_roundtrip_and_replay(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    cache = _make_cache(path, file_format="journal")
+    cache["alpha"] = {"value": 1}
+    cache.set_batch({"beta": 2, "gamma": 3})
+    cache.delete("beta")
+
+    # Snapshot is untouched, mutations only live in the journal
+    assert path.read_text() == "{}"
+    assert path.with_suffix(".journal").stat().st_size > 0
+
+    reloaded = _make_cache(path, file_format="journal")
+    assert reloaded.get("alpha") == {"value": 1}
+    assert reloaded.get("gamma") == 3
+    assert not reloaded.contains("beta")
+
+
+def test_journal_discards_torn_tail(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    cache = _make_cache(path, file_format="journal")
+    cache["alpha"] = 1
+    journal = path.with_suffix(".journal")
+    size = journal.stat().st_size
+    with journal.open("ab") as f:
+        f.write(b'["s","beta","2')
+
+    reloaded = _make_cache(path, file_format="journal")
+    assert reloaded.get("alpha") == 1
+    assert not reloaded.contains("beta")
+    assert journal.stat().st_size == size
+
+    reloaded["gamma"] = 3
+    assert _make_cache(path, file_format="journal").get("gamma") == 3
+
+
+def test_journal_compaction_and_json_fallback(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    cache = _make_cache(path, file_format="journal", journal_compact_size=256)
+    for i in range(50):
+        cache[f"key_{i}"] = i
+
+    assert path.with_suffix(".journal").stat().st_size < 256
+    assert len(_make_cache(path, file_format="journal")) == 50
+
+    # Re-opening with the default format folds the journal into the snapshot
+    legacy = _make_cache(path)
+    assert len(legacy) == 50
+    assert not path.with_suffix(".journal").exists()
+
+
+def test_incremental_sync_between_instances(tmp_path: Path) -> None:
+    path = tmp_path / "cache.json"
+    writer = _make_cache(path, file_format="journal", base_key="ns")
+    reader = _make_cache(path, file_format="journal", base_key="ns")
+
+    writer["alpha"] = 1
+    offset = reader.base._journal_offset
+    assert "alpha" in reader
+    # Only the tail written by the other instance was replayed
+    assert reader.base._journal_offset > offset
+    assert reader.base._snapshot_stat == writer.base._snapshot_stat
+
+    reader["beta"] = 2
+    writer.delete("alpha")
+    assert sorted(reader.keys()) == ["beta"]
+    assert sorted(writer.keys()) == ["beta"]
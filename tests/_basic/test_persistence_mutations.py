@@ -0,0 +1,68 @@
+import pickle
+from pathlib import Path
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from lzl.io.persistence import PersistentDict
+from lzl.io.persistence.mutations import MutationTracker
+
+
+class Session(BaseModel):
+    count: int = 0
+    data: Dict[str, List[int]] = {}
+
+
+def test_tracked_containers_flag_mutations() -> None:
+    tracker = MutationTracker()
+    value = tracker.track("a", {"x": {"y": [1]}, "tags": {"one"}})
+    assert not tracker.is_dirty("a")
+
+    _ = value["x"]["y"][0]
+    _ = list(value.items())
+    assert not tracker.is_dirty("a")
+
+    value["x"]["y"].append(2)
+    assert tracker.is_dirty("a")
+    assert tracker.get_dirty() == {"a": {"x": {"y": [1, 2]}, "tags": {"one"}}}
+
+    tracker.track("b", {"tags": {"one"}})["tags"].add("two")
+    assert tracker.is_dirty("b")
+
+    restored = pickle.loads(pickle.dumps(value))
+    assert type(restored) is dict and type(restored["x"]) is dict
+
+
+def test_tracked_models_flag_mutations() -> None:
+    tracker = MutationTracker()
+    session = tracker.track("s", Session())
+    assert not tracker.is_dirty("s")
+    session.data.setdefault("k", []).append(1)
+    assert tracker.is_dirty("s")
+
+    session = tracker.track("t", Session())
+    session.count += 1
+    assert tracker.is_dirty("t")
+
+
+def test_persistent_dict_writes_only_dirty_keys(tmp_path: Path) -> None:
+    cache = PersistentDict(
+        name="mutations",
+        backend_type="local",
+        file_path=tmp_path / "cache.json",
+        serializer="json",
+        file_format="journal",
+    )
+    cache.set_batch({"clean": {"items": [1]}, "dirty": {"items": [1]}, "model": Session()})
+    _ = cache["clean"]["items"]
+    cache["dirty"]["items"].append(2)
+    cache["model"].count += 1
+
+    offset = cache.base._journal_offset
+    cache.flush()
+    journal = (tmp_path / "cache.journal").read_bytes()[offset:]
+    assert b'"dirty"' in journal and b'"model"' in journal
+    assert b'"clean"' not in journal
+
+    assert cache.get("dirty") == {"items": [1, 2]}
+    assert cache.get("model").count == 1
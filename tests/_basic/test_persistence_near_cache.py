@@ -0,0 +1,87 @@
+import asyncio
+import time
+from pathlib import Path
+
+from lzl.io.persistence import PersistentDict
+from lzl.io.persistence.nearcache import NearCache, MISSING
+
+
+def _make_cache(path: Path, **kwargs) -> PersistentDict:
+    return PersistentDict(
+        name="near",
+        backend_type="local",
+        file_path=path,
+        serializer="json",
+        near_cache=True,
+        **kwargs,
+    )
+
+
+def test_near_cache_hits_and_write_invalidation(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "cache.json")
+    cache["alpha"] = {"value": 1}
+
+    assert cache.get("alpha") == {"value": 1}
+    assert cache.get("alpha") == {"value": 1}
+    assert cache.near_cache.stats["hits"] == 1
+
+    # Hits decode a fresh copy, so callers cannot corrupt the cached value
+    cache.get("alpha")["value"] = 2
+    assert cache.get("alpha") == {"value": 1}
+
+    cache["alpha"] = {"value": 3}
+    assert "alpha" not in cache.near_cache
+    assert cache.get("alpha") == {"value": 3}
+
+    cache.delete("alpha")
+    assert cache.get("alpha") is None
+
+
+def test_near_cache_mutation_tracking(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "cache.json")
+    cache["items"] = [1, 2]
+    cache["items"].append(3)
+    assert cache.get("items") == [1, 2, 3]
+
+
+def test_near_cache_ttl_and_byte_bound() -> None:
+    near = NearCache(max_size=None, max_bytes=10, ttl=0.05)
+    near.set("alpha", b"12345")
+    near.set("beta", b"12345")
+    assert near.get("alpha") == b"12345"
+
+    # Exceeding the byte bound evicts the least recently used entry
+    near.set("gamma", b"123")
+    assert near.get("beta") is MISSING
+    assert near.stats["evictions"] == 1
+    assert near.size_bytes == 8
+
+    time.sleep(0.06)
+    assert near.get("alpha") is MISSING
+    assert len(near) == 1
+
+
+def test_near_cache_background_writes(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "cache.json", async_enabled=True)
+    cache.set("k", "old")
+    cache.set_batch({"a": 1})
+
+    async def _test() -> None:
+        assert cache.get("k") == "old"
+        cache.set("k", "new")
+        # Reads before the write completes are not kept in the near cache
+        cache.get("k")
+        assert "k" not in cache.near_cache
+        cache.set_batch({"a": 2})
+        cache.get("a")
+        await asyncio.sleep(0.5)
+        assert cache.base.get("k") == "new"
+        assert cache.get("k") == "new"
+        assert cache.get("a") == 2
+
+        cache.delete("k")
+        cache.get("k")
+        await asyncio.sleep(0.5)
+        assert cache.get("k") is None
+
+    asyncio.run(_test())
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from pathlib import Path
+
+from lzl.io.persistence import PersistentDict
+
+
+def _make_cache(path: Path, **db_settings) -> PersistentDict:
+    path.mkdir(parents=True, exist_ok=True)
+    return PersistentDict(
+        name="objstore_batches",
+        backend_type="objstore",
+        base_key=path.as_posix(),
+        serializer="json",
+        expiration_backend="file",
+        **db_settings,
+    )
+
+
+def test_batches_share_a_bounded_executor(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "store", max_workers=4, batch_concurrency=3)
+    backend = cache.base
+    data = {f"key_{i}": {"value": i} for i in range(40)}
+    cache.set_batch(data)
+    assert cache.get_values(list(data)) == list(data.values())
+
+    executor = backend.executor
+    threads = threading.active_count()
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+    fetch_one = backend._fetch_one
+
+    def _tracked(*args, **kwargs):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        try:
+            return fetch_one(*args, **kwargs)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    backend._fetch_one = _tracked
+    for _ in range(3):
+        assert dict(backend.iter_values(data)) == data
+    assert peak <= 3
+    assert backend.executor is executor and executor._max_workers == 4
+    assert threading.active_count() <= threads + 4
+    assert dict(backend.iter_items(exclude_base_key=True)).keys() == {f"/{k}" for k in data}
+
+    cache.clear(*data)
+    assert cache.get_values(["key_1"]) == [None]
+
+
+def test_async_batches_stream(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "store", batch_concurrency=2)
+    data = {f"key_{i}": i for i in range(20)}
+
+    async def _test() -> None:
+        await cache.aset_batch(data)
+        assert await cache.aget_values(list(data)) == list(data.values())
+        assert {k: v async for k, v in cache.base.aiter_values(data)} == data
+
+    asyncio.run(_test())
@@ -0,0 +1,123 @@
+import time
+from pathlib import Path
+
+from lzl.io.persistence import PersistentDict
+from lzl.io.persistence.backends.objstore import ExpirationFile
+from lzl.io.persistence.backends.objstore import expirations
+
+
+def _make_cache(path: Path, **expiration_kwargs) -> PersistentDict:
+    path.mkdir(parents=True, exist_ok=True)
+    return PersistentDict(
+        name="objstore_exps",
+        backend_type="objstore",
+        base_key=path.as_posix(),
+        serializer="json",
+        expiration_backend="file",
+        expiration_kwargs={"flush_interval": 0, "num_shards": 4, **expiration_kwargs},
+    )
+
+
+def _data_files(path: Path) -> list:
+    return sorted(p.name for p in path.iterdir() if ".metadata." not in p.name)
+
+
+def test_expirations_are_sharded_and_swept_in_batches(tmp_path: Path) -> None:
+    path = tmp_path / "store"
+    cache = _make_cache(path, sweep_batch=10)
+    exp_backend = cache.base.exp_backend
+    cache.set_batch({f"key_{i}": i for i in range(30)}, ex=0.2)
+    cache.set("persistent", 1)
+
+    shard_files = sorted(p.name for p in path.iterdir() if ".metadata." in p.name)
+    assert len(shard_files) == 4 and all(name.startswith(".objstore_exps.metadata.expires.") for name in shard_files)
+    assert sum(len(shard) for shard in exp_backend.shards) == 30
+
+    # Another instance reads the stored shards
+    other = _make_cache(path)
+    assert sum(len(shard) for shard in other.base.exp_backend.shards) == 0
+    other.base.exp_backend._check(validate=True)
+    assert sum(len(shard) for shard in other.base.exp_backend.shards) == 30
+
+    time.sleep(0.3)
+    # A check removes the checked key and sweeps at most one batch of expired keys
+    assert cache.get("key_29") is None
+    assert len(_data_files(path)) == 31 - 10
+    exp_backend._check(validate=True)
+    assert _data_files(path) == ["persistent"]
+    assert cache.get("persistent") == 1
+
+    # Removals are merged into the stored shards
+    assert all(not shard.pending for shard in exp_backend.shards)
+    assert sum(len(exp_backend._read_shard(n)) for n in range(4)) == 0
+
+
+def test_expirations_are_flushed_in_the_background(tmp_path: Path) -> None:
+    path = tmp_path / "store"
+    cache = _make_cache(path, flush_interval=0.1)
+    exp_backend = cache.base.exp_backend
+    cache.set("a", 1, ex=60)
+    cache.set("b", 2, ex=60)
+    assert exp_backend.shards[exp_backend.get_shard_id("a")].pending
+    time.sleep(0.3)
+    assert all(not shard.pending for shard in exp_backend.shards)
+    assert exp_backend._read_shard(exp_backend.get_shard_id("a"))["a"] > time.time()
+
+    cache.delete("a")
+    exp_backend.flush()
+    assert "a" not in exp_backend._read_shard(exp_backend.get_shard_id("a"))
+
+
+def test_expiration_file_is_migrated(tmp_path: Path) -> None:
+    path = tmp_path / "store"
+    cache = _make_cache(path)
+    cache.set("a", 1)
+    exps = ExpirationFile()
+    exps.add_exp("a", 60)
+    legacy = path / ".objstore_exps.metadata.expires"
+    legacy.write_text(cache.base.exp_backend.ser.dumps(exps))
+
+    migrated = _make_cache(path)
+    assert not legacy.exists()
+    exp_backend = migrated.base.exp_backend
+    assert "a" in exp_backend._read_shard(exp_backend.get_shard_id("a"))
+
+
+def test_expiration_file_is_kept_if_not_migrated(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "store"
+    cache = _make_cache(path)
+    exps = ExpirationFile()
+    exps.add_exp("a", 60)
+    legacy = path / ".objstore_exps.metadata.expires"
+    legacy.write_text(cache.base.exp_backend.ser.dumps(exps))
+
+    def _fail(self, shard_id):
+        raise OSError("write failed")
+
+    monkeypatch.setattr(expirations.FileExpirationBackend, "_read_shard", _fail)
+    _make_cache(path)
+    assert legacy.exists()
+
+
+def test_expirations_are_flushed_at_exit(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "store", flush_interval=60)
+    exp_backend = cache.base.exp_backend
+    cache.set("a", 1, ex=60)
+    assert exp_backend in expirations._file_backends
+    expirations._flush_file_backends()
+    assert "a" in exp_backend._read_shard(exp_backend.get_shard_id("a"))
+
+
+def test_expirations_set_by_another_instance_are_kept(tmp_path: Path) -> None:
+    path = tmp_path / "store"
+    first, second = _make_cache(path), _make_cache(path)
+    first.set("k", "first", ex=1)
+    first.set("expiring", 1, ex=1)
+    second.set("k", "second", ex=100)
+
+    # The loaded shard of the first instance still has the old expiration
+    time.sleep(1.5)
+    assert first.get("k") == "second"
+    first.base.exp_backend._check(validate=True)
+    assert _data_files(path) == ["k"]
+    assert first.base.exp_backend._read_shard(first.base.exp_backend.get_shard_id("k"))["k"] > time.time() + 60
@@ -0,0 +1,124 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+from fsspec.asyn import get_loop
+
+from lzl.io.persistence import PersistentDict
+from lzl.io.persistence.backends.objstore.caching import ConditionalReader, ETagCache
+
+
+def _make_cache(path: Path, **db_settings) -> PersistentDict:
+    path.mkdir(parents=True, exist_ok=True)
+    return PersistentDict(
+        name="objstore_reads",
+        backend_type="objstore",
+        base_key=path.as_posix(),
+        serializer="json",
+        expiration_backend="file",
+        **db_settings,
+    )
+
+
+class _NotModified(Exception):
+    response = {"Error": {"Code": "304"}, "ResponseMetadata": {"HTTPStatusCode": 304}}
+
+
+class _Body:
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def read(self) -> bytes:
+        return self.data
+
+    def close(self) -> None:
+        pass
+
+
+class _FakeS3:
+    """
+    Serves objects like s3fs, including the error translation of a 304
+    """
+
+    def __init__(self):
+        self.loop = get_loop()
+        self.objects = {}
+        self.requests = []
+
+    def split_path(self, path: str):
+        bucket, key = path.split("/", 1)
+        return bucket, key, None
+
+    async def _call_s3(self, method: str, **kwargs):
+        self.requests.append((method, kwargs.get("IfNoneMatch")))
+        if kwargs["Key"] not in self.objects:
+            raise FileNotFoundError(kwargs["Key"])
+        data, etag = self.objects[kwargs["Key"]]
+        if kwargs.get("IfNoneMatch") == etag:
+            raise OSError(5, "Not Modified") from _NotModified()
+        return {"Body": _Body(data), "ETag": etag}
+
+
+def _fake_file(fs: _FakeS3, key: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        is_fsspec=True,
+        filesys=fs,
+        afilesys=fs,
+        fspath_=f"bucket/{key}",
+        as_posix=lambda: f"s3://bucket/{key}",
+    )
+
+
+def test_missing_keys_are_misses(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "store")
+    cache["a"] = {"value": 1}
+    assert cache["a"] == {"value": 1}
+    assert cache.get("missing") is None
+    assert cache.get_values(["a", "missing"]) == [{"value": 1}, None]
+
+    async def _test() -> None:
+        assert await cache.aget("a") == {"value": 1}
+        assert await cache.aget("missing") is None
+
+    asyncio.run(_test())
+
+
+def test_etag_cache_revalidates(tmp_path: Path) -> None:
+    fs = _FakeS3()
+    fs.objects["key.json"] = (b'{"value": 1}', '"v1"')
+    reader = ConditionalReader(cache=ETagCache(), is_binary=False)
+    f = _fake_file(fs, "key.json")
+
+    assert reader.read(f) == '{"value": 1}'
+    assert reader.read(f) == '{"value": 1}'
+    assert reader.cache.hits == 1 and reader.cache.misses == 1
+    # Every read is a single request, revalidated once the ETag is known
+    assert fs.requests == [("get_object", None), ("get_object", '"v1"')]
+
+    fs.objects["key.json"] = (b'{"value": 2}', '"v2"')
+    assert asyncio.run(reader.aread(f)) == '{"value": 2}'
+    assert reader.cache.get("s3://bucket/key.json") == ('"v2"', '{"value": 2}')
+
+    del fs.objects["key.json"]
+    try:
+        reader.read(f)
+        raise AssertionError("Expected a miss")
+    except FileNotFoundError:
+        pass
+    assert len(reader.cache) == 0
+
+    # Local files are read directly
+    cache = _make_cache(tmp_path / "store", etag_cache=True)
+    cache["a"] = 1
+    assert cache["a"] == 1 and len(cache.base.etag_cache) == 0
+
+
+def test_etag_cache_bounds() -> None:
+    cache = ETagCache(max_entries=2, max_size=10)
+    cache.set("a", "1", b"aaaa")
+    cache.set("b", "1", b"bbbb")
+    cache.get("a")
+    cache.set("c", "1", b"cccc")
+    assert cache.get("b") is None and cache.get("a") is not None
+    cache.set("d", "1", b"d" * 11)
+    assert cache.get("d") is None and cache.size == 8
@@ -0,0 +1,110 @@
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+from lzl.io.persistence.backends.redis import RedisStatefulBackend
+
+
+class _Pipeline:
+    def __init__(self, client: "_Client") -> None:
+        self.client = client
+        self.calls: List[Tuple[str, tuple]] = []
+
+    def scan(self, *args, **kwargs) -> None:
+        self.calls.append(("scan", args))
+
+    def mget(self, keys) -> None:
+        self.calls.append(("mget", (list(keys),)))
+
+    def __len__(self) -> int:
+        return len(self.calls)
+
+    def execute(self) -> list:
+        self.client.executed.append([name for name, _ in self.calls])
+        return [getattr(self.client, name)(*args) for name, args in self.calls]
+
+
+class _Client:
+    """Serves the scripted SCAN/HSCAN pages and records the calls."""
+
+    def __init__(self, pages: List[List[bytes]], data: Dict[bytes, bytes]) -> None:
+        self.pages = pages
+        self.data = data
+        self.executed: List[List[str]] = []
+        self.deleted: List[Tuple[str, tuple]] = []
+
+    def _next_cursor(self, cursor: int) -> int:
+        return cursor + 1 if cursor + 1 < len(self.pages) else 0
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    def scan(self, cursor, match=None, count=None):
+        return self._next_cursor(cursor), self.pages[cursor]
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def hscan(self, name, cursor, count=None):
+        return self._next_cursor(cursor), {key: self.data[key] for key in self.pages[cursor]}
+
+    def unlink(self, *keys) -> None:
+        self.deleted.append(("unlink", keys))
+
+    def hdel(self, name, *keys) -> None:
+        self.deleted.append(("hdel", keys))
+
+
+def _make_backend(pages: List[List[bytes]], hset_enabled: bool = False, scan_batch_size: int = 2) -> RedisStatefulBackend:
+    data = {key: key.upper() for page in pages for key in page}
+    backend = RedisStatefulBackend.__new__(RedisStatefulBackend)
+    backend.base_key = "base"
+    backend.hset_enabled = hset_enabled
+    backend.scan_batch_size = scan_batch_size
+    backend.cache = SimpleNamespace(client=_Client(pages, data), hlen=lambda name: len(data))
+    return backend
+
+
+def test_pages_pipeline_mget_with_next_scan() -> None:
+    pages = [[b"base:a", b"base:b"], [], [b"base:c"]]
+    backend = _make_backend(pages)
+    result = list(backend._iter_pages(fetch_values=True))
+
+    # Empty pages are skipped and each page is yielded with its own values
+    assert result == [([b"base:a", b"base:b"], [b"BASE:A", b"BASE:B"]), ([b"base:c"], [b"BASE:C"])]
+    # The MGET of a page is sent with the SCAN of the next page, and the last MGET alone
+    assert backend.cache.client.executed == [["scan"], ["scan", "mget"], ["scan"], ["mget"]]
+
+
+def test_pages_without_values_only_scan() -> None:
+    backend = _make_backend([[b"base:a"], [b"base:b"]])
+    assert list(backend._iter_pages()) == [([b"base:a"], None), ([b"base:b"], None)]
+    assert all(calls == ["scan"] for calls in backend.cache.client.executed)
+
+
+def test_hset_pages() -> None:
+    backend = _make_backend([[b"a", b"b"], [b"c"]], hset_enabled=True)
+    assert list(backend._iter_pages(fetch_values=True)) == [([b"a", b"b"], [b"A", b"B"]), ([b"c"], [b"C"])]
+    assert not backend.cache.client.executed
+    assert len(backend) == 3
+
+
+def test_repeated_keys_are_yielded_once() -> None:
+    pages = [[b"base:a", b"base:b"], [b"base:b", b"base:c"], [b"base:a"]]
+    backend = _make_backend(pages)
+    assert list(backend._iter_pages(fetch_values=True)) == [([b"base:a", b"base:b"], [b"BASE:A", b"BASE:B"]), ([b"base:c"], [b"BASE:C"])]
+    assert list(backend.iter_keys()) == ["base:a", "base:b", "base:c"]
+    assert len(backend) == 3
+
+    backend = _make_backend([[b"a", b"b"], [b"b", b"c"]], hset_enabled=True)
+    assert list(backend._iter_pages(fetch_values=True)) == [([b"a", b"b"], [b"A", b"B"]), ([b"c"], [b"C"])]
+
+
+def test_remove_keys_in_chunks() -> None:
+    keys = [f"base:{i}" for i in range(5)]
+    backend = _make_backend([[]])
+    backend._remove_keys(keys)
+    assert backend.cache.client.deleted == [("unlink", tuple(keys[0:2])), ("unlink", tuple(keys[2:4])), ("unlink", tuple(keys[4:]))]
+
+    backend = _make_backend([[]], hset_enabled=True, scan_batch_size=3)
+    backend._remove_keys(keys)
+    assert backend.cache.client.deleted == [("hdel", tuple(keys[0:3])), ("hdel", tuple(keys[3:]))]
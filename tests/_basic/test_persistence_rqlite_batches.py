@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+from lzl.api import aiorqlite
+from lzl.io.persistence.backends.rqlite.base import BaseRqliteDB
+
+
+class _Node:
+    """
+    Records the multi-statement requests sent to a single rqlite node
+    """
+
+    def __init__(self):
+        self.requests: List[Tuple[str, list]] = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                node.requests.append((self.path, body))
+                data = json.dumps({"results": [{"rows_affected": 1} for _ in body]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _make_db(node: _Node, **kwargs) -> BaseRqliteDB:
+    db = BaseRqliteDB(node.url, "rqlite.batches", **kwargs)
+    db._io = aiorqlite.connect(node.url, log=False, default_mode="sync", default_return="cursor")
+    db._aio = aiorqlite.connect(node.url, log=False, default_mode="async", default_return="cursor")
+    db._extra.update({"cull_limit": 10, "size_limit": 100, "eviction_policy": "least-recently-stored"})
+    return db
+
+
+def test_set_batch_is_chunked_into_transactions() -> None:
+    node = _Node()
+    try:
+        db = _make_db(node, max_batch_size=4096, max_batch_statements=50)
+        db.volume = lambda: 0
+        data = {f"key_{i}": "x" * 100 for i in range(120)}
+        assert db.set_batch(data, expire=60) == 121
+
+        # Chunks respect both limits and the culling ships with the last chunk
+        assert 3 <= len(node.requests) < 120
+        assert all(path.startswith("/db/execute?transaction") for path, _ in node.requests)
+        assert all(len(body) <= 50 for _, body in node.requests)
+        assert sum(len(json.dumps(body)) for _, body in node.requests) < 4096 * len(node.requests)
+        statements = [statement for _, body in node.requests for statement in body]
+        assert [s[1] for s in statements[:-1]] == list(data)
+        assert statements[-1][0].startswith('DELETE FROM "rqlite_batches" WHERE rowid IN (SELECT rowid')
+
+        # Policy eviction is only added over the size limit
+        node.requests.clear()
+        db.volume = lambda: 1000
+        assert db.cull() == 2
+        ((_, body),) = node.requests
+        assert "ORDER BY store_time LIMIT ?" in body[1][0] and body[1][1:] == [10]
+
+        node.requests.clear()
+        assert db.delete_batch(f"key_{i}" for i in range(1200)) == 3
+        assert [len(s) - 1 for _, body in node.requests for s in body] == [500, 500, 200]
+    finally:
+        db._io = db._aio = None
+        node.close()
+
+
+def test_async_batches() -> None:
+    node = _Node()
+    try:
+        db = _make_db(node, max_batch_statements=10)
+
+        async def _test() -> None:
+            assert await db.aset_batch({f"key_{i}": i for i in range(25)}, cull=False) == 25
+            assert [len(body) for _, body in node.requests] == [10, 10, 5]
+            assert await db.adelete_batch(["key_1", "key_2"]) == 1
+            assert node.requests[-1][1] == [['DELETE FROM "rqlite_batches" WHERE key IN (?, ?)', "key_1", "key_2"]]
+
+        asyncio.run(_test())
+    finally:
+        db._io = db._aio = None
+        node.close()
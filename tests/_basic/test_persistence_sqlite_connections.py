@@ -0,0 +1,65 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lzl.io.persistence import PersistentDict
+
+
+def _make_cache(path: Path, **db_settings) -> PersistentDict:
+    return PersistentDict(
+        name="sqlite_conns",
+        backend_type="sqlite",
+        base_key=f"sqlite://{path}",
+        serializer="json",
+        db_settings=db_settings or None,
+    )
+
+
+def test_threaded_reads_and_group_commit(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "cache.db")
+    db = cache.base.db
+    cache.set_batch({f"key_{i}": i for i in range(50)})
+
+    def _worker(idx: int) -> None:
+        for i in range(25):
+            cache[f"w{idx}_{i}"] = i
+            assert cache[f"w{idx}_{i}"] == i
+            assert cache.get(f"key_{i}") == i
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(_worker, range(4)))
+
+    # Every worker thread reads through its own connection
+    assert len(db.readers) >= 4
+    assert db.writer.operations >= 101
+    assert len(cache.base.get_all_keys()) == 150
+
+    cache.delete("key_1")
+    assert cache.get("key_1") is None
+
+    # Writes inside a transaction run on the writer connection and are visible to it
+    with db.transact():
+        db.set("in_txn", 1)
+        assert db.get("in_txn") == 1
+
+
+def test_async_paths(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "cache.db")
+
+    async def _test() -> None:
+        await asyncio.gather(*[cache.aset(f"key_{i}", i) for i in range(50)])
+        await cache.aset_batch({"a": 1, "b": 2})
+        assert [await cache.aget(f"key_{i}") for i in range(50)] == list(range(50))
+        assert await cache.aget("b") == 2
+        await cache.adelete("a")
+        assert await cache.aget("a") is None
+
+    asyncio.run(_test())
+
+
+def test_without_thread_connections(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path / "cache.db", read_connections=False, group_commit=False)
+    cache["alpha"] = {"value": 1}
+    assert cache["alpha"] == {"value": 1}
+    assert cache.base.db.readers is None
+    assert cache.base.db.writer is None
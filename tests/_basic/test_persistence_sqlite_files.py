@@ -0,0 +1,85 @@
+import asyncio
+from pathlib import Path
+
+from lzl.io.persistence import PersistentDict
+
+
+def _make_cache(path: Path, **db_settings) -> PersistentDict:
+    return PersistentDict(
+        name="sqlite_files",
+        backend_type="sqlite",
+        base_key=f"sqlite://{path}",
+        serializer="pickle",
+        db_settings={"large_value_threshold": 1024, **db_settings},
+    )
+
+
+def _value_files(path: Path) -> list:
+    return [p for p in path.parent.joinpath(f"{path.name}-files").rglob("*") if p.is_file()]
+
+
+def test_large_values_are_stored_in_files(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = _make_cache(path)
+    db = cache.base.db
+    large = b"x" * 8192
+    cache["a"] = large
+    cache["b"] = large
+    cache["small"] = {"value": 1}
+
+    # Identical values share a single file and only small values stay inline
+    assert len(_value_files(path)) == 1
+    assert cache["a"] == large
+    assert cache.get_values(["b", "small"]) == [large, {"value": 1}]
+    rows = dict(db._rsql(f'SELECT key, filename FROM "{db.table}"').fetchall())
+    assert rows["a"] == rows["b"] and rows["small"] is None
+    with db.read("a") as f:
+        assert len(f.read()) > len(large)
+
+    # The file is removed once it is no longer referenced
+    del cache["a"]
+    assert len(_value_files(path)) == 1
+    cache["b"] = 2
+    assert _value_files(path) == []
+
+    cache.set_batch({f"key_{i}": bytes([i]) * 4096 for i in range(5)})
+    assert len(_value_files(path)) == 5
+    assert cache["key_3"] == bytes([3]) * 4096
+    cache.clear()
+    assert _value_files(path) == []
+
+
+def test_files_are_read_without_offloading(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    writer = _make_cache(path)
+    writer["large"] = "y" * 4096
+
+    reader = _make_cache(path, large_value_threshold=None)
+    assert reader["large"] == "y" * 4096
+    reader["other"] = "z" * 4096
+    assert reader["other"] == "z" * 4096
+    assert len(_value_files(path)) == 1
+
+    # Deletes of any instance remove the orphaned files
+    reader.delete("large")
+    assert _value_files(path) == []
+
+
+def test_async_transactions_remove_orphaned_files(tmp_path: Path) -> None:
+    path = tmp_path / "cache.db"
+    cache = _make_cache(path)
+    db = cache.base.db
+    cache["a"] = b"x" * 8192
+    cache["b"] = b"y" * 8192
+    assert len(_value_files(path)) == 2
+
+    async def _test() -> None:
+        try:
+            await db._adelete_key_("a")
+            assert len(_value_files(path)) == 1
+            await db._aselect_delete(f'SELECT rowid FROM "{db.table}" WHERE key = ?', ["b"])
+            assert _value_files(path) == []
+        finally:
+            await db.aclose()
+
+    asyncio.run(_test())
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from lzl.io.persistence import PersistentDict
+from lzl.io.persistence.backends.sqlite.base import OPTIMIZED, PRAGMA_PROFILES
+
+
+def _pragma(conn, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def test_optimized_mmap_sizes_are_in_bytes() -> None:
+    assert OPTIMIZED["balanced"]["sqlite_mmap_size"] == 128 * 1024 * 1024
+    assert OPTIMIZED["cache"]["sqlite_mmap_size"] == 512 * 1024 * 1024
+
+
+@pytest.mark.parametrize("profile", list(PRAGMA_PROFILES))
+def test_pragma_profiles_apply_to_every_connection(tmp_path: Path, profile: str) -> None:
+    cache = PersistentDict(
+        name="sqlite_pragmas",
+        backend_type="sqlite",
+        base_key=f"sqlite://{tmp_path / 'cache.db'}",
+        serializer="json",
+        db_settings={"pragma_profile": profile},
+    )
+    cache["alpha"] = 1
+    assert cache["alpha"] == 1
+
+    settings = PRAGMA_PROFILES[profile]
+    db = cache.base.db
+    assert _pragma(db.io, "page_size") == settings["sqlite_page_size"]
+    for conn in (db.io, db.readers.get()):
+        for key in ("sqlite_cache_size", "sqlite_mmap_size", "sqlite_synchronous", "sqlite_temp_store", "sqlite_journal_size_limit"):
+            assert _pragma(conn, key[7:]) == settings[key], key
+
+
+def test_invalid_pragma_profile(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        PersistentDict(
+            name="sqlite_pragmas",
+            backend_type="sqlite",
+            base_key=f"sqlite://{tmp_path / 'cache.db'}",
+            db_settings={"pragma_profile": "fast"},
+        )
+
+
+def test_pragma_profile_overrides_stored_settings(tmp_path: Path) -> None:
+    def _make_cache(**db_settings) -> PersistentDict:
+        return PersistentDict(
+            name="sqlite_pragmas",
+            backend_type="sqlite",
+            base_key=f"sqlite://{tmp_path / 'cache.db'}",
+            serializer="json",
+            db_settings=db_settings or None,
+        )
+
+    _make_cache()["alpha"] = 1
+    db = _make_cache(pragma_profile="durable").base.db
+    assert db.io.execute("PRAGMA synchronous").fetchone()[0] == 2
+    stored = dict(db.io.execute(f'SELECT key, value FROM "{db.table}_settings"').fetchall())
+    for key in ("sqlite_synchronous", "sqlite_mmap_size", "sqlite_cache_size"):
+        assert db._extra[key] == stored[key] == PRAGMA_PROFILES["durable"][key], key
@@ -0,0 +1,80 @@
+import multiprocessing
+import time
+from pathlib import Path
+
+from lzl.io.persistence import TemporaryData
+
+
+def _log_once(filepath: str, barrier, results) -> None:
+    store = TemporaryData(filepath=filepath, is_multithreaded=True)
+    barrier.wait()
+    results.put(store.has_logged("init"))
+
+
+def test_reads_are_served_from_memory(tmp_path: Path, monkeypatch) -> None:
+    store = TemporaryData(filedir=tmp_path)
+    store["alpha"] = 1
+
+    reads = []
+    load_data = store._load_data
+    monkeypatch.setattr(store, "_load_data", lambda: reads.append(1) or load_data())
+    for _ in range(100):
+        assert store.get("alpha") == 1
+        assert "alpha" in store
+    assert not reads
+
+    # A write from another handle changes the file signature and is picked up
+    other = TemporaryData(filepath=store.filepath)
+    other["alpha"] = 20
+    assert store.get("alpha") == 20
+    assert len(reads) == 1
+
+
+def test_appends_are_batched(tmp_path: Path) -> None:
+    store = TemporaryData(filedir=tmp_path, flush_interval=60)
+    for i in range(50):
+        assert store.has_logged(f"key-{i}") is False
+    assert store.has_logged("key-0") is True
+
+    # Nothing is written until the buffer is flushed
+    assert "logged" not in TemporaryData(filepath=store.filepath)
+    store.flush()
+    assert len(TemporaryData(filepath=store.filepath)["logged"]) == 50
+
+    # Buffered appends are also written on a timer
+    store = TemporaryData(filedir=tmp_path / "timer", flush_interval=0.1)
+    assert store.has_logged("key") is False
+    time.sleep(0.5)
+    assert TemporaryData(filepath=store.filepath)["logged"] == ["key"]
+
+
+def test_has_logged_across_processes(tmp_path: Path) -> None:
+    store = TemporaryData(filedir=tmp_path, is_multithreaded=True)
+    assert "logged" not in store
+
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(4), ctx.Queue()
+    procs = [ctx.Process(target=_log_once, args=(str(store.filepath), barrier, results)) for _ in range(4)]
+    for proc in procs: proc.start()
+    logged = [results.get(timeout=60) for _ in procs]
+    for proc in procs: proc.join(timeout=60)
+    assert all(proc.exitcode == 0 for proc in procs)
+
+    # Exactly one process logs, and the main process sees it
+    assert sorted(logged) == [False, True, True, True]
+    assert store.has_logged("init") is True
+
+
+def test_reads_do_not_share_the_cache(tmp_path: Path) -> None:
+    store = TemporaryData(filedir=tmp_path)
+    items = [1, {"a": 1}]
+    store["items"] = items
+    items.append(2)
+
+    store.get("items").append(3)
+    store["items"][1]["a"] = 2
+    store.data["items"].append(4)
+    store.setdefault("items", []).append(5)
+    assert store["items"] == [1, {"a": 1}]
+    assert store == {"items": [1, {"a": 1}]}
+    assert TemporaryData(filepath=store.filepath)["items"] == [1, {"a": 1}]
@@ -0,0 +1,66 @@
+import datetime
+import enum
+
+from pydantic import BaseModel
+
+from lzl.io.ser import (
+    deserialize_object,
+    register_object_serializer,
+    serialize_object,
+    unregister_object_serializer,
+)
+
+
+class Point(BaseModel):
+    x: int
+    y: int
+
+
+class Level(enum.IntEnum):
+    LOW = 1
+
+
+class Money:
+    def __init__(self, amount: int) -> None:
+        self.amount = amount
+
+    def serialize(self) -> dict:
+        return {"amount": self.amount}
+
+
+class Euro(Money):
+    pass
+
+
+def test_nested_payload_roundtrip() -> None:
+    payload = {
+        "points": [Point(x=1, y=2), Point(x=3, y=4)],
+        "when": datetime.datetime(2024, 1, 1),
+        "tags": {"a"},
+        "level": Level.LOW,
+        "nested": [{"raw": b"ab"}, (1, 2.5, None)],
+    }
+    serialized = serialize_object(payload)
+    # IntEnum members are ints and stay primitives
+    assert serialized["level"] is Level.LOW
+    assert serialized["nested"][1] == [1, 2.5, None]
+    assert deserialize_object(serialized) == {
+        **payload,
+        "nested": [{"raw": b"ab"}, [1, 2.5, None]],
+    }
+    assert serialize_object(payload, mode="raw")["points"] == [{"x": 1, "y": 2}, {"x": 3, "y": 4}]
+
+
+def test_registered_serializer_applies_to_subclasses() -> None:
+    # Resolve the built-in handler first so registering has to invalidate it
+    assert serialize_object(Euro(1))["__type__"] == "serializable"
+
+    @register_object_serializer(Money)
+    def _serialize_money(obj: Money, mode: str = "auto", **kwargs) -> int:
+        return obj.amount
+
+    try:
+        assert serialize_object([Money(5), Euro(7)]) == [5, 7]
+    finally:
+        unregister_object_serializer(Money)
+    assert serialize_object(Euro(1))["__type__"] == "serializable"
@@ -0,0 +1,62 @@
+import datetime
+import json
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from lzl.io.ser import get_serializer
+from lzl.io.ser.models import get_model_codec, split_envelope
+
+
+class Item(BaseModel):
+    name: str
+    created_at: datetime.datetime
+
+
+class Order(BaseModel):
+    id: int
+    items: List[Item]
+    primary: Optional[Item] = None
+    by_name: Dict[str, Item] = {}
+
+
+def _make_order() -> Order:
+    item = Item(name="a", created_at=datetime.datetime(2024, 1, 1, 12))
+    return Order(id=1, items=[item, item], primary=item, by_name={"a": item})
+
+
+def test_json_envelope_round_trip() -> None:
+    serializer = get_serializer("json")
+    order = _make_order()
+    dumped = serializer.dumps(order)
+
+    envelope = json.loads(dumped)
+    assert envelope["__type__"] == "pydantic"
+    assert envelope["__class__"] == get_model_codec(Order).class_name
+    assert split_envelope(dumped)[0] == envelope["__class__"]
+
+    loaded = serializer.loads(dumped)
+    assert isinstance(loaded, Order)
+    assert loaded == order
+
+
+def test_json_decodes_generic_envelope() -> None:
+    serializer = get_serializer("json")
+    order = _make_order()
+    # Written with extra whitespace, as older versions or other encoders may
+    dumped = json.dumps(json.loads(serializer.dumps(order)), indent=2)
+    assert split_envelope(dumped) is None
+    assert serializer.loads(dumped) == order
+
+
+def test_msgpack_round_trip() -> None:
+    serializer = get_serializer("msgpack")
+    order = _make_order()
+    loaded = serializer.loads(serializer.dumps({"order": order, "items": order.items}))
+    assert loaded["order"] == order
+    assert loaded["items"] == order.items
+
+
+def test_non_models_have_no_codec() -> None:
+    assert get_model_codec(dict) is None
+    assert get_model_codec(Item) is get_model_codec(Item)
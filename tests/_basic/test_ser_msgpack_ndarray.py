@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("msgpack")
+
+from lzl.io.persistence import PersistentDict
+from lzl.io.ser import get_serializer
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        np.arange(12, dtype=">i2").reshape(3, 4),
+        np.arange(10, dtype=np.float32)[::2],
+        np.zeros((0, 3)),
+        np.array(["a", "bc"]),
+    ],
+)
+def test_arrays_roundtrip_as_ext_types(value) -> None:
+    serializer = get_serializer("msgpack")
+    encoded = serializer.dumps(value)
+    decoded = serializer.loads(encoded)
+    assert decoded.dtype == value.dtype
+    assert decoded.shape == value.shape
+    assert np.array_equal(decoded, value)
+    # The buffer is not copied on decode
+    assert not decoded.flags.owndata
+
+
+def test_scalars_objects_and_bytes() -> None:
+    serializer = get_serializer("msgpack")
+    scalar = serializer.loads(serializer.dumps(np.float32(1.5)))
+    assert isinstance(scalar, np.float32) and scalar == 1.5
+    assert serializer.loads(serializer.dumps(np.array([1, "x"], dtype=object))) == [1, "x"]
+
+    blob = bytes(range(256))
+    encoded = serializer.dumps({"blob": blob})
+    assert len(encoded) < len(blob) + 16
+    assert serializer.loads(encoded) == {"blob": blob}
+
+
+def test_persistent_dict_embeddings(tmp_path: Path) -> None:
+    cache = PersistentDict(
+        name="embeddings",
+        backend_type="local",
+        file_path=tmp_path / "cache.json",
+        serializer="msgpack",
+    )
+    matrix = np.random.rand(64, 32).astype(np.float32)
+    cache["matrix"] = matrix
+    assert np.array_equal(cache["matrix"], matrix)
@@ -0,0 +1,60 @@
+import asyncio
+import datetime
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+from lzl.io.ser import get_serializer
+
+
+class Record(BaseModel):
+    id: int
+    created_at: datetime.datetime
+
+
+def _records(count: int):
+    for i in range(count):
+        yield {"id": i, "text": "line\nbreak", "record": Record(id=i, created_at=datetime.datetime(2024, 1, 1))}
+
+
+@pytest.mark.parametrize("name", ["json", "msgpack", "pickle"])
+@pytest.mark.parametrize("compression", [None, "zlib", "gzip", "zstd"])
+def test_stream_round_trip(name: str, compression) -> None:
+    serializer = get_serializer(name, compression=compression)
+    data = b"".join(serializer.encode_stream(_records(500), chunk_size=1024))
+
+    # Chunks are split at arbitrary byte boundaries when read back
+    chunks = (data[i:i + 7] for i in range(0, len(data), 7))
+    assert list(serializer.decode_stream(chunks)) == list(_records(500))
+
+
+def test_json_stream_is_ndjson() -> None:
+    serializer = get_serializer("json")
+    data = b"".join(serializer.encode_stream([{"a": 1}, [1, 2], "x"]))
+    assert [json.loads(line) for line in data.splitlines()] == [{"a": 1}, [1, 2], "x"]
+
+
+def test_truncated_frame_raises() -> None:
+    serializer = get_serializer("msgpack")
+    data = b"".join(serializer.encode_stream([{"a": 1}, {"b": 2}]))
+    with pytest.raises(ValueError):
+        list(serializer.decode_stream([data[:-1]]))
+
+
+def test_file_streams(tmp_path: Path) -> None:
+    serializer = get_serializer("json", compression="zstd")
+    path = tmp_path / "records.ndjson.zst"
+    serializer.dump_stream(_records(100), path)
+    assert list(serializer.load_stream(path, chunk_size=64)) == list(_records(100))
+
+    async def _run():
+        async def _aiter():
+            for value in _records(100):
+                yield value
+
+        await serializer.adump_stream(_aiter(), path)
+        return [value async for value in serializer.aload_stream(path, chunk_size=64)]
+
+    assert asyncio.run(_run()) == list(_records(100))
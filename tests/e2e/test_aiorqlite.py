@@ -0,0 +1,54 @@
+import os
+import uuid
+
+import httpx
+import pytest
+
+from lzl.api import aiorqlite
+
+
+@pytest.fixture
+def rqlite_hosts():
+    """
+    Returns the rqlite nodes from `RQLITE_HOSTS`, a comma-separated list of
+    one node or of all the nodes of a cluster.
+    """
+    hosts = [h.strip() for h in os.getenv("RQLITE_HOSTS", "http://localhost:4001").split(",") if h.strip()]
+    try:
+        for host in hosts:
+            httpx.get(f"{host}/readyz", timeout=2).raise_for_status()
+    except Exception as e:
+        pytest.skip(f"rqlite not accessible at {hosts}: {e}")
+    return hosts
+
+
+def test_rqlite_leader_routing(rqlite_hosts):
+    conn = aiorqlite.connect(rqlite_hosts, log=False)
+    table = f"t_{uuid.uuid4().hex[:8]}"
+    conn.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, value TEXT)")
+    try:
+        for i in range(10):
+            conn.execute(f"INSERT INTO {table} (value) VALUES (?)", (str(i),))
+        assert conn.io.leader is not None
+        assert conn.io.leader.bare == conn.io.discover_leader(refresh=True).bare
+
+        for level in ("none", "weak", "strong"):
+            result = conn.execute(f"SELECT COUNT(*) FROM {table}", read_consistency=level)
+            assert result.results[0][0] == 10
+    finally:
+        conn.execute(f"DROP TABLE {table}")
+
+
+@pytest.mark.asyncio
+async def test_rqlite_leader_routing_async(rqlite_hosts):
+    conn = aiorqlite.connect(rqlite_hosts, log=False)
+    table = f"t_{uuid.uuid4().hex[:8]}"
+    cursor = conn.cursor()
+    await cursor.aexecute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, value TEXT)")
+    try:
+        await cursor.aexecute(f"INSERT INTO {table} (value) VALUES (?)", ("a",))
+        assert (await conn.io.adiscover_leader()) is conn.io.leader
+        result = await cursor.aexecute(f"SELECT value FROM {table}", read_consistency="strong")
+        assert result.results[0][0] == "a"
+    finally:
+        await cursor.aexecute(f"DROP TABLE {table}")
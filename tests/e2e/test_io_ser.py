@@ -35,3 +35,18 @@ def test_msgpack_serializer():
         assert decoded == data
     except (ImportError, ValueError):
         pytest.skip("msgpack not available")
+
+
+def test_serializer_batch_roundtrip():
+    """
+    Test batched encoding and decoding.
+    """
+    import asyncio
+    ser = get_serializer('json', compression = 'zlib')
+    data = [{"idx": i} for i in range(10)]
+    encoded = ser.encode_many(data)
+    assert encoded == [ser.encode(item) for item in data]
+    assert ser.decode_many(encoded + [None]) == data + [None]
+
+    ser.batch_chunk_size = 3
+    assert asyncio.run(ser.adecode_many(asyncio.run(ser.aencode_many(data)))) == data
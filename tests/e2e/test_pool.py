@@ -35,3 +35,72 @@ def test_thread_pool():
         import anyio
         anyio.run(_test_thread_pool)
         anyio.run(_test)
+
+def test_thread_pool_iterate_window():
+    """
+    Test that ThreadPool.iterate consumes the iterable lazily and preserves order.
+    """
+    consumed = []
+
+    def _items():
+        for i in range(1_000_000):
+            consumed.append(i)
+            yield i
+
+    it = ThreadPool.iterate(cpu_bound_task, _items(), max_in_flight=4)
+    assert [next(it) for _ in range(3)] == [0, 1, 4]
+    assert len(consumed) <= 8
+    it.close()
+
+    assert ThreadPool.map(cpu_bound_task, range(100)) == [x * x for x in range(100)]
+    assert sorted(ThreadPool.map(cpu_bound_task, range(100), return_ordered=False)) == [x * x for x in range(100)]
+    assert ThreadPool.map(cpu_bound_task, range(10), use_process_pool=True, chunksize=3) == [x * x for x in range(10)]
+
+def test_thread_pool_aiterate_ordered_window():
+    """
+    Test that ThreadPool.amap keeps the window busy and yields in input order.
+    """
+    from lzl.pool import TaskStats
+
+    async def _task(x):
+        await asyncio.sleep(0.2 if x == 0 else 0.01)
+        return x
+
+    async def _test():
+        stats = TaskStats()
+        results = await ThreadPool.amap(_task, range(40), concurrency_limit=4, stats=stats)
+        assert results == list(range(40))
+        assert stats.count == 40
+
+        unordered = await ThreadPool.amap(_task, range(40), concurrency_limit=4, return_ordered=False)
+        assert unordered[-1] == 0
+
+    asyncio.run(_test())
+
+def test_adaptive_limiters():
+    """
+    Test that the adaptive limiters grow on success and back off on 429s.
+    """
+    from lzl.pool import AIMDLimiter, GradientLimiter, get_limiter
+
+    class RateLimited(Exception):
+        status_code = 429
+
+    for limiter in (AIMDLimiter(initial_limit=4), GradientLimiter(initial_limit=4)):
+        for _ in range(200):
+            limiter.record(0.01)
+        grown = limiter.limit
+        assert grown > 4
+        limiter.record(0.01, error=RateLimited())
+        assert limiter.limit < grown
+
+    assert get_limiter(8).limit == 8
+    assert isinstance(get_limiter("aimd"), AIMDLimiter)
+
+    async def _test():
+        limiter = AIMDLimiter(initial_limit=2, max_limit=16)
+        results = await ThreadPool.amap(io_bound_task, range(20), concurrency_limit=limiter)
+        assert results == [x + 1 for x in range(20)]
+        assert limiter.limit > 2
+
+    asyncio.run(_test())